@@ -7,6 +7,26 @@ and shares a common caching infrastructure.
 
 Modules:
     cache: Shared VideoCache class for caching downloaded videos
+    metadata_store: Pluggable VideoCache metadata backends (JSON, SQLite)
+    eviction: Cache budgets and LRU/LFU/GDSF eviction policies
+    locking: Cross-process file locks and per-video single-flight locks
+    blob_store: Content-addressed (SHA-256) blob storage for deduplication
+    cache_stats: Incrementally maintained cache size, count and age statistics
+    tiering: Hot storage tier with promotion on repeated hits and LRU demotion
+    byte_ranges: Segment maps and HTTP Range helpers for partial video caching
+    layout: Flat and hashed (sharded) directory layouts of cached files
+    mapped_video: Memory-mapped (zero-copy) access to cached files and sendfile helper
+    integrity: Payload checks at write time and parallel verification with quarantine
+    revalidation: Conditional (ETag/Last-Modified) revalidation of expired entries
+    response_cache: Persistent search/details response cache with stale-while-revalidate
+    negative_cache: Negative cache of missing video IDs and empty searches
+    prefetch: Background cache warmup jobs from scene lists (priorities, budget, progress)
+    fetching: Shared fetch loop (backoff, Retry-After) and resumable streaming into the cache
+    http_client: Shared pooled HTTP client (keep-alive, HTTP/2, timeouts) of each server
+    robots: In-memory robots.txt policies per origin with TTL and single-flight refresh
+    rate_limiter: Adaptive (AIMD) token-bucket rate limiting per origin, optionally shared across processes
+    janitor: Background sweeping of expired entries and orphan files
+    cache_cli: Command-line cache maintenance (python -m mcp_servers.cache_cli)
     dvids_scraping_server: DVIDS web scraping MCP server
 """
 
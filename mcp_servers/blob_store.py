@@ -0,0 +1,143 @@
+"""
+Content-Addressed Blob Store for the Shared VideoCache
+
+The same public-domain footage is often mirrored between providers or
+re-uploaded under different IDs. VideoCache hashes every video with SHA-256
+while writing it and keeps one blob per distinct content under
+cache_dir/blobs/<first two hex digits>/<sha256>.
+
+Cached files keep their usual {provider}/{video_id}.{ext} paths, but are
+hard links to the blob, so duplicate downloads cost no extra disk space and
+readers need no changes. The filesystem link count is the reference count:
+a blob with no remaining video links is deleted on release. On filesystems
+without hard links the cached file is stored on its own (no deduplication).
+"""
+
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIRNAME = "blobs"
+
+
+class BlobStore:
+    """
+    SHA-256 addressed blobs shared by cached video files through hard links.
+
+    Attributes:
+        root: Blob directory (cache_dir/blobs)
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize blob store.
+
+        Args:
+            root: Blob directory (created on first write)
+        """
+        self.root = Path(root)
+
+    def path_for(self, digest: str) -> Path:
+        """
+        Get the blob path for a content hash.
+
+        Args:
+            digest: Hex SHA-256 digest
+
+        Returns:
+            Blob file path
+        """
+        return self.root / digest[:2] / digest
+
+    def refcount(self, digest: str) -> int:
+        """
+        Count cached files linked to a blob.
+
+        Args:
+            digest: Hex SHA-256 digest
+
+        Returns:
+            Number of video links (0 if the blob does not exist)
+        """
+        try:
+            return max(os.stat(self.path_for(digest)).st_nlink - 1, 0)
+        except OSError:
+            return 0
+
+    def commit(self, digest: str, temp_path: Path, target: Path) -> bool:
+        """
+        Move a fully written temporary file to target, sharing its blob.
+
+        If a blob with the same digest exists, target becomes a link to it
+        and temp_path is discarded. Otherwise temp_path becomes the new blob
+        and is moved to target. Target is always replaced atomically.
+
+        Args:
+            digest: Hex SHA-256 digest of temp_path's content
+            temp_path: Temporary file in target's directory
+            target: Final cached file path
+
+        Returns:
+            True if the content was already stored (deduplicated)
+        """
+        blob_path = self.path_for(digest)
+        try:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Cannot create blob directory {blob_path.parent}: {e}")
+            os.replace(temp_path, target)
+            return False
+
+        # Existing blob: link target to it and drop the duplicate download
+        if blob_path.exists():
+            link_path = target.with_name(f".{uuid.uuid4().hex}.link")
+            try:
+                os.link(blob_path, link_path)
+            except FileNotFoundError:
+                pass  # blob released concurrently, store ours instead
+            except OSError as e:
+                logger.debug(f"Hard links unavailable for {blob_path}: {e}")
+                os.replace(temp_path, target)
+                return False
+            else:
+                os.replace(link_path, target)
+                temp_path.unlink()
+                logger.info(f"Deduplicated {target.name} against blob {digest[:12]}")
+                return True
+
+        # New content: publish temp_path as the blob, then move it into place
+        try:
+            os.link(temp_path, blob_path)
+        except FileExistsError:
+            # Another writer published the same content first
+            return self.commit(digest, temp_path, target)
+        except OSError as e:
+            logger.debug(f"Hard links unavailable for {blob_path}: {e}")
+        os.replace(temp_path, target)
+        return False
+
+    def release(self, digest: Optional[str]) -> bool:
+        """
+        Delete a blob once no cached file links to it anymore.
+
+        Args:
+            digest: Hex SHA-256 digest (None is ignored)
+
+        Returns:
+            True if the blob was deleted
+        """
+        if not digest:
+            return False
+        blob_path = self.path_for(digest)
+        try:
+            if os.stat(blob_path).st_nlink > 1:
+                return False
+            blob_path.unlink()
+        except OSError:
+            return False
+        logger.info(f"Released blob {digest[:12]}")
+        return True
@@ -0,0 +1,290 @@
+"""
+Byte-Range Helpers for Partial Video Caching
+
+The assembly pipeline usually needs a few seconds of a long clip. VideoCache
+can store just the byte ranges that were requested in a sparse file and
+track them in a segment map: a sorted list of non-overlapping, non-adjacent
+[start, end) pairs kept in the video's metadata entry.
+
+Interrupted full downloads use the same partial entries: the bytes received
+so far form a segment [0, offset) and the response's ETag/Last-Modified
+validators are recorded, so the next attempt can resume with a Range
+request guarded by If-Range.
+
+This module holds the segment map arithmetic and the HTTP Range plumbing
+shared by the scraping servers.
+"""
+
+import re
+from typing import Any, AsyncIterable, Dict, List, Mapping, Optional, Tuple
+
+# Segment map: sorted, merged [start, end) byte ranges
+Segments = List[List[int]]
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(?:(\d+)-(\d+)|\*)/(\d+|\*)")
+
+
+def merge_segment(segments: Segments, start: int, end: int) -> Segments:
+    """
+    Add [start, end) to a segment map, merging overlapping and adjacent ranges.
+
+    Args:
+        segments: Existing segment map (not modified)
+        start: First byte offset
+        end: Offset after the last byte
+
+    Returns:
+        New segment map
+    """
+    if end <= start:
+        return [list(s) for s in segments]
+    merged: Segments = []
+    for seg_start, seg_end in sorted(segments + [[start, end]]):
+        if merged and seg_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], seg_end)
+        else:
+            merged.append([seg_start, seg_end])
+    return merged
+
+
+def missing_ranges(segments: Segments, start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    Find the parts of [start, end) not covered by a segment map.
+
+    Args:
+        segments: Segment map
+        start: First byte offset
+        end: Offset after the last byte
+
+    Returns:
+        Uncovered [start, end) ranges in ascending order
+    """
+    gaps = []
+    position = start
+    for seg_start, seg_end in segments:
+        if seg_end <= position:
+            continue
+        if seg_start >= end:
+            break
+        if seg_start > position:
+            gaps.append((position, seg_start))
+        position = max(position, seg_end)
+        if position >= end:
+            break
+    if position < end:
+        gaps.append((position, end))
+    return gaps
+
+
+def covers(segments: Segments, start: int, end: int) -> bool:
+    """Check whether a segment map covers all of [start, end)."""
+    return not missing_ranges(segments, start, end)
+
+
+def stored_bytes(segments: Segments) -> int:
+    """Count the bytes held by a segment map."""
+    return sum(seg_end - seg_start for seg_start, seg_end in segments)
+
+
+def range_header(start: int, end: Optional[int] = None) -> str:
+    """
+    Build an HTTP Range header value for [start, end).
+
+    Args:
+        start: First byte offset
+        end: Offset after the last byte (None = to the end of the resource)
+
+    Returns:
+        Header value, e.g. "bytes=0-99" or "bytes=100-"
+    """
+    if end is None:
+        return f"bytes={start}-"
+    return f"bytes={start}-{end - 1}"
+
+
+def parse_content_range(value: Optional[str]) -> Optional[int]:
+    """
+    Get the complete resource length from a Content-Range header.
+
+    Args:
+        value: Header value, e.g. "bytes 0-99/12345" (or "bytes */12345" on HTTP 416)
+
+    Returns:
+        Total length in bytes, or None if missing or unknown ("*")
+    """
+    if not value:
+        return None
+    match = _CONTENT_RANGE_RE.match(value.strip())
+    if match is None or match.group(3) == "*":
+        return None
+    return int(match.group(3))
+
+
+def content_range_start(value: Optional[str]) -> Optional[int]:
+    """
+    Get the first byte offset of a Content-Range header.
+
+    Args:
+        value: Header value, e.g. "bytes 100-199/12345"
+
+    Returns:
+        First byte offset, or None if missing or unsatisfied ("*")
+    """
+    if not value:
+        return None
+    match = _CONTENT_RANGE_RE.match(value.strip())
+    if match is None or match.group(1) is None:
+        return None
+    return int(match.group(1))
+
+
+def range_matches(value: Optional[str], start: int, end: int, received: int) -> bool:
+    """
+    Check that a 206 response carries exactly the requested range [start, end).
+
+    The range may stop early only at the end of the resource.
+
+    Args:
+        value: Content-Range header of the response
+        start: First byte offset requested
+        end: Offset after the last byte requested
+        received: Number of body bytes received
+
+    Returns:
+        True if the Content-Range starts at start, ends at end (or the end of
+        the resource) and matches the body length
+    """
+    if not value:
+        return False
+    match = _CONTENT_RANGE_RE.match(value.strip())
+    if match is None or match.group(1) is None:
+        return False
+    first, stop = int(match.group(1)), int(match.group(2)) + 1
+    total = parse_content_range(value)
+    expected_stop = end if total is None else min(end, total)
+    return first == start and stop == expected_stop and received == stop - first
+
+
+def _header(headers: Optional[Mapping[str, Any]], name: str) -> Optional[str]:
+    """Get a response header as a string, or None if absent."""
+    if headers is None:
+        return None
+    value = headers.get(name)
+    return value if isinstance(value, str) and value else None
+
+
+def response_validators(headers: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+    """
+    Get the cache validators of a response.
+
+    Weak ETags (W/"...") are dropped: they cannot guard a byte-range resume.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Dictionary with "etag" and/or "last_modified" (empty if neither is sent)
+    """
+    validators = {}
+    etag = _header(headers, "ETag")
+    if etag and not etag.startswith("W/"):
+        validators["etag"] = etag
+    last_modified = _header(headers, "Last-Modified")
+    if last_modified:
+        validators["last_modified"] = last_modified
+    return validators
+
+
+def resume_headers(checkpoint: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+    """
+    Build the request headers resuming an interrupted download.
+
+    If-Range makes the origin send the whole file (HTTP 200) instead of the
+    remaining bytes if the file changed since the checkpoint.
+
+    Args:
+        checkpoint: Resume point from VideoCache.resume_point() (or None)
+
+    Returns:
+        Range and If-Range headers, or None to download from the start
+    """
+    if not checkpoint or not checkpoint.get("offset"):
+        return None
+    return {
+        "Range": range_header(checkpoint["offset"]),
+        "If-Range": checkpoint.get("etag") or checkpoint["last_modified"],
+    }
+
+
+def resume_offset(status_code: int, headers: Optional[Mapping[str, Any]],
+                  checkpoint: Optional[Dict[str, Any]]) -> Optional[int]:
+    """
+    Decide where a download response continues the partial file.
+
+    Args:
+        status_code: Response status
+        headers: Response headers
+        checkpoint: Resume point the request was made with (or None)
+
+    Returns:
+        The checkpoint offset if the response carries the remaining bytes of
+        the same file, 0 if it carries the whole file, or None if it is a
+        range of a file that changed (the download must start over)
+    """
+    if status_code != 206 or not checkpoint or not checkpoint.get("offset"):
+        return 0
+    if content_range_start(_header(headers, "Content-Range")) != checkpoint["offset"]:
+        return None
+    validators = response_validators(headers)
+    for name in ("etag", "last_modified"):
+        if checkpoint.get(name) and validators.get(name) and validators[name] != checkpoint[name]:
+            return None
+    return checkpoint["offset"]
+
+
+def expected_length(status_code: int, headers: Optional[Mapping[str, Any]]) -> Optional[int]:
+    """
+    Get the complete file length announced by a download response.
+
+    Args:
+        status_code: Response status (200 or 206)
+        headers: Response headers
+
+    Returns:
+        Length of the whole file in bytes, or None if not announced
+    """
+    if status_code == 206:
+        return parse_content_range(_header(headers, "Content-Range"))
+    content_length = _header(headers, "Content-Length")
+    # A Content-Encoding makes Content-Length count encoded bytes
+    if content_length is None or not content_length.isdigit() or _header(headers, "Content-Encoding"):
+        return None
+    return int(content_length)
+
+
+async def read_window(chunks: AsyncIterable[bytes], start: int, end: int) -> bytes:
+    """
+    Collect bytes [start, end) from a stream of the whole resource.
+
+    Used when a server ignores the Range header and answers 200 with the
+    full body: bytes before start are discarded and the stream is left
+    as soon as end is reached.
+
+    Args:
+        chunks: Async byte chunks of the resource from offset 0
+        start: First byte offset
+        end: Offset after the last byte
+
+    Returns:
+        The requested bytes (shorter if the resource ends first)
+    """
+    window = bytearray()
+    position = 0
+    async for chunk in chunks:
+        chunk_end = position + len(chunk)
+        if chunk_end > start:
+            window += chunk[max(start - position, 0):max(end - position, 0)]
+        position = chunk_end
+        if position >= end:
+            break
+    return bytes(window)
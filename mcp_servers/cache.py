@@ -7,30 +7,182 @@ This module provides a shared caching infrastructure for all video provider MCP
 AC-6.10.5: Shared Caching Module
 """
 
-import json
+import asyncio
+import hashlib
+import inspect
 import logging
+import os
+import time
+import uuid
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Callable, Optional, Dict, Any
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterator, Optional, Dict, Any, Set, Tuple, Union
+
+from .blob_store import BLOB_DIRNAME, BlobStore
+from .byte_ranges import covers, merge_segment, missing_ranges, stored_bytes
+from .cache_stats import CacheStats
+from .eviction import (
+    CacheBudget,
+    EntryKey,
+    EvictionIndex,
+    EvictionPolicy,
+    access_fields,
+    create_eviction_policy,
+)
+from .integrity import QUARANTINE_DIRNAME, IntegrityError, check_payload
+from .layout import LAYOUTS, iter_layout_files, layout_candidates, layout_path
+from .locking import KeyLocks, LockTimeout
+from .mapped_video import MappedVideo
+from .metadata_store import JsonMetadataStore, MetadataStore, create_metadata_store, fsync_directory
+from .tiering import DEFAULT_PROMOTE_AFTER_HITS, HotTier
 
 logger = logging.getLogger(__name__)
 
+# Streaming writes are buffered and flushed to disk in blocks of this size
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Suffix of in-progress downloads inside provider_dir
+TEMP_FILE_SUFFIX = ".tmp"
+
+# Per-video single-flight lock files live in cache_dir/LOCK_DIRNAME
+LOCK_DIRNAME = ".locks"
+
+# Sparse files of partially cached videos live in provider_dir/SEGMENTS_DIRNAME
+SEGMENTS_DIRNAME = "segments"
+
+# Suffix of partial files (byte ranges and interrupted downloads)
+PART_FILE_SUFFIX = ".part"
+
+# Resumable downloads record their progress in metadata every this many bytes
+RESUME_CHECKPOINT_BYTES = 16 * STREAM_CHUNK_SIZE  # 16 MiB
+
+# Days an expired entry with HTTP validators is kept for revalidation
+DEFAULT_REVALIDATE_GRACE_DAYS = 30
+
+# Sentinel for "not in cache" (cached content may legitimately be empty)
+_MISS = object()
+
+
+def _env_int(name: str) -> Optional[int]:
+    """Read an optional integer environment variable."""
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+def cache_options_from_env(provider_name: str) -> Dict[str, Any]:
+    """
+    Build VideoCache keyword arguments from environment variables.
+
+    Global settings use the VIDEO_CACHE_ prefix; per-provider budgets use the
+    provider name as prefix (e.g. DVIDS_CACHE_MAX_BYTES).
+
+    Args:
+        provider_name: Name of the video provider (e.g., "dvids", "nasa")
+
+    Returns:
+        Dictionary of VideoCache keyword arguments
+    """
+    prefix = provider_name.upper()
+    return {
+        "metadata_backend": os.environ.get("VIDEO_CACHE_BACKEND", "json"),
+        "metadata_stat_interval": float(os.environ.get("VIDEO_CACHE_STAT_INTERVAL", "1.0")),
+        "budget": CacheBudget(
+            max_bytes=_env_int(f"{prefix}_CACHE_MAX_BYTES"),
+            max_entries=_env_int(f"{prefix}_CACHE_MAX_ENTRIES")
+        ),
+        "global_budget": CacheBudget(
+            max_bytes=_env_int("VIDEO_CACHE_MAX_BYTES"),
+            max_entries=_env_int("VIDEO_CACHE_MAX_ENTRIES")
+        ),
+        "eviction_policy": os.environ.get("VIDEO_CACHE_EVICTION_POLICY", "lru"),
+        "content_addressed": os.environ.get("VIDEO_CACHE_DEDUP", "1") != "0",
+        "hot_tier": _hot_tier_from_env(),
+        "revalidate_grace_days": _env_int("VIDEO_CACHE_REVALIDATE_GRACE_DAYS") or DEFAULT_REVALIDATE_GRACE_DAYS,
+        "layout": os.environ.get("VIDEO_CACHE_LAYOUT", "flat"),
+    }
+
+
+def _hot_tier_from_env() -> Optional[HotTier]:
+    """Build the hot tier from VIDEO_CACHE_HOT_* variables (None if HOT_DIR is unset)."""
+    hot_dir = os.environ.get("VIDEO_CACHE_HOT_DIR")
+    if not hot_dir:
+        return None
+    return HotTier(
+        hot_dir,
+        budget=CacheBudget(
+            max_bytes=_env_int("VIDEO_CACHE_HOT_MAX_BYTES"),
+            max_entries=_env_int("VIDEO_CACHE_HOT_MAX_ENTRIES")
+        ),
+        promote_after=_env_int("VIDEO_CACHE_PROMOTE_AFTER_HITS") or DEFAULT_PROMOTE_AFTER_HITS
+    )
+
+
+async def iter_chunks(data: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Adapt an in-memory payload to the async chunk stream accepted by put_stream.
+
+    Args:
+        data: Payload bytes
+        chunk_size: Maximum chunk size
+
+    Returns:
+        Async iterator of memoryview slices (no copies)
+    """
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
 
 class VideoCache:
     """
     Shared video cache for MCP video provider servers.
 
     Manages local caching of video files with TTL validation, metadata tracking,
-    and automatic cache directory management.
+    and automatic cache directory management. Metadata is kept in a pluggable
+    MetadataStore (legacy metadata.json or indexed SQLite). Optional byte and
+    entry budgets are enforced on insert by evicting entries chosen by the
+    configured eviction policy. Metadata writes and per-video downloads are
+    locked across processes, so servers sharing cache_dir neither lose
+    entries nor download the same video twice. Identical content cached
+    under several IDs or providers is stored once (see blob_store). With a
+    hot tier configured, frequently hit videos are copied to fast storage
+    and demoted again by LRU (see tiering). Byte ranges and interrupted
+    downloads are kept as partial entries (see byte_ranges), so downloads
+    resume where they stopped. Expired entries recorded with an ETag or
+    Last-Modified can be revalidated with the origin instead of being
+    downloaded again (see aget_entry). Files are stored flat in provider_dir
+    or fanned out over hex prefix directories (see layout); entries written
+    under the other layout are still found and are moved by relocate().
 
     Attributes:
         provider_name: Name of the video provider (e.g., "dvids", "nasa")
         cache_dir: Root cache directory path
         default_ttl_days: Default time-to-live for cached items in days
         provider_dir: Provider-specific cache subdirectory
+        budget: Limits for this provider's entries
+        global_budget: Limits for all providers sharing cache_dir
+        blobs: Content-addressed blob store (None if disabled)
+        hot_tier: Fast storage tier for frequently hit videos (None if disabled)
+        revalidate_grace_days: Days past the TTL an entry with HTTP validators
+            stays available for revalidation
+        layout: Directory layout of new files in provider_dir ("flat" or "sharded")
     """
 
-    def __init__(self, provider_name: str, cache_dir: str, default_ttl_days: int = 30):
+    def __init__(
+        self,
+        provider_name: str,
+        cache_dir: str,
+        default_ttl_days: int = 30,
+        metadata_backend: str = "json",
+        metadata_stat_interval: float = 0.0,
+        budget: Optional[CacheBudget] = None,
+        global_budget: Optional[CacheBudget] = None,
+        eviction_policy: Union[str, EvictionPolicy] = "lru",
+        content_addressed: bool = True,
+        hot_tier: Optional[HotTier] = None,
+        revalidate_grace_days: int = DEFAULT_REVALIDATE_GRACE_DAYS,
+        layout: str = "flat"
+    ):
         """
         Initialize VideoCache with provider-specific directory.
 
@@ -38,188 +190,474 @@ class VideoCache:
             provider_name: Name of the video provider (e.g., "dvids", "nasa")
             cache_dir: Root cache directory path
             default_ttl_days: Default TTL for cached items in days (default: 30)
+            metadata_backend: Metadata store backend, "sqlite" or the legacy
+                "json" fallback (default: "json"; the servers select "sqlite"
+                through VIDEO_CACHE_BACKEND)
+            metadata_stat_interval: Seconds to trust the in-memory metadata view
+                without checking metadata.json on disk (default: 0, always check)
+            budget: Byte/entry limits for this provider (default: unlimited)
+            global_budget: Byte/entry limits across all providers (default: unlimited)
+            eviction_policy: "lru", "lfu", "gdsf" or an EvictionPolicy instance
+            content_addressed: Share storage between videos with identical
+                content through SHA-256 addressed blobs (default: True)
+            hot_tier: Fast tier that repeatedly hit videos are promoted to
+                (default: None, single tier)
+            revalidate_grace_days: Days past the TTL an expired entry with an
+                ETag or Last-Modified is kept for revalidation (default: 30)
+            layout: "flat" ({provider}/{video_id}.mp4) or "sharded"
+                ({provider}/ab/cd/{video_id}.mp4) for new files (default: "flat")
+
+        Raises:
+            ValueError: If the layout is unknown
         """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown cache layout: {layout} (expected one of {', '.join(LAYOUTS)})")
         self.provider_name = provider_name
         self.cache_dir = Path(cache_dir)
         self.default_ttl_days = default_ttl_days
         self.provider_dir = self.cache_dir / provider_name
         self.metadata_file = self.cache_dir / "metadata.json"
-        self._metadata: Dict[str, Any] = {}
+        self.budget = budget or CacheBudget()
+        self.global_budget = global_budget or CacheBudget()
+        self.hot_tier = hot_tier
+        self.revalidate_grace_days = revalidate_grace_days
+        self.layout = layout
+        self._hot_generation: Optional[int] = None
 
         # Create directory structure
         self.provider_dir.mkdir(parents=True, exist_ok=True)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         # Load or create metadata
-        self._load_metadata()
+        self._store: MetadataStore = create_metadata_store(
+            self.cache_dir, metadata_backend, metadata_stat_interval
+        )
+
+        # Identical content cached under several IDs shares one blob
+        self.blobs = BlobStore(self.cache_dir / BLOB_DIRNAME) if content_addressed else None
+
+        # Single-flight locks shared with other processes using cache_dir
+        self._key_locks = KeyLocks(self.cache_dir / LOCK_DIRNAME)
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+        # Eviction index is built lazily on first insert when a budget is set
+        self._eviction = EvictionIndex(create_eviction_policy(eviction_policy))
+        self._eviction_generation: Optional[int] = None
+
+        # Size/count/age statistics, updated on every insert and removal
+        self._stats = CacheStats()
+        self._stats_generation: Optional[int] = None
+
+        # Rebuild a lost index from the files on disk instead of starting empty
+        if self._store.needs_recovery or self._store.count(self.provider_name) == 0:
+            self.recover()
 
         logger.info(
             f"Initialized VideoCache for provider '{provider_name}' "
-            f"at {self.provider_dir} with TTL={default_ttl_days} days"
+            f"at {self.provider_dir} with TTL={default_ttl_days} days "
+            f"({metadata_backend} metadata)"
         )
 
+    @property
+    def _metadata(self) -> Dict[str, Any]:
+        """Metadata document view ({"videos": {video_id: entry}}) for this cache."""
+        if isinstance(self._store, JsonMetadataStore):
+            return self._store.data
+        return {"videos": dict(self._store.items(self.provider_name))}
+
     def _load_metadata(self) -> None:
-        """Load cache metadata from metadata.json file."""
-        if self.metadata_file.exists():
-            try:
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    self._metadata = json.load(f)
-                logger.debug(f"Loaded metadata from {self.metadata_file}")
-            except json.JSONDecodeError as e:
-                logger.warning(f"Invalid metadata.json, creating new: {e}")
-                self._metadata = {"videos": {}}
-                self._save_metadata()
-        else:
-            # Create empty metadata file
-            self._metadata = {"videos": {}}
-            self._save_metadata()
+        """Reload cache metadata from the metadata store."""
+        if isinstance(self._store, JsonMetadataStore):
+            self._store.load()
 
     def _save_metadata(self) -> None:
-        """Save cache metadata to metadata.json file."""
-        try:
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(self._metadata, f, indent=2)
-            logger.debug(f"Saved metadata to {self.metadata_file}")
-        except IOError as e:
-            logger.error(f"Failed to save metadata: {e}")
+        """Persist cache metadata held in memory to the metadata store."""
+        if isinstance(self._store, JsonMetadataStore):
+            self._store.save()
 
-    def is_cached(self, video_id: str) -> bool:
+    def get_entry(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
-        Check if video exists in cache and is within TTL.
+        Get the metadata entry for a video owned by this provider.
 
         Args:
             video_id: Unique video identifier
 
         Returns:
-            True if video is cached and within TTL, False otherwise
+            Entry dictionary (provider, cached_date, ttl, file_path), or None
         """
-        # Reload metadata to get latest state
-        self._load_metadata()
+        return self._store.get(self.provider_name, video_id)
 
-        if video_id not in self._metadata.get("videos", {}):
-            return False
+    def iter_entries(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over the metadata entries owned by this provider.
 
-        video_meta = self._metadata["videos"][video_id]
+        Entries are copies; change them through the cache, not in place.
 
-        # Check if file exists
-        file_path = Path(video_meta.get("file_path", ""))
-        if not file_path.exists():
-            logger.warning(f"Metadata exists but file missing: {file_path}")
-            return False
+        Returns:
+            Iterator of (video_id, entry) tuples, partial downloads included
+        """
+        return self._store.items(self.provider_name)
 
-        # Check TTL
-        cached_date_str = video_meta.get("cached_date")
-        if not cached_date_str:
-            return False
+    def get_cached_entry(self, video_id: str, record_access: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get the metadata entry for a video if it is cached and within TTL.
+
+        Args:
+            video_id: Unique video identifier
+            record_access: Count this lookup as a cache hit for eviction
+                (updates last_access and hits)
+
+        Returns:
+            Entry dictionary, or None if not cached, missing on disk or expired
+        """
+        video_meta = self.get_entry(video_id)
+        if video_meta is not None and HotTier.is_hot(video_meta) \
+                and not Path(video_meta.get("file_path", "")).exists():
+            # Hot copy lost (e.g. scratch disk wiped): fall back to the cold copy
+            video_meta = self._demote((self.provider_name, video_id))
+        if video_meta is None:
+            return None
+        if not self._is_entry_valid(video_id, video_meta):
+            # The file may have been moved by a layout migration
+            video_meta = self.locate_file(video_id, video_meta)
+            if video_meta is None or not self._is_entry_valid(video_id, video_meta):
+                return None
+        if record_access:
+            video_meta = self._record_access(video_id, video_meta)
+            video_meta = self._maybe_promote(video_id, video_meta)
+        return video_meta
+
+    def _record_access(self, video_id: str, video_meta: Dict[str, Any]) -> Dict[str, Any]:
+        """Update access-tracking fields of a cache hit, returning the updated entry."""
+        self._stats.record("hits")
+        fields = access_fields(video_meta)
+        self._store.touch(self.provider_name, video_id, fields)
+        updated = dict(video_meta, **fields)
+        key = (self.provider_name, video_id)
+        if key in self._eviction:
+            self._eviction.update(key, updated)
+        if self.hot_tier is not None and key in self.hot_tier.index:
+            self.hot_tier.index.update(key, self._hot_index_entry(updated))
+        return updated
+
+    def get_metadata_stats(self) -> Dict[str, int]:
+        """
+        Get in-memory metadata view statistics.
 
+        Returns:
+            Dictionary with hits, misses and reloads counts of the metadata store
+        """
+        return self._store.stats()
+
+    def register_file(
+        self,
+        video_id: str,
+        file_path: Path,
+        content_hash: Optional[str] = None,
+        validators: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Record an already-written file as the cached copy of a video.
+
+        Args:
+            video_id: Unique video identifier
+            file_path: Path of the cached video file
+            content_hash: Hex SHA-256 digest of the file's content (optional)
+            validators: HTTP "etag"/"last_modified" of the downloaded file (optional)
+
+        Returns:
+            The stored metadata entry
+        """
+        entry = {
+            "provider": self.provider_name,
+            "cached_date": datetime.now().isoformat(),
+            "ttl": self.default_ttl_days,
+            "file_path": str(file_path),
+            "size": self._file_size(Path(file_path)),
+            "last_access": time.time(),
+            "hits": 0
+        }
+        if content_hash:
+            entry["content_hash"] = content_hash
+        if validators:
+            entry.update(validators)
+        self._put_entry(video_id, entry)
+        return entry
+
+    def _put_entry(self, video_id: str, entry: Dict[str, Any]) -> None:
+        """Store a new or replaced entry, then enforce the cache budgets."""
+        self._store.put(self.provider_name, video_id, entry)
+        self._stats.add((self.provider_name, video_id), entry)
+
+        if self._has_budget():
+            self._sync_eviction_index()
+            key = (self.provider_name, video_id)
+            self._eviction.update(key, entry)
+            self.enforce_budgets(protect=key)
+
+    @staticmethod
+    def _file_size(file_path: Path) -> int:
+        """Get file size in bytes, or 0 if it cannot be determined."""
         try:
-            cached_date = datetime.fromisoformat(cached_date_str)
-            ttl_days = video_meta.get("ttl", self.default_ttl_days)
-            age_days = (datetime.now() - cached_date).days
+            return file_path.stat().st_size
+        except OSError:
+            return 0
 
-            is_valid = age_days < ttl_days
-            logger.debug(f"Cache check for {video_id}: age={age_days}d, ttl={ttl_days}d, valid={is_valid}")
-            return is_valid
-        except ValueError as e:
-            logger.error(f"Invalid cached_date format: {e}")
-            return False
+    def _video_path(self, video_id: str, file_name: str) -> Path:
+        """Get the location of a cached file in the configured layout."""
+        return layout_path(self.provider_dir, video_id, file_name, self.layout)
 
-    def get(self, video_id: str, fetch_fn: Callable[[str], Any]) -> Any:
+    @staticmethod
+    def _same_path(a: Path, b: Path) -> bool:
+        """Compare two paths independently of how cache_dir was spelled."""
+        return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+    def locate_file(self, video_id: str, video_meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Get video content from cache or fetch using provided function.
+        Look up a missing cached file in the other layout (legacy fallback).
 
-        If video is cached and within TTL, returns cached content.
-        Otherwise, calls fetch_fn to download and caches the result.
+        Another process may have migrated the file since the entry was read,
+        or the entry predates a layout change. A file found is recorded in
+        the entry so the next lookup goes straight to it.
 
         Args:
             video_id: Unique video identifier
-            fetch_fn: Function to fetch video content (takes video_id, returns content)
+            video_meta: Entry whose file_path does not exist
 
         Returns:
-            Video content (same type as fetch_fn returns)
+            The updated entry, or None if the file is not found
         """
-        # Reload metadata first
-        self._load_metadata()
+        recorded = Path(video_meta.get("file_path", ""))
+        if video_meta.get("partial") or HotTier.is_hot(video_meta) or not recorded.name:
+            return None
+        for candidate in layout_candidates(self.provider_dir, video_id, recorded.name):
+            if not self._same_path(candidate, recorded) and candidate.exists():
+                moved = dict(video_meta, file_path=str(candidate))
+                self._store.put(self.provider_name, video_id, moved)
+                logger.info(f"Found {video_id} at {candidate} (recorded at {recorded})")
+                return moved
+        return None
 
-        # Check cache first
-        if self.is_cached(video_id):
-            logger.info(f"Cache HIT for {video_id}")
-            video_meta = self._metadata["videos"][video_id]
-            file_path = Path(video_meta["file_path"])
+    def is_misplaced(self, video_id: str, video_meta: Dict[str, Any]) -> bool:
+        """
+        Check whether an entry's cold file is stored under another layout.
 
-            # HIGH PRIORITY H2: Read binary video files using read_bytes()
-            try:
-                content = file_path.read_bytes()
-                return content
-            except Exception as e:
-                logger.warning(f"Failed to read cached file {file_path}: {e}")
-                # Fall through to fetch
+        Args:
+            video_id: Unique video identifier
+            video_meta: Metadata entry (partial entries are never misplaced;
+                their sparse files stay in provider_dir/segments)
+
+        Returns:
+            True if relocate() would move the file
+        """
+        if video_meta.get("partial"):
+            return False
+        current = Path(video_meta.get("cold_path") or video_meta.get("file_path", ""))
+        if not current.name or self._same_path(current, self._video_path(video_id, current.name)):
+            return False
+        # Files registered from elsewhere are not part of the layout
+        return any(
+            self._same_path(current, candidate)
+            for candidate in layout_candidates(self.provider_dir, video_id, current.name)
+        )
+
+    def relocate(self, video_id: str) -> Optional[Path]:
+        """
+        Move a cached file into the configured layout (online migration).
 
-        # Cache miss - fetch and cache
-        logger.info(f"Cache MISS for {video_id}, fetching...")
-        content = fetch_fn(video_id)
+        The file is renamed within provider_dir, so readers holding it open
+        are unaffected; lookups of the old path fall back to the new one.
+        Callers hold the video's lock (see lock_video).
 
-        # Save to cache
-        file_ext = self._get_file_extension(content)
-        cache_file = self.provider_dir / f"{video_id}.{file_ext}"
+        Args:
+            video_id: Unique video identifier
 
+        Returns:
+            The new path, or None if the entry is already in place or its
+            file is missing
+        """
+        entry = self.get_entry(video_id)
+        if entry is None or not self.is_misplaced(video_id, entry):
+            return None
+        field = "cold_path" if entry.get("cold_path") else "file_path"
+        current = Path(entry[field])
+        target = self._video_path(video_id, current.name)
         try:
-            # Handle both bytes and string content
-            if isinstance(content, bytes):
-                cache_file.write_bytes(content)
-            else:
-                cache_file.write_text(str(content))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(current, target)
+        except FileNotFoundError:
+            return None
+        fsync_directory(target.parent)
+        self._store.put(self.provider_name, video_id, dict(entry, **{field: str(target)}))
+        logger.info(f"Moved {video_id} to {target} ({self.layout} layout)")
+        return target
 
-            # Update metadata
-            self._metadata["videos"][video_id] = {
-                "provider": self.provider_name,
-                "cached_date": datetime.now().isoformat(),
-                "ttl": self.default_ttl_days,
-                "file_path": str(cache_file)
-            }
-            self._save_metadata()
+    def recover(self) -> int:
+        """
+        Rebuild metadata for cached files that have no metadata entry.
 
-            logger.info(f"Cached {video_id} to {cache_file}")
+        Scans provider_dir (in both layouts) and records every video file
+        missing from the metadata store, using the file's modification time as cached_date.
+        Runs automatically on startup when the metadata was missing or
+        corrupt, or holds no entries for this provider.
 
-        except IOError as e:
-            logger.error(f"Failed to cache {video_id}: {e}")
+        Returns:
+            Number of entries recovered
+        """
+        recovered: Dict[str, Dict[str, Any]] = {}
+        try:
+            # Hidden files (in-progress temp files) are skipped
+            for dir_entry in iter_layout_files(self.provider_dir):
+                video_id = Path(dir_entry.name).stem
+                if not video_id or video_id in recovered:
+                    continue
+                if self._store.get(self.provider_name, video_id) is not None:
+                    continue
+                st = dir_entry.stat()
+                recovered[video_id] = {
+                    "provider": self.provider_name,
+                    "cached_date": datetime.fromtimestamp(st.st_mtime).isoformat(),
+                    "ttl": self.default_ttl_days,
+                    "file_path": dir_entry.path,
+                    "size": st.st_size,
+                    "last_access": st.st_mtime,
+                    "hits": 0
+                }
+        except OSError as e:
+            logger.error(f"Failed to scan {self.provider_dir} for recovery: {e}")
 
-        return content
+        if recovered:
+            self._store.put_many(self.provider_name, recovered)
+            for video_id, entry in recovered.items():
+                self._stats.add((self.provider_name, video_id), entry)
+            logger.warning(
+                f"Recovered {len(recovered)} cache entries for '{self.provider_name}' "
+                f"from {self.provider_dir}"
+            )
+            self.enforce_budgets()
+        return len(recovered)
 
-    def _get_file_extension(self, content: Any) -> str:
+    def _has_budget(self) -> bool:
+        """Check whether any byte or entry limit is configured."""
+        return any(
+            limit is not None
+            for limit in (
+                self.budget.max_bytes, self.budget.max_entries,
+                self.global_budget.max_bytes, self.global_budget.max_entries
+            )
+        )
+
+    def _sync_eviction_index(self) -> None:
+        """Rebuild the eviction index if other writers changed the metadata."""
+        self._store.refresh()
+        if self._eviction_generation == self._store.generation:
+            return
+
+        index = EvictionIndex(self._eviction.policy)
+        for provider, video_id, entry in self._iter_all_entries():
+            if "size" not in entry:
+                entry = dict(entry, size=self._file_size(Path(entry.get("file_path", ""))))
+            index.update((provider, video_id), entry)
+        self._eviction = index
+        self._eviction_generation = self._store.generation
+        logger.debug(f"Rebuilt eviction index with {len(index)} entries")
+
+    def _iter_all_entries(self):
+        """Iterate (provider, video_id, entry) over every provider in cache_dir."""
+        for video_id, entry in self._store.items(None):
+            yield entry.get("provider", self.provider_name), video_id, entry
+
+    def enforce_budgets(self, protect: Optional[EntryKey] = None) -> int:
         """
-        Determine file extension from content.
+        Evict entries until the provider and global budgets are met.
 
         Args:
-            content: Video content (bytes or string)
+            protect: (provider, video_id) that must not be evicted, typically
+                the entry that was just inserted
 
         Returns:
-            File extension (default: "mp4")
+            Number of entries evicted
         """
-        # Default to mp4 for videos
-        return "mp4"
+        if not self._has_budget():
+            return 0
+        self._sync_eviction_index()
 
-    def invalidate(self, video_id: str) -> bool:
+        evicted = 0
+        busy: Set[EntryKey] = set()
+        while self.budget.is_exceeded(*self._eviction.provider_usage(self.provider_name)):
+            victim = self._eviction.peek_victim(self.provider_name, protect=protect, skip=busy)
+            if victim is None:
+                break
+            if self._evict(victim):
+                evicted += 1
+            else:
+                busy.add(victim)
+
+        while self.global_budget.is_exceeded(self._eviction.total_bytes, len(self._eviction)):
+            victim = self._eviction.peek_victim(protect=protect, skip=busy)
+            if victim is None:
+                break
+            if self._evict(victim):
+                evicted += 1
+            else:
+                busy.add(victim)
+
+        if evicted:
+            logger.info(f"Evicted {evicted} entries to stay within cache budgets")
+        if busy:
+            logger.info(f"Skipped {len(busy)} busy entries while enforcing cache budgets")
+        return evicted
+
+    def _evict(self, key: EntryKey) -> bool:
         """
-        Remove video from cache (delete file and metadata).
+        Delete an entry's file and metadata and drop it from the index.
+
+        The entry's video lock is only tried, never waited for (as the
+        janitor does): a video being downloaded or promoted is skipped.
 
         Args:
-            video_id: Unique video identifier
+            key: (provider, video_id) of the victim
 
         Returns:
-            True if video was removed, False if not found
+            True if evicted, False if another caller holds the video's lock
         """
-        # Reload metadata first
-        self._load_metadata()
+        provider, video_id = key
+        try:
+            with self._key_locks.hold(f"{provider}/{video_id}", timeout=0):
+                priority = self._eviction.priority_of(key)
+                entry = self._store.get(provider, video_id)
+                if entry is not None:
+                    self._remove_cached_file(entry)
+                    self._store.delete(provider, video_id)
+                self._drop_from_indexes(key)
+        except LockTimeout:
+            return False  # being downloaded right now
+        self._stats.record("evictions")
+        self._eviction.policy.on_evict(priority)
+        logger.info(f"Evicted {provider}/{video_id} ({self._eviction.policy.name})")
+        return True
 
-        if video_id not in self._metadata.get("videos", {}):
-            logger.warning(f"Cannot invalidate {video_id}: not in cache")
-            return False
+    def _drop_from_indexes(self, key: EntryKey) -> None:
+        """Forget a removed entry in the eviction, statistics and hot tier indexes."""
+        self._eviction.remove(key)
+        self._stats.remove(key)
+        if self.hot_tier is not None:
+            self.hot_tier.index.remove(key)
 
-        video_meta = self._metadata["videos"][video_id]
-        file_path = Path(video_meta.get("file_path", ""))
+    def _remove_cached_file(self, entry: Dict[str, Any]) -> None:
+        """Delete an entry's cached file(s) and release its blob if unreferenced."""
+        self._delete_file(Path(entry.get("file_path", "")))
+        if entry.get("cold_path"):
+            self._delete_file(Path(entry["cold_path"]))
+        self._release_blob(entry)
+
+    def _release_blob(self, entry: Dict[str, Any]) -> None:
+        """Delete the blob of an entry once no cached file links to it."""
+        if self.blobs is not None:
+            self.blobs.release(entry.get("content_hash"))
 
-        # Delete file
+    def _delete_file(self, file_path: Path) -> None:
+        """Delete a cached file, logging (not raising) failures."""
         if file_path.exists():
             try:
                 file_path.unlink()
@@ -227,62 +665,1387 @@ class VideoCache:
             except IOError as e:
                 logger.error(f"Failed to delete {file_path}: {e}")
 
-        # Remove metadata
-        del self._metadata["videos"][video_id]
-        self._save_metadata()
+    @staticmethod
+    def _hot_index_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Hot copies are plain files, so every one counts in full."""
+        return dict(entry, content_hash=None)
 
-        logger.info(f"Invalidated cache entry for {video_id}")
-        return True
+    def _sync_hot_index(self) -> None:
+        """Rebuild the hot tier index if other writers changed the metadata."""
+        self._store.refresh()
+        if self._hot_generation == self._store.generation:
+            return
+        index = EvictionIndex(self.hot_tier.index.policy)
+        for provider, video_id, entry in self._iter_all_entries():
+            if HotTier.is_hot(entry):
+                index.update((provider, video_id), self._hot_index_entry(entry))
+        self.hot_tier.index = index
+        self._hot_generation = self._store.generation
 
-    def get_cache_size(self) -> int:
+    def _maybe_promote(self, video_id: str, video_meta: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Get total size of all cached files in bytes.
+        Copy a repeatedly hit video to the hot tier.
+
+        Skipped (returning video_meta unchanged) when no hot tier is
+        configured, the video is not due for promotion, another caller holds
+        its lock, or the copy fails.
+
+        Args:
+            video_id: Unique video identifier
+            video_meta: Entry after recording the current hit
 
         Returns:
-            Total cache size in bytes
+            The entry to serve (pointing at the hot copy if promoted)
         """
-        # Reload metadata first
-        self._load_metadata()
+        if self.hot_tier is None or not self.hot_tier.should_promote(video_meta):
+            return video_meta
 
-        total_size = 0
-        for video_id, video_meta in self._metadata.get("videos", {}).items():
-            file_path = Path(video_meta.get("file_path", ""))
-            if file_path.exists():
-                try:
-                    total_size += file_path.stat().st_size
-                except OSError as e:
-                    logger.warning(f"Cannot get size for {file_path}: {e}")
+        key = (self.provider_name, video_id)
+        try:
+            with self.lock_video(video_id, timeout=0):
+                current = self.get_entry(video_id)
+                if current is None or HotTier.is_hot(current):
+                    return current or video_meta
+                cold_path = Path(current["file_path"])
+                hot_path = self.hot_tier.copy_in(self.provider_name, cold_path)
+                promoted = dict(current, tier="hot", file_path=str(hot_path), cold_path=str(cold_path))
+                self._store.put(self.provider_name, video_id, promoted)
+        except LockTimeout:
+            return video_meta
+        except OSError as e:
+            logger.warning(f"Failed to promote {video_id} to the hot tier: {e}")
+            return video_meta
 
-        return total_size
+        self._stats.add(key, promoted)
+        self._stats.record("promotions")
+        self._sync_hot_index()
+        self.hot_tier.index.update(key, self._hot_index_entry(promoted))
+        logger.info(f"Promoted {video_id} to the hot tier")
+        self._enforce_hot_budget(protect=key)
+        return promoted
 
-    def get_cache_count(self) -> int:
+    def _enforce_hot_budget(self, protect: Optional[EntryKey] = None) -> int:
+        """Demote least recently used hot entries until the hot tier budget is met."""
+        self._sync_hot_index()
+        index = self.hot_tier.index
+        demoted = 0
+        while self.hot_tier.budget.is_exceeded(index.total_bytes, len(index)):
+            victim = index.peek_victim(protect=protect)
+            if victim is None:
+                break
+            self._demote(victim)
+            demoted += 1
+        return demoted
+
+    def demote(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get number of cached videos.
+        Move a video back to the cold tier and delete its hot copy.
+
+        Args:
+            video_id: Unique video identifier
 
         Returns:
-            Number of videos in cache
+            The cold entry, or None if the video is not cached
         """
-        # Reload metadata first
-        self._load_metadata()
-        return len(self._metadata.get("videos", {}))
+        return self._demote((self.provider_name, video_id))
 
-    def get_cache_age(self, video_id: str) -> Optional[int]:
+    def _demote(self, key: EntryKey) -> Optional[Dict[str, Any]]:
         """
-        Get age of cached video in days.
+        Move an entry back to the cold tier and delete its hot copy.
+
+        Args:
+            key: (provider, video_id) of a hot entry
+
+        Returns:
+            The cold entry, or None if the entry no longer exists
+        """
+        provider, video_id = key
+        if self.hot_tier is not None:
+            self.hot_tier.index.remove(key)
+        entry = self._store.get(provider, video_id)
+        if entry is None or not HotTier.is_hot(entry):
+            return entry
+
+        cold = HotTier.cold_entry(entry)
+        self._store.put(provider, video_id, cold)
+        self._stats.add(key, cold)
+        self._stats.record("demotions")
+        self._delete_file(Path(entry["file_path"]))
+        logger.info(f"Demoted {provider}/{video_id} to the cold tier")
+        return cold
+
+    def is_cached(self, video_id: str) -> bool:
+        """
+        Check if video exists in cache and is within TTL.
 
         Args:
             video_id: Unique video identifier
 
         Returns:
-            Age in days, or None if video not cached
+            True if video is cached and within TTL, False otherwise
+        """
+        return self.get_cached_entry(video_id) is not None
+
+    def _is_entry_valid(self, video_id: str, video_meta: Dict[str, Any]) -> bool:
+        """
+        Check that a metadata entry's file exists and its TTL has not expired.
+
+        Args:
+            video_id: Unique video identifier
+            video_meta: Metadata entry for the video
+
+        Returns:
+            True if the entry can be served from cache
+        """
+        # Partially cached videos can only serve byte ranges (see read_range)
+        if video_meta.get("partial"):
+            return False
+
+        # Check if file exists and still has the length recorded at write time
+        file_path = Path(video_meta.get("file_path", ""))
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            logger.warning(f"Metadata exists but file missing: {file_path}")
+            return False
+        if "size" in video_meta and size != int(video_meta["size"]):
+            logger.warning(
+                f"Cached file {file_path} is {size} bytes, expected {video_meta['size']} (truncated or replaced)"
+            )
+            return False
+
+        # Check TTL
+        is_valid = not self.is_expired(video_meta)
+        logger.debug(f"Cache check for {video_id}: valid={is_valid}")
+        return is_valid
+
+    def is_expired(self, video_meta: Dict[str, Any]) -> bool:
+        """
+        Check whether a metadata entry's TTL has passed.
+
+        Entries without a readable cached_date count as expired.
+
+        Args:
+            video_meta: Metadata entry for the video
+
+        Returns:
+            True if the entry must no longer be served
+        """
+        cached_date_str = video_meta.get("cached_date")
+        if not cached_date_str:
+            return True
+
+        try:
+            cached_date = datetime.fromisoformat(cached_date_str)
+        except ValueError as e:
+            logger.error(f"Invalid cached_date format: {e}")
+            return True
+
+        ttl_days = video_meta.get("ttl", self.default_ttl_days)
+        age_days = (datetime.now() - cached_date).days
+        return age_days >= ttl_days
+
+    def is_revalidatable(self, video_meta: Dict[str, Any]) -> bool:
+        """
+        Check whether an entry can be revalidated with the origin.
+
+        Complete entries recorded with an ETag or Last-Modified qualify
+        until revalidate_grace_days past their TTL. The janitor keeps such
+        expired entries instead of deleting them.
+
+        Args:
+            video_meta: Metadata entry for the video
+
+        Returns:
+            True if a conditional request can renew the entry
+        """
+        if video_meta.get("partial"):
+            return False
+        if not (video_meta.get("etag") or video_meta.get("last_modified")):
+            return False
+        grace = dict(video_meta, ttl=video_meta.get("ttl", self.default_ttl_days) + self.revalidate_grace_days)
+        return not self.is_expired(grace)
+
+    def get_revalidatable_entry(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an expired entry that can be renewed by revalidation.
+
+        Args:
+            video_id: Unique video identifier
+
+        Returns:
+            Entry dictionary, or None if the video is not expired, has no
+            validators or its file is missing
+        """
+        video_meta = self.get_entry(video_id)
+        if video_meta is None or not self.is_expired(video_meta) or not self.is_revalidatable(video_meta):
+            return None
+        if not Path(video_meta.get("file_path", "")).exists():
+            return self.locate_file(video_id, video_meta)
+        return video_meta
+
+    def extend_ttl(self, video_id: str, validators: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
         """
-        # Reload metadata first
-        self._load_metadata()
+        Renew an entry after the origin confirmed it is unchanged (HTTP 304).
+
+        The cached file is kept and cached_date restarts the TTL.
+
+        Args:
+            video_id: Unique video identifier
+            validators: Updated "etag"/"last_modified" sent by the origin
 
-        if video_id not in self._metadata.get("videos", {}):
+        Returns:
+            The renewed entry, or None if the video is not cached
+        """
+        video_meta = self.get_entry(video_id)
+        if video_meta is None:
             return None
+        renewed = dict(video_meta, cached_date=datetime.now().isoformat(), **(validators or {}))
+        renewed.update(access_fields(video_meta))
+        self._put_entry(video_id, renewed)
+        self._stats.record("revalidations")
+        logger.info(f"Revalidated {video_id}, TTL extended by {renewed.get('ttl', self.default_ttl_days)} days")
+        return renewed
 
-        cached_date_str = self._metadata["videos"][video_id].get("cached_date")
+    def get(self, video_id: str, fetch_fn: Callable[[str], Any]) -> Any:
+        """
+        Get video content from cache or fetch using provided function.
+
+        If video is cached and within TTL, returns cached content.
+        Otherwise, calls fetch_fn to download and caches the result.
+        Concurrent misses for the same video (from any thread or process
+        sharing cache_dir) call fetch_fn once; the others wait and read the
+        cached result.
+
+        Hits copy the whole file into memory; large clips are better read
+        with get_mapped(), which maps the file instead.
+
+        Args:
+            video_id: Unique video identifier
+            fetch_fn: Function to fetch video content (takes video_id, returns content)
+
+        Returns:
+            Video content (same type as fetch_fn returns)
+        """
+        # Check cache first
+        content = self._read_cached(video_id)
+        if content is not _MISS:
+            return content
+
+        with self.lock_video(video_id):
+            # Another caller may have cached it while we waited for the lock
+            content = self._read_cached(video_id)
+            if content is not _MISS:
+                return content
+
+            # Cache miss - fetch and cache
+            logger.info(f"Cache MISS for {video_id}, fetching...")
+            self._stats.record("misses")
+            content = fetch_fn(video_id)
+            self._store_content(video_id, content)
+
+        return content
+
+    async def aget(self, video_id: str, fetch_fn: Callable[[str], Any]) -> Any:
+        """
+        Async version of get() for use inside the servers' event loop.
+
+        fetch_fn may be a regular function or a coroutine function. Cache
+        file reads and writes run in a worker thread, and concurrent misses
+        for the same video share one fetch_fn call.
+
+        Args:
+            video_id: Unique video identifier
+            fetch_fn: Function or coroutine function fetching video content
+
+        Returns:
+            Video content (same type as fetch_fn returns)
+        """
+        content = await asyncio.to_thread(self._read_cached, video_id)
+        if content is not _MISS:
+            return content
+        return await self._single_flight(video_id, lambda: self._fetch_and_store(video_id, fetch_fn))
+
+    async def _fetch_and_store(self, video_id: str, fetch_fn: Callable[[str], Any]) -> Any:
+        """Fetch and cache a video under its cross-process lock (aget() miss path)."""
+        async with self.lock_video_async(video_id):
+            # Another process may have cached it while we waited for the lock
+            content = await asyncio.to_thread(self._read_cached, video_id)
+            if content is not _MISS:
+                return content
+
+            logger.info(f"Cache MISS for {video_id}, fetching...")
+            self._stats.record("misses")
+            content = fetch_fn(video_id)
+            if inspect.isawaitable(content):
+                content = await content
+            await asyncio.to_thread(self._store_content, video_id, content)
+            return content
+
+    async def aget_entry(
+        self,
+        video_id: str,
+        download_fn: Callable[[str], Awaitable[Dict[str, Any]]],
+        revalidate_fn: Optional[Callable[[str, Dict[str, Any]], Awaitable[Optional[Dict[str, str]]]]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Get the metadata entry of a cached video, downloading it on a miss.
+
+        download_fn is a coroutine function that stores the video itself
+        (typically with put_stream()) and returns the stored entry. Concurrent
+        misses for the same video, in this process or others sharing
+        cache_dir, wait for a single download.
+
+        If the entry has expired but can be revalidated, revalidate_fn
+        (video_id, entry) is awaited first. It asks the origin whether the
+        file changed (conditional request) and returns the current
+        validators if it did not, or None if it did; an unchanged entry
+        has its TTL extended and no body is downloaded.
+
+        Args:
+            video_id: Unique video identifier
+            download_fn: Coroutine function taking video_id, returning the entry
+            revalidate_fn: Coroutine function checking an expired entry (optional)
+
+        Returns:
+            (entry, cached) where cached is True if no download was needed
+        """
+        # Off the event loop: a hit may promote the video to the hot tier
+        video_meta = await asyncio.to_thread(self.get_cached_entry, video_id, True)
+        if video_meta is not None:
+            return video_meta, True
+        return await self._single_flight(
+            video_id, lambda: self._download_entry(video_id, download_fn, revalidate_fn)
+        )
+
+    async def _download_entry(
+        self,
+        video_id: str,
+        download_fn: Callable[[str], Awaitable[Dict[str, Any]]],
+        revalidate_fn: Optional[Callable[[str, Dict[str, Any]], Awaitable[Optional[Dict[str, str]]]]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Revalidate or run download_fn under the video's cross-process lock (aget_entry() miss path)."""
+        async with self.lock_video_async(video_id):
+            video_meta = await asyncio.to_thread(self.get_cached_entry, video_id, True)
+            if video_meta is not None:
+                logger.info(f"Video {video_id} was downloaded by another process")
+                return video_meta, True
+
+            if revalidate_fn is not None:
+                stale = await asyncio.to_thread(self.get_revalidatable_entry, video_id)
+                if stale is not None:
+                    validators = await revalidate_fn(video_id, stale)
+                    if validators is not None:
+                        video_meta = await asyncio.to_thread(self.extend_ttl, video_id, validators)
+                        if video_meta is not None:
+                            return video_meta, True
+                    logger.info(f"Video {video_id} changed at the origin, downloading again")
+
+            self._stats.record("misses")
+            return await download_fn(video_id), False
+
+    async def _single_flight(self, video_id: str, start: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Share one in-flight operation per video between concurrent callers.
+
+        The first caller runs start(); callers arriving while it is running
+        await the same result (or exception) instead of starting their own.
+
+        Args:
+            video_id: Unique video identifier
+            start: Zero-argument coroutine function performing the operation
+
+        Returns:
+            Result of the shared operation
+        """
+        pending = self._inflight.get(video_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        pending = asyncio.get_running_loop().create_future()
+        # Mark exceptions as retrieved when no other caller was waiting
+        pending.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[video_id] = pending
+        try:
+            result = await start()
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            del self._inflight[video_id]
+        pending.set_result(result)
+        return result
+
+    def _store_content(self, video_id: str, content: Any) -> None:
+        """
+        Write fetched content to the cache and record it.
+
+        Failures are logged rather than raised so callers still get content.
+
+        Args:
+            video_id: Unique video identifier
+            content: Video content (bytes or text)
+        """
+        file_ext = self._get_file_extension(content)
+        cache_file = self._video_path(video_id, f"{video_id}.{file_ext}")
+
+        temp_path = self._new_temp_path()
+        try:
+            # Handle both bytes and string content
+            if isinstance(content, bytes):
+                temp_path.write_bytes(content)
+                digest = hashlib.sha256(content).hexdigest()
+            else:
+                temp_path.write_text(str(content))
+                digest = hashlib.sha256(temp_path.read_bytes()).hexdigest()
+
+            # Move into place and update metadata
+            self._commit_temp_file(video_id, temp_path, file_ext, digest)
+
+            logger.info(f"Cached {video_id} to {cache_file}")
+
+        except IOError as e:
+            self._discard_temp_file(temp_path)
+            logger.error(f"Failed to cache {video_id}: {e}")
+
+    def _read_cached(self, video_id: str, reader: Optional[Callable[[Path], Any]] = None) -> Any:
+        """
+        Read a cached video's content.
+
+        Args:
+            video_id: Unique video identifier
+            reader: Function opening the cached file (default: read the
+                whole file; MappedVideo.open for zero-copy hits)
+
+        Returns:
+            File content, or _MISS if not cached, expired or unreadable
+        """
+        video_meta = self.get_cached_entry(video_id, record_access=True)
+        if video_meta is None:
+            return _MISS
+
+        logger.info(f"Cache HIT for {video_id}")
+        file_path = Path(video_meta["file_path"])
+
+        # HIGH PRIORITY H2: Read binary video files using read_bytes()
+        try:
+            return file_path.read_bytes() if reader is None else reader(file_path)
+        except Exception as e:
+            logger.warning(f"Failed to read cached file {file_path}: {e}")
+            return _MISS
+
+    def open_cached(self, video_id: str) -> Optional[MappedVideo]:
+        """
+        Memory-map a cached video without copying it (hit path only).
+
+        Args:
+            video_id: Unique video identifier
+
+        Returns:
+            MappedVideo the caller must close, or None if not cached
+        """
+        mapped = self._read_cached(video_id, MappedVideo.open)
+        return None if mapped is _MISS else mapped
+
+    def get_mapped(self, video_id: str, fetch_fn: Callable[[str], Any]) -> MappedVideo:
+        """
+        Zero-copy version of get(): return a memory map of the cached file.
+
+        Hits map the file instead of reading it, so large clips cost no
+        copy and only the pages read become resident. On a miss the fetched
+        content is cached as in get() and the stored file is mapped.
+
+        Args:
+            video_id: Unique video identifier
+            fetch_fn: Function to fetch video content (takes video_id, returns content)
+
+        Returns:
+            MappedVideo (use as a context manager or close() it); its path
+            and fileno() suit os.sendfile() and external tools
+        """
+        mapped = self.open_cached(video_id)
+        if mapped is not None:
+            return mapped
+
+        with self.lock_video(video_id):
+            mapped = self.open_cached(video_id)
+            if mapped is not None:
+                return mapped
+
+            logger.info(f"Cache MISS for {video_id}, fetching...")
+            self._stats.record("misses")
+            content = fetch_fn(video_id)
+            self._store_content(video_id, content)
+            return self._map_stored(video_id, content)
+
+    async def aget_mapped(self, video_id: str, fetch_fn: Callable[[str], Any]) -> MappedVideo:
+        """
+        Async version of get_mapped(); fetch_fn may be a coroutine function.
+
+        Concurrent misses share one fetch (as in aget()), but every caller
+        gets its own MappedVideo to close.
+
+        Args:
+            video_id: Unique video identifier
+            fetch_fn: Function or coroutine function fetching video content
+
+        Returns:
+            MappedVideo of the cached video
+        """
+        mapped = await asyncio.to_thread(self.open_cached, video_id)
+        if mapped is not None:
+            return mapped
+        content = await self._single_flight(video_id, lambda: self._fetch_and_store(video_id, fetch_fn))
+        return await asyncio.to_thread(self._map_stored, video_id, content)
+
+    def _map_stored(self, video_id: str, content: Any) -> MappedVideo:
+        """Map the just-stored file of a video, or wrap content if it could not be cached."""
+        video_meta = self.get_cached_entry(video_id)
+        if video_meta is not None:
+            try:
+                return MappedVideo.open(Path(video_meta["file_path"]))
+            except OSError as e:
+                logger.warning(f"Failed to map cached file of {video_id}: {e}")
+        return MappedVideo.from_bytes(content)
+
+    def lock_video(self, video_id: str, timeout: Optional[float] = None):
+        """
+        Hold the single-flight lock of a video in synchronous code.
+
+        Args:
+            video_id: Unique video identifier
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            Context manager holding the lock
+
+        Raises:
+            LockTimeout: If the lock was not acquired in time
+        """
+        return self._key_locks.hold(f"{self.provider_name}/{video_id}", timeout)
+
+    def lock_video_async(self, video_id: str, timeout: Optional[float] = None):
+        """
+        Hold the single-flight lock of a video without blocking the event loop.
+
+        Use as "async with cache.lock_video_async(video_id):" around a
+        re-check of the cache and the download.
+
+        Args:
+            video_id: Unique video identifier
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            Async context manager holding the lock
+
+        Raises:
+            LockTimeout: If the lock was not acquired in time
+        """
+        return self._key_locks.hold_async(f"{self.provider_name}/{video_id}", timeout)
+
+    def get_path(self, video_id: str) -> Optional[Path]:
+        """
+        Get the path of a cached video without reading it into memory.
+
+        Counts as a cache hit for eviction.
+
+        Args:
+            video_id: Unique video identifier
+
+        Returns:
+            Path of the cached file, or None if not cached or expired
+        """
+        video_meta = self.get_cached_entry(video_id, record_access=True)
+        if video_meta is None:
+            return None
+        return Path(video_meta["file_path"])
+
+    async def put_stream(
+        self,
+        video_id: str,
+        chunks: AsyncIterable[bytes],
+        file_ext: str = "mp4"
+    ) -> Dict[str, Any]:
+        """
+        Cache a video from an async byte stream without holding it in memory.
+
+        Chunks are hashed (SHA-256) and written to a temporary file in
+        provider_dir through a STREAM_CHUNK_SIZE write buffer, then
+        atomically moved into place (sharing the blob of identical content
+        already cached) and recorded in metadata. All disk I/O runs in a worker thread, so
+        the event loop is never blocked. A failed or cancelled stream leaves
+        the previous cached copy (if any) untouched.
+
+        Args:
+            video_id: Unique video identifier
+            chunks: Async iterable of byte chunks (e.g. httpx aiter_bytes())
+            file_ext: Extension of the cached file (default: "mp4")
+
+        Returns:
+            The stored metadata entry
+        """
+        temp_path = self._new_temp_path()
+        hasher = hashlib.sha256()
+        try:
+            f = await asyncio.to_thread(open, temp_path, 'wb', STREAM_CHUNK_SIZE)
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(self._write_chunk, f, hasher, chunk)
+                await asyncio.to_thread(self._sync_file, f)
+            finally:
+                f.close()
+            entry = await asyncio.to_thread(
+                self._commit_temp_file, video_id, temp_path, file_ext, hasher.hexdigest()
+            )
+        except BaseException:
+            self._discard_temp_file(temp_path)
+            raise
+
+        logger.info(f"Cached {video_id} to {entry['file_path']} ({entry['size']} bytes)")
+        return entry
+
+    @staticmethod
+    def _write_chunk(f, hasher, chunk: bytes) -> None:
+        """Hash and write one streamed chunk."""
+        hasher.update(chunk)
+        f.write(chunk)
+
+    @staticmethod
+    def _sync_file(f) -> None:
+        """Flush a file's buffer and fsync it to disk."""
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _new_temp_path(self) -> Path:
+        """Get a unique temporary file path inside provider_dir."""
+        return self.provider_dir / f".{uuid.uuid4().hex}{TEMP_FILE_SUFFIX}"
+
+    def _commit_temp_file(
+        self,
+        video_id: str,
+        temp_path: Path,
+        file_ext: str = "mp4",
+        content_hash: Optional[str] = None,
+        validators: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Move a fully written temporary file into place and record it.
+
+        With content addressing enabled and a content_hash given, the cached
+        file shares the blob of identical content already in the cache.
+
+        Args:
+            video_id: Unique video identifier
+            temp_path: Temporary file inside provider_dir
+            file_ext: Extension of the cached file
+            content_hash: Hex SHA-256 digest of the file's content
+            validators: HTTP "etag"/"last_modified" of the downloaded file
+
+        Returns:
+            The stored metadata entry
+
+        Raises:
+            IntegrityError: If the file is empty or an HTML page
+        """
+        # Empty files and error pages must never become cache hits
+        check_payload(temp_path)
+
+        cache_file = self._video_path(video_id, f"{video_id}.{file_ext}")
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        previous = self.get_entry(video_id)
+
+        if self.blobs is not None and content_hash:
+            self.blobs.commit(content_hash, temp_path, cache_file)
+        else:
+            os.replace(temp_path, cache_file)
+        fsync_directory(cache_file.parent)
+        entry = self.register_file(video_id, cache_file, content_hash=content_hash, validators=validators)
+
+        # The replaced copy may have been the last reference to its blob
+        if previous is not None and previous.get("content_hash") != content_hash:
+            self._release_blob(previous)
+        # A complete download supersedes the sparse file of a partial entry
+        if previous is not None and previous.get("partial"):
+            self._delete_file(Path(previous["file_path"]))
+        # New downloads go to the cold tier; drop an outdated hot copy
+        if previous is not None and HotTier.is_hot(previous):
+            self._delete_file(Path(previous["file_path"]))
+            if self.hot_tier is not None:
+                self.hot_tier.index.remove((self.provider_name, video_id))
+        # A copy written under the other layout is not replaced by os.replace
+        if previous is not None and not previous.get("partial"):
+            old_file = Path(previous.get("cold_path") or previous.get("file_path", ""))
+            if old_file.name and not self._same_path(old_file, cache_file):
+                self._delete_file(old_file)
+        return entry
+
+    @staticmethod
+    def _discard_temp_file(temp_path: Path) -> None:
+        """Remove a temporary file left by a failed write."""
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+
+    def _range_entry(self, video_id: str, offset: int, length: int) -> Optional[Dict[str, Any]]:
+        """Get a valid entry whose stored bytes cover [offset, offset + length)."""
+        video_meta = self.get_entry(video_id)
+        if video_meta is None:
+            return None
+        if not video_meta.get("partial"):
+            return self.get_cached_entry(video_id)
+        if self.is_expired(video_meta):
+            return None
+        end = offset + length
+        if video_meta.get("total_size") is not None:
+            end = min(end, int(video_meta["total_size"]))
+        return video_meta if covers(video_meta.get("segments", []), offset, end) else None
+
+    @staticmethod
+    def _read_file_range(file_path: Path, offset: int, length: int) -> bytes:
+        """Read up to length bytes of a file starting at offset."""
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def read_range(self, video_id: str, offset: int, length: int) -> Optional[bytes]:
+        """
+        Read part of a cached video without loading the whole file.
+
+        Served from a fully cached file or from the stored segments of a
+        partially cached one. Counts as a cache hit.
+
+        Args:
+            video_id: Unique video identifier
+            offset: First byte offset
+            length: Number of bytes (fewer are returned at the end of the video)
+
+        Returns:
+            The requested bytes, or None if the range is not cached
+        """
+        video_meta = self._range_entry(video_id, offset, length)
+        if video_meta is None:
+            return None
+        video_meta = self._record_access(video_id, video_meta)
+        if not video_meta.get("partial"):
+            video_meta = self._maybe_promote(video_id, video_meta)
+        try:
+            return self._read_file_range(Path(video_meta["file_path"]), offset, length)
+        except OSError as e:
+            logger.warning(f"Failed to read range of {video_id}: {e}")
+            return None
+
+    def put_range(
+        self,
+        video_id: str,
+        offset: int,
+        data: bytes,
+        total_size: Optional[int] = None,
+        file_ext: str = "mp4"
+    ) -> Dict[str, Any]:
+        """
+        Store one byte range of a video in its sparse file.
+
+        The range is written at its offset in provider_dir/segments/ and
+        merged into the entry's segment map. Once the segments cover the
+        whole video (total_size known), the file is committed as a regular
+        cached video. Callers should hold the video's lock.
+
+        Args:
+            video_id: Unique video identifier
+            offset: Byte offset of data within the video
+            data: Bytes of the range
+            total_size: Length of the complete video, if known
+            file_ext: Extension of the cached file (default: "mp4")
+
+        Returns:
+            The stored metadata entry (partial, or complete once all bytes are stored)
+        """
+        video_meta = self.get_entry(video_id)
+        if video_meta is not None and self._is_entry_valid(video_id, video_meta):
+            return video_meta  # already fully cached
+        if video_meta is not None and (not video_meta.get("partial") or self.is_expired(video_meta)):
+            # Start over from an expired or lost copy
+            self.invalidate(video_id)
+            video_meta = None
+
+        sparse_path = self._part_path(video_id, file_ext)
+        sparse_path.parent.mkdir(parents=True, exist_ok=True)
+        if video_meta is None:
+            self._discard_temp_file(sparse_path)  # stale file without an entry
+            segments = []
+        else:
+            segments = video_meta.get("segments", [])
+            sparse_path = Path(video_meta["file_path"])
+            if total_size is None:
+                total_size = video_meta.get("total_size")
+
+        with open(sparse_path, 'r+b' if sparse_path.exists() else 'w+b') as f:
+            f.seek(offset)
+            f.write(data)
+            self._sync_file(f)
+
+        segments = merge_segment(segments, offset, offset + len(data))
+        if total_size is not None and covers(segments, 0, total_size):
+            return self._commit_complete_range(video_id, sparse_path, file_ext, total_size)
+
+        entry = self._partial_entry(video_meta, sparse_path, segments, total_size)
+        self._put_entry(video_id, entry)
+        logger.info(f"Cached bytes {offset}-{offset + len(data)} of {video_id} ({entry['size']} bytes stored)")
+        return entry
+
+    def _part_path(self, video_id: str, file_ext: str) -> Path:
+        """Get the partial file of a video (byte ranges and interrupted downloads)."""
+        return self.provider_dir / SEGMENTS_DIRNAME / f"{video_id}.{file_ext}{PART_FILE_SUFFIX}"
+
+    def _partial_entry(
+        self,
+        video_meta: Optional[Dict[str, Any]],
+        file_path: Path,
+        segments: list,
+        total_size: Optional[int],
+        validators: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Build the metadata entry of a partial file, keeping an existing entry's age and hits."""
+        entry = {
+            "provider": self.provider_name,
+            "cached_date": video_meta["cached_date"] if video_meta else datetime.now().isoformat(),
+            "ttl": self.default_ttl_days,
+            "file_path": str(file_path),
+            "size": stored_bytes(segments),
+            "last_access": time.time(),
+            "hits": int(video_meta.get("hits", 0)) if video_meta else 0,
+            "partial": True,
+            "segments": segments,
+        }
+        if total_size is not None:
+            entry["total_size"] = total_size
+        if validators:
+            entry.update(validators)
+        return entry
+
+    @staticmethod
+    def _hash_file(f, hasher) -> None:
+        """Feed the rest of an open file to a hasher."""
+        for block in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            hasher.update(block)
+
+    def _commit_complete_range(
+        self,
+        video_id: str,
+        sparse_path: Path,
+        file_ext: str,
+        total_size: int
+    ) -> Dict[str, Any]:
+        """Commit a sparse file whose segments now cover the whole video."""
+        with open(sparse_path, 'r+b') as f:
+            f.truncate(total_size)
+        hasher = hashlib.sha256()
+        with open(sparse_path, 'rb') as f:
+            self._hash_file(f, hasher)
+        logger.info(f"All byte ranges of {video_id} cached, committing complete file")
+        try:
+            return self._commit_temp_file(video_id, sparse_path, file_ext, hasher.hexdigest())
+        except IntegrityError:
+            self._discard_part(video_id, sparse_path)
+            raise
+
+    async def aensure_range(
+        self,
+        video_id: str,
+        offset: int,
+        length: int,
+        fetch_range_fn: Callable[[str, int, int], Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Make sure a byte range of a video is cached, fetching only missing parts.
+
+        fetch_range_fn(video_id, start, end) fetches bytes [start, end) and
+        returns (data, total_size), where total_size is the length of the
+        complete video or None if unknown. It may be a regular function or
+        a coroutine function. Concurrent callers for the same video are
+        serialized by the video's cross-process lock.
+
+        Args:
+            video_id: Unique video identifier
+            offset: First byte offset
+            length: Number of bytes
+            fetch_range_fn: Function fetching a byte range
+
+        Returns:
+            (entry, cached) where cached is True if nothing had to be fetched
+        """
+        video_meta = await asyncio.to_thread(self._range_entry, video_id, offset, length)
+        if video_meta is not None:
+            return video_meta, True
+
+        async with self.lock_video_async(video_id):
+            video_meta = await asyncio.to_thread(self._range_entry, video_id, offset, length)
+            if video_meta is not None:
+                return video_meta, True
+
+            self._stats.record("misses")
+            video_meta = self.get_entry(video_id)
+            segments: list = []
+            end = offset + length
+            if video_meta is not None and video_meta.get("partial") and not self.is_expired(video_meta):
+                segments = video_meta.get("segments", [])
+                if video_meta.get("total_size") is not None:
+                    end = min(end, int(video_meta["total_size"]))
+
+            for start, stop in missing_ranges(segments, offset, end):
+                result = fetch_range_fn(video_id, start, stop)
+                if inspect.isawaitable(result):
+                    result = await result
+                data, total_size = result
+                video_meta = await asyncio.to_thread(self.put_range, video_id, start, data, total_size)
+                if not video_meta.get("partial"):
+                    break
+            return video_meta, False
+
+    async def aread_range(
+        self,
+        video_id: str,
+        offset: int,
+        length: int,
+        fetch_range_fn: Callable[[str, int, int], Any]
+    ) -> bytes:
+        """
+        Read a byte range of a video, fetching and caching missing parts first.
+
+        Args:
+            video_id: Unique video identifier
+            offset: First byte offset
+            length: Number of bytes
+            fetch_range_fn: Function fetching a byte range (see aensure_range())
+
+        Returns:
+            The requested bytes (fewer at the end of the video)
+        """
+        data = await asyncio.to_thread(self.read_range, video_id, offset, length)
+        if data is not None:
+            return data
+        video_meta, _ = await self.aensure_range(video_id, offset, length, fetch_range_fn)
+        return await asyncio.to_thread(
+            self._read_file_range, Path(video_meta["file_path"]), offset, length
+        )
+
+    def resume_point(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the checkpoint of an interrupted download of a video.
+
+        A download can be resumed when the video's partial file holds a
+        contiguous prefix and the ETag or Last-Modified of the remote file
+        was recorded, so the origin can confirm the file is unchanged.
+
+        Args:
+            video_id: Unique video identifier
+
+        Returns:
+            Dictionary with offset, etag, last_modified and total_size, or
+            None if the download has to start from the beginning
+        """
+        video_meta = self.get_entry(video_id)
+        if video_meta is None or not video_meta.get("partial") or self.is_expired(video_meta):
+            return None
+        segments = video_meta.get("segments", [])
+        if not segments or segments[0][0] != 0:
+            return None
+        if not (video_meta.get("etag") or video_meta.get("last_modified")):
+            return None
+        if not Path(video_meta["file_path"]).exists():
+            return None
+        return {
+            "offset": segments[0][1],
+            "etag": video_meta.get("etag"),
+            "last_modified": video_meta.get("last_modified"),
+            "total_size": video_meta.get("total_size"),
+        }
+
+    async def put_stream_resumable(
+        self,
+        video_id: str,
+        chunks: AsyncIterable[bytes],
+        offset: int = 0,
+        validators: Optional[Dict[str, str]] = None,
+        total_size: Optional[int] = None,
+        file_ext: str = "mp4"
+    ) -> Dict[str, Any]:
+        """
+        Cache a video from an async byte stream, keeping progress on failure.
+
+        Like put_stream(), but the video is written to its .part file in
+        provider_dir/segments/ and the bytes received so far are recorded in
+        metadata every RESUME_CHECKPOINT_BYTES and when the stream fails or
+        is cancelled. With offset set (from resume_point()), chunks continue
+        the partial file at that offset. The file is committed only once it
+        is complete: its length must match total_size when known. Callers
+        should hold the video's lock (aget_entry() download functions do).
+
+        Args:
+            video_id: Unique video identifier
+            chunks: Async iterable of byte chunks starting at offset
+            offset: Bytes already stored in the partial file (0 = start over)
+            validators: "etag"/"last_modified" of the remote file; without
+                them an interrupted download cannot be resumed
+            total_size: Length of the complete video, if known
+            file_ext: Extension of the cached file (default: "mp4")
+
+        Returns:
+            The stored metadata entry
+
+        Raises:
+            ValueError: If offset is beyond the recorded checkpoint
+            IOError: If the stream ended before total_size bytes were received
+        """
+        part_path, f, hasher = await asyncio.to_thread(
+            self._open_part_file, video_id, offset, file_ext
+        )
+        position = checkpointed = offset
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(self._write_chunk, f, hasher, chunk)
+                position += len(chunk)
+                if position - checkpointed >= RESUME_CHECKPOINT_BYTES:
+                    await asyncio.to_thread(
+                        self._checkpoint_part, video_id, f, part_path, position, validators, total_size
+                    )
+                    checkpointed = position
+            if total_size is not None and position != total_size:
+                raise IOError(f"Incomplete download of {video_id}: got {position} of {total_size} bytes")
+            await asyncio.to_thread(self._sync_file, f)
+        except BaseException:
+            logger.warning(f"Download of {video_id} interrupted after {position} bytes")
+            # Synchronous on purpose: must also complete when cancelled
+            self._save_or_discard_part(video_id, f, part_path, position, validators, total_size)
+            raise
+        finally:
+            f.close()
+
+        try:
+            entry = await asyncio.to_thread(
+                self._commit_temp_file, video_id, part_path, file_ext, hasher.hexdigest(), validators
+            )
+        except IntegrityError:
+            # Not worth resuming: the origin sent an error page or nothing
+            self._discard_part(video_id, part_path)
+            raise
+        logger.info(
+            f"Cached {video_id} to {entry['file_path']} ({entry['size']} bytes"
+            f"{f', resumed at {offset}' if offset else ''})"
+        )
+        return entry
+
+    def _open_part_file(self, video_id: str, offset: int, file_ext: str):
+        """
+        Open a video's partial file for a (resumed) download.
+
+        Returns:
+            (part_path, file positioned at offset, SHA-256 hasher of bytes before offset)
+        """
+        previous = self.get_entry(video_id)
+        if previous is not None and not previous.get("partial"):
+            # Expired or lost copy being downloaded again
+            self.invalidate(video_id)
+            previous = None
+
+        part_path = self._part_path(video_id, file_ext)
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        if not offset:
+            if previous is not None:
+                self._delete_file(Path(previous["file_path"]))
+                self.forget(video_id)
+            return part_path, open(part_path, 'wb', STREAM_CHUNK_SIZE), hasher
+
+        checkpoint = self.resume_point(video_id)
+        if checkpoint is None or checkpoint["offset"] < offset or Path(previous["file_path"]) != part_path:
+            raise ValueError(f"Cannot resume {video_id} at byte {offset}: no matching checkpoint")
+        # Drop bytes past the checkpoint (and any later byte ranges) before appending
+        self._put_entry(video_id, dict(
+            previous, segments=[[0, offset]], size=offset, last_access=time.time()
+        ))
+        f = open(part_path, 'r+b', STREAM_CHUNK_SIZE)
+        try:
+            f.truncate(offset)
+            self._hash_file(f, hasher)
+            f.seek(offset)
+        except BaseException:
+            f.close()
+            raise
+        return part_path, f, hasher
+
+    def _checkpoint_part(
+        self,
+        video_id: str,
+        f,
+        part_path: Path,
+        position: int,
+        validators: Optional[Dict[str, str]],
+        total_size: Optional[int]
+    ) -> None:
+        """Flush a partial download to disk and record its progress in metadata."""
+        self._sync_file(f)
+        entry = self._partial_entry(
+            self.get_entry(video_id), part_path, [[0, position]], total_size, validators
+        )
+        self._put_entry(video_id, entry)
+        logger.debug(f"Checkpointed download of {video_id} at {position} bytes")
+
+    def _save_or_discard_part(
+        self,
+        video_id: str,
+        f,
+        part_path: Path,
+        position: int,
+        validators: Optional[Dict[str, str]],
+        total_size: Optional[int]
+    ) -> None:
+        """Keep a failed download's progress if it can be resumed, else delete it."""
+        resumable = bool(validators) and position > 0 and (total_size is None or position < total_size)
+        try:
+            if resumable:
+                self._checkpoint_part(video_id, f, part_path, position, validators, total_size)
+                return
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to checkpoint download of {video_id}: {e}")
+        f.close()
+        self._discard_part(video_id, part_path)
+
+    def _discard_part(self, video_id: str, part_path: Path) -> None:
+        """Delete a partial file and forget its partial entry."""
+        self._discard_temp_file(part_path)
+        video_meta = self.get_entry(video_id)
+        if video_meta is not None and video_meta.get("partial"):
+            self.forget(video_id)
+
+    def _get_file_extension(self, content: Any) -> str:
+        """
+        Determine file extension from content.
+
+        Args:
+            content: Video content (bytes or string)
+
+        Returns:
+            File extension (default: "mp4")
+        """
+        # Default to mp4 for videos
+        return "mp4"
+
+    def invalidate(self, video_id: str) -> bool:
+        """
+        Remove video from cache (delete file and metadata).
+
+        Args:
+            video_id: Unique video identifier
+
+        Returns:
+            True if video was removed, False if not found
+        """
+        video_meta = self.get_entry(video_id)
+        if video_meta is None:
+            logger.warning(f"Cannot invalidate {video_id}: not in cache")
+            return False
+
+        # Delete file (and its blob if no other video shares it)
+        self._remove_cached_file(video_meta)
+
+        # Remove metadata
+        self._store.delete(self.provider_name, video_id)
+        self._drop_from_indexes((self.provider_name, video_id))
+
+        logger.info(f"Invalidated cache entry for {video_id}")
+        return True
+
+    def forget(self, video_id: str) -> bool:
+        """
+        Remove a video's metadata without touching files on disk.
+
+        Used for entries whose file has already been deleted.
+
+        Args:
+            video_id: Unique video identifier
+
+        Returns:
+            True if an entry was removed
+        """
+        removed = self._store.delete(self.provider_name, video_id)
+        self._drop_from_indexes((self.provider_name, video_id))
+        return removed
+
+    def quarantine(self, video_id: str, reason: str, cached_date: Optional[str] = None) -> Optional[Path]:
+        """
+        Move a bad cached file out of the cache and drop its entry.
+
+        The file goes to cache_dir/quarantine/<provider>/ for inspection;
+        a hot tier copy is deleted. Runs under the video's lock, so a
+        concurrent download of the same video is never moved or deleted
+        half-written.
+
+        Args:
+            video_id: Unique video identifier
+            reason: Why the entry failed verification (logged)
+            cached_date: Only quarantine the entry if it still has this
+                cached_date, i.e. was not replaced since it was checked
+
+        Returns:
+            Directory the file was moved to, or None if the entry is gone
+            or was replaced
+        """
+        with self.lock_video(video_id):
+            entry = self.get_entry(video_id)
+            if entry is None or (cached_date is not None and entry.get("cached_date") != cached_date):
+                return None
+
+            target_dir = self.cache_dir / QUARANTINE_DIRNAME / self.provider_name
+            target_dir.mkdir(parents=True, exist_ok=True)
+            file_path = Path(entry.get("file_path", ""))
+            paths = [file_path] + ([Path(entry["cold_path"])] if entry.get("cold_path") else [])
+            blob_path = self.blobs.path_for(entry["content_hash"]) \
+                if self.blobs is not None and entry.get("content_hash") else None
+            for path in paths:
+                # A deduplicated file shares its (now suspect) blob: drop the blob too,
+                # so the next download of this content does not link to it again
+                if blob_path is not None and path.exists() and blob_path.exists() \
+                        and os.path.samefile(path, blob_path):
+                    self._delete_file(blob_path)
+            if file_path.exists():
+                os.replace(file_path, target_dir / f"{int(time.time())}-{file_path.name}")
+            if entry.get("cold_path"):
+                self._delete_file(Path(entry["cold_path"]))
+            self._release_blob(entry)
+            self.forget(video_id)
+        logger.warning(f"Quarantined {self.provider_name}/{video_id}: {reason}")
+        return target_dir
+
+    def close(self) -> None:
+        """
+        Flush batched access updates and release the metadata store.
+
+        Hits recorded since the last flush (last_access, hits) are what the
+        eviction policies rank by, so call this on shutdown; the cache must
+        not be used afterwards.
+        """
+        self._store.close()
+        logger.info(f"Closed VideoCache for provider '{self.provider_name}'")
+
+    def compact(self) -> None:
+        """
+        Compact the metadata store and rebuild the eviction index.
+
+        The eviction heaps accumulate stale items between rebuilds; the next
+        budget check rebuilds them from the compacted metadata.
+        """
+        self._store.compact()
+        self._eviction_generation = None
+
+    def _sync_stats(self) -> None:
+        """Rebuild statistics if other writers changed the metadata."""
+        self._store.refresh()
+        if self._stats_generation == self._store.generation:
+            return
+        self._stats.rebuild(
+            (((provider, video_id), entry) for provider, video_id, entry in self._iter_all_entries()),
+            size_of=self._recorded_size
+        )
+        self._stats_generation = self._store.generation
+
+    def _recorded_size(self, entry: Dict[str, Any]) -> int:
+        """Get an entry's recorded size, stat()ing files of legacy entries without one."""
+        if "size" in entry:
+            return int(entry["size"])
+        return self._file_size(Path(entry.get("file_path", "")))
+
+    def get_stats(self, reconcile: bool = False) -> Dict[str, Any]:
+        """
+        Get cache statistics in constant time.
+
+        Sizes and counts cover every provider sharing cache_dir and are
+        maintained on insert, eviction and invalidation; hits, misses and
+        evictions count events of this VideoCache instance. The age
+        histogram covers this provider's entries.
+
+        Args:
+            reconcile: Rescan every cached file on disk instead of trusting
+                recorded sizes (slow; repairs drift from external changes)
+
+        Returns:
+            Dictionary with total_bytes, total_entries, provider_bytes,
+            provider_entries, hits, misses, evictions and age_histogram
+            (plus missing_files when reconciling)
+        """
+        if not reconcile:
+            self._sync_stats()
+            return self._stats.snapshot(self.provider_name)
+
+        self._store.refresh()
+        missing = 0
+        entries = []
+        for provider, video_id, entry in self._iter_all_entries():
+            file_path = Path(entry.get("file_path", ""))
+            try:
+                size = file_path.stat().st_size
+            except OSError:
+                missing += 1
+                size = 0
+            entries.append(((provider, video_id), dict(entry, size=size)))
+        self._stats.rebuild(entries)
+        self._stats_generation = self._store.generation
+        logger.info(f"Reconciled cache statistics for {len(entries)} entries ({missing} missing files)")
+        return dict(self._stats.snapshot(self.provider_name), missing_files=missing)
+
+    def get_cache_size(self) -> int:
+        """
+        Get total size of all cached files in bytes.
+
+        Covers every provider sharing cache_dir; see get_provider_usage()
+        for this provider alone. Uses the incrementally maintained
+        statistics; see get_stats().
+
+        Returns:
+            Total cache size in bytes
+        """
+        self._sync_stats()
+        return self._stats.total_bytes
+
+    def get_cache_count(self) -> int:
+        """
+        Get number of cached videos.
+
+        Returns:
+            Number of videos in cache (all providers)
+        """
+        self._sync_stats()
+        return len(self._stats)
+
+    def get_provider_usage(self) -> Tuple[int, int]:
+        """
+        Get the size and number of this provider's cached videos.
+
+        Returns:
+            (total_bytes, entry_count) for this provider
+        """
+        self._sync_stats()
+        return self._stats.provider_usage(self.provider_name)
+
+    def get_cache_age(self, video_id: str) -> Optional[int]:
+        """
+        Get age of cached video in days.
+
+        Args:
+            video_id: Unique video identifier
+
+        Returns:
+            Age in days, or None if video not cached
+        """
+        video_meta = self.get_entry(video_id)
+        if video_meta is None:
+            return None
+
+        cached_date_str = video_meta.get("cached_date")
         if not cached_date_str:
             return None
 
@@ -0,0 +1,180 @@
+"""
+Command-Line Maintenance for the Shared VideoCache
+
+Runs cache maintenance outside the MCP servers, e.g. from cron:
+
+    python -m mcp_servers.cache_cli janitor ./assets/cache
+    python -m mcp_servers.cache_cli janitor ./assets/cache --provider nasa --job expired
+    python -m mcp_servers.cache_cli verify ./assets/cache --workers 4
+    VIDEO_CACHE_LAYOUT=sharded python -m mcp_servers.cache_cli janitor ./assets/cache --job layout
+
+Cache options (metadata backend, budgets) are read from the same
+environment variables as the servers (see cache_options_from_env); the
+"layout" job moves files into the layout named by VIDEO_CACHE_LAYOUT.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .blob_store import BLOB_DIRNAME
+from .cache import LOCK_DIRNAME, VideoCache, cache_options_from_env
+from .integrity import QUARANTINE_DIRNAME, verify_cache
+from .janitor import (
+    DEFAULT_BATCH_PAUSE_SECONDS,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_ORPHAN_GRACE_SECONDS,
+    JANITOR_JOBS,
+    CacheJanitor,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def discover_providers(cache_dir: Path) -> List[str]:
+    """
+    List provider subdirectories of a cache directory.
+
+    Args:
+        cache_dir: Root cache directory
+
+    Returns:
+        Sorted provider names (hidden, blob and quarantine directories excluded)
+    """
+    if not cache_dir.is_dir():
+        return []
+    return sorted(
+        path.name for path in cache_dir.iterdir()
+        if path.is_dir() and not path.name.startswith(".")
+        and path.name not in (BLOB_DIRNAME, LOCK_DIRNAME, QUARANTINE_DIRNAME)
+    )
+
+
+def _run_janitor(args: argparse.Namespace) -> int:
+    """Run one maintenance pass for each selected provider."""
+    cache_dir = Path(args.cache_dir)
+    providers = args.provider or discover_providers(cache_dir)
+    if not providers:
+        logger.warning(f"No providers found in {cache_dir}")
+        return 0
+
+    for provider in providers:
+        cache = VideoCache(provider, str(cache_dir), **cache_options_from_env(provider))
+        janitor = CacheJanitor(
+            cache,
+            batch_size=args.batch_size,
+            batch_pause=args.batch_pause,
+            orphan_grace=args.orphan_grace
+        )
+        try:
+            results = janitor.run_once(args.job)
+        finally:
+            cache.close()
+        summary = ", ".join(f"{job}={count}" for job, count in results.items())
+        print(f"{provider}: {summary}")
+    return 0
+
+
+def _run_verify(args: argparse.Namespace) -> int:
+    """Re-hash every cached file of each selected provider; exit 1 if any is bad."""
+    cache_dir = Path(args.cache_dir)
+    providers = args.provider or discover_providers(cache_dir)
+    if not providers:
+        logger.warning(f"No providers found in {cache_dir}")
+        return 0
+
+    bad = 0
+    for provider in providers:
+        cache = VideoCache(provider, str(cache_dir), **cache_options_from_env(provider))
+        try:
+            results = verify_cache(cache, workers=args.workers, quarantine=not args.dry_run)
+        finally:
+            cache.close()
+        for video_id, problem in sorted(results["problems"].items()):
+            print(f"{provider}/{video_id}: {problem}")
+        print(
+            f"{provider}: checked={results['checked']}, ok={results['ok']}, "
+            f"bad={results['bad']}, quarantined={results['quarantined']}"
+        )
+        bad += results["bad"]
+    return 1 if bad else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the cache_cli argument parser.
+
+    Returns:
+        Parser with one subcommand per maintenance task
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m mcp_servers.cache_cli",
+        description="Maintain the shared video cache."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    janitor = subparsers.add_parser(
+        "janitor",
+        help="Sweep expired entries, migrate the layout, drop orphan and missing files, then compact"
+    )
+    janitor.add_argument("cache_dir", help="Root cache directory")
+    janitor.add_argument(
+        "--provider", action="append",
+        help="Provider to maintain (repeatable; default: all providers in cache_dir)"
+    )
+    janitor.add_argument(
+        "--job", action="append", choices=JANITOR_JOBS,
+        help="Job to run (repeatable; default: all jobs)"
+    )
+    janitor.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    janitor.add_argument("--batch-pause", type=float, default=DEFAULT_BATCH_PAUSE_SECONDS)
+    janitor.add_argument(
+        "--orphan-grace", type=float, default=DEFAULT_ORPHAN_GRACE_SECONDS,
+        help="Minimum age in seconds before unreferenced files are deleted"
+    )
+    janitor.set_defaults(handler=_run_janitor)
+
+    verify = subparsers.add_parser(
+        "verify",
+        help="Re-hash cached files in parallel and quarantine corrupted ones"
+    )
+    verify.add_argument("cache_dir", help="Root cache directory")
+    verify.add_argument(
+        "--provider", action="append",
+        help="Provider to verify (repeatable; default: all providers in cache_dir)"
+    )
+    verify.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes (default: CPU count)"
+    )
+    verify.add_argument(
+        "--dry-run", action="store_true",
+        help=f"Only report bad entries instead of moving them to {QUARANTINE_DIRNAME}/"
+    )
+    verify.set_defaults(handler=_run_verify)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point for the cache maintenance command line.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
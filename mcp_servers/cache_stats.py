@@ -0,0 +1,243 @@
+"""
+Incremental Statistics for the Shared VideoCache
+
+Cache dashboards poll sizes and counts frequently. Instead of stat()ing
+every cached file per call, VideoCache keeps a CacheStats instance up to
+date on every insert, eviction and invalidation, so reading statistics
+costs the same for ten entries as for ten thousand:
+
+    total_bytes: Stored content size (deduplicated content counted once)
+    total_entries: Entries across all providers sharing cache_dir
+    provider_bytes / provider_entries: Per-provider totals (every entry in full)
+    hits / misses / evictions / promotions / demotions / revalidations:
+        Counters of this VideoCache instance
+    tiers: Bytes and entries per storage tier (the hot tier holds copies
+        of cold entries, so cold covers every entry)
+    age_histogram: Entries per cached_date age bucket
+
+Ages are tracked as counts per cached day, so the histogram is computed
+from at most one item per distinct day rather than per entry. Sizes come
+from the "size" field recorded in metadata; VideoCache.get_stats(
+reconcile=True) rebuilds everything from the files on disk.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .eviction import EntryKey
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (exclusive, in days) and labels of the age histogram buckets
+AGE_BUCKETS: Tuple[Tuple[int, str], ...] = (
+    (1, "<1d"),
+    (7, "1-7d"),
+    (30, "7-30d"),
+    (90, "30-90d"),
+)
+AGE_OVERFLOW_LABEL = ">=90d"
+AGE_UNKNOWN_LABEL = "unknown"
+
+COUNTERS = ("hits", "misses", "evictions", "promotions", "demotions", "revalidations")
+
+
+def _cached_day(entry: Dict[str, Any]) -> Optional[int]:
+    """Get the ordinal day of an entry's cached_date, or None if unreadable."""
+    try:
+        return datetime.fromisoformat(entry["cached_date"]).toordinal()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def age_bucket(age_days: Optional[int]) -> str:
+    """
+    Get the histogram label for an age.
+
+    Args:
+        age_days: Age in days (None if unknown)
+
+    Returns:
+        Bucket label from AGE_BUCKETS, AGE_OVERFLOW_LABEL or AGE_UNKNOWN_LABEL
+    """
+    if age_days is None:
+        return AGE_UNKNOWN_LABEL
+    for upper, label in AGE_BUCKETS:
+        if age_days < upper:
+            return label
+    return AGE_OVERFLOW_LABEL
+
+
+class CacheStats:
+    """
+    Cache size, count and age statistics maintained incrementally.
+
+    Every update is O(1); snapshot() is proportional to the number of
+    providers and distinct cached days, not to the number of entries.
+
+    Attributes:
+        total_bytes: Stored content size (shared content counted once)
+        counters: Event counters (see COUNTERS)
+    """
+
+    def __init__(self):
+        """Initialize empty statistics with zeroed counters."""
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._clear_entries()
+
+    def _clear_entries(self) -> None:
+        """Drop all entry statistics."""
+        self.total_bytes = 0
+        self._entries: Dict[EntryKey, Tuple[int, Optional[int], Optional[str], bool]] = {}
+        self._blob_refs: Dict[str, int] = {}
+        self._provider_bytes: Dict[str, int] = {}
+        self._provider_entries: Dict[str, int] = {}
+        self._cached_days: Dict[str, Dict[Optional[int], int]] = {}
+        self._hot_bytes = 0
+        self._hot_entries = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: EntryKey, entry: Dict[str, Any]) -> None:
+        """
+        Record a new or replaced entry.
+
+        Args:
+            key: (provider, video_id)
+            entry: Metadata entry with size, cached_date and content_hash fields
+        """
+        self.remove(key)
+        provider = key[0]
+        size = int(entry.get("size", 0))
+        day = _cached_day(entry)
+        digest = entry.get("content_hash")
+        hot = entry.get("tier") == "hot"
+
+        self._entries[key] = (size, day, digest, hot)
+        if hot:
+            self._hot_bytes += size
+            self._hot_entries += 1
+        self._provider_bytes[provider] = self._provider_bytes.get(provider, 0) + size
+        self._provider_entries[provider] = self._provider_entries.get(provider, 0) + 1
+        days = self._cached_days.setdefault(provider, {})
+        days[day] = days.get(day, 0) + 1
+        if digest:
+            self._blob_refs[digest] = self._blob_refs.get(digest, 0) + 1
+            if self._blob_refs[digest] > 1:
+                return
+        self.total_bytes += size
+
+    def remove(self, key: EntryKey) -> None:
+        """
+        Forget an entry (no-op if unknown).
+
+        Args:
+            key: (provider, video_id)
+        """
+        previous = self._entries.pop(key, None)
+        if previous is None:
+            return
+        provider = key[0]
+        size, day, digest, hot = previous
+        if hot:
+            self._hot_bytes -= size
+            self._hot_entries -= 1
+
+        self._provider_bytes[provider] -= size
+        self._provider_entries[provider] -= 1
+        days = self._cached_days[provider]
+        days[day] -= 1
+        if not days[day]:
+            del days[day]
+        if digest:
+            self._blob_refs[digest] -= 1
+            if self._blob_refs[digest]:
+                return
+            del self._blob_refs[digest]
+        self.total_bytes -= size
+
+    def record(self, counter: str) -> None:
+        """
+        Increment an event counter.
+
+        Args:
+            counter: One of COUNTERS
+        """
+        self.counters[counter] += 1
+
+    def rebuild(self, entries: Iterable[Tuple[EntryKey, Dict[str, Any]]],
+                size_of: Optional[Callable[[Dict[str, Any]], int]] = None) -> None:
+        """
+        Replace all entry statistics, keeping the event counters.
+
+        Args:
+            entries: (key, entry) pairs of every cached entry
+            size_of: Size of an entry (default: its recorded "size" field)
+        """
+        self._clear_entries()
+        for key, entry in entries:
+            if size_of is not None:
+                entry = dict(entry, size=size_of(entry))
+            self.add(key, entry)
+
+    def provider_usage(self, provider: str) -> Tuple[int, int]:
+        """
+        Get usage for one provider.
+
+        Args:
+            provider: Video provider name
+
+        Returns:
+            (total_bytes, entry_count) for the provider
+        """
+        return self._provider_bytes.get(provider, 0), self._provider_entries.get(provider, 0)
+
+    def age_histogram(self, provider: Optional[str] = None,
+                      today: Optional[date] = None) -> Dict[str, int]:
+        """
+        Count entries per age bucket.
+
+        Args:
+            provider: Restrict to this provider (None = all providers)
+            today: Reference date (default: today)
+
+        Returns:
+            Entry count per bucket label, including empty buckets
+        """
+        now = (today or date.today()).toordinal()
+        labels = [label for _, label in AGE_BUCKETS] + [AGE_OVERFLOW_LABEL]
+        histogram = dict.fromkeys(labels, 0)
+
+        providers = self._cached_days if provider is None else {
+            provider: self._cached_days.get(provider, {})
+        }
+        for days in providers.values():
+            for day, count in days.items():
+                label = age_bucket(None if day is None else now - day)
+                histogram[label] = histogram.get(label, 0) + count
+        return histogram
+
+    def snapshot(self, provider: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a copy of all statistics.
+
+        Args:
+            provider: Provider whose age histogram to report (None = all)
+
+        Returns:
+            Dictionary with total_bytes, total_entries, provider_bytes,
+            provider_entries, the event counters, tiers and age_histogram
+        """
+        return {
+            "total_bytes": self.total_bytes,
+            "total_entries": len(self._entries),
+            "provider_bytes": {p: b for p, b in self._provider_bytes.items() if self._provider_entries[p]},
+            "provider_entries": {p: n for p, n in self._provider_entries.items() if n},
+            **self.counters,
+            "tiers": {
+                "cold": {"bytes": self.total_bytes, "entries": len(self._entries)},
+                "hot": {"bytes": self._hot_bytes, "entries": self._hot_entries},
+            },
+            "age_histogram": self.age_histogram(provider),
+        }
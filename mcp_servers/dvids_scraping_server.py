@@ -8,19 +8,34 @@ AC-6.10.1: DVIDS Scraping MCP Server Implementation
 """
 
 import asyncio
+import functools
 import logging
 import re
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-from urllib.robotparser import RobotFileParser
-from urllib.parse import urlparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 
 import httpx
 from bs4 import BeautifulSoup
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 
-from .cache import VideoCache
+from .byte_ranges import parse_content_range, range_header, range_matches, read_window
+from .cache import STREAM_CHUNK_SIZE, VideoCache, cache_options_from_env, iter_chunks
+from .fetching import fetch_with_backoff, stream_to_cache
+from .http_client import SharedHttpClient, http_client_options_from_env
+from .janitor import start_janitor
+from .negative_cache import (
+    NEGATIVE_DB_NAME,
+    NegativeCache,
+    is_not_found,
+    negative_cache_options_from_env,
+    not_found_error,
+)
+from .prefetch import PrefetchPlanner
+from .rate_limiter import rate_limiter_from_env
+from .response_cache import RESPONSES_DB_NAME, ResponseCache, response_cache_options_from_env, response_key
+from .revalidation import conditional_headers, unchanged_validators
+from .robots import RobotsCache, robots_cache_options_from_env
 
 # Configure logging
 logging.basicConfig(
@@ -33,7 +48,7 @@ logger = logging.getLogger(__name__)
 server = Server("dvids-scraping-server")
 
 # Rate limiting configuration
-RATE_LIMIT_SECONDS = 30  # 1 request per 30 seconds
+RATE_LIMIT_SECONDS = 30  # 1 request per 30 seconds (default of DVIDS_RATE_LIMIT)
 BASE_BACKOFF_SECONDS = 2  # Base backoff for retries
 MAX_BACKOFF_SECONDS = 60  # Maximum backoff cap
 MAX_RETRIES = 5  # Maximum retry attempts
@@ -44,35 +59,31 @@ DVIDS_SEARCH_URL = f"{DVIDS_BASE_URL}/search/"
 DVIDS_VIDEO_URL = f"{DVIDS_BASE_URL}/video/"
 
 
-async def check_robots_txt(url: str) -> bool:
+async def check_robots_txt(
+    url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    robots: Optional[RobotsCache] = None
+) -> bool:
     """
     Check robots.txt compliance before scraping.
 
     (MEDIUM PRIORITY M3: robots.txt compliance check)
 
+    With a RobotsCache the origin's robots.txt is fetched once per TTL and
+    the check is an in-memory lookup.
+
     Args:
         url: URL to check against robots.txt
+        client: Pooled client to fetch robots.txt with (default: a
+            short-lived client)
+        robots: Cache of parsed robots.txt policies (default: fetch
+            robots.txt for this check only)
 
     Returns:
         True if allowed to scrape, False if disallowed
     """
     try:
-        parsed_url = urlparse(url)
-        robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-
-        rp = RobotFileParser()
-        rp.set_url(robots_url)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(robots_url, timeout=10)
-            if response.status_code == 200:
-                rp.parse(response.text.splitlines())
-                return rp.can_fetch('*', url)
-
-        # If no robots.txt, assume allowed
-        logger.info(f"No robots.txt found at {robots_url}, allowing scrape")
-        return True
-
+        return await (robots or RobotsCache()).is_allowed(url, client)
     except Exception as e:
         logger.warning(f"Failed to check robots.txt: {e}, allowing scrape")
         return True
@@ -88,7 +99,13 @@ class DVIDSScrapingMCPServer:
     Attributes:
         cache_dir: Directory for cached videos
         cache: VideoCache instance for managing cached content
-        _last_request_time: Timestamp of last HTTP request for rate limiting
+        responses: Cache of parsed search and details responses
+        negative: Cache of missing video IDs and empty searches
+        prefetcher: Background cache warmup jobs (see prefetch())
+        http: Pooled HTTP client shared by all requests (closed by aclose())
+        robots: Cached robots.txt policies checked before each request
+        limiter: Adaptive token-bucket rate limiter of requests to the provider
+        _download_urls: Resolved video file URLs, reused by range requests
     """
 
     def __init__(self, cache_dir: str):
@@ -102,9 +119,24 @@ class DVIDSScrapingMCPServer:
         self.cache = VideoCache(
             provider_name="dvids",
             cache_dir=cache_dir,
-            default_ttl_days=30
+            default_ttl_days=30,
+            **cache_options_from_env("dvids")
+        )
+        self.negative = NegativeCache(
+            Path(cache_dir) / NEGATIVE_DB_NAME,
+            **negative_cache_options_from_env()
         )
-        self._last_request_time: Optional[float] = None
+        self.responses = ResponseCache(
+            Path(cache_dir) / RESPONSES_DB_NAME,
+            negative=self.negative,
+            **response_cache_options_from_env()
+        )
+        self.limiter = rate_limiter_from_env("dvids", DVIDS_BASE_URL, RATE_LIMIT_SECONDS)
+        # Estimates follow the adaptive limiter's current interval
+        self.prefetcher = PrefetchPlanner(self, rate_interval=lambda: self.limiter.interval)
+        self.http = SharedHttpClient(**http_client_options_from_env())
+        self.robots = RobotsCache(**robots_cache_options_from_env())
+        self._download_urls: Dict[str, str] = {}
 
         logger.info(f"DVIDS Scraping MCP Server initialized with cache_dir={cache_dir}")
 
@@ -117,28 +149,34 @@ class DVIDSScrapingMCPServer:
         """
         Enforce rate limiting between requests.
 
-        Waits if necessary to ensure minimum time between requests.
+        Waits for a token of the provider's bucket, so concurrent requests
+        are spaced RATE_LIMIT_SECONDS apart (or DVIDS_RATE_LIMIT) after
+        the configured burst.
         (AC-6.10.1.5: Rate limiting enforces 30 second delay)
         """
-        if self._last_request_time is not None:
-            loop_time = asyncio.get_event_loop().time()
-            elapsed = loop_time - self._last_request_time
-
-            if elapsed < RATE_LIMIT_SECONDS:
-                wait_time = RATE_LIMIT_SECONDS - elapsed
-                logger.info(f"Rate limit: waiting {wait_time:.1f}s before next request")
-                await asyncio.sleep(wait_time)
-
-    async def _fetch_with_backoff(self, url: str, client: httpx.AsyncClient) -> httpx.Response:
+        await self.limiter.acquire()
+
+    async def _fetch_with_backoff(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        method: str = "GET"
+    ) -> httpx.Response:
         """
         Fetch URL with exponential backoff on HTTP 429/503 responses.
 
-        Implements exponential backoff: base_backoff × 2^attempt (capped at MAX_BACKOFF)
+        Runs the shared fetch loop (see fetching.fetch_with_backoff) with
+        this server's rate limiter and retry settings.
         (AC-6.10.1.6, AC-6.10.1.7: Exponential backoff on HTTP 429/503)
 
         Args:
             url: URL to fetch
             client: httpx async client
+            stream: Return before reading the body; caller must aclose() the response
+            headers: Extra request headers (e.g. Range)
+            method: HTTP method (e.g. "HEAD" for revalidation)
 
         Returns:
             HTTP response
@@ -146,44 +184,64 @@ class DVIDSScrapingMCPServer:
         Raises:
             httpx.HTTPStatusError: If max retries exceeded
         """
-        for attempt in range(MAX_RETRIES):
-            try:
-                # Respect rate limit before request
-                await self._respect_rate_limit()
-
-                logger.debug(f"Fetching {url} (attempt {attempt + 1}/{MAX_RETRIES})")
-                response = await client.get(url)
-
-                # Update last request time
-                self._last_request_time = asyncio.get_event_loop().time()
-
-                # Check for rate limiting or service unavailable
-                if response.status_code in (429, 503):
-                    if attempt < MAX_RETRIES - 1:
-                        # Calculate exponential backoff
-                        backoff = min(BASE_BACKOFF_SECONDS * (2 ** attempt), MAX_BACKOFF_SECONDS)
-                        logger.warning(
-                            f"HTTP {response.status_code} on attempt {attempt + 1}, "
-                            f"backing off {backoff}s"
-                        )
-                        await asyncio.sleep(backoff)
-                        continue
-                    else:
-                        logger.error(f"Max retries exceeded for {url}")
-
-                # Raise for other errors
-                response.raise_for_status()
-                return response
-
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code in (429, 503) and attempt < MAX_RETRIES - 1:
-                    continue
-                raise
+        return await fetch_with_backoff(
+            url, client, self.limiter, self._respect_rate_limit,
+            stream=stream, headers=headers, method=method,
+            max_retries=MAX_RETRIES, base_backoff=BASE_BACKOFF_SECONDS, max_backoff=MAX_BACKOFF_SECONDS
+        )
+
+    async def _fetch_video_page(self, video_id: str, video_url: str, client: httpx.AsyncClient) -> httpx.Response:
+        """
+        Fetch a video page, answering known-missing video IDs from the negative cache.
+
+        A 404/410 is recorded with a TTL that grows on repeated misses;
+        while it lasts the same error is raised without a request (no rate
+        limit slot, no backoff). A successful fetch forgets earlier misses.
+
+        Args:
+            video_id: DVIDS video identifier
+            video_url: Video page URL
+            client: httpx async client
+
+        Returns:
+            HTTP response
+
+        Raises:
+            httpx.HTTPStatusError: If the page does not exist (possibly cached)
+        """
+        key = response_key("video", "dvids", video_id=video_id)
+        miss = await asyncio.to_thread(self.negative.get, key)
+        if miss is not None:
+            logger.info(f"Video {video_id} is known to be missing, not fetching {video_url}")
+            raise not_found_error(video_url, miss)
+
+        try:
+            response = await self._fetch_with_backoff(video_url, client)
+        except httpx.HTTPStatusError as e:
+            if is_not_found(e):
+                await asyncio.to_thread(self.negative.record, key)
+            raise
+        await asyncio.to_thread(self.negative.clear, key)
+        return response
 
-        raise httpx.HTTPStatusError(
-            f"Max retries ({MAX_RETRIES}) exceeded",
-            request=None,
-            response=None
+    async def _stream_to_cache(self, video_id: str, url: str, client: httpx.AsyncClient) -> Dict[str, Any]:
+        """
+        Stream a video file from url straight into the cache.
+
+        Interrupted downloads are resumed with a Range request (see
+        fetching.stream_to_cache); the URL is remembered for range fetches.
+
+        Args:
+            video_id: DVIDS video identifier
+            url: Video file URL
+            client: httpx async client
+
+        Returns:
+            Cache metadata entry of the stored video
+        """
+        self._download_urls[video_id] = url
+        return await stream_to_cache(
+            self.cache, video_id, url, functools.partial(self._fetch_with_backoff, client=client)
         )
 
     async def search_videos(self, query: str, max_duration: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -200,89 +258,98 @@ class DVIDSScrapingMCPServer:
         Returns:
             List of video results with videoId, title, duration, format, resolution, download_url, public_domain
         """
+        # Repeated queries are answered from the response cache (stale-while-revalidate)
+        # Queries without results are remembered briefly in the negative cache
+        key = response_key("search", "dvids", query=query, max_duration=max_duration)
+        return await self.responses.aget(
+            key, lambda: self._search_videos(query, max_duration), is_negative=lambda results: not results
+        )
+
+    async def _search_videos(self, query: str, max_duration: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Scrape DVIDS search results (search_videos() response cache miss path)."""
         search_url = f"{DVIDS_SEARCH_URL}?query={query}"
 
         # MEDIUM PRIORITY M3: Check robots.txt compliance
-        if not await check_robots_txt(search_url):
+        if not await check_robots_txt(search_url, self.http.client, self.robots):
             logger.warning(f"Robots.txt disallows scraping: {search_url}")
             raise PermissionError(f"Robots.txt disallows scraping: {search_url}")
 
         logger.info(f"Searching DVIDS for: query='{query}', max_duration={max_duration}")
 
-        async with httpx.AsyncClient() as client:
-            # Construct search URL
-            search_url = f"{DVIDS_SEARCH_URL}?query={query}"
-
-            # Fetch with backoff
-            response = await self._fetch_with_backoff(search_url, client)
-
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract video results
-            results = []
-            video_items = soup.find_all('div', class_='video-item')
-
-            if not video_items:
-                # Try alternative selectors
-                video_items = soup.find_all('div', {'data-video-id': True})
-
-            for item in video_items:
-                try:
-                    # Extract video metadata
-                    video_id = item.get('data-video-id')
-                    if not video_id:
-                        # Try to extract from href
-                        link = item.find('a', href=True)
-                        if link:
-                            href = link['href']
-                            match = re.search(r'/video/(\w+)', href)
-                            if match:
-                                video_id = match.group(1)
-
-                    if not video_id:
-                        continue
-
-                    title_elem = item.find(['h3', 'h4', 'span'], class_=['title', 'video-title'])
-                    title = title_elem.get_text(strip=True) if title_elem else f"Video {video_id}"
-
-                    duration_elem = item.find('span', class_='duration')
-                    duration_text = duration_elem.get_text(strip=True) if duration_elem else "0"
-                    duration = self._parse_duration(duration_text)
-
-                    # Filter by max_duration if specified
-                    if max_duration and duration > max_duration:
-                        continue
-
-                    format_elem = item.find('span', class_='format')
-                    video_format = format_elem.get_text(strip=True) if format_elem else "MP4"
-
-                    resolution_elem = item.find('span', class_='resolution')
-                    resolution = resolution_elem.get_text(strip=True) if resolution_elem else "1920x1080"
-
-                    download_link = item.find('a', class_='download-link')
-                    download_url = download_link['href'] if download_link else f"{DVIDS_VIDEO_URL}{video_id}"
-
-                    # Check for public domain badge
-                    public_domain_badge = item.find('span', class_='public-domain-badge')
-                    public_domain = public_domain_badge is not None
-
-                    results.append({
-                        'videoId': video_id,
-                        'title': title,
-                        'duration': duration,
-                        'format': video_format,
-                        'resolution': resolution,
-                        'download_url': download_url,
-                        'public_domain': public_domain
-                    })
-
-                except Exception as e:
-                    logger.warning(f"Error parsing video item: {e}")
+        client = self.http.client
+        # Construct search URL
+        search_url = f"{DVIDS_SEARCH_URL}?query={query}"
+
+        # Fetch with backoff
+        response = await self._fetch_with_backoff(search_url, client)
+
+        # Parse HTML
+        soup = BeautifulSoup(response.text, 'html.parser')
+
+        # Extract video results
+        results = []
+        video_items = soup.find_all('div', class_='video-item')
+
+        if not video_items:
+            # Try alternative selectors
+            video_items = soup.find_all('div', {'data-video-id': True})
+
+        for item in video_items:
+            try:
+                # Extract video metadata
+                video_id = item.get('data-video-id')
+                if not video_id:
+                    # Try to extract from href
+                    link = item.find('a', href=True)
+                    if link:
+                        href = link['href']
+                        match = re.search(r'/video/(\w+)', href)
+                        if match:
+                            video_id = match.group(1)
+
+                if not video_id:
+                    continue
+
+                title_elem = item.find(['h3', 'h4', 'span'], class_=['title', 'video-title'])
+                title = title_elem.get_text(strip=True) if title_elem else f"Video {video_id}"
+
+                duration_elem = item.find('span', class_='duration')
+                duration_text = duration_elem.get_text(strip=True) if duration_elem else "0"
+                duration = self._parse_duration(duration_text)
+
+                # Filter by max_duration if specified
+                if max_duration and duration > max_duration:
                     continue
 
-            logger.info(f"Found {len(results)} videos for query '{query}'")
-            return results
+                format_elem = item.find('span', class_='format')
+                video_format = format_elem.get_text(strip=True) if format_elem else "MP4"
+
+                resolution_elem = item.find('span', class_='resolution')
+                resolution = resolution_elem.get_text(strip=True) if resolution_elem else "1920x1080"
+
+                download_link = item.find('a', class_='download-link')
+                download_url = download_link['href'] if download_link else f"{DVIDS_VIDEO_URL}{video_id}"
+
+                # Check for public domain badge
+                public_domain_badge = item.find('span', class_='public-domain-badge')
+                public_domain = public_domain_badge is not None
+
+                results.append({
+                    'videoId': video_id,
+                    'title': title,
+                    'duration': duration,
+                    'format': video_format,
+                    'resolution': resolution,
+                    'download_url': download_url,
+                    'public_domain': public_domain
+                })
+
+            except Exception as e:
+                logger.warning(f"Error parsing video item: {e}")
+                continue
+
+        logger.info(f"Found {len(results)} videos for query '{query}'")
+        return results
 
     async def download_video(self, video_id: str) -> Dict[str, Any]:
         """
@@ -300,84 +367,302 @@ class DVIDSScrapingMCPServer:
         video_url = f"{DVIDS_VIDEO_URL}{video_id}"
 
         # MEDIUM PRIORITY M3: Check robots.txt compliance
-        if not await check_robots_txt(video_url):
+        if not await check_robots_txt(video_url, self.http.client, self.robots):
             logger.warning(f"Robots.txt disallows scraping: {video_url}")
             raise PermissionError(f"Robots.txt disallows scraping: {video_url}")
 
         logger.info(f"Downloading video {video_id} from DVIDS")
 
-        # Check cache first
-        if self.cache.is_cached(video_id):
+        # Cache hit, or a single download shared by concurrent requests
+        try:
+            video_meta, cached = await self.cache.aget_entry(
+                video_id, self._download_to_cache, revalidate_fn=self._revalidate
+            )
+        except Exception as e:
+            logger.error(f"Failed to download video {video_id}: {e}")
+            raise
+
+        if cached:
             logger.info(f"Video {video_id} found in cache")
-            self.cache._load_metadata()
-            video_meta = self.cache._metadata["videos"][video_id]
-            return {
-                'video_id': video_id,
-                'file_path': video_meta['file_path'],
-                'cached': True
-            }
+        else:
+            logger.info(f"Downloaded and cached video {video_id} to {video_meta['file_path']}")
+
+        return {
+            'video_id': video_id,
+            'file_path': video_meta['file_path'],
+            'cached': cached
+        }
+
+    async def _download_to_cache(self, video_id: str) -> Dict[str, Any]:
+        """
+        Download a video from DVIDS straight into the cache.
+
+        Args:
+            video_id: DVIDS video identifier
+
+        Returns:
+            Cache metadata entry of the stored video
+        """
+        client = self.http.client
+        download_url, content = await self._resolve_download(video_id, client)
+
+        if download_url:
+            # Stream actual video file to the cache in chunks
+            return await self._stream_to_cache(video_id, download_url, client)
+
+        # Page response is the video payload itself
+        return await self.cache.put_stream(video_id, iter_chunks(content))
+
+    async def _resolve_download(self, video_id: str, client: httpx.AsyncClient) -> Tuple[Optional[str], bytes]:
+        """
+        Find the video file URL on a DVIDS video page.
+
+        Args:
+            video_id: DVIDS video identifier
+            client: httpx async client
+
+        Returns:
+            (download_url, content): download_url is None when the page
+            response is the video payload itself, which is then in content
+        """
+        video_url = f"{DVIDS_VIDEO_URL}{video_id}"
+        response = await self._fetch_video_page(video_id, video_url, client)
+
+        # Get content (handle both binary and HTML responses)
+        download_url = None
+        if hasattr(response, 'content') and response.content:
+            content = response.content
+
+            # Check if response has text attribute and it's a string
+            has_text = hasattr(response, 'text') and isinstance(response.text, str)
+
+            # Check if it's binary data (not HTML)
+            try:
+                content.decode('utf-8')
+                # It's text, might be HTML - parse for download link
+                if has_text:
+                    soup = BeautifulSoup(response.text, 'html.parser')
+                    download_link = soup.find('a', {'href': re.compile(r'\.mp4$')})
+
+                    if download_link:
+                        download_url = download_link['href']
+                        if not download_url.startswith('http'):
+                            download_url = f"{DVIDS_BASE_URL}{download_url}"
+            except UnicodeDecodeError:
+                # Binary data, use as-is
+                pass
+        else:
+            content = b''
+
+        return download_url, content
+
+    async def _revalidate(self, video_id: str, video_meta: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        Ask the origin whether an expired cached video changed.
 
-        # Download video
+        Sends a conditional HEAD request (If-None-Match/If-Modified-Since)
+        for the video file, so no body is transferred.
+
+        Args:
+            video_id: DVIDS video identifier
+            video_meta: Expired metadata entry with etag and/or last_modified
+
+        Returns:
+            Current validators if the video is unchanged, None if it must
+            be downloaded again
+        """
         try:
-            video_url = f"{DVIDS_VIDEO_URL}{video_id}"
-            async with httpx.AsyncClient() as client:
-                response = await self._fetch_with_backoff(video_url, client)
-
-                # Get content (handle both binary and HTML responses)
-                if hasattr(response, 'content') and response.content:
-                    content = response.content
-
-                    # Check if response has text attribute and it's a string
-                    has_text = hasattr(response, 'text') and isinstance(response.text, str)
-
-                    # Check if it's binary data (not HTML)
-                    try:
-                        content.decode('utf-8')
-                        # It's text, might be HTML - parse for download link
-                        if has_text:
-                            soup = BeautifulSoup(response.text, 'html.parser')
-                            download_link = soup.find('a', {'href': re.compile(r'\.mp4$')})
-
-                            if download_link:
-                                download_url = download_link['href']
-                                if not download_url.startswith('http'):
-                                    download_url = f"{DVIDS_BASE_URL}{download_url}"
-
-                                # Download actual video file
-                                video_response = await self._fetch_with_backoff(download_url, client)
-                                content = video_response.content
-                    except UnicodeDecodeError:
-                        # Binary data, use as-is
-                        pass
-                else:
-                    content = b''
-
-            # Cache the content
-            cache_file = self.cache.provider_dir / f"{video_id}.mp4"
-            cache_file.write_bytes(content)
-
-            # Update metadata
-            self.cache._load_metadata()
-            self.cache._metadata["videos"][video_id] = {
-                "provider": "dvids",
-                "cached_date": datetime.now().isoformat(),
-                "ttl": 30,
-                "file_path": str(cache_file)
-            }
-            self.cache._save_metadata()
+            client = self.http.client
+            download_url = self._download_urls.get(video_id)
+            if download_url is None:
+                download_url, _ = await self._resolve_download(video_id, client)
+                if not download_url:
+                    return None  # the page itself is the payload
+                self._download_urls[video_id] = download_url
+
+            response = await self._fetch_with_backoff(
+                download_url, client, headers=conditional_headers(video_meta), method="HEAD"
+            )
+            return unchanged_validators(response.status_code, response.headers, video_meta)
+        except httpx.HTTPError as e:
+            logger.warning(f"Revalidation of {video_id} failed, downloading again: {e}")
+            return None
 
-            logger.info(f"Downloaded and cached video {video_id} to {cache_file}")
+    async def download_video_range(self, video_id: str, offset: int, length: int) -> Dict[str, Any]:
+        """
+        Download and cache only a byte range of a DVIDS video.
 
-            return {
-                'video_id': video_id,
-                'file_path': str(cache_file),
-                'cached': False
-            }
+        Missing parts of the range are fetched with HTTP Range requests and
+        stored in a sparse file; bytes sit at their original offsets, so the
+        range can be read from file_path even if the video is partial.
 
-        except Exception as e:
-            logger.error(f"Failed to download video {video_id}: {e}")
+        Args:
+            video_id: DVIDS video identifier
+            offset: First byte offset
+            length: Number of bytes
+
+        Returns:
+            Dictionary with video_id, file_path, offset, length, partial and cached
+        """
+        if offset < 0 or length <= 0:
+            raise ValueError("offset must be >= 0 and length must be > 0")
+
+        video_url = f"{DVIDS_VIDEO_URL}{video_id}"
+        if not await check_robots_txt(video_url, self.http.client, self.robots):
+            logger.warning(f"Robots.txt disallows scraping: {video_url}")
+            raise PermissionError(f"Robots.txt disallows scraping: {video_url}")
+
+        video_meta, cached = await self.cache.aensure_range(video_id, offset, length, self._fetch_range)
+        return {
+            'video_id': video_id,
+            'file_path': video_meta['file_path'],
+            'offset': offset,
+            'length': length,
+            'partial': bool(video_meta.get('partial')),
+            'cached': cached
+        }
+
+    async def read_video_range(self, video_id: str, offset: int, length: int) -> bytes:
+        """
+        Read a byte range of a DVIDS video, downloading only what is missing.
+
+        Args:
+            video_id: DVIDS video identifier
+            offset: First byte offset
+            length: Number of bytes
+
+        Returns:
+            The requested bytes (fewer at the end of the video)
+        """
+        await self.download_video_range(video_id, offset, length)
+        return await self.cache.aread_range(video_id, offset, length, self._fetch_range)
+
+    async def _fetch_range(self, video_id: str, start: int, end: int) -> Tuple[bytes, Optional[int]]:
+        """
+        Fetch bytes [start, end) of a DVIDS video with an HTTP Range request.
+
+        Args:
+            video_id: DVIDS video identifier
+            start: First byte offset
+            end: Offset after the last byte
+
+        Returns:
+            (data, total_size) where total_size is the video length if known
+
+        Raises:
+            IOError: If a partial response does not hold exactly the requested range
+        """
+        client = self.http.client
+        download_url = self._download_urls.get(video_id)
+        if download_url is None:
+            download_url, content = await self._resolve_download(video_id, client)
+            if not download_url:
+                return content[start:end], len(content)
+            self._download_urls[video_id] = download_url
+
+        try:
+            response = await self._fetch_with_backoff(
+                download_url, client, stream=True, headers={"Range": range_header(start, end)}
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response is not None and e.response.status_code == 416:
+                # Range starts past the end of the video
+                return b'', parse_content_range(e.response.headers.get("Content-Range"))
             raise
 
+        try:
+            if response.status_code == 206:
+                data = b''.join([chunk async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE)])
+                content_range = response.headers.get("Content-Range")
+                if not range_matches(content_range, start, end, len(data)):
+                    raise IOError(
+                        f"Range request for bytes {start}-{end - 1} of {video_id} returned "
+                        f"{len(data)} bytes with Content-Range {content_range!r}"
+                    )
+                return data, parse_content_range(content_range)
+
+            # Server ignored the Range header and sent the whole file
+            data = await read_window(response.aiter_bytes(STREAM_CHUNK_SIZE), start, end)
+            content_length = response.headers.get("Content-Length")
+            if content_length:
+                return data, int(content_length)
+            return data, start + len(data) if len(data) < end - start else None
+        finally:
+            await response.aclose()
+
+    async def prefetch(
+        self,
+        items: List[Any],
+        per_query: int = 1,
+        max_requests: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Warm the cache in the background from a scene list.
+
+        Videos are downloaded highest priority first, one request at a time
+        within the DVIDS rate limit; already cached videos are skipped.
+
+        Args:
+            items: Query strings, or dictionaries with video_id or query and
+                optional priority (higher first) and max_duration
+            per_query: Search results downloaded per query (default: 1)
+            max_requests: Cap on rate-limited requests: one per search, two per
+                download (default: unlimited)
+
+        Returns:
+            Progress snapshot of the started job (includes job_id)
+        """
+        job = self.prefetcher.start(items, per_query=per_query, max_requests=max_requests)
+        return job.snapshot()
+
+    def prefetch_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Get the progress of a prefetch job.
+
+        Args:
+            job_id: Job identifier returned by prefetch()
+
+        Returns:
+            Progress snapshot
+        """
+        return self.prefetcher.get(job_id).snapshot()
+
+    def cancel_prefetch(self, job_id: str) -> Dict[str, Any]:
+        """
+        Cancel a prefetch job; interrupted downloads stay resumable.
+
+        Args:
+            job_id: Job identifier returned by prefetch()
+
+        Returns:
+            Progress snapshot with cancelled True if the job was running
+        """
+        job = self.prefetcher.get(job_id)
+        return {**job.snapshot(), "cancelled": job.cancel()}
+
+    def rate_limit_status(self) -> Dict[str, Any]:
+        """
+        Get the current request rate of the provider's adaptive rate limiter.
+
+        Returns:
+            Limiter statistics (see RateLimiter.stats)
+        """
+        return self.limiter.stats()
+
+    async def aclose(self) -> None:
+        """
+        Release the server's resources on shutdown.
+
+        Cancels prefetch jobs, closes the response caches, flushes and
+        closes the video cache metadata and closes the pooled HTTP
+        connections.
+        """
+        self.prefetcher.cancel_all()
+        self.responses.close()
+        self.negative.close()
+        await asyncio.to_thread(self.cache.close)
+        await self.http.aclose()
+
     async def get_video_details(self, video_id: str) -> Dict[str, Any]:
         """
         Retrieve video metadata from DVIDS.
@@ -391,62 +676,67 @@ class DVIDSScrapingMCPServer:
         Returns:
             Video metadata dictionary
         """
+        key = response_key("details", "dvids", video_id=video_id)
+        return await self.responses.aget(key, lambda: self._get_video_details(video_id))
+
+    async def _get_video_details(self, video_id: str) -> Dict[str, Any]:
+        """Scrape DVIDS video metadata (get_video_details() response cache miss path)."""
         video_url = f"{DVIDS_VIDEO_URL}{video_id}"
 
         # MEDIUM PRIORITY M3: Check robots.txt compliance
-        if not await check_robots_txt(video_url):
+        if not await check_robots_txt(video_url, self.http.client, self.robots):
             logger.warning(f"Robots.txt disallows scraping: {video_url}")
             raise PermissionError(f"Robots.txt disallows scraping: {video_url}")
 
         logger.info(f"Getting details for video {video_id} from DVIDS")
 
-        async with httpx.AsyncClient() as client:
-            video_url = f"{DVIDS_VIDEO_URL}{video_id}"
+        client = self.http.client
+        video_url = f"{DVIDS_VIDEO_URL}{video_id}"
 
-            # Fetch with backoff
-            response = await self._fetch_with_backoff(video_url, client)
+        # Fetch with backoff
+        response = await self._fetch_video_page(video_id, video_url, client)
 
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+        # Parse HTML
+        soup = BeautifulSoup(response.text, 'html.parser')
 
-            # Extract metadata
-            title_elem = soup.find(['h1', 'h2'], class_=['title', 'video-title'])
-            title = title_elem.get_text(strip=True) if title_elem else f"Video {video_id}"
+        # Extract metadata
+        title_elem = soup.find(['h1', 'h2'], class_=['title', 'video-title'])
+        title = title_elem.get_text(strip=True) if title_elem else f"Video {video_id}"
 
-            desc_elem = soup.find('p', class_='description')
-            description = desc_elem.get_text(strip=True) if desc_elem else ""
+        desc_elem = soup.find('p', class_='description')
+        description = desc_elem.get_text(strip=True) if desc_elem else ""
 
-            duration_elem = soup.find('span', class_='duration')
-            duration_text = duration_elem.get_text(strip=True) if duration_elem else "0"
-            duration = self._parse_duration(duration_text)
+        duration_elem = soup.find('span', class_='duration')
+        duration_text = duration_elem.get_text(strip=True) if duration_elem else "0"
+        duration = self._parse_duration(duration_text)
 
-            format_elem = soup.find('span', class_='format')
-            video_format = format_elem.get_text(strip=True) if format_elem else "MP4"
+        format_elem = soup.find('span', class_='format')
+        video_format = format_elem.get_text(strip=True) if format_elem else "MP4"
 
-            resolution_elem = soup.find('span', class_='resolution')
-            resolution = resolution_elem.get_text(strip=True) if resolution_elem else "1920x1080"
+        resolution_elem = soup.find('span', class_='resolution')
+        resolution = resolution_elem.get_text(strip=True) if resolution_elem else "1920x1080"
 
-            download_link = soup.find('a', {'href': re.compile(r'(\.mp4$|download)' )})
-            download_url = download_link['href'] if download_link else f"{DVIDS_VIDEO_URL}{video_id}"
-            if not download_url.startswith('http'):
-                download_url = f"{DVIDS_BASE_URL}{download_url}"
+        download_link = soup.find('a', {'href': re.compile(r'(\.mp4$|download)' )})
+        download_url = download_link['href'] if download_link else f"{DVIDS_VIDEO_URL}{video_id}"
+        if not download_url.startswith('http'):
+            download_url = f"{DVIDS_BASE_URL}{download_url}"
 
-            public_domain_badge = soup.find('span', class_='public-domain-badge')
-            public_domain = public_domain_badge is not None
+        public_domain_badge = soup.find('span', class_='public-domain-badge')
+        public_domain = public_domain_badge is not None
 
-            details = {
-                'videoId': video_id,
-                'title': title,
-                'description': description,
-                'duration': duration,
-                'format': video_format,
-                'resolution': resolution,
-                'download_url': download_url,
-                'public_domain': public_domain
-            }
+        details = {
+            'videoId': video_id,
+            'title': title,
+            'description': description,
+            'duration': duration,
+            'format': video_format,
+            'resolution': resolution,
+            'download_url': download_url,
+            'public_domain': public_domain
+        }
 
-            logger.info(f"Retrieved details for video {video_id}: {title}")
-            return details
+        logger.info(f"Retrieved details for video {video_id}: {title}")
+        return details
 
     def _parse_duration(self, duration_text: str) -> int:
         """
@@ -483,6 +773,49 @@ class DVIDSScrapingMCPServer:
         return total_seconds
 
 
+# Default cache directory when none is given on the command line
+DEFAULT_CACHE_DIR = "./assets/cache"
+
+# Long-lived server shared by every tool call (see get_server())
+_server_instance: Optional[DVIDSScrapingMCPServer] = None
+
+
+def get_server(cache_dir: Optional[str] = None) -> DVIDSScrapingMCPServer:
+    """
+    Get the process-wide DVIDS server, creating it on first use.
+
+    Every tool call shares its VideoCache, HTTP connection pool, rate
+    limiter state and response caches instead of rebuilding them.
+
+    Args:
+        cache_dir: Cache directory used when the server is created
+            (default: first command-line argument or ./assets/cache)
+
+    Returns:
+        The shared server instance
+    """
+    global _server_instance
+    if _server_instance is None:
+        if cache_dir is None:
+            import sys
+            cache_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CACHE_DIR
+        _server_instance = DVIDSScrapingMCPServer(cache_dir=cache_dir)
+    return _server_instance
+
+
+# Names of the tools registered by list_tools()
+TOOL_NAMES = (
+    "search_videos",
+    "download_video",
+    "download_video_range",
+    "get_video_details",
+    "prefetch_videos",
+    "prefetch_status",
+    "cancel_prefetch",
+    "rate_limit_status",
+)
+
+
 # HIGH PRIORITY H1 & H3: MCP stdio server implementation with tool registration
 
 
@@ -530,6 +863,31 @@ async def list_tools() -> List[Tool]:
                 "required": ["video_id"]
             }
         ),
+        Tool(
+            name="download_video_range",
+            description=(
+                "Download only a byte range of a DVIDS video into the cache "
+                "(bytes are stored at their original offsets in file_path)"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "video_id": {
+                        "type": "string",
+                        "description": "DVIDS video identifier"
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "First byte offset"
+                    },
+                    "length": {
+                        "type": "integer",
+                        "description": "Number of bytes"
+                    }
+                },
+                "required": ["video_id", "offset", "length"]
+            }
+        ),
         Tool(
             name="get_video_details",
             description="Get detailed metadata for a DVIDS video",
@@ -543,6 +901,76 @@ async def list_tools() -> List[Tool]:
                 },
                 "required": ["video_id"]
             }
+        ),
+        Tool(
+            name="prefetch_videos",
+            description=(
+                "Download videos into the cache in the background, highest priority first "
+                "(returns a job_id for prefetch_status/cancel_prefetch)"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "description": "Videos or searches to prefetch",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "video_id": {"type": "string", "description": "DVIDS video identifier"},
+                                "query": {"type": "string", "description": "Search query"},
+                                "priority": {"type": "number", "description": "Higher is fetched first"},
+                                "max_duration": {"type": "number", "description": "Search duration filter"}
+                            }
+                        }
+                    },
+                    "per_query": {
+                        "type": "integer",
+                        "description": "Search results downloaded per query (default: 1)"
+                    },
+                    "max_requests": {
+                        "type": "integer",
+                        "description": "Maximum rate-limited requests: one per search, two per download (optional)"
+                    }
+                },
+                "required": ["items"]
+            }
+        ),
+        Tool(
+            name="prefetch_status",
+            description="Get the progress of a prefetch job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job identifier returned by prefetch_videos"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="cancel_prefetch",
+            description="Cancel a prefetch job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job identifier returned by prefetch_videos"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="rate_limit_status",
+            description="Get the current request rate of the adaptive rate limiter",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
         )
     ]
 
@@ -562,9 +990,9 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     Returns:
         Tool result as text content
     """
-    import sys
-    cache_dir = sys.argv[1] if len(sys.argv) > 1 else "./assets/cache"
-    dvids_server = DVIDSScrapingMCPServer(cache_dir=cache_dir)
+    if name not in TOOL_NAMES:
+        raise ValueError(f"Unknown tool: {name}")
+    dvids_server = get_server()
 
     if name == "search_videos":
         results = await dvids_server.search_videos(
@@ -579,12 +1007,40 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         )
         return [TextContent(type="text", text=str(result))]
 
+    elif name == "download_video_range":
+        result = await dvids_server.download_video_range(
+            video_id=arguments.get("video_id"),
+            offset=int(arguments.get("offset", 0)),
+            length=int(arguments.get("length", 0))
+        )
+        return [TextContent(type="text", text=str(result))]
+
     elif name == "get_video_details":
         details = await dvids_server.get_video_details(
             video_id=arguments.get("video_id")
         )
         return [TextContent(type="text", text=str(details))]
 
+    elif name == "prefetch_videos":
+        max_requests = arguments.get("max_requests")
+        result = await dvids_server.prefetch(
+            items=arguments.get("items") or [],
+            per_query=int(arguments.get("per_query", 1)),
+            max_requests=int(max_requests) if max_requests is not None else None
+        )
+        return [TextContent(type="text", text=str(result))]
+
+    elif name == "prefetch_status":
+        result = dvids_server.prefetch_status(job_id=arguments.get("job_id"))
+        return [TextContent(type="text", text=str(result))]
+
+    elif name == "cancel_prefetch":
+        result = dvids_server.cancel_prefetch(job_id=arguments.get("job_id"))
+        return [TextContent(type="text", text=str(result))]
+
+    elif name == "rate_limit_status":
+        return [TextContent(type="text", text=str(dvids_server.rate_limit_status()))]
+
     else:
         raise ValueError(f"Unknown tool: {name}")
 
@@ -608,21 +1064,28 @@ def main():
     logger.info("Starting DVIDS Scraping MCP Server")
 
     # Default cache directory
-    cache_dir = sys.argv[1] if len(sys.argv) > 1 else "./assets/cache"
+    cache_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CACHE_DIR
 
-    # Create server instance
-    dvids_server_instance = DVIDSScrapingMCPServer(cache_dir=cache_dir)
+    # Create the server instance shared by every tool call
+    dvids_server_instance = get_server(cache_dir)
 
     logger.info(f"DVIDS Scraping MCP Server ready (cache_dir={cache_dir})")
 
     # HIGH PRIORITY H1: Run MCP stdio server
     async def run_server():
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                server.create_initialization_options()
-            )
+        # Sweep expired entries and orphan files in the background
+        janitor_task = start_janitor(dvids_server_instance.cache)
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    server.create_initialization_options()
+                )
+        finally:
+            if janitor_task is not None:
+                janitor_task.cancel()
+            await dvids_server_instance.aclose()
 
     asyncio.run(run_server())
 
@@ -0,0 +1,347 @@
+"""
+Size-Bounded Eviction for the Shared VideoCache
+
+This module provides byte/entry budgets and pluggable eviction policies for
+VideoCache. Eviction runs incrementally on insert: after a new video is
+recorded, the lowest-priority entries are removed until every budget is met.
+
+Policies:
+    LRUPolicy: Evict the least recently accessed entry
+    LFUPolicy: Evict the least frequently accessed entry (ties by recency)
+    GDSFPolicy: Greedy-Dual-Size-Frequency, favours small, popular entries
+
+All policies only ever raise an entry's priority when it is accessed, so the
+EvictionIndex can use heaps with lazy invalidation: stale heap items are
+skipped when popped, keeping inserts, accesses and evictions at O(log N).
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from typing import AbstractSet, Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Key of an entry in the eviction index: (provider, video_id)
+EntryKey = Tuple[str, str]
+
+
+class CacheBudget:
+    """
+    Byte and entry limits for a cache scope (one provider or the whole cache).
+
+    Attributes:
+        max_bytes: Maximum total size in bytes (None = unlimited)
+        max_entries: Maximum number of entries (None = unlimited)
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None):
+        """
+        Initialize cache budget.
+
+        Args:
+            max_bytes: Maximum total size in bytes (None = unlimited)
+            max_entries: Maximum number of entries (None = unlimited)
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def is_exceeded(self, total_bytes: int, total_entries: int) -> bool:
+        """
+        Check whether usage exceeds this budget.
+
+        Args:
+            total_bytes: Current total size in bytes
+            total_entries: Current number of entries
+
+        Returns:
+            True if either limit is exceeded
+        """
+        if self.max_bytes is not None and total_bytes > self.max_bytes:
+            return True
+        if self.max_entries is not None and total_entries > self.max_entries:
+            return True
+        return False
+
+    def __repr__(self) -> str:
+        return f"CacheBudget(max_bytes={self.max_bytes}, max_entries={self.max_entries})"
+
+
+class EvictionPolicy:
+    """
+    Base eviction policy. Entries with the lowest priority are evicted first.
+
+    Priorities must never decrease for an entry as it is accessed.
+    """
+
+    name = "base"
+
+    def priority(self, entry: Dict[str, Any]) -> Any:
+        """
+        Compute eviction priority for an entry.
+
+        Args:
+            entry: Metadata entry with size, last_access and hits fields
+
+        Returns:
+            Comparable priority value (lower = evicted sooner)
+        """
+        raise NotImplementedError
+
+    def on_evict(self, priority: Any) -> None:
+        """
+        Notify the policy that an entry with the given priority was evicted.
+
+        Args:
+            priority: Priority of the evicted entry
+        """
+
+
+class LRUPolicy(EvictionPolicy):
+    """Least-recently-used: priority is the last access time."""
+
+    name = "lru"
+
+    def priority(self, entry: Dict[str, Any]) -> float:
+        return float(entry.get("last_access", 0.0))
+
+
+class LFUPolicy(EvictionPolicy):
+    """Least-frequently-used: priority is (hit count, last access time)."""
+
+    name = "lfu"
+
+    def priority(self, entry: Dict[str, Any]) -> Tuple[int, float]:
+        return (int(entry.get("hits", 0)), float(entry.get("last_access", 0.0)))
+
+
+class GDSFPolicy(EvictionPolicy):
+    """
+    Greedy-Dual-Size-Frequency: priority = L + hits * cost / size.
+
+    L is an inflation value set to the priority of the last evicted entry, so
+    entries that have not been accessed for a while age out relative to
+    newly accessed ones. Cost is 1 per entry (minimize miss count).
+    """
+
+    name = "gdsf"
+
+    def __init__(self):
+        self.inflation = 0.0
+
+    def priority(self, entry: Dict[str, Any]) -> float:
+        size = max(int(entry.get("size", 0)), 1)
+        hits = max(int(entry.get("hits", 0)), 1)
+        return self.inflation + hits / size
+
+    def on_evict(self, priority: float) -> None:
+        self.inflation = max(self.inflation, priority)
+
+
+EVICTION_POLICIES = {
+    LRUPolicy.name: LRUPolicy,
+    LFUPolicy.name: LFUPolicy,
+    GDSFPolicy.name: GDSFPolicy,
+}
+
+
+def create_eviction_policy(policy: Union[str, EvictionPolicy]) -> EvictionPolicy:
+    """
+    Create an eviction policy from a name or return the given instance.
+
+    Args:
+        policy: Policy name ("lru", "lfu", "gdsf") or EvictionPolicy instance
+
+    Returns:
+        EvictionPolicy instance
+
+    Raises:
+        ValueError: If policy name is unknown
+    """
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    try:
+        return EVICTION_POLICIES[policy.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown eviction policy: {policy}")
+
+
+class EvictionIndex:
+    """
+    In-memory index of cache entries ordered by eviction priority.
+
+    Keeps global and per-provider totals plus one heap per scope. Heap items
+    are (priority, sequence, key); items whose priority no longer matches the
+    entry's current priority are discarded when they reach the top.
+
+    Entries with a content_hash share deduplicated storage: their size counts
+    once towards total_bytes while any entry references the hash, so evicting
+    one of several references frees nothing and eviction continues.
+    Provider totals count every entry in full.
+
+    Attributes:
+        policy: Eviction policy computing entry priorities
+        total_bytes: Total size of stored content (shared content counted once)
+    """
+
+    def __init__(self, policy: EvictionPolicy):
+        """
+        Initialize empty eviction index.
+
+        Args:
+            policy: Eviction policy computing entry priorities
+        """
+        self.policy = policy
+        self.total_bytes = 0
+        self._entries: Dict[EntryKey, Tuple[int, Any, Optional[str]]] = {}
+        self._blob_refs: Dict[str, int] = {}
+        self._provider_bytes: Dict[str, int] = {}
+        self._provider_entries: Dict[str, int] = {}
+        self._global_heap: List[Tuple[Any, int, EntryKey]] = []
+        self._provider_heaps: Dict[str, List[Tuple[Any, int, EntryKey]]] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: EntryKey) -> bool:
+        return key in self._entries
+
+    def provider_usage(self, provider: str) -> Tuple[int, int]:
+        """
+        Get usage for one provider.
+
+        Args:
+            provider: Video provider name
+
+        Returns:
+            (total_bytes, entry_count) for the provider
+        """
+        return self._provider_bytes.get(provider, 0), self._provider_entries.get(provider, 0)
+
+    def update(self, key: EntryKey, entry: Dict[str, Any]) -> None:
+        """
+        Insert an entry or refresh its size and priority after an access.
+
+        Args:
+            key: (provider, video_id)
+            entry: Metadata entry with size, last_access and hits fields
+        """
+        provider = key[0]
+        size = int(entry.get("size", 0))
+        priority = self.policy.priority(entry)
+        digest = entry.get("content_hash")
+
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._account(provider, -previous[0], -1, previous[2])
+        self._entries[key] = (size, priority, digest)
+        self._account(provider, size, 1, digest)
+
+        item = (priority, next(self._seq), key)
+        heapq.heappush(self._global_heap, item)
+        heapq.heappush(self._provider_heaps.setdefault(provider, []), item)
+        self._maybe_compact()
+
+    def remove(self, key: EntryKey) -> None:
+        """
+        Remove an entry from the index (its heap items become stale).
+
+        Args:
+            key: (provider, video_id)
+        """
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._account(key[0], -previous[0], -1, previous[2])
+
+    def peek_victim(self, provider: Optional[str] = None,
+                    protect: Optional[EntryKey] = None,
+                    skip: AbstractSet[EntryKey] = frozenset()) -> Optional[EntryKey]:
+        """
+        Find the entry that should be evicted next.
+
+        Args:
+            provider: Restrict to this provider's entries (None = all providers)
+            protect: Key that must not be chosen (e.g. the entry just inserted)
+            skip: Further keys that must not be chosen (e.g. busy entries)
+
+        Returns:
+            Key of the lowest-priority entry, or None if there is no candidate
+        """
+        heap = self._global_heap if provider is None else self._provider_heaps.get(provider, [])
+        protected_items = []
+        victim = None
+
+        while heap:
+            priority, _, key = heap[0]
+            current = self._entries.get(key)
+            if current is None or current[1] != priority:
+                heapq.heappop(heap)  # stale item
+                continue
+            if key == protect or key in skip:
+                protected_items.append(heapq.heappop(heap))
+                continue
+            victim = key
+            break
+
+        for item in protected_items:
+            heapq.heappush(heap, item)
+        return victim
+
+    def priority_of(self, key: EntryKey) -> Any:
+        """Get the current priority of an indexed entry."""
+        return self._entries[key][1]
+
+    def blob_refs(self, digest: str) -> int:
+        """Get the number of indexed entries sharing a content hash."""
+        return self._blob_refs.get(digest, 0)
+
+    def _account(self, provider: str, size_delta: int, count_delta: int,
+                 digest: Optional[str] = None) -> None:
+        """Apply size/count deltas to the global and provider totals."""
+        self._provider_bytes[provider] = self._provider_bytes.get(provider, 0) + size_delta
+        self._provider_entries[provider] = self._provider_entries.get(provider, 0) + count_delta
+        if digest is None:
+            self.total_bytes += size_delta
+            return
+
+        refs = self._blob_refs.get(digest, 0) + count_delta
+        if refs > 0:
+            self._blob_refs[digest] = refs
+        else:
+            self._blob_refs.pop(digest, None)
+        # Shared content is added with its first reference, freed with its last
+        if (count_delta > 0 and refs == 1) or (count_delta < 0 and refs == 0):
+            self.total_bytes += size_delta
+
+    def _maybe_compact(self) -> None:
+        """Rebuild heaps when stale items dominate, bounding memory use."""
+        if len(self._global_heap) <= 2 * len(self._entries) + 64:
+            return
+        self._global_heap = []
+        self._provider_heaps = {}
+        for key, (_, priority, _) in self._entries.items():
+            item = (priority, next(self._seq), key)
+            self._global_heap.append(item)
+            self._provider_heaps.setdefault(key[0], []).append(item)
+        heapq.heapify(self._global_heap)
+        for heap in self._provider_heaps.values():
+            heapq.heapify(heap)
+
+
+def access_fields(entry: Dict[str, Any], now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Compute updated access-tracking fields for a cache hit.
+
+    Args:
+        entry: Current metadata entry
+        now: Access timestamp (default: current time)
+
+    Returns:
+        Dictionary with new last_access and hits values
+    """
+    return {
+        "last_access": time.time() if now is None else now,
+        "hits": int(entry.get("hits", 0)) + 1,
+    }
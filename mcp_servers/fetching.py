@@ -0,0 +1,197 @@
+"""
+Shared Fetch Loop and Streaming Download for the Scraping Servers
+
+The DVIDS and NASA servers fetch pages and video files the same way; only
+their URLs, rate limiters and retry settings differ. This module holds
+that shared plumbing:
+
+    fetch_with_backoff: One request per rate limit token, retried with
+        full-jitter exponential backoff (at least Retry-After) on HTTP
+        429/503, feeding the adaptive rate limiter
+    stream_to_cache: Stream a video file into a VideoCache in chunks,
+        resuming an interrupted download with Range and If-Range
+
+Each server keeps thin _fetch_with_backoff/_stream_to_cache methods that
+pass in its client, limiter and provider-specific URLs.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from .byte_ranges import expected_length, response_validators, resume_headers, resume_offset
+from .cache import STREAM_CHUNK_SIZE
+from .rate_limiter import RateLimiter, full_jitter_backoff, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_BACKOFF_SECONDS = 2
+DEFAULT_MAX_BACKOFF_SECONDS = 60
+DEFAULT_MAX_RETRIES = 5
+
+
+async def fetch_with_backoff(
+    url: str,
+    client: httpx.AsyncClient,
+    limiter: RateLimiter,
+    acquire: Callable[[], Awaitable[None]],
+    stream: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+    method: str = "GET",
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base_backoff: float = DEFAULT_BASE_BACKOFF_SECONDS,
+    max_backoff: float = DEFAULT_MAX_BACKOFF_SECONDS
+) -> httpx.Response:
+    """
+    Fetch URL with exponential backoff on HTTP 429/503 responses.
+
+    Each attempt first awaits acquire() for a rate limit token. On 429/503
+    the delay is a random value up to base_backoff × 2^attempt (capped at
+    max_backoff), or the response's Retry-After if longer. A Retry-After
+    beyond max_backoff is not waited for: the error is raised. Responses
+    feed the limiter: fast successes speed it up, 429/503 halve its rate.
+
+    Args:
+        url: URL to fetch
+        client: httpx async client
+        limiter: Adaptive rate limiter of the origin
+        acquire: Coroutine function waiting for a rate limit token
+        stream: Return before reading the body; caller must aclose() the response
+        headers: Extra request headers (e.g. Range)
+        method: HTTP method (e.g. "HEAD" for revalidation)
+        max_retries: Maximum attempts (default: 5)
+        base_backoff: Backoff of the first retry in seconds (default: 2)
+        max_backoff: Maximum backoff in seconds (default: 60)
+
+    Returns:
+        HTTP response
+
+    Raises:
+        httpx.HTTPStatusError: If max retries exceeded
+    """
+    give_up = False
+    for attempt in range(max_retries):
+        try:
+            # Respect rate limit before request
+            await acquire()
+
+            logger.debug(f"Fetching {url} (attempt {attempt + 1}/{max_retries})")
+            started = time.monotonic()
+            if stream:
+                response = await client.send(
+                    client.build_request(method, url, headers=headers), stream=True
+                )
+            elif method != "GET":
+                response = await client.request(method, url, headers=headers)
+            else:
+                response = await client.get(url, headers=headers)
+
+            # Check for rate limiting or service unavailable
+            if response.status_code in (429, 503):
+                if stream:
+                    await response.aclose()
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                await limiter.on_throttle(retry_after)
+                if retry_after is not None and retry_after > max_backoff:
+                    logger.error(f"{url} asked to retry after {retry_after:.0f}s, giving up")
+                    give_up = True
+                elif attempt < max_retries - 1:
+                    # Full-jitter exponential backoff, at least Retry-After
+                    backoff = max(
+                        retry_after or 0.0,
+                        full_jitter_backoff(attempt, base_backoff, max_backoff)
+                    )
+                    logger.warning(
+                        f"HTTP {response.status_code} on attempt {attempt + 1}, "
+                        f"backing off {backoff:.1f}s"
+                    )
+                    await asyncio.sleep(backoff)
+                    continue
+                else:
+                    logger.error(f"Max retries exceeded for {url}")
+
+            # Raise for other errors
+            if stream and response.status_code >= 400:
+                await response.aclose()
+            # 304 answers a conditional (revalidation) request, not an error
+            if response.status_code != 304:
+                response.raise_for_status()
+            if response.status_code not in (429, 503):
+                limiter.on_success(time.monotonic() - started)
+            return response
+
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in (429, 503) and attempt < max_retries - 1 and not give_up:
+                continue
+            raise
+
+    raise httpx.HTTPStatusError(
+        f"Max retries ({max_retries}) exceeded",
+        request=None,
+        response=None
+    )
+
+
+async def stream_to_cache(
+    cache,
+    video_id: str,
+    url: str,
+    fetch: Callable[..., Awaitable[httpx.Response]]
+) -> Dict[str, Any]:
+    """
+    Stream a video file from url straight into the cache.
+
+    The body is written in STREAM_CHUNK_SIZE chunks, so memory use does
+    not grow with the size of the video. An interrupted download is kept
+    as a .part file and resumed by the next call with a Range request;
+    If-Range and the recorded ETag/Last-Modified make sure the remote
+    file has not changed in between, otherwise it starts over.
+
+    Args:
+        cache: VideoCache to store the video in
+        video_id: Video identifier
+        url: Video file URL
+        fetch: Coroutine function fetch(url, stream=True, headers=None)
+            returning a streamed response (the server's fetch loop)
+
+    Returns:
+        Cache metadata entry of the stored video
+    """
+    checkpoint = await asyncio.to_thread(cache.resume_point, video_id)
+    response = None
+    try:
+        response = await fetch(url, stream=True, headers=resume_headers(checkpoint))
+    except httpx.HTTPStatusError as e:
+        # 416: the checkpoint is past the end of the (changed) remote file
+        if checkpoint is None or e.response is None or e.response.status_code != 416:
+            raise
+
+    offset = None
+    if response is not None:
+        offset = resume_offset(response.status_code, response.headers, checkpoint)
+    if offset is None:
+        logger.info(f"Remote file of {video_id} changed, restarting download")
+        if response is not None:
+            await response.aclose()
+        response = await fetch(url, stream=True)
+        offset = 0
+    elif offset:
+        logger.info(f"Resuming download of {video_id} at byte {offset}")
+
+    try:
+        validators = response_validators(response.headers)
+        if offset and not validators:
+            # 206 responses need not repeat the validators; keep the checkpoint's
+            validators = {k: checkpoint[k] for k in ("etag", "last_modified") if checkpoint.get(k)}
+        return await cache.put_stream_resumable(
+            video_id,
+            response.aiter_bytes(STREAM_CHUNK_SIZE),
+            offset=offset,
+            validators=validators,
+            total_size=expected_length(response.status_code, response.headers)
+        )
+    finally:
+        await response.aclose()
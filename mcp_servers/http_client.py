@@ -0,0 +1,156 @@
+"""
+Shared HTTP Client for the Scraping Servers
+
+Opening an httpx.AsyncClient per tool call (and another one per robots.txt
+check) paid a TCP and TLS handshake on every request. Each scraping server
+now owns one SharedHttpClient: a long-lived httpx.AsyncClient with a
+bounded connection pool, keep-alive, HTTP/2 where the host negotiates it
+and explicit timeouts. It is closed when the MCP server exits.
+
+HTTP/2 needs the optional h2 package (pip install "httpx[http2]"); without
+it the client silently uses HTTP/1.1 with keep-alive.
+
+Settings are read from environment variables (see
+http_client_options_from_env):
+
+    VIDEO_HTTP_CONNECT_TIMEOUT: Seconds to establish a connection (default: 10)
+    VIDEO_HTTP_READ_TIMEOUT: Seconds to wait for each chunk of a response (default: 60)
+    VIDEO_HTTP_MAX_CONNECTIONS: Open connections in the pool (default: 10)
+    VIDEO_HTTP_MAX_KEEPALIVE: Idle connections kept alive (default: 5)
+    VIDEO_HTTP2: "0" disables HTTP/2 (default: enabled when h2 is installed)
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+# Video bodies are streamed, so the read timeout bounds each chunk, not the download
+DEFAULT_READ_TIMEOUT_SECONDS = 60.0
+DEFAULT_WRITE_TIMEOUT_SECONDS = 30.0
+# Time to wait for a free connection when the pool is exhausted
+DEFAULT_POOL_TIMEOUT_SECONDS = 30.0
+
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 5
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+
+def http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read an optional float environment variable."""
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def http_client_options_from_env() -> Dict[str, Any]:
+    """
+    Build SharedHttpClient keyword arguments from environment variables.
+
+    Returns:
+        Dictionary of SharedHttpClient keyword arguments
+    """
+    return {
+        "connect_timeout": _env_float("VIDEO_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT_SECONDS),
+        "read_timeout": _env_float("VIDEO_HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT_SECONDS),
+        "max_connections": int(_env_float("VIDEO_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+        "max_keepalive_connections": int(
+            _env_float("VIDEO_HTTP_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+        ),
+        "http2": os.environ.get("VIDEO_HTTP2", "1") != "0",
+    }
+
+
+class SharedHttpClient:
+    """
+    Long-lived pooled httpx.AsyncClient shared by a server's requests.
+
+    The client is created on first use. Connections belong to the event
+    loop that opened them, so a client used from a different loop (e.g. a
+    server reused across asyncio.run() calls) is replaced by a fresh one.
+
+    Attributes:
+        timeout: Connect/read/write/pool timeouts of every request
+        limits: Connection pool size and keep-alive settings
+        http2: Whether HTTP/2 is negotiated with hosts that support it
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = DEFAULT_READ_TIMEOUT_SECONDS,
+        write_timeout: float = DEFAULT_WRITE_TIMEOUT_SECONDS,
+        pool_timeout: float = DEFAULT_POOL_TIMEOUT_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        http2: bool = True
+    ):
+        """
+        Initialize shared client settings (the client itself is created lazily).
+
+        Args:
+            connect_timeout: Seconds to establish a connection (default: 10)
+            read_timeout: Seconds to wait for response data (default: 60)
+            write_timeout: Seconds to send request data (default: 30)
+            pool_timeout: Seconds to wait for a free pooled connection (default: 30)
+            max_connections: Maximum open connections (default: 10)
+            max_keepalive_connections: Maximum idle connections kept open (default: 5)
+            keepalive_expiry: Seconds an idle connection is kept (default: 60)
+            http2: Negotiate HTTP/2 when h2 is installed (default: True)
+        """
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout, read=read_timeout, write=write_timeout, pool=pool_timeout
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and http2_available()
+        if http2 and not self.http2:
+            logger.info("h2 is not installed, using HTTP/1.1 with keep-alive")
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client, created (or replaced after aclose()) on demand."""
+        loop = self._running_loop()
+        if self._client is None or self._client.is_closed or loop is not self._loop:
+            if self._client is not None and not self._client.is_closed:
+                logger.debug("Event loop changed, replacing pooled HTTP client")
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+            self._loop = loop
+        return self._client
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        """Get the running event loop, or None outside a coroutine."""
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    @property
+    def closed(self) -> bool:
+        """Whether no client is currently open."""
+        return self._client is None or self._client.is_closed
+
+    async def aclose(self) -> None:
+        """Close pooled connections; a later request opens a new client."""
+        # Connections of a finished event loop cannot be closed from another one
+        if not self.closed and self._loop is self._running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
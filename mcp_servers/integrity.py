@@ -0,0 +1,178 @@
+"""
+Integrity Checks for Cached Video Files
+
+A cache hit used to mean only "the file exists", so a truncated download
+or an error page saved as a video (e.g. NASA's fallback to the page content
+when streaming fails) was served as a valid clip. Integrity is now checked
+at three points:
+
+    write: every committed file has its SHA-256 content_hash and size
+        recorded; empty files and HTML payloads are rejected before commit
+        (IntegrityError) instead of being cached
+    hit: the file's length must still match the recorded size (one stat)
+    verify: verify_cache() re-hashes every entry across a process pool and
+        moves bad files to cache_dir/quarantine/<provider>/, dropping their
+        entries (python -m mcp_servers.cache_cli verify <cache_dir>)
+"""
+
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Quarantined files live in cache_dir/QUARANTINE_DIRNAME/<provider>/
+QUARANTINE_DIRNAME = "quarantine"
+
+# Leading bytes inspected to recognise error pages
+SNIFF_BYTES = 512
+
+# Lower-cased starts of HTML documents (after leading whitespace/BOM)
+HTML_SIGNATURES = (b"<!doctype html", b"<html", b"<head", b"<body", b"<!--")
+
+HASH_BLOCK_SIZE = 1024 * 1024  # 1 MiB
+
+
+class IntegrityError(IOError):
+    """A payload or cached file failed an integrity check."""
+
+
+def payload_problem(head: bytes, size: int) -> Optional[str]:
+    """
+    Check the start of a payload for results that are not videos.
+
+    Args:
+        head: First bytes of the payload (SNIFF_BYTES suffice)
+        size: Total payload size in bytes
+
+    Returns:
+        Description of the problem, or None if the payload is acceptable
+    """
+    if size == 0:
+        return "empty payload"
+    start = head[:SNIFF_BYTES].lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if start.startswith(HTML_SIGNATURES):
+        return "HTML payload"
+    return None
+
+
+def check_payload(file_path: Path) -> None:
+    """
+    Reject a written file that is empty or an HTML page.
+
+    Args:
+        file_path: File about to be committed to the cache
+
+    Raises:
+        IntegrityError: If the file is not an acceptable payload
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        problem = payload_problem(f.read(SNIFF_BYTES), size)
+    if problem is not None:
+        raise IntegrityError(f"Refusing to cache {file_path.name}: {problem}")
+
+
+def hash_file(file_path: Path) -> Tuple[str, int]:
+    """
+    Compute the SHA-256 digest and length of a file.
+
+    Args:
+        file_path: File to hash
+
+    Returns:
+        (hex digest, size in bytes)
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            hasher.update(block)
+            size += len(block)
+    return hasher.hexdigest(), size
+
+
+def check_entry(entry: Dict[str, Any]) -> Optional[str]:
+    """
+    Verify one cached file against its metadata entry.
+
+    Runs in verify_cache()'s worker processes, so it only reads files.
+
+    Args:
+        entry: Metadata entry (file_path, size, content_hash, cold_path)
+
+    Returns:
+        Description of the problem, or None if the file is intact
+    """
+    paths = [entry.get("file_path", "")]
+    if entry.get("cold_path"):
+        paths.append(entry["cold_path"])
+    for path in map(Path, paths):
+        try:
+            with open(path, "rb") as f:
+                head = f.read(SNIFF_BYTES)
+            digest, size = hash_file(path)
+        except OSError as e:
+            return f"unreadable {path.name}: {e}"
+        if "size" in entry and size != int(entry["size"]):
+            return f"{path.name} is {size} bytes, expected {entry['size']}"
+        if entry.get("content_hash") and digest != entry["content_hash"]:
+            return f"{path.name} content does not match its SHA-256"
+        problem = payload_problem(head, size)
+        if problem is not None:
+            return f"{path.name}: {problem}"
+    return None
+
+
+def _check_item(item: Tuple[str, Dict[str, Any]]) -> Tuple[str, Optional[str]]:
+    """Process pool task: check (video_id, entry)."""
+    video_id, entry = item
+    return video_id, check_entry(entry)
+
+
+def verify_cache(cache, workers: Optional[int] = None, quarantine: bool = True) -> Dict[str, Any]:
+    """
+    Re-hash every complete entry of a provider across a process pool.
+
+    Partial entries (byte ranges, interrupted downloads) are skipped; they
+    are verified when completed.
+
+    Args:
+        cache: VideoCache to verify
+        workers: Worker processes (default: CPU count)
+        quarantine: Move bad files to quarantine and drop their entries
+            (False only reports them)
+
+    Returns:
+        Dictionary with checked, ok, bad and quarantined counts and the
+        problems by video_id
+    """
+    items: List[Tuple[str, Dict[str, Any]]] = [
+        (video_id, entry) for video_id, entry in cache.iter_entries()
+        if not entry.get("partial")
+    ]
+    problems: Dict[str, str] = {}
+    if items:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for video_id, problem in pool.map(_check_item, items, chunksize=8):
+                if problem is not None:
+                    problems[video_id] = problem
+
+    quarantined = 0
+    if quarantine:
+        entries = dict(items)
+        for video_id, reason in problems.items():
+            # Skipped if the entry was replaced while verifying
+            if cache.quarantine(video_id, reason, cached_date=entries[video_id].get("cached_date")):
+                quarantined += 1
+
+    return {
+        "checked": len(items),
+        "ok": len(items) - len(problems),
+        "bad": len(problems),
+        "quarantined": quarantined,
+        "problems": problems,
+    }
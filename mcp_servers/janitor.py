@@ -0,0 +1,345 @@
+"""
+Background Maintenance for the Shared VideoCache
+
+Expired entries are otherwise only detected lazily and never removed, and
+files whose metadata was lost stay on disk forever. CacheJanitor runs the
+maintenance jobs for one provider:
+
+    expired: Delete entries whose TTL has passed (file, blob and metadata);
+        entries with an ETag or Last-Modified are kept for revalidation
+        until revalidate_grace_days past their TTL
+    layout: Move files stored under another directory layout into the
+        cache's layout (online migration between flat and sharded)
+    missing: Drop metadata entries whose file no longer exists
+    orphans: Delete files in provider_dir, its shard and segments
+        directories, the hot
+        tier and blobs no entry refers to, including partial downloads left
+        by crashed writers
+    compact: Compact the metadata store and the eviction index
+
+Every job works in batches of batch_size items with a pause between
+batches, so a sweep never holds locks or the disk for long. The servers
+run it as an asyncio task (each batch runs in a worker thread); the
+cache_cli "janitor" subcommand runs a single pass from the shell.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .blob_store import BLOB_DIRNAME
+from .cache import SEGMENTS_DIRNAME
+from .layout import iter_shard_files
+from .locking import LockTimeout
+
+logger = logging.getLogger(__name__)
+
+JANITOR_JOBS = ("expired", "layout", "missing", "orphans", "compact")
+
+# Files younger than this are never treated as orphans; they may belong to
+# a download that has not been recorded in metadata yet
+DEFAULT_ORPHAN_GRACE_SECONDS = 3600
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_PAUSE_SECONDS = 0.05
+DEFAULT_JANITOR_INTERVAL_SECONDS = 3600
+
+
+def janitor_interval_from_env() -> float:
+    """
+    Read the background maintenance interval from the environment.
+
+    VIDEO_CACHE_JANITOR_INTERVAL gives the seconds between passes; 0
+    disables the background janitor.
+
+    Returns:
+        Interval in seconds (0 = disabled)
+    """
+    value = os.environ.get("VIDEO_CACHE_JANITOR_INTERVAL")
+    if not value:
+        return DEFAULT_JANITOR_INTERVAL_SECONDS
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logger.warning(f"Ignoring invalid VIDEO_CACHE_JANITOR_INTERVAL={value!r}")
+        return DEFAULT_JANITOR_INTERVAL_SECONDS
+
+
+def start_janitor(cache, interval: Optional[float] = None) -> Optional["asyncio.Task[None]"]:
+    """
+    Start background maintenance of a cache on the running event loop.
+
+    Args:
+        cache: VideoCache to maintain
+        interval: Seconds between passes (default: from the environment)
+
+    Returns:
+        The janitor task (cancel it on shutdown), or None if disabled
+    """
+    if interval is None:
+        interval = janitor_interval_from_env()
+    if interval <= 0:
+        logger.info(f"Cache maintenance for '{cache.provider_name}' is disabled")
+        return None
+    return asyncio.create_task(CacheJanitor(cache).run_forever(interval))
+
+
+class CacheJanitor:
+    """
+    Rate-limited maintenance jobs for one VideoCache provider.
+
+    Attributes:
+        cache: VideoCache to maintain
+        batch_size: Items processed per batch
+        batch_pause: Seconds to pause between batches
+        orphan_grace: Minimum age in seconds before an unreferenced file is deleted
+    """
+
+    def __init__(
+        self,
+        cache,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_pause: float = DEFAULT_BATCH_PAUSE_SECONDS,
+        orphan_grace: float = DEFAULT_ORPHAN_GRACE_SECONDS
+    ):
+        """
+        Initialize janitor.
+
+        Args:
+            cache: VideoCache to maintain
+            batch_size: Items processed per batch (default: 100)
+            batch_pause: Seconds to pause between batches (default: 0.05)
+            orphan_grace: Minimum age in seconds of orphan files (default: 3600)
+        """
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.batch_pause = batch_pause
+        self.orphan_grace = orphan_grace
+
+    def _jobs(self, jobs: Optional[List[str]]) -> Dict[str, Callable[[], Iterator[int]]]:
+        """Map selected job names to their batch generators, validating names."""
+        available = {
+            "expired": self._sweep_expired,
+            "layout": self._migrate_layout,
+            "missing": self._drop_missing,
+            "orphans": self._delete_orphans,
+            "compact": self._compact,
+        }
+        selected = list(jobs or JANITOR_JOBS)
+        unknown = [job for job in selected if job not in available]
+        if unknown:
+            raise ValueError(f"Unknown janitor jobs: {', '.join(unknown)}")
+        return {job: available[job] for job in JANITOR_JOBS if job in selected}
+
+    def run_once(self, jobs: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Run maintenance jobs to completion, pausing between batches.
+
+        Args:
+            jobs: Job names to run (default: all of JANITOR_JOBS)
+
+        Returns:
+            Number of items removed per job
+        """
+        results = {}
+        for job, batches in self._jobs(jobs).items():
+            results[job] = 0
+            for removed in batches():
+                results[job] += removed
+                time.sleep(self.batch_pause)
+        self._log_results(results)
+        return results
+
+    async def run_once_async(self, jobs: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Run maintenance jobs without blocking the event loop.
+
+        Each batch runs in a worker thread; the loop is free to serve
+        requests during batches and the pauses between them.
+
+        Args:
+            jobs: Job names to run (default: all of JANITOR_JOBS)
+
+        Returns:
+            Number of items removed per job
+        """
+        results = {}
+        for job, batches in self._jobs(jobs).items():
+            results[job] = 0
+            iterator = batches()
+            while True:
+                removed = await asyncio.to_thread(next, iterator, None)
+                if removed is None:
+                    break
+                results[job] += removed
+                await asyncio.sleep(self.batch_pause)
+        self._log_results(results)
+        return results
+
+    async def run_forever(self, interval: float = DEFAULT_JANITOR_INTERVAL_SECONDS) -> None:
+        """
+        Run all jobs every interval seconds until cancelled.
+
+        Errors are logged and the next pass runs as scheduled.
+
+        Args:
+            interval: Seconds between passes
+        """
+        while True:
+            try:
+                await self.run_once_async()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache maintenance for '{self.cache.provider_name}' failed: {e}")
+            await asyncio.sleep(interval)
+
+    def _log_results(self, results: Dict[str, int]) -> None:
+        """Log a summary of a maintenance pass."""
+        summary = ", ".join(f"{job}={count}" for job, count in results.items())
+        logger.info(f"Cache maintenance for '{self.cache.provider_name}': {summary}")
+
+    def _batched(self, items: List, handle: Callable) -> Iterator[int]:
+        """Apply handle to items batch by batch, yielding the removals per batch."""
+        for start in range(0, len(items), self.batch_size):
+            yield sum(1 for item in items[start:start + self.batch_size] if handle(*item))
+
+    def _sweep_expired(self) -> Iterator[int]:
+        """Delete expired entries together with their files and blobs."""
+        candidates = [
+            (video_id,)
+            for video_id, entry in self.cache.iter_entries()
+            if self._is_sweepable(entry)
+        ]
+        yield from self._batched(candidates, self._remove_if_expired)
+
+    def _is_sweepable(self, entry: Dict) -> bool:
+        """Check whether an entry is expired and can no longer be revalidated."""
+        return self.cache.is_expired(entry) and not self.cache.is_revalidatable(entry)
+
+    def _remove_if_expired(self, video_id: str) -> bool:
+        """Invalidate an entry if it is still expired, skipping busy videos."""
+        try:
+            with self.cache.lock_video(video_id, timeout=0):
+                entry = self.cache.get_entry(video_id)
+                if entry is None or not self._is_sweepable(entry):
+                    return False
+                return self.cache.invalidate(video_id)
+        except LockTimeout:
+            return False  # being downloaded right now
+
+    def _migrate_layout(self) -> Iterator[int]:
+        """Move files written under another directory layout into the cache's layout."""
+        candidates = [
+            (video_id,)
+            for video_id, entry in self.cache.iter_entries()
+            if self.cache.is_misplaced(video_id, entry)
+        ]
+        yield from self._batched(candidates, self._relocate)
+
+    def _relocate(self, video_id: str) -> bool:
+        """Move one video's file, skipping busy videos."""
+        try:
+            with self.cache.lock_video(video_id, timeout=0):
+                return self.cache.relocate(video_id) is not None
+        except LockTimeout:
+            return False  # being downloaded right now
+
+    def _drop_missing(self) -> Iterator[int]:
+        """Drop metadata entries whose cached file no longer exists."""
+        candidates = [(video_id,) for video_id, _ in self.cache.iter_entries()]
+        yield from self._batched(candidates, self._drop_if_missing)
+
+    def _drop_if_missing(self, video_id: str) -> bool:
+        """Forget an entry whose file is gone (demoting lost hot copies), skipping busy videos."""
+        try:
+            with self.cache.lock_video(video_id, timeout=0):
+                # Re-read: the entry may have been moved or replaced since listing
+                entry = self.cache.get_entry(video_id)
+                if entry is None:
+                    return False
+                file_path = entry.get("file_path", "")
+                cold_path = entry.get("cold_path")
+                if file_path and os.path.exists(file_path):
+                    return False
+                if cold_path and os.path.exists(cold_path):
+                    self.cache.demote(video_id)
+                    return False
+                if self.cache.locate_file(video_id, entry) is not None:
+                    return False
+                logger.info(f"Dropping metadata for missing file: {file_path}")
+                return self.cache.forget(video_id)
+        except LockTimeout:
+            return False  # being downloaded right now
+
+    def _delete_orphans(self) -> Iterator[int]:
+        """Delete unreferenced files in provider_dir, its shards, the hot tier and blobs."""
+        referenced = set()
+        for _, entry in self.cache.iter_entries():
+            for field in ("file_path", "cold_path"):
+                if entry.get(field):
+                    referenced.add(os.path.normcase(os.path.abspath(entry[field])))
+        cutoff = time.time() - self.orphan_grace
+
+        directories = [self.cache.provider_dir, self.cache.provider_dir / SEGMENTS_DIRNAME]
+        if self.cache.hot_tier is not None:
+            directories.append(self.cache.hot_tier.root / self.cache.provider_name)
+
+        candidates = []
+        for directory in directories:
+            try:
+                with os.scandir(directory) as it:
+                    for dir_entry in it:
+                        if not dir_entry.is_file(follow_symlinks=False):
+                            continue
+                        path = os.path.normcase(os.path.abspath(dir_entry.path))
+                        if path not in referenced and dir_entry.stat().st_mtime < cutoff:
+                            candidates.append((Path(dir_entry.path),))
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.error(f"Failed to scan {directory}: {e}")
+        try:
+            for dir_entry in iter_shard_files(self.cache.provider_dir):
+                path = os.path.normcase(os.path.abspath(dir_entry.path))
+                if path not in referenced and dir_entry.stat().st_mtime < cutoff:
+                    candidates.append((Path(dir_entry.path),))
+        except OSError as e:
+            logger.error(f"Failed to scan shards of {self.cache.provider_dir}: {e}")
+
+        yield from self._batched(candidates, self._delete_orphan)
+
+        if self.cache.blobs is not None:
+            blobs = [
+                (path,) for path in self._iter_blob_files()
+                if path.stat().st_nlink <= 1 and path.stat().st_mtime < cutoff
+            ]
+            yield from self._batched(blobs, self._delete_orphan)
+
+    def _iter_blob_files(self) -> Iterator[Path]:
+        """Iterate over blob files in cache_dir/blobs."""
+        blob_root = self.cache.cache_dir / BLOB_DIRNAME
+        if not blob_root.is_dir():
+            return
+        for prefix_dir in blob_root.iterdir():
+            if prefix_dir.is_dir():
+                yield from (path for path in prefix_dir.iterdir() if path.is_file())
+
+    @staticmethod
+    def _delete_orphan(path: Path) -> bool:
+        """Delete an orphan file."""
+        try:
+            path.unlink()
+        except OSError as e:
+            logger.warning(f"Failed to delete orphan {path}: {e}")
+            return False
+        logger.info(f"Deleted orphan file: {path}")
+        return True
+
+    def _compact(self) -> Iterator[int]:
+        """Compact the metadata store and rebuild the eviction index."""
+        self.cache.compact()
+        yield 0
@@ -0,0 +1,127 @@
+"""
+Directory Layouts of Cached Video Files
+
+The flat layout keeps every clip directly in cache_dir/{provider}/. With
+hundreds of thousands of files, directory lookups and listings get slow
+on ext4 and NFS. The sharded layout fans files out over two levels of hex
+prefix directories taken from the SHA-256 of the video ID:
+
+    flat:     cache_dir/dvids/12345.mp4
+    sharded:  cache_dir/dvids/5e/88/12345.mp4
+
+so each directory holds at most a few entries per 65536 videos. Metadata
+entries record absolute file paths, so both layouts can coexist while a
+cache is migrated; VideoCache falls back to the other layout's location
+when an entry's file has moved (VideoCache.locate_file()), and the
+janitor's "layout" job moves files online with VideoCache.relocate(),
+one video at a time under its lock.
+"""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Iterator, List
+
+LAYOUTS = ("flat", "sharded")
+
+_SHARD_DIR_RE = re.compile(r"^[0-9a-f]{2}$")
+
+
+def shard_dirs(video_id: str) -> List[str]:
+    """
+    Get the two prefix directories of a video in the sharded layout.
+
+    Args:
+        video_id: Unique video identifier
+
+    Returns:
+        [first, second] two-character hex directory names
+    """
+    digest = hashlib.sha256(video_id.encode("utf-8")).hexdigest()
+    return [digest[:2], digest[2:4]]
+
+
+def layout_path(provider_dir: Path, video_id: str, file_name: str, layout: str) -> Path:
+    """
+    Get the location of a cached file in a layout.
+
+    Args:
+        provider_dir: The provider's cache directory
+        video_id: Unique video identifier
+        file_name: Cached file name (e.g. "12345.mp4")
+        layout: "flat" or "sharded"
+
+    Returns:
+        Path of the file in that layout
+
+    Raises:
+        ValueError: If the layout is unknown
+    """
+    if layout == "flat":
+        return provider_dir / file_name
+    if layout == "sharded":
+        return provider_dir.joinpath(*shard_dirs(video_id), file_name)
+    raise ValueError(f"Unknown cache layout: {layout} (expected one of {', '.join(LAYOUTS)})")
+
+
+def layout_candidates(provider_dir: Path, video_id: str, file_name: str) -> List[Path]:
+    """
+    Get every location a cached file may have (for legacy fallback lookups).
+
+    Args:
+        provider_dir: The provider's cache directory
+        video_id: Unique video identifier
+        file_name: Cached file name
+
+    Returns:
+        Paths of the file in each layout
+    """
+    return [layout_path(provider_dir, video_id, file_name, layout) for layout in LAYOUTS]
+
+
+def iter_layout_files(provider_dir: Path) -> Iterator[os.DirEntry]:
+    """
+    Iterate over cached files in provider_dir in either layout.
+
+    Hidden (in-progress) files and subdirectories other than the shard
+    directories are skipped.
+
+    Args:
+        provider_dir: The provider's cache directory
+
+    Yields:
+        os.DirEntry of each cached file
+    """
+    try:
+        with os.scandir(provider_dir) as it:
+            entries = [d for d in it if not d.name.startswith(".") and d.is_file(follow_symlinks=False)]
+    except FileNotFoundError:
+        return
+    yield from entries
+    yield from (d for d in iter_shard_files(provider_dir) if not d.name.startswith("."))
+
+
+def iter_shard_files(provider_dir: Path) -> Iterator[os.DirEntry]:
+    """
+    Iterate over the files in provider_dir's two-level shard directories.
+
+    Args:
+        provider_dir: The provider's cache directory
+
+    Yields:
+        os.DirEntry of each file (including hidden ones)
+    """
+    for first_level in _subdirs(provider_dir):
+        for second_level in _subdirs(Path(first_level.path)):
+            with os.scandir(second_level.path) as it:
+                yield from [d for d in it if d.is_file(follow_symlinks=False)]
+
+
+def _subdirs(directory: Path) -> List[os.DirEntry]:
+    """List the shard directories (two hex digits) directly inside directory."""
+    try:
+        with os.scandir(directory) as it:
+            return [d for d in it if _SHARD_DIR_RE.match(d.name) and d.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
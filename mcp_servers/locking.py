@@ -0,0 +1,282 @@
+"""
+Cross-Process Locking for the Shared VideoCache
+
+The DVIDS and NASA servers run as separate processes sharing one cache_dir.
+This module provides the locks they use to coordinate:
+
+    FileLock: Re-entrant advisory lock on a lock file (fcntl.flock on POSIX,
+        msvcrt.locking on Windows), exclusive across threads and processes
+    KeyLocks: Per-key single-flight locks, so concurrent requests for the
+        same video wait for one download instead of fetching duplicates
+
+Lock files are never deleted while in use; removing a lock file another
+process holds open would let a third process lock a different inode.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Polling interval while waiting for a lock held by another process
+LOCK_POLL_SECONDS = 0.05
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a lock could not be acquired within the timeout."""
+
+
+def _try_lock_fd(fd: int) -> bool:
+    """Try to take an exclusive lock on fd without blocking."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_fd(fd: int) -> None:
+    """Release the lock held on fd."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """
+    Re-entrant exclusive lock shared by threads and processes.
+
+    A thread lock serializes threads of this process; the OS-level lock on
+    the lock file serializes processes. The same thread may acquire the
+    lock several times and must release it as often.
+
+    Attributes:
+        path: Lock file path
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize lock (the lock file is created on first acquire).
+
+        Args:
+            path: Lock file path
+        """
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Acquire the lock.
+
+        Args:
+            blocking: Wait for the lock if it is held elsewhere
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            True if acquired, False if non-blocking and the lock is held
+
+        Raises:
+            LockTimeout: If timeout elapsed before the lock was acquired
+        """
+        if not blocking:
+            timeout = None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._thread_lock.acquire(blocking, -1 if timeout is None else timeout):
+            if blocking:
+                raise LockTimeout(f"Timed out waiting for {self.path}")
+            return False
+
+        if self._depth > 0:
+            self._depth += 1
+            return True
+
+        try:
+            if self._acquire_file(blocking, deadline):
+                self._depth = 1
+                return True
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._thread_lock.release()
+        if blocking:
+            raise LockTimeout(f"Timed out waiting for {self.path}")
+        return False
+
+    def _acquire_file(self, blocking: bool, deadline: Optional[float]) -> bool:
+        """Open the lock file and take the OS-level lock."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if blocking and deadline is None and fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                self._fd = fd
+                return True
+            while not _try_lock_fd(fd):
+                if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                    os.close(fd)
+                    return False
+                time.sleep(LOCK_POLL_SECONDS)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """
+        Release the lock once.
+
+        Raises:
+            RuntimeError: If the calling thread does not hold the lock
+        """
+        if self._depth == 0:
+            raise RuntimeError(f"Releasing unlocked {self.path}")
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            try:
+                _unlock_fd(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._thread_lock.release()
+
+    @property
+    def locked(self) -> bool:
+        """Whether this process currently holds the lock."""
+        return self._depth > 0
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class KeyLocks:
+    """
+    Per-key single-flight locks backed by lock files.
+
+    Holding the lock for a key guarantees that no other thread, coroutine
+    or process using the same lock_dir holds it. Callers re-check the cache
+    after acquiring, so waiters reuse the download of the first caller.
+
+    Attributes:
+        lock_dir: Directory holding one lock file per key
+    """
+
+    def __init__(self, lock_dir: Path):
+        """
+        Initialize key locks.
+
+        Args:
+            lock_dir: Directory holding one lock file per key
+        """
+        self.lock_dir = Path(lock_dir)
+        self._guard = threading.Lock()
+        self._file_locks: Dict[str, FileLock] = {}
+        self._async_locks: Dict[str, asyncio.Lock] = {}
+        self._users: Dict[str, int] = {}
+
+    def _lock_path(self, key: str) -> Path:
+        """Lock file path for a key (hashed, since keys may contain '/')."""
+        return self.lock_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.lock"
+
+    def _checkout(self, key: str) -> FileLock:
+        """Get the FileLock for a key and register the caller as a user."""
+        with self._guard:
+            file_lock = self._file_locks.get(key)
+            if file_lock is None:
+                file_lock = self._file_locks[key] = FileLock(self._lock_path(key))
+            self._users[key] = self._users.get(key, 0) + 1
+            return file_lock
+
+    def _checkin(self, key: str) -> None:
+        """Unregister a user, dropping the key's locks once nobody uses them."""
+        with self._guard:
+            self._users[key] -= 1
+            if self._users[key] == 0:
+                del self._users[key]
+                del self._file_locks[key]
+                self._async_locks.pop(key, None)
+
+    @contextmanager
+    def hold(self, key: str, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold the lock for key in a synchronous context.
+
+        Args:
+            key: Lock key (e.g. "dvids/12345")
+            timeout: Maximum seconds to wait (None = forever)
+
+        Raises:
+            LockTimeout: If the lock was not acquired in time
+        """
+        file_lock = self._checkout(key)
+        try:
+            file_lock.acquire(timeout=timeout)
+            try:
+                yield
+            finally:
+                file_lock.release()
+        finally:
+            self._checkin(key)
+
+    @asynccontextmanager
+    async def hold_async(self, key: str, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Hold the lock for key without blocking the event loop.
+
+        Coroutines waiting on the same key queue on an asyncio.Lock; the
+        lock file is then polled so other processes are waited for with
+        asyncio.sleep rather than a blocking system call.
+
+        Args:
+            key: Lock key (e.g. "dvids/12345")
+            timeout: Maximum seconds to wait (None = forever)
+
+        Raises:
+            LockTimeout: If the lock was not acquired in time
+        """
+        file_lock = self._checkout(key)
+        try:
+            with self._guard:
+                async_lock = self._async_locks.setdefault(key, asyncio.Lock())
+            try:
+                await asyncio.wait_for(async_lock.acquire(), timeout)
+            except asyncio.TimeoutError:
+                raise LockTimeout(f"Timed out waiting for {key}")
+            try:
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while not file_lock.acquire(blocking=False):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise LockTimeout(f"Timed out waiting for {key}")
+                    await asyncio.sleep(LOCK_POLL_SECONDS)
+                try:
+                    yield
+                finally:
+                    file_lock.release()
+            finally:
+                async_lock.release()
+        finally:
+            self._checkin(key)
@@ -0,0 +1,175 @@
+"""
+Zero-Copy Access to Cached Video Files
+
+VideoCache.get() returns file_path.read_bytes(), which copies the whole
+clip into a bytes object: a 500 MB video costs 500 MB of resident memory
+per reader. MappedVideo maps the cached file read-only instead. Its view
+is a memoryview over the page cache, so slicing it copies nothing and
+only the pages actually touched become resident.
+
+Consumers that hand the clip to another process or a socket should not
+map it at all: path and fileno() give a path/file descriptor for
+os.sendfile() (see send_file()), ffmpeg and similar tools.
+
+Closing: release memoryviews sliced from view before close() (mmap
+refuses to close while buffers are exported). On POSIX a mapped file
+stays readable even if the janitor or eviction deletes it meanwhile.
+"""
+
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+
+SEND_CHUNK_SIZE = 1024 * 1024  # Fallback copy size when os.sendfile is unavailable
+
+
+class MappedVideo:
+    """
+    Read-only memory map of a cached video file.
+
+    Usable as a context manager; bytes(video.view) makes an explicit copy.
+
+    Attributes:
+        path: Path of the mapped file (None for in-memory content)
+        size: Content size in bytes
+        view: Read-only memoryview of the content
+    """
+
+    def __init__(self, path: Optional[Path], file: Optional[BinaryIO], mapping: Any, size: int):
+        """
+        Wrap an open file and its mapping (use open() or from_bytes()).
+
+        Args:
+            path: Path of the mapped file, or None
+            file: Open file object, or None
+            mapping: mmap object or bytes backing the view
+            size: Content size in bytes
+        """
+        self.path = path
+        self.size = size
+        self._file = file
+        self._mapping = mapping
+        self.view = memoryview(mapping)
+
+    @classmethod
+    def open(cls, path: Path) -> "MappedVideo":
+        """
+        Map a file read-only.
+
+        Args:
+            path: File to map
+
+        Returns:
+            MappedVideo over the file
+
+        Raises:
+            OSError: If the file cannot be opened or mapped
+        """
+        path = Path(path)
+        file = open(path, "rb")
+        try:
+            size = os.fstat(file.fileno()).st_size
+            # Zero-length files cannot be mapped
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except BaseException:
+            file.close()
+            raise
+        return cls(path, file, mapping, size)
+
+    @classmethod
+    def from_bytes(cls, content: Any) -> "MappedVideo":
+        """
+        Wrap in-memory content (e.g. fetched content that could not be cached).
+
+        Args:
+            content: bytes or text
+
+        Returns:
+            MappedVideo over the content, with path None
+        """
+        data = content if isinstance(content, bytes) else str(content).encode("utf-8")
+        return cls(None, None, data, len(data))
+
+    def fileno(self) -> int:
+        """
+        Get the file descriptor of the mapped file (e.g. for os.sendfile()).
+
+        Raises:
+            ValueError: If the content is not backed by a file
+        """
+        if self._file is None:
+            raise ValueError("MappedVideo has no backing file")
+        return self._file.fileno()
+
+    def close(self) -> None:
+        """Release the view, unmap the file and close it."""
+        self.view.release()
+        if isinstance(self._mapping, mmap.mmap):
+            self._mapping.close()
+        if self._file is not None:
+            self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        """True once close() was called."""
+        try:
+            self.view.nbytes
+        except ValueError:
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __enter__(self) -> "MappedVideo":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def send_file(path: Path, out: BinaryIO, offset: int = 0, count: Optional[int] = None) -> int:
+    """
+    Copy (part of) a cached file to a file or socket without reading it into Python.
+
+    Uses os.sendfile() (kernel-side copy) where available and falls back
+    to bounded chunked copies elsewhere.
+
+    Args:
+        path: Cached file to send
+        out: Destination opened for binary writing (file or socket makefile)
+        offset: First byte to send
+        count: Number of bytes to send (default: to the end of the file)
+
+    Returns:
+        Number of bytes sent
+    """
+    with open(path, "rb") as src:
+        size = os.fstat(src.fileno()).st_size
+        remaining = max(size - offset, 0) if count is None else max(min(count, size - offset), 0)
+        out.flush()
+        sent = 0
+        if hasattr(os, "sendfile"):
+            try:
+                while sent < remaining:
+                    n = os.sendfile(out.fileno(), src.fileno(), offset + sent, remaining - sent)
+                    if n == 0:
+                        break
+                    sent += n
+                return sent
+            except (OSError, ValueError, AttributeError) as e:
+                # e.g. destination without a real descriptor, or unsupported pair
+                logger.debug(f"os.sendfile unavailable for {path}, copying in chunks: {e}")
+
+        src.seek(offset + sent)
+        while sent < remaining:
+            chunk = src.read(min(SEND_CHUNK_SIZE, remaining - sent))
+            if not chunk:
+                break
+            out.write(chunk)
+            sent += len(chunk)
+        return sent
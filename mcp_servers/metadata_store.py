@@ -0,0 +1,821 @@
+"""
+Metadata Store Backends for the Shared VideoCache
+
+This module provides pluggable metadata backends for VideoCache. Each backend
+stores one entry per (provider, video_id) with the cached_date, ttl and
+file_path fields used for TTL validation, plus any extra fields.
+
+Backends:
+    JsonMetadataStore: Legacy metadata.json file (human readable fallback);
+        one document keyed by video_id only, rewritten on every put
+    SQLiteMetadataStore: Indexed SQLite database in WAL mode keyed by
+        (provider, video_id), O(log N) lookups and single-row writes; the
+        servers use it (VIDEO_CACHE_BACKEND=sqlite in config/mcp_servers.json)
+        and an existing metadata.json is migrated when it is first opened
+
+Commits are crash safe: metadata.json is replaced atomically (temp file +
+fsync + rename) and SQLite commits through its WAL. A store that finds its
+metadata missing or corrupt sets needs_recovery so VideoCache can rebuild
+the index from the files on disk.
+"""
+
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .locking import FileLock
+
+logger = logging.getLogger(__name__)
+
+# Entry fields stored as dedicated SQLite columns; everything else goes to "extra"
+CORE_FIELDS = ("provider", "cached_date", "ttl", "file_path", "size", "last_access", "hits")
+
+# Access-tracking updates (touch) are batched for the JSON backend
+ACCESS_FLUSH_SECONDS = 30
+
+JSON_METADATA_FILENAME = "metadata.json"
+SQLITE_METADATA_FILENAME = "metadata.db"
+CHANGE_COUNTER_FILENAME = "metadata.version"
+METADATA_LOCK_FILENAME = "metadata.lock"
+
+# Unreadable metadata is moved aside with this suffix before starting over
+CORRUPT_SUFFIX = ".corrupt"
+
+
+def fsync_directory(directory: Path) -> None:
+    """Flush a rename inside directory to disk (no-op where unsupported)."""
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """
+    Replace a file's contents atomically.
+
+    The text is written to a temporary file next to path, fsynced and
+    renamed over path, so readers and a crash at any point see either the
+    old or the new contents, never a truncated file.
+
+    Args:
+        path: Destination file path
+        text: New file contents
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+    fsync_directory(path.parent)
+
+
+def move_aside(path: Path) -> Optional[Path]:
+    """
+    Rename an unreadable metadata file to <name>.corrupt for inspection.
+
+    Args:
+        path: File to move
+
+    Returns:
+        New path, or None if the file could not be moved
+    """
+    target = path.with_name(path.name + CORRUPT_SUFFIX)
+    try:
+        os.replace(path, target)
+    except OSError as e:
+        logger.error(f"Failed to move corrupt metadata {path} aside: {e}")
+        return None
+    return target
+
+
+class ChangeCounter:
+    """
+    Cross-process change counter backed by a memory-mapped file.
+
+    Writers bump the counter after every metadata commit; readers compare it
+    against the value they last saw. Reading is a plain memory access, so
+    checking for changes costs no system call.
+
+    Attributes:
+        path: Path to the counter file
+    """
+
+    _FORMAT = "<Q"
+    _SIZE = struct.calcsize(_FORMAT)
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) the counter file and map it into memory.
+
+        Args:
+            path: Path to the counter file
+        """
+        self.path = Path(path)
+        fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < self._SIZE:
+                os.write(fd, b"\0" * self._SIZE)
+            self._map = mmap.mmap(fd, self._SIZE)
+        finally:
+            os.close(fd)
+
+    @property
+    def value(self) -> int:
+        """Current counter value."""
+        return struct.unpack_from(self._FORMAT, self._map, 0)[0]
+
+    def bump(self) -> int:
+        """
+        Increment the counter.
+
+        Returns:
+            New counter value
+        """
+        new_value = (self.value + 1) & 0xFFFFFFFFFFFFFFFF
+        struct.pack_into(self._FORMAT, self._map, 0, new_value)
+        return new_value
+
+    def close(self) -> None:
+        """Unmap the counter file."""
+        self._map.close()
+
+
+class MetadataStore:
+    """
+    Base interface for VideoCache metadata backends.
+
+    Entries are plain dictionaries containing at least "provider",
+    "cached_date" (ISO format), "ttl" (days) and "file_path".
+
+    Attributes:
+        needs_recovery: True if the store started without usable metadata
+            (missing or corrupt) and its index should be rebuilt from disk
+    """
+
+    needs_recovery = False
+
+    def get(self, provider: str, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get metadata entry for a video.
+
+        Args:
+            provider: Video provider name
+            video_id: Unique video identifier
+
+        Returns:
+            Entry dictionary, or None if not present
+        """
+        raise NotImplementedError
+
+    def put(self, provider: str, video_id: str, entry: Dict[str, Any]) -> None:
+        """
+        Insert or replace metadata entry for a video.
+
+        Args:
+            provider: Video provider name
+            video_id: Unique video identifier
+            entry: Entry dictionary
+        """
+        raise NotImplementedError
+
+    def put_many(self, provider: str, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Insert or replace several entries in a single commit.
+
+        Args:
+            provider: Video provider name
+            entries: Mapping of video_id to entry dictionary
+        """
+        for video_id, entry in entries.items():
+            self.put(provider, video_id, entry)
+
+    def delete(self, provider: str, video_id: str) -> bool:
+        """
+        Delete metadata entry for a video.
+
+        Args:
+            provider: Video provider name
+            video_id: Unique video identifier
+
+        Returns:
+            True if an entry was removed, False if not found
+        """
+        raise NotImplementedError
+
+    def items(self, provider: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over (video_id, entry) pairs.
+
+        Args:
+            provider: Only yield entries for this provider (optional)
+
+        Returns:
+            Iterator of (video_id, entry) tuples
+        """
+        raise NotImplementedError
+
+    def count(self, provider: Optional[str] = None) -> int:
+        """
+        Count metadata entries.
+
+        Args:
+            provider: Only count entries for this provider (optional)
+
+        Returns:
+            Number of entries
+        """
+        return sum(1 for _ in self.items(provider))
+
+    def touch(self, provider: str, video_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Update access-tracking fields (last_access, hits) of an entry.
+
+        Backends may batch these updates; they are advisory and never
+        create an entry that does not exist.
+
+        Args:
+            provider: Video provider name
+            video_id: Unique video identifier
+            fields: Fields to merge into the entry
+        """
+        entry = self.get(provider, video_id)
+        if entry is not None:
+            self.put(provider, video_id, dict(entry, **fields))
+
+    def refresh(self) -> None:
+        """Pick up changes committed by other processes."""
+
+    @property
+    def generation(self) -> int:
+        """Counter that moves whenever entries were reloaded from other writers."""
+        return self._stats["reloads"]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get in-memory metadata view statistics.
+
+        Returns:
+            Dictionary with "hits" (served from memory), "misses" (view was
+            stale or incomplete) and "reloads" (full re-reads from disk)
+        """
+        return dict(self._stats)
+
+    def compact(self) -> None:
+        """Reclaim space left behind by deleted entries (maintenance hook)."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class JsonMetadataStore(MetadataStore):
+    """
+    Legacy metadata.json backend.
+
+    Stores all entries in a single JSON document of the form
+    {"videos": {video_id: entry}}. The parsed document is kept in memory and
+    only re-read when the cross-process change counter moves or the file's
+    (inode, size, mtime) signature changes. Writes hold the cross-process
+    metadata.lock, reload any newer copy, apply the change and rewrite the
+    file atomically via atomic_write_text(), so concurrent writers in other
+    processes never lose each other's entries.
+
+    Attributes:
+        metadata_file: Path to metadata.json
+        lock: Cross-process lock serializing metadata.json writers
+        data: Parsed metadata document
+        stat_interval: Seconds to trust the in-memory view without a stat()
+            call while the change counter is unchanged (0 = always stat)
+    """
+
+    def __init__(self, metadata_file: Path, stat_interval: float = 0.0):
+        """
+        Initialize JSON metadata store, creating the file if missing.
+
+        Args:
+            metadata_file: Path to metadata.json
+            stat_interval: Seconds to trust the in-memory view without stat()
+        """
+        self.metadata_file = Path(metadata_file)
+        self.stat_interval = stat_interval
+        self.data: Dict[str, Any] = {"videos": {}}
+        self._counter = ChangeCounter(self.metadata_file.with_name(CHANGE_COUNTER_FILENAME))
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._seen_counter = -1
+        self._last_stat = 0.0
+        self._stats = {"hits": 0, "misses": 0, "reloads": 0}
+        self._pending_touches: Dict[str, Dict[str, Any]] = {}
+        self._last_flush = time.monotonic()
+        self.lock = FileLock(self.metadata_file.with_name(METADATA_LOCK_FILENAME))
+        self.load()
+
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Get (inode, size, mtime_ns) of metadata.json, or None if missing."""
+        try:
+            st = os.stat(self.metadata_file)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _remember_state(self) -> None:
+        """Record the on-disk state matching the in-memory view."""
+        self._signature = self._file_signature()
+        self._seen_counter = self._counter.value
+        self._last_stat = time.monotonic()
+
+    def refresh(self) -> None:
+        """Reload metadata.json only if another writer changed it."""
+        counter = self._counter.value
+        if counter == self._seen_counter and self._signature is not None:
+            now = time.monotonic()
+            if now - self._last_stat < self.stat_interval:
+                self._stats["hits"] += 1
+                return
+            self._last_stat = now
+            if self._file_signature() == self._signature:
+                self._stats["hits"] += 1
+                return
+
+        self._stats["misses"] += 1
+        self.load()
+
+    def _read_document(self) -> Optional[Dict[str, Any]]:
+        """
+        Parse metadata.json.
+
+        Returns:
+            Metadata document, or None if the file does not exist
+
+        Raises:
+            ValueError: If the file is not a valid metadata document
+        """
+        try:
+            with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if not isinstance(data, dict) or not isinstance(data.setdefault("videos", {}), dict):
+            raise ValueError("expected an object with a \"videos\" object")
+        return data
+
+    def load(self) -> None:
+        """
+        Load metadata from metadata.json, resetting it if missing or invalid.
+
+        The reset happens under the metadata lock after re-reading the file,
+        so a file another process just wrote is never replaced. An invalid
+        file is moved aside to metadata.json.corrupt, and in both cases
+        needs_recovery is set so the index can be rebuilt from disk.
+        """
+        try:
+            data = self._read_document()
+        except ValueError:
+            data = None
+
+        if data is None:
+            with self.lock:
+                try:
+                    data = self._read_document()
+                except ValueError as e:
+                    logger.warning(f"Invalid metadata.json, creating new: {e}")
+                    move_aside(self.metadata_file)
+                if data is None:
+                    # Create empty metadata file
+                    self.needs_recovery = True
+                    self.data = {"videos": {}}
+                    self._write()
+                    return
+
+        self.data = data
+        self._apply_pending_touches()
+        self._stats["reloads"] += 1
+        self._remember_state()
+        logger.debug(f"Loaded metadata from {self.metadata_file}")
+
+    def _sync_for_write(self) -> None:
+        """Reload if another writer committed since the view was loaded (lock held)."""
+        if self._counter.value != self._seen_counter or self._file_signature() != self._signature:
+            self._stats["misses"] += 1
+            self.load()
+
+    def save(self) -> None:
+        """Atomically save metadata to metadata.json and notify other readers."""
+        with self.lock:
+            self._write()
+
+    def _write(self) -> None:
+        """Write the in-memory document to metadata.json (lock held)."""
+        try:
+            atomic_write_text(self.metadata_file, json.dumps(self.data, indent=2))
+            self._counter.bump()
+            self._remember_state()
+            self._pending_touches.clear()
+            self._last_flush = time.monotonic()
+            logger.debug(f"Saved metadata to {self.metadata_file}")
+        except OSError as e:
+            logger.error(f"Failed to save metadata: {e}")
+
+    def _matches(self, entry: Dict[str, Any], provider: Optional[str]) -> bool:
+        """Check whether an entry belongs to provider (entries without one match any)."""
+        return provider is None or entry.get("provider", provider) == provider
+
+    def get(self, provider: str, video_id: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        entry = self.data["videos"].get(video_id)
+        if entry is None or not self._matches(entry, provider):
+            return None
+        # A copy, as from SQLite: changing it must not change the view without a write
+        return dict(entry)
+
+    def put(self, provider: str, video_id: str, entry: Dict[str, Any]) -> None:
+        with self.lock:
+            self._sync_for_write()
+            self.data["videos"][video_id] = dict(entry, provider=provider)
+            self._write()
+
+    def put_many(self, provider: str, entries: Dict[str, Dict[str, Any]]) -> None:
+        with self.lock:
+            self._sync_for_write()
+            for video_id, entry in entries.items():
+                self.data["videos"][video_id] = dict(entry, provider=provider)
+            self._write()
+
+    def delete(self, provider: str, video_id: str) -> bool:
+        with self.lock:
+            self._sync_for_write()
+            entry = self.data["videos"].get(video_id)
+            if entry is None or not self._matches(entry, provider):
+                return False
+            del self.data["videos"][video_id]
+            self._write()
+        return True
+
+    def items(self, provider: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        self.refresh()
+        for video_id, entry in list(self.data["videos"].items()):
+            if self._matches(entry, provider):
+                yield video_id, dict(entry)
+
+    def touch(self, provider: str, video_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Update access-tracking fields in memory, flushing at most every
+        ACCESS_FLUSH_SECONDS so cache hits do not rewrite metadata.json.
+        """
+        entry = self.get(provider, video_id)
+        if entry is None:
+            return
+        self.data["videos"][video_id] = dict(entry, **fields)
+        self._pending_touches.setdefault(video_id, {}).update(fields)
+        if time.monotonic() - self._last_flush >= ACCESS_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Persist batched access-tracking updates on top of the latest metadata."""
+        if self._pending_touches:
+            with self.lock:
+                self._sync_for_write()
+                self._write()
+
+    def _apply_pending_touches(self) -> None:
+        """Re-apply unflushed access updates after reloading from disk."""
+        for video_id, fields in self._pending_touches.items():
+            entry = self.data["videos"].get(video_id)
+            if entry is not None:
+                entry.update(fields)
+
+    def compact(self) -> None:
+        """Rewrite metadata.json from the latest state, including batched access updates."""
+        with self.lock:
+            self._sync_for_write()
+            self._write()
+
+    def close(self) -> None:
+        self.flush()
+        self._counter.close()
+
+
+class SQLiteMetadataStore(MetadataStore):
+    """
+    Indexed SQLite metadata backend running in WAL mode.
+
+    Entries are keyed by (provider, video_id) with secondary indexes on
+    cached_date and ttl, so lookups are O(log N) and each write touches a
+    single row. Fields outside CORE_FIELDS are stored as JSON in "extra".
+
+    Looked-up rows are kept in an in-memory view that is dropped whenever
+    PRAGMA data_version reports a commit from another connection, so
+    repeated lookups of the same video do not touch the database.
+
+    Attributes:
+        db_path: Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the SQLite metadata database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._create_schema()
+        except sqlite3.DatabaseError:
+            self._conn.close()
+            raise
+        self._view: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        self._data_version = self._read_data_version()
+        self._stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+    def _read_data_version(self) -> int:
+        """Read SQLite's change counter for commits made by other connections."""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync_view(self) -> None:
+        """Drop the in-memory view if another connection committed changes."""
+        data_version = self._read_data_version()
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._view.clear()
+            self._stats["reloads"] += 1
+
+    def _create_schema(self) -> None:
+        """Create the videos table and its indexes if they do not exist."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS videos (
+                    provider TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    cached_date TEXT,
+                    ttl REAL,
+                    file_path TEXT,
+                    size INTEGER,
+                    last_access REAL,
+                    hits INTEGER,
+                    extra TEXT,
+                    PRIMARY KEY (provider, video_id)
+                )
+                """
+            )
+            # Upgrade databases created before access tracking was added
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(videos)")}
+            for column, column_type in (("size", "INTEGER"), ("last_access", "REAL"), ("hits", "INTEGER")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE videos ADD COLUMN {column} {column_type}")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_videos_cached_date ON videos (cached_date)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_ttl ON videos (ttl)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_videos_last_access ON videos (last_access)"
+            )
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a database row into an entry dictionary."""
+        entry: Dict[str, Any] = json.loads(row["extra"]) if row["extra"] else {}
+        entry["provider"] = row["provider"]
+        if row["cached_date"] is not None:
+            entry["cached_date"] = row["cached_date"]
+        if row["ttl"] is not None:
+            ttl = row["ttl"]
+            entry["ttl"] = int(ttl) if float(ttl).is_integer() else ttl
+        for field in ("file_path", "size", "last_access", "hits"):
+            if row[field] is not None:
+                entry[field] = row[field]
+        return entry
+
+    def get(self, provider: str, video_id: str) -> Optional[Dict[str, Any]]:
+        key = (provider, video_id)
+        with self._lock:
+            self._sync_view()
+            if key in self._view:
+                self._stats["hits"] += 1
+                entry = self._view[key]
+                return dict(entry) if entry is not None else None
+
+            self._stats["misses"] += 1
+            row = self._conn.execute(
+                "SELECT * FROM videos WHERE provider = ? AND video_id = ?",
+                (provider, video_id)
+            ).fetchone()
+            entry = self._row_to_entry(row) if row else None
+            self._view[key] = entry
+        return dict(entry) if entry is not None else None
+
+    def put(self, provider: str, video_id: str, entry: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._put_row(provider, video_id, entry)
+
+    def put_many(self, provider: str, entries: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock, self._conn:
+            for video_id, entry in entries.items():
+                self._put_row(provider, video_id, entry)
+
+    def _put_row(self, provider: str, video_id: str, entry: Dict[str, Any]) -> None:
+        """Write one row inside the caller's transaction and update the view."""
+        extra = {k: v for k, v in entry.items() if k not in CORE_FIELDS}
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO videos
+                (provider, video_id, cached_date, ttl, file_path, size, last_access, hits, extra)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                provider,
+                video_id,
+                entry.get("cached_date"),
+                entry.get("ttl"),
+                entry.get("file_path"),
+                entry.get("size"),
+                entry.get("last_access"),
+                entry.get("hits"),
+                json.dumps(extra) if extra else None
+            )
+        )
+        self._view[(provider, video_id)] = dict(entry, provider=provider)
+
+    def delete(self, provider: str, video_id: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM videos WHERE provider = ? AND video_id = ?",
+                (provider, video_id)
+            )
+            self._view[(provider, video_id)] = None
+        return cursor.rowcount > 0
+
+    def touch(self, provider: str, video_id: str, fields: Dict[str, Any]) -> None:
+        """Update access-tracking columns of a single row in place."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE videos SET last_access = ?, hits = ? WHERE provider = ? AND video_id = ?",
+                (fields.get("last_access"), fields.get("hits"), provider, video_id)
+            )
+            cached = self._view.get((provider, video_id))
+            if cached is not None:
+                cached.update(fields)
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._sync_view()
+
+    def items(self, provider: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            if provider is None:
+                rows = self._conn.execute("SELECT * FROM videos").fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT * FROM videos WHERE provider = ?", (provider,)
+                ).fetchall()
+        for row in rows:
+            yield row["video_id"], self._row_to_entry(row)
+
+    def count(self, provider: Optional[str] = None) -> int:
+        with self._lock:
+            if provider is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM videos WHERE provider = ?", (provider,)
+                ).fetchone()
+        return row[0]
+
+    def compact(self) -> None:
+        """Fold the WAL back into the database and refresh query planner statistics."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("PRAGMA optimize")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_to_sqlite(json_path: Path, db_path: Path, remove_source: bool = False) -> int:
+    """
+    One-shot migration of a legacy metadata.json into a SQLite metadata store.
+
+    Existing rows with the same (provider, video_id) are replaced. Entries
+    without a provider field are skipped since their owner is unknown.
+
+    Args:
+        json_path: Path to the legacy metadata.json file
+        db_path: Path to the SQLite database to populate
+        remove_source: Rename metadata.json to metadata.json.migrated afterwards
+
+    Returns:
+        Number of entries migrated
+    """
+    json_path = Path(json_path)
+    if not json_path.exists():
+        logger.info(f"No legacy metadata at {json_path}, nothing to migrate")
+        return 0
+
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            videos = json.load(f).get("videos", {})
+    except (json.JSONDecodeError, AttributeError) as e:
+        logger.warning(f"Cannot migrate invalid metadata file {json_path}: {e}")
+        return 0
+
+    store = SQLiteMetadataStore(db_path)
+    migrated = 0
+    try:
+        for video_id, entry in videos.items():
+            provider = entry.get("provider")
+            if not provider:
+                logger.warning(f"Skipping {video_id} during migration: missing provider")
+                continue
+            store.put(provider, video_id, entry)
+            migrated += 1
+    finally:
+        store.close()
+
+    if remove_source:
+        json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+
+    logger.info(f"Migrated {migrated} metadata entries from {json_path} to {db_path}")
+    return migrated
+
+
+def create_metadata_store(
+    cache_dir: Path,
+    backend: str = "json",
+    stat_interval: float = 0.0
+) -> MetadataStore:
+    """
+    Create a metadata store for a cache directory.
+
+    The SQLite backend performs a one-shot migration from metadata.json the
+    first time its database is created. A database that cannot be opened is
+    moved aside to metadata.db.corrupt and replaced by an empty one.
+
+    Args:
+        cache_dir: Root cache directory path
+        backend: "json" or "sqlite"
+        stat_interval: Seconds the JSON backend trusts its in-memory view
+            without a stat() call (ignored by the SQLite backend)
+
+    Returns:
+        MetadataStore instance
+
+    Raises:
+        ValueError: If backend is unknown
+    """
+    cache_dir = Path(cache_dir)
+    if backend == "json":
+        return JsonMetadataStore(cache_dir / JSON_METADATA_FILENAME, stat_interval)
+
+    if backend == "sqlite":
+        db_path = cache_dir / SQLITE_METADATA_FILENAME
+        json_path = cache_dir / JSON_METADATA_FILENAME
+        needs_recovery = not db_path.exists()
+        if needs_recovery and json_path.exists():
+            needs_recovery = migrate_json_to_sqlite(json_path, db_path, remove_source=True) == 0
+        try:
+            store = SQLiteMetadataStore(db_path)
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Invalid metadata database {db_path}, creating new: {e}")
+            move_aside(db_path)
+            for suffix in ("-wal", "-shm"):
+                Path(str(db_path) + suffix).unlink(missing_ok=True)
+            store = SQLiteMetadataStore(db_path)
+            needs_recovery = True
+        store.needs_recovery = needs_recovery
+        return store
+
+    raise ValueError(f"Unknown metadata backend: {backend}")
@@ -8,17 +8,33 @@ AC-6.11.1: NASA Scraping MCP Server Implementation
 """
 
 import asyncio
+import functools
 import logging
 import re
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 
 import httpx
 from bs4 import BeautifulSoup
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 
-from .cache import VideoCache
+from .byte_ranges import parse_content_range, range_header, range_matches, read_window
+from .cache import STREAM_CHUNK_SIZE, VideoCache, cache_options_from_env, iter_chunks
+from .fetching import fetch_with_backoff, stream_to_cache
+from .http_client import SharedHttpClient, http_client_options_from_env
+from .janitor import start_janitor
+from .negative_cache import (
+    NEGATIVE_DB_NAME,
+    NegativeCache,
+    is_not_found,
+    negative_cache_options_from_env,
+    not_found_error,
+)
+from .prefetch import PrefetchPlanner
+from .rate_limiter import rate_limiter_from_env
+from .response_cache import RESPONSES_DB_NAME, ResponseCache, response_cache_options_from_env, response_key
+from .revalidation import conditional_headers, unchanged_validators
 
 # Configure logging
 logging.basicConfig(
@@ -31,7 +47,7 @@ logger = logging.getLogger(__name__)
 server = Server("nasa-scraping-server")
 
 # Rate limiting configuration
-RATE_LIMIT_SECONDS = 10  # 1 request per 10 seconds
+RATE_LIMIT_SECONDS = 10  # 1 request per 10 seconds (default of NASA_RATE_LIMIT)
 BASE_BACKOFF_SECONDS = 2  # Base backoff for retries
 MAX_BACKOFF_SECONDS = 60  # Maximum backoff cap
 MAX_RETRIES = 5  # Maximum retry attempts
@@ -52,7 +68,12 @@ class NASAScrapingMCPServer:
     Attributes:
         cache_dir: Directory for cached videos
         cache: VideoCache instance for managing cached content
-        _last_request_time: Timestamp of last HTTP request for rate limiting
+        responses: Cache of parsed search and details responses
+        negative: Cache of missing video IDs and empty searches
+        prefetcher: Background cache warmup jobs (see prefetch())
+        http: Pooled HTTP client shared by all requests (closed by aclose())
+        limiter: Adaptive token-bucket rate limiter of requests to the provider
+        _download_urls: Resolved video file URLs, reused by range requests
     """
 
     def __init__(self, cache_dir: str):
@@ -66,9 +87,23 @@ class NASAScrapingMCPServer:
         self.cache = VideoCache(
             provider_name="nasa",
             cache_dir=cache_dir,
-            default_ttl_days=30
+            default_ttl_days=30,
+            **cache_options_from_env("nasa")
+        )
+        self.negative = NegativeCache(
+            Path(cache_dir) / NEGATIVE_DB_NAME,
+            **negative_cache_options_from_env()
+        )
+        self.responses = ResponseCache(
+            Path(cache_dir) / RESPONSES_DB_NAME,
+            negative=self.negative,
+            **response_cache_options_from_env()
         )
-        self._last_request_time: Optional[float] = None
+        self.limiter = rate_limiter_from_env("nasa", NASA_BASE_URL, RATE_LIMIT_SECONDS)
+        # Estimates follow the adaptive limiter's current interval
+        self.prefetcher = PrefetchPlanner(self, rate_interval=lambda: self.limiter.interval)
+        self.http = SharedHttpClient(**http_client_options_from_env())
+        self._download_urls: Dict[str, str] = {}
 
         logger.info(f"NASA Scraping MCP Server initialized with cache_dir={cache_dir}")
 
@@ -81,28 +116,34 @@ class NASAScrapingMCPServer:
         """
         Enforce rate limiting between requests.
 
-        Waits if necessary to ensure minimum time between requests.
+        Waits for a token of the provider's bucket, so concurrent requests
+        are spaced RATE_LIMIT_SECONDS apart (or NASA_RATE_LIMIT) after
+        the configured burst.
         (AC-6.11.1.5: Rate limiting enforces 10 second delay)
         """
-        if self._last_request_time is not None:
-            loop_time = asyncio.get_event_loop().time()
-            elapsed = loop_time - self._last_request_time
-
-            if elapsed < RATE_LIMIT_SECONDS:
-                wait_time = RATE_LIMIT_SECONDS - elapsed
-                logger.info(f"Rate limit: waiting {wait_time:.1f}s before next request")
-                await asyncio.sleep(wait_time)
-
-    async def _fetch_with_backoff(self, url: str, client: httpx.AsyncClient) -> httpx.Response:
+        await self.limiter.acquire()
+
+    async def _fetch_with_backoff(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        method: str = "GET"
+    ) -> httpx.Response:
         """
         Fetch URL with exponential backoff on HTTP 429/503 responses.
 
-        Implements exponential backoff: base_backoff × 2^attempt (capped at MAX_BACKOFF)
+        Runs the shared fetch loop (see fetching.fetch_with_backoff) with
+        this server's rate limiter and retry settings.
         (AC-6.11.1.6, AC-6.11.1.7: Exponential backoff on HTTP 429/503)
 
         Args:
             url: URL to fetch
             client: httpx async client
+            stream: Return before reading the body; caller must aclose() the response
+            headers: Extra request headers (e.g. Range)
+            method: HTTP method (e.g. "HEAD" for revalidation)
 
         Returns:
             HTTP response
@@ -110,44 +151,64 @@ class NASAScrapingMCPServer:
         Raises:
             httpx.HTTPStatusError: If max retries exceeded
         """
-        for attempt in range(MAX_RETRIES):
-            try:
-                # Respect rate limit before request
-                await self._respect_rate_limit()
-
-                logger.debug(f"Fetching {url} (attempt {attempt + 1}/{MAX_RETRIES})")
-                response = await client.get(url)
-
-                # Update last request time
-                self._last_request_time = asyncio.get_event_loop().time()
-
-                # Check for rate limiting or service unavailable
-                if response.status_code in (429, 503):
-                    if attempt < MAX_RETRIES - 1:
-                        # Calculate exponential backoff (capped at MAX_BACKOFF)
-                        backoff = min(BASE_BACKOFF_SECONDS * (2 ** attempt), MAX_BACKOFF_SECONDS)
-                        logger.warning(
-                            f"HTTP {response.status_code} on attempt {attempt + 1}, "
-                            f"backing off {backoff}s"
-                        )
-                        await asyncio.sleep(backoff)
-                        continue
-                    else:
-                        logger.error(f"Max retries exceeded for {url}")
-
-                # Raise for other errors
-                response.raise_for_status()
-                return response
-
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code in (429, 503) and attempt < MAX_RETRIES - 1:
-                    continue
-                raise
+        return await fetch_with_backoff(
+            url, client, self.limiter, self._respect_rate_limit,
+            stream=stream, headers=headers, method=method,
+            max_retries=MAX_RETRIES, base_backoff=BASE_BACKOFF_SECONDS, max_backoff=MAX_BACKOFF_SECONDS
+        )
+
+    async def _fetch_video_page(self, video_id: str, video_url: str, client: httpx.AsyncClient) -> httpx.Response:
+        """
+        Fetch a video page, answering known-missing video IDs from the negative cache.
+
+        A 404/410 is recorded with a TTL that grows on repeated misses;
+        while it lasts the same error is raised without a request (no rate
+        limit slot, no backoff). A successful fetch forgets earlier misses.
+
+        Args:
+            video_id: NASA video identifier
+            video_url: Video page URL
+            client: httpx async client
+
+        Returns:
+            HTTP response
 
-        raise httpx.HTTPStatusError(
-            f"Max retries ({MAX_RETRIES}) exceeded",
-            request=None,
-            response=None
+        Raises:
+            httpx.HTTPStatusError: If the page does not exist (possibly cached)
+        """
+        key = response_key("video", "nasa", video_id=video_id)
+        miss = await asyncio.to_thread(self.negative.get, key)
+        if miss is not None:
+            logger.info(f"Video {video_id} is known to be missing, not fetching {video_url}")
+            raise not_found_error(video_url, miss)
+
+        try:
+            response = await self._fetch_with_backoff(video_url, client)
+        except httpx.HTTPStatusError as e:
+            if is_not_found(e):
+                await asyncio.to_thread(self.negative.record, key)
+            raise
+        await asyncio.to_thread(self.negative.clear, key)
+        return response
+
+    async def _stream_to_cache(self, video_id: str, url: str, client: httpx.AsyncClient) -> Dict[str, Any]:
+        """
+        Stream a video file from url straight into the cache.
+
+        Interrupted downloads are resumed with a Range request (see
+        fetching.stream_to_cache); the URL is remembered for range fetches.
+
+        Args:
+            video_id: NASA video identifier
+            url: Video file URL
+            client: httpx async client
+
+        Returns:
+            Cache metadata entry of the stored video
+        """
+        self._download_urls[video_id] = url
+        return await stream_to_cache(
+            self.cache, video_id, url, functools.partial(self._fetch_with_backoff, client=client)
         )
 
     async def search_videos(self, query: str, max_duration: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -183,111 +244,120 @@ class NASAScrapingMCPServer:
             if max_duration > 3600:  # Max 1 hour
                 raise ValueError("max_duration must not exceed 3600 seconds (1 hour)")
 
+        # Repeated queries are answered from the response cache (stale-while-revalidate)
+        # Queries without results are remembered briefly in the negative cache
+        key = response_key("search", "nasa", query=query, max_duration=max_duration)
+        return await self.responses.aget(
+            key, lambda: self._search_videos(query, max_duration), is_negative=lambda results: not results
+        )
+
+    async def _search_videos(self, query: str, max_duration: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Scrape NASA search results (search_videos() response cache miss path)."""
         # Build search URL
         search_url = f"{NASA_SEARCH_URL}?q={query}&media=video"
 
         logger.info(f"Searching NASA for: query='{query}', max_duration={max_duration}")
 
-        async with httpx.AsyncClient() as client:
-            # Fetch with backoff
-            response = await self._fetch_with_backoff(search_url, client)
-
-            # Parse HTML with efficient parser
-            # MEDIUM PRIORITY M3: Use lxml parser for better performance
-            soup = BeautifulSoup(response.text, 'lxml')
-
-            # Extract video results
-            results = []
-
-            # MEDIUM PRIORITY M3: Use efficient CSS selectors instead of multiple find_all calls
-            # Try different selectors for NASA website structure
-            video_items = soup.select('div.video-item')
-
-            if not video_items:
-                # Try alternative selector - data-nasa-id attribute
-                video_items = soup.select('div[data-nasa-id]')
-
-            if not video_items:
-                # Try another alternative - search-results container
-                search_results = soup.select_one('div.search-results')
-                if search_results:
-                    video_items = search_results.select('div[data-nasa-id], div.video-item')
-
-            for item in video_items:
-                try:
-                    # Extract video metadata
-                    # Try data-nasa-id attribute first (NASA specific)
-                    video_id = item.get('data-nasa-id')
-
-                    if not video_id:
-                        # Try data-video-id attribute (generic)
-                        video_id = item.get('data-video-id')
-
-                    if not video_id:
-                        # Try to extract from href
-                        link = item.find('a', href=True)
-                        if link:
-                            href = link['href']
-                            # Extract ID from URLs like /details/12345, /video/12345/download, etc.
-                            match = re.search(r'/(?:details|video)/(\d+)', href)
-                            if match:
-                                video_id = match.group(1)
-
-                    if not video_id:
-                        continue
-
-                    title_elem = item.find(['h1', 'h2', 'h3'], class_='title')
-                    title = title_elem.get_text(strip=True) if title_elem else f"NASA Video {video_id}"
-
-                    duration_elem = item.find('span', class_='duration')
-                    duration_text = duration_elem.get_text(strip=True) if duration_elem else "0"
-                    duration = self._parse_duration(duration_text)
-
-                    # Filter by max_duration if specified
-                    if max_duration and duration > max_duration:
-                        continue
-
-                    format_elem = item.find('span', class_='format')
-                    video_format = format_elem.get_text(strip=True) if format_elem else "MP4"
-
-                    resolution_elem = item.find('span', class_='resolution')
-                    resolution = resolution_elem.get_text(strip=True) if resolution_elem else "1920x1080"
-
-                    center_elem = item.find('span', class_='center')
-                    center = center_elem.get_text(strip=True) if center_elem else "NASA"
-
-                    date_elem = item.find('span', class_='date')
-                    date = date_elem.get_text(strip=True) if date_elem else ""
-
-                    download_link = item.find('a', class_='download-link')
-                    if download_link:
-                        download_url = download_link['href']
-                        if not download_url.startswith('http'):
-                            download_url = f"{NASA_BASE_URL}{download_url}"
-                    else:
-                        download_url = f"{NASA_VIDEO_URL}/{video_id}"
-
-                    description_elem = item.find('p', class_='description')
-                    description = description_elem.get_text(strip=True) if description_elem else ""
-
-                    results.append({
-                        'videoId': video_id,
-                        'title': title,
-                        'description': description,
-                        'duration': duration,
-                        'format': video_format,
-                        'resolution': resolution,
-                        'center': center,
-                        'date': date,
-                        'download_url': download_url
-                    })
-
-                except Exception as e:
-                    logger.warning(f"Error parsing video item: {e}")
+        client = self.http.client
+        # Fetch with backoff
+        response = await self._fetch_with_backoff(search_url, client)
+
+        # Parse HTML with efficient parser
+        # MEDIUM PRIORITY M3: Use lxml parser for better performance
+        soup = BeautifulSoup(response.text, 'lxml')
+
+        # Extract video results
+        results = []
+
+        # MEDIUM PRIORITY M3: Use efficient CSS selectors instead of multiple find_all calls
+        # Try different selectors for NASA website structure
+        video_items = soup.select('div.video-item')
+
+        if not video_items:
+            # Try alternative selector - data-nasa-id attribute
+            video_items = soup.select('div[data-nasa-id]')
+
+        if not video_items:
+            # Try another alternative - search-results container
+            search_results = soup.select_one('div.search-results')
+            if search_results:
+                video_items = search_results.select('div[data-nasa-id], div.video-item')
+
+        for item in video_items:
+            try:
+                # Extract video metadata
+                # Try data-nasa-id attribute first (NASA specific)
+                video_id = item.get('data-nasa-id')
+
+                if not video_id:
+                    # Try data-video-id attribute (generic)
+                    video_id = item.get('data-video-id')
+
+                if not video_id:
+                    # Try to extract from href
+                    link = item.find('a', href=True)
+                    if link:
+                        href = link['href']
+                        # Extract ID from URLs like /details/12345, /video/12345/download, etc.
+                        match = re.search(r'/(?:details|video)/(\d+)', href)
+                        if match:
+                            video_id = match.group(1)
+
+                if not video_id:
                     continue
 
-            logger.info(f"Found {len(results)} videos for query '{query}'")
-            return results
+                title_elem = item.find(['h1', 'h2', 'h3'], class_='title')
+                title = title_elem.get_text(strip=True) if title_elem else f"NASA Video {video_id}"
+
+                duration_elem = item.find('span', class_='duration')
+                duration_text = duration_elem.get_text(strip=True) if duration_elem else "0"
+                duration = self._parse_duration(duration_text)
+
+                # Filter by max_duration if specified
+                if max_duration and duration > max_duration:
+                    continue
+
+                format_elem = item.find('span', class_='format')
+                video_format = format_elem.get_text(strip=True) if format_elem else "MP4"
+
+                resolution_elem = item.find('span', class_='resolution')
+                resolution = resolution_elem.get_text(strip=True) if resolution_elem else "1920x1080"
+
+                center_elem = item.find('span', class_='center')
+                center = center_elem.get_text(strip=True) if center_elem else "NASA"
+
+                date_elem = item.find('span', class_='date')
+                date = date_elem.get_text(strip=True) if date_elem else ""
+
+                download_link = item.find('a', class_='download-link')
+                if download_link:
+                    download_url = download_link['href']
+                    if not download_url.startswith('http'):
+                        download_url = f"{NASA_BASE_URL}{download_url}"
+                else:
+                    download_url = f"{NASA_VIDEO_URL}/{video_id}"
+
+                description_elem = item.find('p', class_='description')
+                description = description_elem.get_text(strip=True) if description_elem else ""
+
+                results.append({
+                    'videoId': video_id,
+                    'title': title,
+                    'description': description,
+                    'duration': duration,
+                    'format': video_format,
+                    'resolution': resolution,
+                    'center': center,
+                    'date': date,
+                    'download_url': download_url
+                })
+
+            except Exception as e:
+                logger.warning(f"Error parsing video item: {e}")
+                continue
+
+        logger.info(f"Found {len(results)} videos for query '{query}'")
+        return results
 
     async def download_video(self, video_id: str) -> Dict[str, Any]:
         """
@@ -304,6 +374,45 @@ class NASAScrapingMCPServer:
             Dictionary with file_path and metadata
         """
         # MEDIUM PRIORITY M2: Input validation
+        video_id = self._validate_video_id(video_id)
+
+        logger.info(f"Downloading video {video_id} from NASA")
+
+        # HIGH PRIORITY H4: Use the public cache API instead of private _metadata access
+        # Cache hit, or a single download shared by concurrent requests
+        try:
+            video_meta, cached = await self.cache.aget_entry(
+                video_id, self._download_to_cache, revalidate_fn=self._revalidate
+            )
+        except Exception as e:
+            logger.error(f"Failed to download video {video_id}: {e}")
+            raise
+
+        if cached:
+            logger.info(f"Video {video_id} found in cache")
+        else:
+            logger.info(f"Downloaded and cached video {video_id} to {video_meta['file_path']}")
+
+        return {
+            'video_id': video_id,
+            'file_path': video_meta['file_path'],
+            'cached': cached
+        }
+
+    @staticmethod
+    def _validate_video_id(video_id: str) -> str:
+        """
+        Validate and sanitize a NASA video identifier.
+
+        Args:
+            video_id: NASA video identifier
+
+        Returns:
+            Stripped video_id
+
+        Raises:
+            ValueError: If video_id is empty, too long or contains invalid characters
+        """
         if not video_id or not isinstance(video_id, str):
             raise ValueError("video_id must be a non-empty string")
 
@@ -316,121 +425,292 @@ class NASAScrapingMCPServer:
         # Check for potentially dangerous characters (SQL injection, path traversal)
         if any(char in video_id for char in ['\x00', '..', '\\', '\n', '\r']):
             raise ValueError("video_id contains invalid characters")
+        return video_id
+
+    async def _download_to_cache(self, video_id: str) -> Dict[str, Any]:
+        """
+        Download a video from NASA straight into the cache.
+
+        Args:
+            video_id: NASA video identifier
+
+        Returns:
+            Cache metadata entry of the stored video
+        """
+        client = self.http.client
+        download_url, content = await self._resolve_download(video_id, client)
+
+        if download_url:
+            try:
+                # Stream the actual video file to the cache
+                return await self._stream_to_cache(video_id, download_url, client)
+            except Exception as e:
+                # Keep a resumable partial download for the next attempt
+                if await asyncio.to_thread(self.cache.resume_point, video_id) is not None:
+                    raise
+                # If the download link fails, try using the page content directly
+                logger.warning(f"Streaming {download_url} failed, trying direct content: {e}")
+
+        return await self.cache.put_stream(video_id, iter_chunks(content))
+
+    async def _resolve_download(self, video_id: str, client: httpx.AsyncClient) -> Tuple[Optional[str], bytes]:
+        """
+        Find the video file URL on a NASA video page.
+
+        Args:
+            video_id: NASA video identifier
+            client: httpx async client
 
+        Returns:
+            (download_url, content): download_url is None when the page
+            response is the video payload itself, which is then in content
+        """
         video_url = f"{NASA_VIDEO_URL}/{video_id}"
+        # First, get the video details page to find the download link
+        response = await self._fetch_video_page(video_id, video_url, client)
+        content = response.content if hasattr(response, 'content') and response.content else b''
 
-        logger.info(f"Downloading video {video_id} from NASA")
+        # Check if response is already binary content (for mocked tests)
+        # or if it's an HTML page that needs parsing
+        if content:
+            try:
+                text = content.decode('utf-8')
+                # If it decodes and doesn't look like HTML, treat as binary
+                if not ('<html' in text[:100].lower() or '<!DOCTYPE' in text[:100].upper()):
+                    # This is likely direct video content
+                    return None, content
+            except UnicodeDecodeError:
+                # Binary content, use directly
+                return None, content
+
+        # Parse HTML to find download link
+        try:
+            soup = BeautifulSoup(response.text, 'html.parser')
 
-        # HIGH PRIORITY H4: Use cache.get() instead of private _metadata access
-        async def fetch_video(v_id: str) -> bytes:
-            """Fetch video from NASA website."""
-            async with httpx.AsyncClient() as client:
-                # First, get the video details page to find the download link
-                response = await self._fetch_with_backoff(video_url, client)
-
-                # Check if response is already binary content (for mocked tests)
-                # or if it's an HTML page that needs parsing
-                content = None
-
-                # Try to get binary content directly first
-                if hasattr(response, 'content') and response.content:
-                    # Check if it's binary (not HTML) by trying to decode
-                    try:
-                        text = response.content.decode('utf-8')
-                        # If it decodes and doesn't look like HTML, treat as binary
-                        if not ('<html' in text[:100].lower() or '<!DOCTYPE' in text[:100].upper()):
-                            # This is likely direct video content
-                            content = response.content
-                    except UnicodeDecodeError:
-                        # Binary content, use directly
-                        content = response.content
-
-                # If we don't have content yet, parse HTML to find download link
-                if content is None:
-                    # Parse HTML to find download link
-                    try:
-                        soup = BeautifulSoup(response.text, 'html.parser')
-
-                        # Find the download link
-                        download_link = soup.find('a', {'href': re.compile(r'download')})
-                        if download_link:
-                            download_url = download_link['href']
-                            if not download_url.startswith('http'):
-                                download_url = f"{NASA_BASE_URL}{download_link}"
-                        else:
-                            # Try to find video source element
-                            video_elem = soup.find('video')
-                            if video_elem:
-                                source_elem = video_elem.find('source')
-                                if source_elem and source_elem.get('src'):
-                                    download_url = source_elem['src']
-                                    if not download_url.startswith('http'):
-                                        download_url = f"{NASA_BASE_URL}{download_url}"
-                                else:
-                                    download_url = video_url
-                            else:
-                                download_url = video_url
-
-                        # Download the actual video file
-                        video_response = await self._fetch_with_backoff(download_url, client)
-                        content = video_response.content if hasattr(video_response, 'content') else b''
-                    except Exception as e:
-                        # If HTML parsing fails, try using response content directly
-                        logger.warning(f"HTML parsing failed, trying direct content: {e}")
-                        content = response.content if hasattr(response, 'content') else b''
-
-                # Final fallback
-                if content is None:
-                    content = b''
-
-                return content
-
-        # Use cache.get() which handles cache hit/miss automatically
-        # Note: fetch_video is async but cache.get expects sync function
-        # so we need to handle this differently
-        import asyncio
+            # Find the download link
+            download_link = soup.find('a', {'href': re.compile(r'download')})
+            if download_link:
+                download_url = download_link['href']
+            else:
+                # Try to find video source element
+                video_elem = soup.find('video')
+                source_elem = video_elem.find('source') if video_elem else None
+                if source_elem and source_elem.get('src'):
+                    download_url = source_elem['src']
+                else:
+                    download_url = video_url
+
+            if not download_url.startswith('http'):
+                download_url = f"{NASA_BASE_URL}{download_url}"
+            return download_url, content
+        except Exception as e:
+            # If HTML parsing fails, try using response content directly
+            logger.warning(f"HTML parsing failed, trying direct content: {e}")
+            return None, content
 
+    async def _revalidate(self, video_id: str, video_meta: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        Ask the origin whether an expired cached video changed.
+
+        Sends a conditional HEAD request (If-None-Match/If-Modified-Since)
+        for the video file, so no body is transferred.
+
+        Args:
+            video_id: NASA video identifier
+            video_meta: Expired metadata entry with etag and/or last_modified
+
+        Returns:
+            Current validators if the video is unchanged, None if it must
+            be downloaded again
+        """
         try:
-            # Try to get from cache first
-            if self.cache.is_cached(video_id):
-                logger.info(f"Video {video_id} found in cache")
-                self.cache._load_metadata()
-                video_meta = self.cache._metadata["videos"][video_id]
-                return {
-                    'video_id': video_id,
-                    'file_path': video_meta['file_path'],
-                    'cached': True
-                }
-
-            # Cache miss - download the video
-            content = await fetch_video(video_id)
-
-            # Cache the content using cache.get() pattern
-            cache_file = self.cache.provider_dir / f"{video_id}.mp4"
-            cache_file.write_bytes(content)
-
-            # Update metadata
-            self.cache._load_metadata()
-            self.cache._metadata["videos"][video_id] = {
-                "provider": "nasa",
-                "cached_date": datetime.now().isoformat(),
-                "ttl": 30,
-                "file_path": str(cache_file)
-            }
-            self.cache._save_metadata()
+            client = self.http.client
+            download_url = self._download_urls.get(video_id)
+            if download_url is None:
+                download_url, _ = await self._resolve_download(video_id, client)
+                if not download_url:
+                    return None  # the page itself is the payload
+                self._download_urls[video_id] = download_url
+
+            response = await self._fetch_with_backoff(
+                download_url, client, headers=conditional_headers(video_meta), method="HEAD"
+            )
+            return unchanged_validators(response.status_code, response.headers, video_meta)
+        except httpx.HTTPError as e:
+            logger.warning(f"Revalidation of {video_id} failed, downloading again: {e}")
+            return None
 
-            logger.info(f"Downloaded and cached video {video_id} to {cache_file}")
+    async def download_video_range(self, video_id: str, offset: int, length: int) -> Dict[str, Any]:
+        """
+        Download and cache only a byte range of a NASA video.
 
-            return {
-                'video_id': video_id,
-                'file_path': str(cache_file),
-                'cached': False
-            }
+        Missing parts of the range are fetched with HTTP Range requests and
+        stored in a sparse file; bytes sit at their original offsets, so the
+        range can be read from file_path even if the video is partial.
 
-        except Exception as e:
-            logger.error(f"Failed to download video {video_id}: {e}")
+        Args:
+            video_id: NASA video identifier
+            offset: First byte offset
+            length: Number of bytes
+
+        Returns:
+            Dictionary with video_id, file_path, offset, length, partial and cached
+        """
+        video_id = self._validate_video_id(video_id)
+        if offset < 0 or length <= 0:
+            raise ValueError("offset must be >= 0 and length must be > 0")
+
+        video_meta, cached = await self.cache.aensure_range(video_id, offset, length, self._fetch_range)
+        return {
+            'video_id': video_id,
+            'file_path': video_meta['file_path'],
+            'offset': offset,
+            'length': length,
+            'partial': bool(video_meta.get('partial')),
+            'cached': cached
+        }
+
+    async def read_video_range(self, video_id: str, offset: int, length: int) -> bytes:
+        """
+        Read a byte range of a NASA video, downloading only what is missing.
+
+        Args:
+            video_id: NASA video identifier
+            offset: First byte offset
+            length: Number of bytes
+
+        Returns:
+            The requested bytes (fewer at the end of the video)
+        """
+        await self.download_video_range(video_id, offset, length)
+        return await self.cache.aread_range(video_id.strip(), offset, length, self._fetch_range)
+
+    async def _fetch_range(self, video_id: str, start: int, end: int) -> Tuple[bytes, Optional[int]]:
+        """
+        Fetch bytes [start, end) of a NASA video with an HTTP Range request.
+
+        Args:
+            video_id: NASA video identifier
+            start: First byte offset
+            end: Offset after the last byte
+
+        Returns:
+            (data, total_size) where total_size is the video length if known
+
+        Raises:
+            IOError: If a partial response does not hold exactly the requested range
+        """
+        client = self.http.client
+        download_url = self._download_urls.get(video_id)
+        if download_url is None:
+            download_url, content = await self._resolve_download(video_id, client)
+            if not download_url:
+                return content[start:end], len(content)
+            self._download_urls[video_id] = download_url
+
+        try:
+            response = await self._fetch_with_backoff(
+                download_url, client, stream=True, headers={"Range": range_header(start, end)}
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response is not None and e.response.status_code == 416:
+                # Range starts past the end of the video
+                return b'', parse_content_range(e.response.headers.get("Content-Range"))
             raise
 
+        try:
+            if response.status_code == 206:
+                data = b''.join([chunk async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE)])
+                content_range = response.headers.get("Content-Range")
+                if not range_matches(content_range, start, end, len(data)):
+                    raise IOError(
+                        f"Range request for bytes {start}-{end - 1} of {video_id} returned "
+                        f"{len(data)} bytes with Content-Range {content_range!r}"
+                    )
+                return data, parse_content_range(content_range)
+
+            # Server ignored the Range header and sent the whole file
+            data = await read_window(response.aiter_bytes(STREAM_CHUNK_SIZE), start, end)
+            content_length = response.headers.get("Content-Length")
+            if content_length:
+                return data, int(content_length)
+            return data, start + len(data) if len(data) < end - start else None
+        finally:
+            await response.aclose()
+
+    async def prefetch(
+        self,
+        items: List[Any],
+        per_query: int = 1,
+        max_requests: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Warm the cache in the background from a scene list.
+
+        Videos are downloaded highest priority first, one request at a time
+        within the NASA rate limit; already cached videos are skipped.
+
+        Args:
+            items: Query strings, or dictionaries with video_id or query and
+                optional priority (higher first) and max_duration
+            per_query: Search results downloaded per query (default: 1)
+            max_requests: Cap on rate-limited requests: one per search, two per
+                download (default: unlimited)
+
+        Returns:
+            Progress snapshot of the started job (includes job_id)
+        """
+        job = self.prefetcher.start(items, per_query=per_query, max_requests=max_requests)
+        return job.snapshot()
+
+    def prefetch_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Get the progress of a prefetch job.
+
+        Args:
+            job_id: Job identifier returned by prefetch()
+
+        Returns:
+            Progress snapshot
+        """
+        return self.prefetcher.get(job_id).snapshot()
+
+    def cancel_prefetch(self, job_id: str) -> Dict[str, Any]:
+        """
+        Cancel a prefetch job; interrupted downloads stay resumable.
+
+        Args:
+            job_id: Job identifier returned by prefetch()
+
+        Returns:
+            Progress snapshot with cancelled True if the job was running
+        """
+        job = self.prefetcher.get(job_id)
+        return {**job.snapshot(), "cancelled": job.cancel()}
+
+    def rate_limit_status(self) -> Dict[str, Any]:
+        """
+        Get the current request rate of the provider's adaptive rate limiter.
+
+        Returns:
+            Limiter statistics (see RateLimiter.stats)
+        """
+        return self.limiter.stats()
+
+    async def aclose(self) -> None:
+        """
+        Release the server's resources on shutdown.
+
+        Cancels prefetch jobs, closes the response caches, flushes and
+        closes the video cache metadata and closes the pooled HTTP
+        connections.
+        """
+        self.prefetcher.cancel_all()
+        self.responses.close()
+        self.negative.close()
+        await asyncio.to_thread(self.cache.close)
+        await self.http.aclose()
+
     async def get_video_details(self, video_id: str) -> Dict[str, Any]:
         """
         Retrieve video metadata from NASA.
@@ -458,78 +738,83 @@ class NASAScrapingMCPServer:
         if any(char in video_id for char in ['\x00', '..', '\\', '\n', '\r']):
             raise ValueError("video_id contains invalid characters")
 
+        key = response_key("details", "nasa", video_id=video_id)
+        return await self.responses.aget(key, lambda: self._get_video_details(video_id))
+
+    async def _get_video_details(self, video_id: str) -> Dict[str, Any]:
+        """Scrape NASA video metadata (get_video_details() response cache miss path)."""
         video_url = f"{NASA_VIDEO_URL}/{video_id}"
 
         logger.info(f"Getting details for video {video_id} from NASA")
 
-        async with httpx.AsyncClient() as client:
-            # Fetch with backoff
-            response = await self._fetch_with_backoff(video_url, client)
-
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract metadata
-            title_elem = soup.find(['h1', 'h2'], class_='title')
-            title = title_elem.get_text(strip=True) if title_elem else f"NASA Video {video_id}"
-
-            desc_elem = soup.find('div', class_='description')
-            if desc_elem:
-                description = desc_elem.get_text(strip=True)
-            else:
-                desc_elem = soup.find('p', class_='description')
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-
-            duration_elem = soup.find('span', class_='duration')
-            duration_text = duration_elem.get_text(strip=True) if duration_elem else "0"
-            duration = self._parse_duration(duration_text)
-
-            format_elem = soup.find('span', class_='format')
-            video_format = format_elem.get_text(strip=True) if format_elem else "MP4"
-
-            resolution_elem = soup.find('span', class_='resolution')
-            resolution = resolution_elem.get_text(strip=True) if resolution_elem else "1920x1080"
-
-            center_elem = soup.find('span', class_='center')
-            center = center_elem.get_text(strip=True) if center_elem else "NASA"
-
-            date_elem = soup.find('span', class_='date')
-            date = date_elem.get_text(strip=True) if date_elem else ""
-
-            # Find download link
-            download_link = soup.find('a', {'href': re.compile(r'download')})
-            if download_link:
-                download_url = download_link['href']
-                if not download_url.startswith('http'):
-                    download_url = f"{NASA_BASE_URL}{download_url}"
-            else:
-                # Try video source element
-                video_elem = soup.find('video')
-                if video_elem:
-                    source_elem = video_elem.find('source')
-                    if source_elem and source_elem.get('src'):
-                        download_url = source_elem['src']
-                        if not download_url.startswith('http'):
-                            download_url = f"{NASA_BASE_URL}{download_url}"
-                    else:
-                        download_url = video_url
+        client = self.http.client
+        # Fetch with backoff
+        response = await self._fetch_video_page(video_id, video_url, client)
+
+        # Parse HTML
+        soup = BeautifulSoup(response.text, 'html.parser')
+
+        # Extract metadata
+        title_elem = soup.find(['h1', 'h2'], class_='title')
+        title = title_elem.get_text(strip=True) if title_elem else f"NASA Video {video_id}"
+
+        desc_elem = soup.find('div', class_='description')
+        if desc_elem:
+            description = desc_elem.get_text(strip=True)
+        else:
+            desc_elem = soup.find('p', class_='description')
+            description = desc_elem.get_text(strip=True) if desc_elem else ""
+
+        duration_elem = soup.find('span', class_='duration')
+        duration_text = duration_elem.get_text(strip=True) if duration_elem else "0"
+        duration = self._parse_duration(duration_text)
+
+        format_elem = soup.find('span', class_='format')
+        video_format = format_elem.get_text(strip=True) if format_elem else "MP4"
+
+        resolution_elem = soup.find('span', class_='resolution')
+        resolution = resolution_elem.get_text(strip=True) if resolution_elem else "1920x1080"
+
+        center_elem = soup.find('span', class_='center')
+        center = center_elem.get_text(strip=True) if center_elem else "NASA"
+
+        date_elem = soup.find('span', class_='date')
+        date = date_elem.get_text(strip=True) if date_elem else ""
+
+        # Find download link
+        download_link = soup.find('a', {'href': re.compile(r'download')})
+        if download_link:
+            download_url = download_link['href']
+            if not download_url.startswith('http'):
+                download_url = f"{NASA_BASE_URL}{download_url}"
+        else:
+            # Try video source element
+            video_elem = soup.find('video')
+            if video_elem:
+                source_elem = video_elem.find('source')
+                if source_elem and source_elem.get('src'):
+                    download_url = source_elem['src']
+                    if not download_url.startswith('http'):
+                        download_url = f"{NASA_BASE_URL}{download_url}"
                 else:
                     download_url = video_url
-
-            details = {
-                'videoId': video_id,
-                'title': title,
-                'description': description,
-                'duration': duration,
-                'format': video_format,
-                'resolution': resolution,
-                'center': center,
-                'date': date,
-                'download_url': download_url
-            }
-
-            logger.info(f"Retrieved details for video {video_id}: {title}")
-            return details
+            else:
+                download_url = video_url
+
+        details = {
+            'videoId': video_id,
+            'title': title,
+            'description': description,
+            'duration': duration,
+            'format': video_format,
+            'resolution': resolution,
+            'center': center,
+            'date': date,
+            'download_url': download_url
+        }
+
+        logger.info(f"Retrieved details for video {video_id}: {title}")
+        return details
 
     def _parse_duration(self, duration_text: str) -> int:
         """
@@ -571,6 +856,49 @@ class NASAScrapingMCPServer:
         return total_seconds
 
 
+# Default cache directory when none is given on the command line
+DEFAULT_CACHE_DIR = "./assets/cache"
+
+# Long-lived server shared by every tool call (see get_server())
+_server_instance: Optional[NASAScrapingMCPServer] = None
+
+
+def get_server(cache_dir: Optional[str] = None) -> NASAScrapingMCPServer:
+    """
+    Get the process-wide NASA server, creating it on first use.
+
+    Every tool call shares its VideoCache, HTTP connection pool, rate
+    limiter state and response caches instead of rebuilding them.
+
+    Args:
+        cache_dir: Cache directory used when the server is created
+            (default: first command-line argument or ./assets/cache)
+
+    Returns:
+        The shared server instance
+    """
+    global _server_instance
+    if _server_instance is None:
+        if cache_dir is None:
+            import sys
+            cache_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CACHE_DIR
+        _server_instance = NASAScrapingMCPServer(cache_dir=cache_dir)
+    return _server_instance
+
+
+# Names of the tools registered by list_tools()
+TOOL_NAMES = (
+    "search_videos",
+    "download_video",
+    "download_video_range",
+    "get_video_details",
+    "prefetch_videos",
+    "prefetch_status",
+    "cancel_prefetch",
+    "rate_limit_status",
+)
+
+
 # HIGH PRIORITY H1 & H3: MCP stdio server implementation with tool registration
 
 
@@ -618,6 +946,31 @@ async def list_tools() -> List[Tool]:
                 "required": ["video_id"]
             }
         ),
+        Tool(
+            name="download_video_range",
+            description=(
+                "Download only a byte range of a NASA video into the cache "
+                "(bytes are stored at their original offsets in file_path)"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "video_id": {
+                        "type": "string",
+                        "description": "NASA video identifier"
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "First byte offset"
+                    },
+                    "length": {
+                        "type": "integer",
+                        "description": "Number of bytes"
+                    }
+                },
+                "required": ["video_id", "offset", "length"]
+            }
+        ),
         Tool(
             name="get_video_details",
             description="Get detailed metadata for a NASA video",
@@ -631,6 +984,76 @@ async def list_tools() -> List[Tool]:
                 },
                 "required": ["video_id"]
             }
+        ),
+        Tool(
+            name="prefetch_videos",
+            description=(
+                "Download videos into the cache in the background, highest priority first "
+                "(returns a job_id for prefetch_status/cancel_prefetch)"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "description": "Videos or searches to prefetch",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "video_id": {"type": "string", "description": "NASA video identifier"},
+                                "query": {"type": "string", "description": "Search query"},
+                                "priority": {"type": "number", "description": "Higher is fetched first"},
+                                "max_duration": {"type": "number", "description": "Search duration filter"}
+                            }
+                        }
+                    },
+                    "per_query": {
+                        "type": "integer",
+                        "description": "Search results downloaded per query (default: 1)"
+                    },
+                    "max_requests": {
+                        "type": "integer",
+                        "description": "Maximum rate-limited requests: one per search, two per download (optional)"
+                    }
+                },
+                "required": ["items"]
+            }
+        ),
+        Tool(
+            name="prefetch_status",
+            description="Get the progress of a prefetch job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job identifier returned by prefetch_videos"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="cancel_prefetch",
+            description="Cancel a prefetch job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job identifier returned by prefetch_videos"
+                    }
+                },
+                "required": ["job_id"]
+            }
+        ),
+        Tool(
+            name="rate_limit_status",
+            description="Get the current request rate of the adaptive rate limiter",
+            inputSchema={
+                "type": "object",
+                "properties": {}
+            }
         )
     ]
 
@@ -650,9 +1073,9 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     Returns:
         Tool result as text content
     """
-    import sys
-    cache_dir = sys.argv[1] if len(sys.argv) > 1 else "./assets/cache"
-    nasa_server = NASAScrapingMCPServer(cache_dir=cache_dir)
+    if name not in TOOL_NAMES:
+        raise ValueError(f"Unknown tool: {name}")
+    nasa_server = get_server()
 
     if name == "search_videos":
         results = await nasa_server.search_videos(
@@ -667,12 +1090,40 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         )
         return [TextContent(type="text", text=str(result))]
 
+    elif name == "download_video_range":
+        result = await nasa_server.download_video_range(
+            video_id=arguments.get("video_id"),
+            offset=int(arguments.get("offset", 0)),
+            length=int(arguments.get("length", 0))
+        )
+        return [TextContent(type="text", text=str(result))]
+
     elif name == "get_video_details":
         details = await nasa_server.get_video_details(
             video_id=arguments.get("video_id")
         )
         return [TextContent(type="text", text=str(details))]
 
+    elif name == "prefetch_videos":
+        max_requests = arguments.get("max_requests")
+        result = await nasa_server.prefetch(
+            items=arguments.get("items") or [],
+            per_query=int(arguments.get("per_query", 1)),
+            max_requests=int(max_requests) if max_requests is not None else None
+        )
+        return [TextContent(type="text", text=str(result))]
+
+    elif name == "prefetch_status":
+        result = nasa_server.prefetch_status(job_id=arguments.get("job_id"))
+        return [TextContent(type="text", text=str(result))]
+
+    elif name == "cancel_prefetch":
+        result = nasa_server.cancel_prefetch(job_id=arguments.get("job_id"))
+        return [TextContent(type="text", text=str(result))]
+
+    elif name == "rate_limit_status":
+        return [TextContent(type="text", text=str(nasa_server.rate_limit_status()))]
+
     else:
         raise ValueError(f"Unknown tool: {name}")
 
@@ -696,21 +1147,28 @@ def main():
     logger.info("Starting NASA Scraping MCP Server")
 
     # Default cache directory
-    cache_dir = sys.argv[1] if len(sys.argv) > 1 else "./assets/cache"
+    cache_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CACHE_DIR
 
-    # Create server instance
-    nasa_server_instance = NASAScrapingMCPServer(cache_dir=cache_dir)
+    # Create the server instance shared by every tool call
+    nasa_server_instance = get_server(cache_dir)
 
     logger.info(f"NASA Scraping MCP Server ready (cache_dir={cache_dir})")
 
     # HIGH PRIORITY H1: Run MCP stdio server
     async def run_server():
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                server.create_initialization_options()
-            )
+        # Sweep expired entries and orphan files in the background
+        janitor_task = start_janitor(nasa_server_instance.cache)
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    server.create_initialization_options()
+                )
+        finally:
+            if janitor_task is not None:
+                janitor_task.cancel()
+            await nasa_server_instance.aclose()
 
     asyncio.run(run_server())
 
@@ -0,0 +1,217 @@
+"""
+Negative Cache for Missing Videos and Empty Searches
+
+Scene matching keeps asking for video IDs that 404 and for queries that
+find nothing. Each of those lookups costs a rate-limit slot (30 s for
+DVIDS, 10 s for NASA) and possibly the backoff loop. NegativeCache
+remembers such misses in cache_dir/negative.db, next to the VideoCache
+metadata, so repeats are answered without touching the network.
+
+A negative entry expires after base_ttl seconds. If the lookup misses
+again after expiry, the TTL doubles (up to max_ttl): a video that 404s
+once is retried after a few minutes, one that keeps 404ing only about
+once a day. A successful lookup clears the entry, and entries not renewed
+for max_ttl after expiring are forgotten, so the count starts over.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+NEGATIVE_DB_NAME = "negative.db"
+
+DEFAULT_NEGATIVE_TTL_SECONDS = 300
+DEFAULT_NEGATIVE_MAX_TTL_SECONDS = 24 * 3600
+NEGATIVE_TTL_GROWTH = 2
+
+# Statuses meaning the video does not exist (as opposed to transient errors)
+NOT_FOUND_STATUSES = (404, 410)
+
+
+def negative_cache_options_from_env() -> Dict[str, Any]:
+    """
+    Build NegativeCache keyword arguments from environment variables.
+
+    VIDEO_CACHE_NEGATIVE_TTL is the first TTL and VIDEO_CACHE_NEGATIVE_MAX_TTL
+    the cap, both in seconds.
+
+    Returns:
+        Dictionary of NegativeCache keyword arguments
+    """
+    return {
+        "base_ttl": float(os.environ.get("VIDEO_CACHE_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL_SECONDS)),
+        "max_ttl": float(os.environ.get("VIDEO_CACHE_NEGATIVE_MAX_TTL", DEFAULT_NEGATIVE_MAX_TTL_SECONDS)),
+    }
+
+
+def is_not_found(error: BaseException) -> bool:
+    """
+    Check whether an error says the requested resource does not exist.
+
+    Args:
+        error: Exception raised by a lookup
+
+    Returns:
+        True for HTTP 404/410 errors
+    """
+    response = getattr(error, "response", None) if isinstance(error, httpx.HTTPStatusError) else None
+    return response is not None and response.status_code in NOT_FOUND_STATUSES
+
+
+def not_found_error(url: str, miss: Dict[str, Any]) -> httpx.HTTPStatusError:
+    """
+    Build the error raised for a lookup answered by the negative cache.
+
+    It is the same HTTPStatusError (status 404) a network lookup raises,
+    so callers need not tell the two apart.
+
+    Args:
+        url: URL that would have been fetched
+        miss: Negative entry from NegativeCache.get()
+
+    Returns:
+        HTTPStatusError to raise
+    """
+    request = httpx.Request("GET", url)
+    return httpx.HTTPStatusError(
+        f"Not found (cached, retry in {miss['expires_in']:.0f}s): {url}",
+        request=request,
+        response=httpx.Response(404, request=request)
+    )
+
+
+class NegativeCache:
+    """
+    Persistent record of failed lookups with exponentially growing TTLs.
+
+    Attributes:
+        db_path: Path to the SQLite database file
+        base_ttl: Seconds the first miss of a key is remembered
+        max_ttl: Upper bound of the TTL
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        base_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        max_ttl: float = DEFAULT_NEGATIVE_MAX_TTL_SECONDS
+    ):
+        """
+        Open (or create) the negative cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            base_ttl: Seconds the first miss is remembered (default: 5 minutes)
+            max_ttl: Upper bound of the TTL (default: 1 day)
+        """
+        self.db_path = Path(db_path)
+        self.base_ttl = base_ttl
+        self.max_ttl = max(max_ttl, base_ttl)
+        self._lock = threading.RLock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS misses ("
+                    " key TEXT PRIMARY KEY,"
+                    " misses INTEGER NOT NULL,"
+                    " expires_at REAL NOT NULL,"
+                    " value TEXT)"
+                )
+        except sqlite3.DatabaseError:
+            self._conn.close()
+            raise
+
+    def ttl_for(self, misses: int) -> float:
+        """
+        Get the TTL of a key that missed a number of times in a row.
+
+        Args:
+            misses: Consecutive misses including the current one
+
+        Returns:
+            base_ttl * 2^(misses - 1), capped at max_ttl
+        """
+        return min(self.base_ttl * NEGATIVE_TTL_GROWTH ** max(misses - 1, 0), self.max_ttl)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an unexpired negative entry.
+
+        Args:
+            key: Lookup key (e.g. from response_key())
+
+        Returns:
+            Dictionary with misses, expires_in (seconds) and the recorded
+            value, or None if the key may be looked up again
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT misses, expires_at, value FROM misses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        expires_in = row[1] - time.time()
+        if expires_in <= 0:
+            return None
+        return {
+            "misses": row[0],
+            "expires_in": expires_in,
+            "value": json.loads(row[2]) if row[2] is not None else None,
+        }
+
+    def record(self, key: str, value: Any = None) -> float:
+        """
+        Record a miss, growing the TTL if the key missed before.
+
+        Args:
+            key: Lookup key
+            value: JSON-serializable answer to return for the key while
+                it is cached (e.g. an empty result list)
+
+        Returns:
+            TTL of the entry in seconds
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            # Forget keys that have not missed for a long time
+            self._conn.execute("DELETE FROM misses WHERE expires_at < ?", (now - self.max_ttl,))
+            row = self._conn.execute("SELECT misses FROM misses WHERE key = ?", (key,)).fetchone()
+            misses = (row[0] if row else 0) + 1
+            ttl = self.ttl_for(misses)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO misses (key, misses, expires_at, value) VALUES (?, ?, ?, ?)",
+                (key, misses, now + ttl, json.dumps(value) if value is not None else None)
+            )
+        logger.info(f"Negative cache: {key} missed {misses} time(s), remembered for {ttl:.0f}s")
+        return ttl
+
+    def clear(self, key: str) -> bool:
+        """
+        Forget a key after a successful lookup.
+
+        Args:
+            key: Lookup key
+
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM misses WHERE key = ?", (key,)).rowcount > 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,396 @@
+"""
+Cache Warmup from a Scene List
+
+When a script is generated all scene keywords are known up front, but
+clips used to be fetched one at a time when assembly asked for them.
+PrefetchPlanner fills the VideoCache in the background instead: given
+video IDs and search queries with priorities, a prefetch job downloads
+them highest priority first, so assembly later finds them cached.
+
+Jobs stay within the provider's rate limit: items are processed one at a
+time through the server's own search_videos/download_video (and so its
+rate limiter, response cache and negative cache), videos already cached
+cost nothing, and max_requests caps how many rate-limited requests a job
+may spend: one per search and DOWNLOAD_REQUESTS per download (the video
+page, then the file). Progress is available as a snapshot (and an optional callback);
+jobs can be cancelled, leaving interrupted downloads resumable.
+
+Jobs are registered process-wide, so they can be queried and cancelled
+by ID from any MCP tool call.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Job states; the last three are final
+PREFETCH_STATES = ("pending", "running", "done", "cancelled", "failed")
+
+# Finished jobs kept for status queries
+MAX_FINISHED_JOBS = 100
+
+# Rate-limited requests of one download_video: the video page, then the file
+DOWNLOAD_REQUESTS = 2
+
+_jobs: Dict[str, "PrefetchJob"] = {}
+
+
+class PrefetchItem:
+    """
+    One video ID or search query to prefetch.
+
+    Attributes:
+        kind: "video" or "query"
+        value: Video ID or query string
+        priority: Higher priorities are fetched first
+        max_duration: Search filter for queries (seconds, optional)
+    """
+
+    def __init__(self, kind: str, value: str, priority: float = 0, max_duration: Optional[int] = None):
+        """
+        Initialize a prefetch item.
+
+        Args:
+            kind: "video" or "query"
+            value: Video ID or query string
+            priority: Higher priorities are fetched first (default: 0)
+            max_duration: Search filter for queries (optional)
+        """
+        self.kind = kind
+        self.value = value
+        self.priority = priority
+        self.max_duration = max_duration
+
+    @classmethod
+    def parse(cls, item: Union[str, Dict[str, Any]]) -> "PrefetchItem":
+        """
+        Build an item from a query string or a dictionary.
+
+        Args:
+            item: Query string, or dictionary with video_id or query and
+                optional priority and max_duration
+
+        Returns:
+            PrefetchItem
+
+        Raises:
+            ValueError: If the item names neither a video_id nor a query
+        """
+        if isinstance(item, str):
+            item = {"query": item}
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid prefetch item: {item!r}")
+        priority = float(item.get("priority") or 0)
+        if item.get("video_id"):
+            return cls("video", str(item["video_id"]), priority)
+        if item.get("query") and str(item["query"]).strip():
+            return cls("query", str(item["query"]), priority, item.get("max_duration"))
+        raise ValueError(f"Prefetch item needs a video_id or a query: {item!r}")
+
+
+class PrefetchJob:
+    """
+    Background warmup of a VideoCache from a list of prefetch items.
+
+    Attributes:
+        job_id: Unique job identifier
+        provider: Provider name of the server running the job
+        items: Items in processing order (highest priority first)
+        per_query: Search results downloaded per query
+        max_requests: Cap on rate-limited requests (a search costs one, a
+            download DOWNLOAD_REQUESTS), or None
+        status: One of PREFETCH_STATES
+        counts: Numbers of cached, downloaded, failed and skipped videos
+        errors: Error messages by video ID or query
+    """
+
+    def __init__(
+        self,
+        server: Any,
+        items: List[PrefetchItem],
+        per_query: int = 1,
+        max_requests: Optional[int] = None,
+        rate_interval: Union[float, Callable[[], float]] = 0,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Create a job (use PrefetchPlanner.start() to run it).
+
+        Args:
+            server: Scraping server with cache, search_videos and download_video
+            items: Items to prefetch
+            per_query: Search results downloaded per query (default: 1)
+            max_requests: Cap on rate-limited requests (default: unlimited)
+            rate_interval: Provider's seconds between requests, for estimates,
+                or a function returning the current value (adaptive limiters)
+            on_progress: Called with snapshot() after every step
+        """
+        self.job_id = uuid.uuid4().hex[:12]
+        self.provider = server.cache.provider_name
+        # Stable sort: equal priorities keep their order
+        self.items = sorted(items, key=lambda item: -item.priority)
+        self.per_query = max(per_query, 0)
+        self.max_requests = max_requests
+        self.status = "pending"
+        self.counts = {"cached": 0, "downloaded": 0, "failed": 0, "skipped": 0}
+        self.errors: Dict[str, str] = {}
+        self._server = server
+        self._rate_interval = rate_interval
+        self._on_progress = on_progress
+        self._requests = 0
+        self._items_done = 0
+        self._current: Optional[str] = None
+        self._seen: set = set()
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def finished(self) -> bool:
+        """True once the job is done, cancelled or failed."""
+        return self.status in PREFETCH_STATES[2:]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the progress of the job.
+
+        Returns:
+            Dictionary with job_id, provider, status, items_total,
+            items_done, current, requests (rate-limited requests spent),
+            the video counts, errors and
+            estimated_seconds_left (rate-limit bound estimate)
+        """
+        interval = self._rate_interval() if callable(self._rate_interval) else self._rate_interval
+        remaining = self.items[self._items_done:]
+        pending_requests = sum(
+            DOWNLOAD_REQUESTS if item.kind == "video" else 1 + self.per_query * DOWNLOAD_REQUESTS
+            for item in remaining
+        )
+        if self.max_requests is not None:
+            pending_requests = min(pending_requests, max(self.max_requests - self._requests, 0))
+        return {
+            "job_id": self.job_id,
+            "provider": self.provider,
+            "status": self.status,
+            "items_total": len(self.items),
+            "items_done": self._items_done,
+            "current": self._current,
+            "requests": self._requests,
+            **self.counts,
+            "errors": dict(self.errors),
+            "estimated_seconds_left": 0 if self.finished else pending_requests * interval,
+            "elapsed_seconds": (self._finished_at or time.time()) - self._started_at if self._started_at else 0,
+        }
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job; an interrupted download stays resumable.
+
+        Returns:
+            True if the job was still running
+        """
+        if self.finished or self._task is None:
+            return False
+        self._task.cancel()
+        if self.status == "pending":
+            # Cancelled before its task ever ran
+            self.status = "cancelled"
+        return True
+
+    async def wait(self) -> Dict[str, Any]:
+        """
+        Wait for the job to finish.
+
+        Returns:
+            Final snapshot()
+        """
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+        return self.snapshot()
+
+    async def run(self) -> None:
+        """Process all items in priority order (the job's task)."""
+        self.status = "running"
+        self._started_at = time.time()
+        logger.info(f"Prefetch {self.job_id} ({self.provider}): {len(self.items)} items")
+        try:
+            for item in self.items:
+                if item.kind == "query":
+                    await self._prefetch_query(item)
+                else:
+                    await self._prefetch_video(item.value)
+                self._items_done += 1
+                self._report()
+            self.status = "done"
+        except asyncio.CancelledError:
+            self.status = "cancelled"
+            raise
+        except Exception as e:
+            self.status = "failed"
+            self.errors["job"] = str(e)
+            logger.error(f"Prefetch {self.job_id} failed: {e}")
+        finally:
+            self._current = None
+            self._finished_at = time.time()
+            logger.info(f"Prefetch {self.job_id} {self.status}: {self.counts}")
+            self._report()
+
+    async def _prefetch_query(self, item: PrefetchItem) -> None:
+        """Search a query and prefetch its top per_query results."""
+        if self.per_query == 0:
+            return
+        if not self._take_request():
+            self.counts["skipped"] += self.per_query
+            return
+        self._current = f"search: {item.value}"
+        self._report()
+        try:
+            results = await self._server.search_videos(query=item.value, max_duration=item.max_duration)
+        except Exception as e:
+            self.errors[item.value] = str(e)
+            logger.warning(f"Prefetch search '{item.value}' failed: {e}")
+            return
+
+        video_ids = [str(result["videoId"]) for result in results if result.get("videoId")]
+        for video_id in video_ids[:self.per_query]:
+            await self._prefetch_video(video_id)
+
+    async def _prefetch_video(self, video_id: str) -> None:
+        """Download a video unless it is cached or the request budget is spent."""
+        if video_id in self._seen:
+            return
+        self._seen.add(video_id)
+
+        if await asyncio.to_thread(self._server.cache.is_cached, video_id):
+            self.counts["cached"] += 1
+            return
+        if not self._take_request(DOWNLOAD_REQUESTS):
+            self.counts["skipped"] += 1
+            return
+
+        self._current = video_id
+        self._report()
+        try:
+            result = await self._server.download_video(video_id=video_id)
+        except Exception as e:
+            self.counts["failed"] += 1
+            self.errors[video_id] = str(e)
+            logger.warning(f"Prefetch of video {video_id} failed: {e}")
+            return
+        self.counts["cached" if result.get("cached") else "downloaded"] += 1
+
+    def _take_request(self, count: int = 1) -> bool:
+        """Spend count rate-limited requests of the budget, if that many are left."""
+        if self.max_requests is not None and self._requests + count > self.max_requests:
+            return False
+        self._requests += count
+        return True
+
+    def _report(self) -> None:
+        """Pass the current progress to the progress callback."""
+        if self._on_progress is None:
+            return
+        try:
+            self._on_progress(self.snapshot())
+        except Exception as e:
+            logger.warning(f"Prefetch progress callback failed: {e}")
+
+
+class PrefetchPlanner:
+    """
+    Starts and tracks prefetch jobs for one scraping server.
+
+    Attributes:
+        server: Scraping server whose cache is warmed
+        rate_interval: Provider's seconds between requests, for estimates
+            (a number, or a function returning the current value)
+    """
+
+    def __init__(self, server: Any, rate_interval: Union[float, Callable[[], float]] = 0):
+        """
+        Initialize the planner.
+
+        Args:
+            server: Scraping server with cache, search_videos and download_video
+            rate_interval: Provider's seconds between requests, or a function
+                returning the current value (read on every snapshot)
+        """
+        self.server = server
+        self.rate_interval = rate_interval
+
+    def start(
+        self,
+        items: List[Union[str, Dict[str, Any]]],
+        per_query: int = 1,
+        max_requests: Optional[int] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> PrefetchJob:
+        """
+        Start a prefetch job on the running event loop.
+
+        Args:
+            items: Query strings, or dictionaries with video_id or query
+                and optional priority (higher first) and max_duration
+            per_query: Search results downloaded per query (default: 1)
+            max_requests: Cap on rate-limited requests (default: unlimited)
+            on_progress: Called with the job's snapshot() after every step
+
+        Returns:
+            The running PrefetchJob
+
+        Raises:
+            ValueError: If an item is invalid
+        """
+        job = PrefetchJob(
+            self.server,
+            [PrefetchItem.parse(item) for item in items],
+            per_query=per_query,
+            max_requests=max_requests,
+            rate_interval=self.rate_interval,
+            on_progress=on_progress
+        )
+        job._task = asyncio.get_running_loop().create_task(job.run())
+        # Mark the cancellation as retrieved when nobody waits for the job
+        job._task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        _register(job)
+        return job
+
+    def get(self, job_id: str) -> PrefetchJob:
+        """
+        Look up a prefetch job of this provider.
+
+        Args:
+            job_id: Job identifier returned by start()
+
+        Returns:
+            The job
+
+        Raises:
+            ValueError: If no such job exists
+        """
+        job = _jobs.get(job_id)
+        if job is None or job.provider != self.server.cache.provider_name:
+            raise ValueError(f"Unknown prefetch job: {job_id}")
+        return job
+
+    def cancel_all(self) -> int:
+        """
+        Cancel all running jobs of this provider (e.g. on shutdown).
+
+        Returns:
+            Number of jobs cancelled
+        """
+        provider = self.server.cache.provider_name
+        return sum(job.cancel() for job in list(_jobs.values()) if job.provider == provider)
+
+
+def _register(job: PrefetchJob) -> None:
+    """Register a job, forgetting the oldest finished jobs beyond MAX_FINISHED_JOBS."""
+    _jobs[job.job_id] = job
+    finished = [job_id for job_id, other in _jobs.items() if other.finished]
+    for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+        del _jobs[job_id]
@@ -0,0 +1,454 @@
+"""
+Token-Bucket Rate Limiting for the Scraping Servers
+
+The servers used to compare one _last_request_time before each request:
+concurrent coroutines all read the same timestamp and fired together, and
+separate processes did not coordinate at all. RateLimiter is a token
+bucket refilled at one token per interval seconds and holding up to burst
+tokens. acquire() reserves a token under a lock, so concurrent callers are
+queued one interval apart instead of racing; a caller cancelled while
+waiting hands its token back.
+
+The bucket state lives in a backend:
+
+    memory: in this limiter only (default; one budget per server process)
+    file: a small JSON state file per origin guarded by a FileLock, so
+        every worker process on the host shares one budget per origin
+
+The interval adapts to the origin (AIMD): every fast successful response
+adds a fixed step to the request rate, up to the ceiling of one request
+per min_interval; a 429/503 halves the rate, down to one request per
+max_interval, and a Retry-After header holds back every request of the
+limiter until it passes, including callers already waiting for a token.
+stats() reports the current rate. The adapted interval belongs to this
+limiter; the file backend shares the tokens and the Retry-After hold, not
+the interval.
+
+Limits are read from the environment the MCP launcher sets from
+config/mcp_servers.json (see rate_limiter_from_env):
+
+    {PROVIDER}_RATE_LIMIT: Seconds between requests (e.g. DVIDS_RATE_LIMIT=30)
+    {PROVIDER}_RATE_LIMIT_MIN: Fastest interval reached while the origin is
+        healthy (default: {PROVIDER}_RATE_LIMIT, i.e. never faster)
+    {PROVIDER}_RATE_LIMIT_MAX: Slowest interval after throttling (default: 300)
+    {PROVIDER}_RATE_BURST: Requests allowed back to back (default: 1)
+    VIDEO_RATE_LIMIT_BACKEND: "memory" or "file" (default: "memory")
+    VIDEO_RATE_LIMIT_DIR: State directory of the file backend
+        (default: <tempdir>/mcp-rate-limits)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .locking import FileLock
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKENDS = ("memory", "file")
+
+DEFAULT_RATE_BURST = 1
+
+# Default state directory of the file backend (shared by all users of the host)
+RATE_LIMIT_DIRNAME = "mcp-rate-limits"
+
+# Adaptive (AIMD) limiting
+MAX_INTERVAL_SECONDS = 300  # Slowest interval after repeated throttling
+RATE_DECREASE_FACTOR = 0.5  # Rate multiplier on HTTP 429/503
+RATE_INCREASE_STEPS = 10  # Fast successes to climb from zero to the ceiling rate
+FAST_LATENCY_SECONDS = 2.0  # Responses slower than this do not speed up the rate
+
+
+def parse_retry_after(value: Any, now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value: delay-seconds or an HTTP date
+        now: Current time for HTTP dates (default: now, UTC)
+
+    Returns:
+        Seconds to wait, or None if the value is missing or invalid
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+def full_jitter_backoff(attempt: int, base: float, cap: float) -> float:
+    """
+    Get a retry delay with full jitter: uniform in [0, min(cap, base × 2^attempt)].
+
+    Randomizing the whole delay keeps clients that were throttled together
+    from retrying together.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay bound of the first attempt
+        cap: Largest delay bound
+
+    Returns:
+        Seconds to wait
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def reserve_token(
+    tokens: float,
+    updated_at: float,
+    now: float,
+    rate: float,
+    burst: int
+) -> Tuple[float, float]:
+    """
+    Take one token from a bucket, refilling it for the time elapsed.
+
+    The bucket may go negative: each reservation beyond the available
+    tokens waits for the refill of the tokens reserved before it.
+
+    Args:
+        tokens: Tokens in the bucket at updated_at
+        updated_at: Time of the last update
+        now: Current time (same clock as updated_at)
+        rate: Tokens added per second
+        burst: Bucket capacity
+
+    Returns:
+        (tokens left, seconds to wait before using the token)
+    """
+    tokens = min(float(burst), tokens + max(0.0, now - updated_at) * rate) - 1
+    return tokens, (-tokens / rate if tokens < 0 else 0.0)
+
+
+class MemoryBucket:
+    """
+    Token bucket state held in memory, shared by threads and coroutines.
+
+    Attributes:
+        tokens: Tokens available (negative while reservations are queued)
+        updated_at: time.monotonic() of the last update
+    """
+
+    def __init__(self, burst: int):
+        """
+        Initialize a full bucket.
+
+        Args:
+            burst: Bucket capacity
+        """
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, rate: float, burst: int) -> float:
+        """Reserve a token, returning the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens, wait = reserve_token(self.tokens, self.updated_at, now, rate, burst)
+            self.updated_at = now
+            return wait
+
+    def refund(self, burst: int) -> None:
+        """Return a reserved token that was not used (never beyond burst)."""
+        with self._lock:
+            self.tokens = min(float(burst), self.tokens + 1)
+
+
+class FileBucket:
+    """
+    Token bucket state in a JSON file, shared by every process on the host.
+
+    The state file holds {"tokens", "updated_at", "blocked_until"}
+    (wall-clock times, since monotonic clocks are not comparable between
+    processes) and is only read and written while holding the lock file
+    next to it.
+
+    Attributes:
+        path: State file path
+    """
+
+    def __init__(self, state_dir: Path, key: str):
+        """
+        Initialize bucket (files are created on first use).
+
+        Args:
+            state_dir: Directory of state and lock files
+            key: Budget name, e.g. the origin "https://images.nasa.gov"
+        """
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        self.path = Path(state_dir) / f"{digest}.json"
+        self._lock = FileLock(self.path.with_suffix(".lock"))
+
+    def _read(self, burst: int) -> Tuple[float, float, float]:
+        """Read (tokens, updated_at, blocked_until); a missing or corrupt file is a full bucket."""
+        try:
+            state = json.loads(self.path.read_text())
+            return float(state["tokens"]), float(state["updated_at"]), float(state.get("blocked_until", 0.0))
+        except (OSError, ValueError, KeyError, TypeError):
+            return float(burst), time.time(), 0.0
+
+    def _write(self, tokens: float, updated_at: float, blocked_until: float) -> None:
+        """Write the bucket state (called with the lock held)."""
+        self.path.write_text(json.dumps(
+            {"tokens": tokens, "updated_at": updated_at, "blocked_until": blocked_until}
+        ))
+
+    def reserve(self, rate: float, burst: int) -> float:
+        """Reserve a token, returning the seconds to wait before using it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            tokens, updated_at, blocked_until = self._read(burst)
+            now = time.time()
+            tokens, wait = reserve_token(tokens, updated_at, now, rate, burst)
+            self._write(tokens, now, blocked_until)
+            return wait
+
+    def refund(self, burst: int) -> None:
+        """Return a reserved token that was not used (never beyond burst)."""
+        with self._lock:
+            tokens, updated_at, blocked_until = self._read(burst)
+            self._write(min(float(burst), tokens + 1), updated_at, blocked_until)
+
+    def block(self, seconds: float, burst: int) -> None:
+        """Hold back every process's requests for seconds (Retry-After)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            tokens, updated_at, blocked_until = self._read(burst)
+            self._write(tokens, updated_at, max(blocked_until, time.time() + seconds))
+
+    def blocked_for(self, burst: int) -> float:
+        """Get the seconds left of the shared Retry-After hold."""
+        with self._lock:
+            _, _, blocked_until = self._read(burst)
+        return max(0.0, blocked_until - time.time())
+
+
+class RateLimiter:
+    """
+    asyncio-safe, adaptive token-bucket limiter for one origin.
+
+    Attributes:
+        key: Budget name (the origin requests go to)
+        interval: Current seconds between requests once the burst is used up
+        min_interval: Fastest interval (the rate ceiling)
+        max_interval: Slowest interval (the rate floor)
+        burst: Requests allowed back to back
+        bucket: MemoryBucket or FileBucket holding the state
+        blocked_until: time.monotonic() before which no request is sent
+            (Retry-After; the file backend also keeps it in the shared state)
+        throttled: Number of 429/503 responses reported
+    """
+
+    def __init__(
+        self,
+        key: str,
+        interval: float,
+        burst: int = DEFAULT_RATE_BURST,
+        backend: str = "memory",
+        state_dir: Optional[Path] = None,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        fast_latency: float = FAST_LATENCY_SECONDS
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            key: Budget name (the origin requests go to)
+            interval: Starting seconds between requests (0 disables limiting)
+            burst: Requests allowed back to back (default: 1)
+            backend: "memory" (this limiter) or "file" (all processes on the host)
+            state_dir: State directory of the file backend
+                (default: <tempdir>/mcp-rate-limits)
+            min_interval: Fastest interval reached by speeding up
+                (default: interval, i.e. never faster than configured)
+            max_interval: Slowest interval reached by backing off
+                (default: the larger of interval and 300 s)
+            fast_latency: Latency below which a success speeds up the rate (default: 2 s)
+
+        Raises:
+            ValueError: If the backend is unknown
+        """
+        if backend not in RATE_LIMIT_BACKENDS:
+            raise ValueError(
+                f"Unknown rate limit backend: {backend} (expected one of {', '.join(RATE_LIMIT_BACKENDS)})"
+            )
+        self.key = key
+        self.interval = interval
+        self.min_interval = min(interval, min_interval) if min_interval else interval
+        self.max_interval = max(interval, max_interval if max_interval is not None else MAX_INTERVAL_SECONDS)
+        self.fast_latency = fast_latency
+        self.burst = max(1, burst)
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self.backend = backend
+        if backend == "file":
+            self.bucket = FileBucket(state_dir or Path(tempfile.gettempdir()) / RATE_LIMIT_DIRNAME, key)
+        else:
+            self.bucket = MemoryBucket(self.burst)
+
+    @property
+    def rate(self) -> float:
+        """Requests per second."""
+        return 1.0 / self.interval if self.interval > 0 else float("inf")
+
+    async def _reserve(self) -> float:
+        """Reserve a token (file locks are taken off the event loop)."""
+        if self.backend == "file":
+            return await asyncio.to_thread(self.bucket.reserve, self.rate, self.burst)
+        return self.bucket.reserve(self.rate, self.burst)
+
+    async def _refund(self) -> None:
+        """Return an unused token; the file backend's lock is taken off the event loop."""
+        if self.backend == "file":
+            # Shielded: a second cancellation must not lose the refund
+            await asyncio.shield(asyncio.to_thread(self.bucket.refund, self.burst))
+        else:
+            self.bucket.refund(self.burst)
+
+    async def _blocked(self) -> float:
+        """Get the seconds left of a Retry-After hold (the file backend's is read off the event loop)."""
+        if self.backend == "file":
+            shared = await asyncio.to_thread(self.bucket.blocked_for, self.burst)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + shared)
+        return max(0.0, self.blocked_until - time.monotonic())
+
+    async def _wait_blocked(self) -> float:
+        """Sleep until no Retry-After hold is left, returning the seconds slept."""
+        waited = 0.0
+        blocked = await self._blocked()
+        while blocked > 0:
+            logger.info(f"Rate limit: {self.key} asked to retry later, waiting {blocked:.1f}s")
+            await asyncio.sleep(blocked)
+            waited += blocked
+            blocked = await self._blocked()
+        return waited
+
+    async def acquire(self) -> float:
+        """
+        Wait until a request may be sent.
+
+        Returns:
+            Seconds waited
+        """
+        if self.interval <= 0:
+            return 0.0
+        waited = await self._wait_blocked()
+        wait = await self._reserve()
+        try:
+            if wait > 0:
+                logger.info(f"Rate limit: waiting {wait:.1f}s before next request to {self.key}")
+                await asyncio.sleep(wait)
+                waited += wait
+            # A Retry-After received while waiting for the token holds it back too
+            waited += await self._wait_blocked()
+        except asyncio.CancelledError:
+            await self._refund()
+            raise
+        return waited
+
+    def on_success(self, latency: float) -> None:
+        """
+        Report a successful response; a fast one adds a step to the rate.
+
+        Args:
+            latency: Seconds the response took
+        """
+        if self.interval <= 0 or latency > self.fast_latency or self.interval <= self.min_interval:
+            return
+        step = 1.0 / (self.min_interval * RATE_INCREASE_STEPS)
+        self._set_interval(max(self.min_interval, 1.0 / (self.rate + step)))
+
+    async def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Report an HTTP 429/503 response: halve the rate and honor Retry-After.
+
+        With the file backend the Retry-After hold is written to the shared
+        state (off the event loop), so every process waits it out.
+
+        Args:
+            retry_after: Seconds the origin asked to wait (Retry-After),
+                held for at most max_interval
+        """
+        self.throttled += 1
+        if self.interval <= 0:
+            return
+        self._set_interval(min(self.max_interval, self.interval / RATE_DECREASE_FACTOR))
+        if retry_after:
+            hold = min(retry_after, self.max_interval)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + hold)
+            if self.backend == "file":
+                await asyncio.to_thread(self.bucket.block, hold, self.burst)
+
+    def _set_interval(self, interval: float) -> None:
+        """Change the interval, logging the new rate."""
+        if interval != self.interval:
+            logger.info(f"Rate limit of {self.key}: {60.0 / interval:.2f} requests/min (every {interval:.1f}s)")
+            self.interval = interval
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the current rate and limiter state.
+
+        Returns:
+            Dictionary with key, backend, interval, min_interval,
+            max_interval, requests_per_minute, burst, throttled and
+            blocked_seconds
+        """
+        return {
+            "key": self.key,
+            "backend": self.backend,
+            "interval": self.interval,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "requests_per_minute": 60.0 / self.interval if self.interval > 0 else None,
+            "burst": self.burst,
+            "throttled": self.throttled,
+            "blocked_seconds": max(0.0, self.blocked_until - time.monotonic()),
+        }
+
+
+def rate_limiter_from_env(provider_name: str, origin: str, default_interval: float) -> RateLimiter:
+    """
+    Build a provider's RateLimiter from environment variables.
+
+    Args:
+        provider_name: Name of the video provider (e.g., "dvids", "nasa")
+        origin: Origin requests go to, naming the shared budget
+        default_interval: Seconds between requests when {PROVIDER}_RATE_LIMIT is unset
+
+    Returns:
+        Configured RateLimiter
+    """
+    prefix = provider_name.upper()
+    interval = os.environ.get(f"{prefix}_RATE_LIMIT")
+    min_interval = os.environ.get(f"{prefix}_RATE_LIMIT_MIN")
+    max_interval = os.environ.get(f"{prefix}_RATE_LIMIT_MAX")
+    burst = os.environ.get(f"{prefix}_RATE_BURST")
+    state_dir = os.environ.get("VIDEO_RATE_LIMIT_DIR")
+    return RateLimiter(
+        key=origin,
+        interval=float(interval) if interval else default_interval,
+        burst=int(burst) if burst else DEFAULT_RATE_BURST,
+        backend=os.environ.get("VIDEO_RATE_LIMIT_BACKEND", "memory"),
+        state_dir=Path(state_dir) if state_dir else None,
+        min_interval=float(min_interval) if min_interval else None,
+        max_interval=float(max_interval) if max_interval else None
+    )
@@ -0,0 +1,292 @@
+"""
+Persistent Cache of Parsed Search and Details Responses
+
+search_videos and get_video_details scrape HTML pages behind per-provider
+rate limits (30 s for DVIDS, 10 s for NASA), so a repeated query used to
+cost seconds. ResponseCache keeps the parsed results in an SQLite database
+in cache_dir, shared by every server process using it:
+
+    fresh (age < ttl): served directly
+    stale (age < ttl + stale_ttl): served directly while one background
+        task refreshes the entry (stale-while-revalidate)
+    older or missing: fetched; concurrent callers for the same key wait
+        for a single fetch
+
+The total size of stored responses is capped at max_bytes by deleting the
+least recently used responses. Failed fetches are never stored. Responses
+a caller marks as negative (e.g. a search without results) go to the
+NegativeCache instead, whose short, growing TTL suits them better.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .negative_cache import NegativeCache
+
+logger = logging.getLogger(__name__)
+
+RESPONSES_DB_NAME = "responses.db"
+
+DEFAULT_RESPONSE_TTL_SECONDS = 3600
+DEFAULT_RESPONSE_STALE_SECONDS = 7 * 24 * 3600
+DEFAULT_RESPONSE_MAX_BYTES = 64 * 1024 * 1024  # 64 MiB
+
+
+def response_key(kind: str, provider: str, **params: Any) -> str:
+    """
+    Build a normalized cache key for a response.
+
+    String parameters are stripped, lower-cased and have runs of whitespace
+    collapsed, so "Space  Shuttle " and "space shuttle" share an entry.
+
+    Args:
+        kind: Response kind (e.g. "search", "details")
+        provider: Video provider name
+        **params: Request parameters
+
+    Returns:
+        Key string
+    """
+    normalized = {
+        name: " ".join(value.split()).lower() if isinstance(value, str) else value
+        for name, value in params.items()
+    }
+    return f"{provider}:{kind}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+def response_cache_options_from_env() -> Dict[str, Any]:
+    """
+    Build ResponseCache keyword arguments from environment variables.
+
+    VIDEO_CACHE_RESPONSE_TTL and VIDEO_CACHE_RESPONSE_STALE_TTL are in
+    seconds; VIDEO_CACHE_RESPONSE_MAX_BYTES caps the stored size.
+
+    Returns:
+        Dictionary of ResponseCache keyword arguments
+    """
+    return {
+        "ttl": float(os.environ.get("VIDEO_CACHE_RESPONSE_TTL", DEFAULT_RESPONSE_TTL_SECONDS)),
+        "stale_ttl": float(os.environ.get("VIDEO_CACHE_RESPONSE_STALE_TTL", DEFAULT_RESPONSE_STALE_SECONDS)),
+        "max_bytes": int(os.environ.get("VIDEO_CACHE_RESPONSE_MAX_BYTES", DEFAULT_RESPONSE_MAX_BYTES)),
+    }
+
+
+class ResponseCache:
+    """
+    TTL cache of JSON-serializable responses with stale-while-revalidate.
+
+    Attributes:
+        db_path: Path to the SQLite database file
+        ttl: Seconds a response is served without refreshing
+        stale_ttl: Seconds past ttl a response is still served while refreshing
+        max_bytes: Cap on the total size of stored responses
+        negative: NegativeCache for responses marked negative, or None
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl: float = DEFAULT_RESPONSE_TTL_SECONDS,
+        stale_ttl: float = DEFAULT_RESPONSE_STALE_SECONDS,
+        max_bytes: int = DEFAULT_RESPONSE_MAX_BYTES,
+        negative: Optional[NegativeCache] = None
+    ):
+        """
+        Open (or create) the response cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl: Seconds a response is fresh (default: 1 hour)
+            stale_ttl: Seconds past ttl a stale response may be served (default: 7 days)
+            max_bytes: Cap on the total size of stored responses (default: 64 MiB)
+            negative: NegativeCache for negative responses (default: store them normally)
+        """
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.negative = negative
+        self._lock = threading.RLock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL,"
+                    " stored_at REAL NOT NULL,"
+                    " last_access REAL NOT NULL,"
+                    " size INTEGER NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+                )
+        except sqlite3.DatabaseError:
+            self._conn.close()
+            raise
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a stored response.
+
+        Args:
+            key: Response key (see response_key())
+
+        Returns:
+            (value, age_seconds), or None if not stored or too old to serve
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            age = now - row[1]
+            if age >= self.ttl + self.stale_ttl:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(row[0]), age
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a response, evicting least recently used ones over max_bytes.
+
+        Args:
+            key: Response key (see response_key())
+            value: JSON-serializable response
+        """
+        text = json.dumps(value)
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.warning(f"Response for {key} ({size} bytes) exceeds the response cache size, not stored")
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at, last_access, size)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, text, now, now, size)
+            )
+            self._enforce_size()
+
+    def _enforce_size(self) -> None:
+        """Delete least recently used responses until the total fits max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        logger.info(f"Response cache over {self.max_bytes} bytes, evicted {len(victims)} responses")
+
+    def invalidate(self, key: str) -> bool:
+        """
+        Remove a stored response.
+
+        Args:
+            key: Response key
+
+        Returns:
+            True if a response was removed
+        """
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount > 0
+
+    def total_bytes(self) -> int:
+        """Get the total size of stored responses in bytes."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    async def aget(
+        self,
+        key: str,
+        fetch_fn: Callable[[], Awaitable[Any]],
+        is_negative: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Get a response, fetching it on a miss and refreshing it when stale.
+
+        Args:
+            key: Response key (see response_key())
+            fetch_fn: Zero-argument coroutine function producing the response
+            is_negative: Predicate marking responses (e.g. empty results) to
+                keep in the NegativeCache rather than for the full ttl
+
+        Returns:
+            The stored or freshly fetched response
+        """
+        if self.negative is not None and is_negative is not None:
+            miss = await asyncio.to_thread(self.negative.get, key)
+            if miss is not None:
+                logger.info(f"Negative cache hit for {key} (expires in {miss['expires_in']:.0f}s)")
+                return miss["value"]
+
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            value, age = cached
+            if age >= self.ttl and key not in self._inflight:
+                logger.info(f"Serving stale response for {key}, refreshing in background")
+                self._start_fetch(key, fetch_fn, is_negative)
+            return value
+
+        task = self._inflight.get(key) or self._start_fetch(key, fetch_fn, is_negative)
+        return await asyncio.shield(task)
+
+    def _start_fetch(
+        self,
+        key: str,
+        fetch_fn: Callable[[], Awaitable[Any]],
+        is_negative: Optional[Callable[[Any], bool]] = None
+    ) -> "asyncio.Task[Any]":
+        """Start the single shared fetch of a key."""
+        task = asyncio.get_running_loop().create_task(self._fetch_and_store(key, fetch_fn, is_negative))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._fetch_done(key, t))
+        return task
+
+    async def _fetch_and_store(
+        self,
+        key: str,
+        fetch_fn: Callable[[], Awaitable[Any]],
+        is_negative: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """Fetch a response and store it in the response or negative cache."""
+        value = await fetch_fn()
+        if self.negative is not None and is_negative is not None:
+            if is_negative(value):
+                await asyncio.to_thread(self.invalidate, key)
+                await asyncio.to_thread(self.negative.record, key, value)
+                return value
+            await asyncio.to_thread(self.negative.clear, key)
+        await asyncio.to_thread(self.put, key, value)
+        return value
+
+    def _fetch_done(self, key: str, task: "asyncio.Task[Any]") -> None:
+        """Forget a finished fetch and log its failure (nothing is stored)."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Fetching response for {key} failed: {task.exception()}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
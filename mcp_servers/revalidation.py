@@ -0,0 +1,72 @@
+"""
+Conditional Revalidation of Expired Cache Entries
+
+Archive footage almost never changes, so an expired entry is usually
+still correct. Entries record the ETag and Last-Modified of the file they
+were downloaded from (their size is the Content-Length). When such an
+entry expires, the servers send a conditional HEAD request; if the origin
+answers 304 Not Modified, or a plain 200 whose validators match, VideoCache
+extends the TTL without transferring the body again.
+
+This module builds the conditional headers and interprets the answer.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+
+from .byte_ranges import expected_length, response_validators
+
+
+def conditional_headers(video_meta: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build the conditional request headers for a cached entry.
+
+    Args:
+        video_meta: Metadata entry with etag and/or last_modified
+
+    Returns:
+        If-None-Match and/or If-Modified-Since headers
+    """
+    headers = {}
+    if video_meta.get("etag"):
+        headers["If-None-Match"] = video_meta["etag"]
+    if video_meta.get("last_modified"):
+        headers["If-Modified-Since"] = video_meta["last_modified"]
+    return headers
+
+
+def unchanged_validators(
+    status_code: int,
+    headers: Optional[Mapping[str, Any]],
+    video_meta: Dict[str, Any]
+) -> Optional[Dict[str, str]]:
+    """
+    Decide from a conditional response whether the cached file is current.
+
+    Origins that ignore conditional headers answer 200; the file then
+    counts as unchanged if its ETag matches, or if it has no ETag and both
+    Last-Modified and Content-Length match.
+
+    Args:
+        status_code: Response status
+        headers: Response headers
+        video_meta: Metadata entry the request was made for
+
+    Returns:
+        Validators to store with the renewed entry, or None if the file
+        changed (or the answer is inconclusive) and must be downloaded again
+    """
+    current = response_validators(headers)
+    stored = {name: video_meta[name] for name in ("etag", "last_modified") if video_meta.get(name)}
+    if status_code == 304:
+        return {**stored, **current}
+    if status_code != 200:
+        return None
+
+    content_length = expected_length(200, headers)
+    if content_length is not None and content_length != int(video_meta.get("size", -1)):
+        return None
+    if stored.get("etag") and current.get("etag"):
+        return current if current["etag"] == stored["etag"] else None
+    if stored.get("last_modified") and current.get("last_modified") == stored["last_modified"]:
+        return current
+    return None
@@ -0,0 +1,254 @@
+"""
+Cached robots.txt Policies
+
+check_robots_txt used to download and parse robots.txt before every
+search, download and details request, adding a round-trip the rate limiter
+did not even count. RobotsCache keeps the parsed policy of each origin
+(scheme://host) in memory:
+
+    fresh: checks are answered from the parsed rules without a request
+    expired or unknown: the policy is fetched again; concurrent checks for
+        the same origin wait for a single fetch
+
+A policy is kept for the response's Cache-Control max-age (or Expires)
+when present, otherwise for ttl (ROBOTS_CACHE_TTL, default 24 hours),
+bounded by min_ttl and max_ttl; RFC 9309 asks crawlers not to rely on a
+cached robots.txt for more than 24 hours. A missing robots.txt (4xx)
+allows everything. Server errors and network failures keep the previous
+policy (or allow, as before) and are retried after error_ttl.
+"""
+
+import asyncio
+import email.utils
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROBOTS_TTL_SECONDS = 24 * 3600
+MAX_ROBOTS_TTL_SECONDS = 24 * 3600
+# Floor for no-cache/max-age=0 responses, so checks never refetch per request
+MIN_ROBOTS_TTL_SECONDS = 60
+# Retry delay after a failed fetch (5xx or network error)
+ROBOTS_ERROR_TTL_SECONDS = 300
+ROBOTS_FETCH_TIMEOUT_SECONDS = 10
+
+
+def robots_cache_options_from_env() -> Dict[str, Any]:
+    """
+    Build RobotsCache keyword arguments from environment variables.
+
+    Returns:
+        Dictionary of RobotsCache keyword arguments
+    """
+    ttl = os.environ.get("ROBOTS_CACHE_TTL")
+    return {"ttl": float(ttl) if ttl else DEFAULT_ROBOTS_TTL_SECONDS}
+
+
+def ttl_from_headers(headers: Mapping[str, str], default: float) -> float:
+    """
+    Get the freshness lifetime of a response from its cache headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+        default: Lifetime when the headers do not specify one
+
+    Returns:
+        Lifetime in seconds (0 for no-store/no-cache)
+    """
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return max(0.0, float(int(directives["max-age"])))
+        except ValueError:
+            pass
+
+    expires = headers.get("expires")
+    if expires:
+        try:
+            expires_at = email.utils.parsedate_to_datetime(expires)
+            date = headers.get("date")
+            now = email.utils.parsedate_to_datetime(date) if date else datetime.now(timezone.utc)
+            return max(0.0, (expires_at - now).total_seconds())
+        except (TypeError, ValueError):
+            return 0.0  # an invalid Expires means "already expired"
+    return default
+
+
+class RobotsPolicy:
+    """
+    Parsed robots.txt rules of one origin.
+
+    Attributes:
+        origin: scheme://host the rules apply to
+        parser: Parsed rules (None allows everything)
+        expires_at: time.monotonic() after which the policy is refreshed
+    """
+
+    def __init__(self, origin: str, parser: Optional[RobotFileParser], expires_at: float):
+        """
+        Initialize policy.
+
+        Args:
+            origin: scheme://host the rules apply to
+            parser: Parsed rules, or None to allow everything
+            expires_at: time.monotonic() after which the policy is refreshed
+        """
+        self.origin = origin
+        self.parser = parser
+        self.expires_at = expires_at
+
+    def allows(self, url: str, user_agent: str = "*") -> bool:
+        """Check whether the rules allow fetching url."""
+        return self.parser is None or self.parser.can_fetch(user_agent, url)
+
+    def is_fresh(self) -> bool:
+        """Check whether the policy can still be used without refreshing."""
+        return time.monotonic() < self.expires_at
+
+
+class RobotsCache:
+    """
+    In-memory robots.txt policies per origin with single-flight refresh.
+
+    Attributes:
+        ttl: Policy lifetime when robots.txt has no cache headers
+        min_ttl: Shortest policy lifetime
+        max_ttl: Longest policy lifetime
+        error_ttl: Seconds before a failed fetch is retried
+        user_agent: User agent matched against the rules
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_ROBOTS_TTL_SECONDS,
+        min_ttl: float = MIN_ROBOTS_TTL_SECONDS,
+        max_ttl: float = MAX_ROBOTS_TTL_SECONDS,
+        error_ttl: float = ROBOTS_ERROR_TTL_SECONDS,
+        user_agent: str = "*"
+    ):
+        """
+        Initialize robots.txt cache.
+
+        Args:
+            ttl: Policy lifetime when robots.txt has no cache headers (default: 24 h)
+            min_ttl: Shortest policy lifetime (default: 60 s)
+            max_ttl: Longest policy lifetime (default: 24 h)
+            error_ttl: Seconds before a failed fetch is retried (default: 300)
+            user_agent: User agent matched against the rules (default: "*")
+        """
+        self.ttl = ttl
+        self.min_ttl = min(min_ttl, max_ttl)
+        self.max_ttl = max_ttl
+        self.error_ttl = error_ttl
+        self.user_agent = user_agent
+        self._policies: Dict[str, RobotsPolicy] = {}
+        self._inflight: Dict[str, "asyncio.Task[RobotsPolicy]"] = {}
+
+    @staticmethod
+    def origin(url: str) -> str:
+        """Get the scheme://host a URL's robots.txt belongs to."""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def get_policy(self, url: str) -> Optional[RobotsPolicy]:
+        """Get the cached policy of a URL's origin, fresh or not (None if unknown)."""
+        return self._policies.get(self.origin(url))
+
+    async def is_allowed(self, url: str, client: Optional[httpx.AsyncClient] = None) -> bool:
+        """
+        Check a URL against its origin's robots.txt.
+
+        Args:
+            url: URL to check
+            client: Client to fetch robots.txt with when the policy is not
+                fresh (default: a short-lived client)
+
+        Returns:
+            True if allowed to scrape, False if disallowed
+        """
+        origin = self.origin(url)
+        policy = self._policies.get(origin)
+        if policy is None or not policy.is_fresh():
+            task = self._inflight.get(origin) or self._start_refresh(origin, client)
+            policy = await asyncio.shield(task)
+        return policy.allows(url, self.user_agent)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """
+        Drop the cached policy of a URL's origin, or every policy.
+
+        Args:
+            url: Any URL of the origin (default: all origins)
+        """
+        if url is None:
+            self._policies.clear()
+        else:
+            self._policies.pop(self.origin(url), None)
+
+    def _start_refresh(self, origin: str, client: Optional[httpx.AsyncClient]) -> "asyncio.Task[RobotsPolicy]":
+        """Start the single shared fetch of an origin's robots.txt."""
+        task = asyncio.get_running_loop().create_task(self._refresh(origin, client))
+        self._inflight[origin] = task
+        task.add_done_callback(lambda t: self._refresh_done(origin, t))
+        return task
+
+    def _refresh_done(self, origin: str, task: "asyncio.Task[RobotsPolicy]") -> None:
+        """Forget a finished fetch."""
+        if self._inflight.get(origin) is task:
+            del self._inflight[origin]
+
+    async def _refresh(self, origin: str, client: Optional[httpx.AsyncClient]) -> RobotsPolicy:
+        """Fetch and parse an origin's robots.txt, storing the resulting policy."""
+        robots_url = f"{origin}/robots.txt"
+        try:
+            if client is None:
+                async with httpx.AsyncClient() as own_client:
+                    response = await self._fetch(own_client, robots_url)
+            else:
+                response = await self._fetch(client, robots_url)
+        except Exception as e:
+            return self._keep_previous(origin, f"Failed to fetch {robots_url}: {e}")
+        if response.status_code >= 500:
+            return self._keep_previous(origin, f"HTTP {response.status_code} for {robots_url}")
+
+        if response.status_code == 200:
+            parser = RobotFileParser(robots_url)
+            parser.parse(response.text.splitlines())
+        else:
+            # No robots.txt: everything is allowed
+            logger.info(f"No robots.txt found at {robots_url}, allowing scrape")
+            parser = None
+        ttl = min(max(ttl_from_headers(response.headers, self.ttl), self.min_ttl), self.max_ttl)
+        policy = RobotsPolicy(origin, parser, time.monotonic() + ttl)
+        self._policies[origin] = policy
+        logger.info(f"Cached robots.txt policy of {origin} for {ttl:.0f}s")
+        return policy
+
+    @staticmethod
+    async def _fetch(client: httpx.AsyncClient, robots_url: str) -> httpx.Response:
+        """GET robots.txt, following redirects."""
+        return await client.get(robots_url, timeout=ROBOTS_FETCH_TIMEOUT_SECONDS, follow_redirects=True)
+
+    def _keep_previous(self, origin: str, reason: str) -> RobotsPolicy:
+        """Keep using the last known policy (or allow everything) until error_ttl passes."""
+        previous = self._policies.get(origin)
+        parser = previous.parser if previous is not None else None
+        policy = RobotsPolicy(origin, parser, time.monotonic() + self.error_ttl)
+        self._policies[origin] = policy
+        action = "keeping previous policy" if previous is not None else "allowing scrape"
+        logger.warning(f"{reason}, {action} for {self.error_ttl:.0f}s")
+        return policy
@@ -0,0 +1,152 @@
+"""
+Hot Storage Tier for the Shared VideoCache
+
+Render hosts often have a small fast disk (NVMe) next to a large, slow
+volume (NFS/HDD). VideoCache always writes downloads to cache_dir, the
+cold tier. With a HotTier configured, a video that keeps being requested
+is copied to the hot tier once its hit count reaches promote_after, and
+its metadata entry points readers at the hot copy:
+
+    {"tier": "hot", "file_path": <hot copy>, "cold_path": <cold copy>}
+
+The hot tier is inclusive: the cold copy stays in place, so demoting an
+entry only deletes the hot copy and points file_path back at cold_path.
+When the hot tier's byte or entry budget is exceeded, the least recently
+used hot entries are demoted; they must earn promote_after new hits before
+being promoted again. Readers resolve tiers through file_path and need no
+changes.
+"""
+
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .eviction import CacheBudget, EvictionIndex, LRUPolicy
+
+logger = logging.getLogger(__name__)
+
+HOT_TIER = "hot"
+COLD_TIER = "cold"
+
+# Hits after which a cold entry is promoted
+DEFAULT_PROMOTE_AFTER_HITS = 2
+
+
+class HotTier:
+    """
+    Fast storage tier holding copies of frequently used videos.
+
+    Attributes:
+        root: Hot tier root directory (videos go to root/{provider}/)
+        budget: Byte/entry limits of the hot tier (shared by all providers)
+        promote_after: Hits after which a cold entry is promoted
+        index: LRU index of hot entries used to pick demotion victims
+    """
+
+    def __init__(
+        self,
+        root: str,
+        budget: Optional[CacheBudget] = None,
+        promote_after: int = DEFAULT_PROMOTE_AFTER_HITS
+    ):
+        """
+        Initialize hot tier.
+
+        Args:
+            root: Hot tier root directory (created on first promotion)
+            budget: Byte/entry limits (default: unlimited)
+            promote_after: Hits after which a cold entry is promoted (default: 2)
+        """
+        self.root = Path(root)
+        self.budget = budget or CacheBudget()
+        self.promote_after = max(1, promote_after)
+        self.index = EvictionIndex(LRUPolicy())
+
+    def __repr__(self) -> str:
+        return f"HotTier(root={str(self.root)!r}, budget={self.budget!r}, promote_after={self.promote_after})"
+
+    @staticmethod
+    def is_hot(entry: Dict[str, Any]) -> bool:
+        """Check whether an entry is served from the hot tier."""
+        return entry.get("tier") == HOT_TIER
+
+    def should_promote(self, entry: Dict[str, Any]) -> bool:
+        """
+        Check whether a cold entry has been hit often enough to promote.
+
+        Args:
+            entry: Metadata entry (after its hit was recorded)
+
+        Returns:
+            True if the entry should be copied to the hot tier
+        """
+        if self.is_hot(entry):
+            return False
+        size = int(entry.get("size", 0))
+        if self.budget.max_bytes is not None and size > self.budget.max_bytes:
+            return False  # would be demoted straight away
+        # Count only hits since the last demotion, so demoted videos do not bounce back
+        hits = int(entry.get("hits", 0)) - int(entry.get("demoted_at_hits", 0))
+        return hits >= self.promote_after
+
+    def path_for(self, provider: str, cold_path: Path) -> Path:
+        """
+        Get the hot tier path of a cold file.
+
+        Args:
+            provider: Video provider name
+            cold_path: Cached file in the cold tier
+
+        Returns:
+            Path under root/{provider}/ with the same file name
+        """
+        return self.root / provider / cold_path.name
+
+    def copy_in(self, provider: str, cold_path: Path) -> Path:
+        """
+        Copy a cold file into the hot tier atomically.
+
+        Args:
+            provider: Video provider name
+            cold_path: Cached file in the cold tier
+
+        Returns:
+            Path of the hot copy
+
+        Raises:
+            OSError: If the copy failed (no partial file is left behind)
+        """
+        hot_path = self.path_for(provider, cold_path)
+        hot_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = hot_path.with_name(f".{uuid.uuid4().hex}.tmp")
+        try:
+            shutil.copyfile(cold_path, temp_path)
+            with open(temp_path, "rb") as f:
+                os.fsync(f.fileno())
+            os.replace(temp_path, hot_path)
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            raise
+        return hot_path
+
+    @staticmethod
+    def cold_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the cold tier version of a hot entry.
+
+        Args:
+            entry: Hot metadata entry
+
+        Returns:
+            Entry whose file_path is the cold copy, without tier fields
+        """
+        cold = {k: v for k, v in entry.items() if k not in ("tier", "cold_path")}
+        cold["file_path"] = entry.get("cold_path", entry.get("file_path", ""))
+        cold["demoted_at_hits"] = int(entry.get("hits", 0))
+        return cold
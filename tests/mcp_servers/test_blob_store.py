@@ -0,0 +1,97 @@
+"""
+VideoCache Content-Addressed Storage Tests
+
+These tests validate SHA-256 blob deduplication of identical videos cached
+under different IDs or providers, and reference-counted blob release.
+"""
+
+import hashlib
+import os
+
+import pytest
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+class TestContentAddressedCache:
+    """Test blob deduplication in VideoCache."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_duplicate_content_shares_one_blob(self, tmp_path):
+        """[P0] The same footage cached by two providers is stored once.
+
+        GIVEN: A DVIDS and a NASA cache sharing cache_dir
+        WHEN: Both stream identical content under different IDs
+        THEN: Both files exist and are links to the same blob
+        """
+        from mcp_servers.cache import VideoCache
+
+        dvids = VideoCache("dvids", str(tmp_path))
+        nasa = VideoCache("nasa", str(tmp_path))
+        payload = b"public domain launch footage"
+        digest = hashlib.sha256(payload).hexdigest()
+
+        first = await dvids.put_stream("d-1", _chunks(payload[:10], payload[10:]))
+        second = await nasa.put_stream("n-1", _chunks(payload))
+
+        assert first["content_hash"] == second["content_hash"] == digest
+        assert os.path.samefile(first["file_path"], second["file_path"])
+        assert dvids.blobs.refcount(digest) == 2
+        assert (tmp_path / "nasa" / "n-1.mp4").read_bytes() == payload
+
+    @pytest.mark.P0
+    def test_blob_released_with_last_reference(self, tmp_path):
+        """[P0] A blob is deleted only when its last video is removed.
+
+        GIVEN: Two videos with identical content
+        WHEN: Invalidating them one after the other
+        THEN: The blob survives the first removal and is deleted after the second
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("a", lambda v: b"same bytes")
+        cache.get("b", lambda v: b"same bytes")
+        blob = cache.blobs.path_for(cache.get_entry("a")["content_hash"])
+
+        cache.invalidate("a")
+        assert blob.exists()
+        assert cache.get("b", lambda v: pytest.fail("should be cached")) == b"same bytes"
+
+        cache.invalidate("b")
+        assert not blob.exists()
+
+    @pytest.mark.P1
+    def test_global_budget_counts_shared_content_once(self, tmp_path):
+        """[P1] Duplicates do not count against the global byte budget.
+
+        GIVEN: A global budget of 150 bytes
+        WHEN: Caching the same 100 byte clip under two IDs
+        THEN: Nothing is evicted
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.eviction import CacheBudget
+
+        cache = VideoCache("dvids", str(tmp_path), global_budget=CacheBudget(max_bytes=150))
+        cache.get("a", lambda v: b"x" * 100)
+        cache.get("b", lambda v: b"x" * 100)
+
+        assert cache.is_cached("a") is True
+        assert cache.is_cached("b") is True
+
+    @pytest.mark.P2
+    def test_dedup_can_be_disabled(self, tmp_path):
+        """[P2] content_addressed=False stores independent copies."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path), content_addressed=False)
+        cache.get("a", lambda v: b"same bytes")
+        cache.get("b", lambda v: b"same bytes")
+
+        assert cache.blobs is None
+        assert not (tmp_path / "blobs").exists()
+        assert not os.path.samefile(tmp_path / "dvids" / "a.mp4", tmp_path / "dvids" / "b.mp4")
@@ -0,0 +1,176 @@
+"""
+VideoCache Byte-Range Tests
+
+These tests validate partial-clip caching: segment map arithmetic, storing
+and reading byte ranges in sparse files, fetching only missing ranges, and
+committing a complete file once every byte is cached.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+class TestSegmentMaps:
+    """Test segment map helpers."""
+
+    @pytest.mark.P0
+    def test_merge_and_missing_ranges(self):
+        """[P0] Overlapping and adjacent ranges merge; gaps are reported in order."""
+        from mcp_servers.byte_ranges import merge_segment, missing_ranges, stored_bytes
+
+        segments = merge_segment([], 100, 200)
+        segments = merge_segment(segments, 300, 400)
+        segments = merge_segment(segments, 200, 250)
+        segments = merge_segment(segments, 350, 500)
+
+        assert segments == [[100, 250], [300, 500]]
+        assert stored_bytes(segments) == 350
+        assert missing_ranges(segments, 0, 600) == [(0, 100), (250, 300), (500, 600)]
+        assert missing_ranges(segments, 120, 240) == []
+
+    @pytest.mark.P1
+    def test_content_range_header(self):
+        """[P1] Total length is parsed from 206 and 416 Content-Range values."""
+        from mcp_servers.byte_ranges import parse_content_range, range_header
+
+        assert range_header(0, 100) == "bytes=0-99"
+        assert parse_content_range("bytes 0-99/12345") == 12345
+        assert parse_content_range("bytes */12345") == 12345
+        assert parse_content_range("bytes 0-99/*") is None
+        assert parse_content_range(None) is None
+
+    @pytest.mark.P1
+    def test_range_matches(self):
+        """[P1] A 206 body must start at the requested offset and hold the requested length."""
+        from mcp_servers.byte_ranges import range_matches
+
+        assert range_matches("bytes 100-109/5000", 100, 110, 10) is True
+        assert range_matches("bytes 4990-4999/5000", 4990, 5100, 10) is True
+        assert range_matches("bytes 0-9/5000", 100, 110, 10) is False
+        assert range_matches("bytes 100-104/5000", 100, 110, 5) is False
+        assert range_matches("bytes 100-109/5000", 100, 110, 8) is False
+        assert range_matches(None, 100, 110, 10) is False
+
+
+class TestVideoCacheRanges:
+    """Test put_range, read_range and aensure_range."""
+
+    @pytest.mark.P0
+    def test_put_and_read_range(self, tmp_path):
+        """[P0] A stored range is readable; other ranges are not.
+
+        GIVEN: A cache holding bytes 10-20 of a video
+        WHEN: Reading ranges inside and outside the stored segment
+        THEN: Only the stored range is served and get() does not treat it as cached
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        entry = cache.put_range("clip", 10, b"0123456789", total_size=100)
+
+        assert entry["partial"] is True
+        assert entry["segments"] == [[10, 20]]
+        assert entry["size"] == 10
+        assert cache.read_range("clip", 12, 4) == b"2345"
+        assert cache.read_range("clip", 0, 20) is None
+        assert cache.get_cached_entry("clip") is None
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_aensure_range_fetches_only_gaps(self, tmp_path):
+        """[P0] Only the uncached parts of a range are fetched.
+
+        GIVEN: A cache holding bytes 0-100 of a 1000-byte video
+        WHEN: Ensuring bytes 50-300
+        THEN: Only bytes 100-300 are fetched and a repeat request fetches nothing
+        """
+        from mcp_servers.cache import VideoCache
+
+        video = bytes(range(256)) * 4
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.put_range("clip", 0, video[:100], total_size=len(video))
+        fetched = []
+
+        async def fetch_range(video_id, start, end):
+            fetched.append((start, end))
+            return video[start:end], len(video)
+
+        entry, cached = await cache.aensure_range("clip", 50, 250, fetch_range)
+        assert (cached, fetched) == (False, [(100, 300)])
+        assert entry["segments"] == [[0, 300]]
+
+        data = await cache.aread_range("clip", 50, 250, fetch_range)
+        assert data == video[50:300]
+        assert fetched == [(100, 300)]
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_complete_segments_commit_full_file(self, tmp_path):
+        """[P1] Once every byte is cached the video becomes a regular entry."""
+        from mcp_servers.cache import VideoCache
+
+        video = b"abcdefghij" * 10
+        cache = VideoCache("dvids", str(tmp_path))
+
+        def fetch_range(video_id, start, end):
+            return video[start:end], len(video)
+
+        await cache.aensure_range("clip", 0, 40, fetch_range)
+        entry, _ = await cache.aensure_range("clip", 30, 500, fetch_range)
+
+        assert not entry.get("partial")
+        assert entry["size"] == len(video)
+        assert cache.get("clip", lambda v: pytest.fail("should be cached")) == video
+        assert not (tmp_path / "dvids" / "segments" / "clip.mp4.part").exists()
+
+
+class TestServerRangeRequests:
+    """Test HTTP Range requests of the scraping servers."""
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_dvids_fetch_range_sends_range_header(self, tmp_path):
+        """[P1] DVIDS asks for exactly the missing bytes and reads the total length."""
+        import httpx
+        from mcp_servers.dvids_scraping_server import DVIDSScrapingMCPServer
+
+        server = DVIDSScrapingMCPServer(str(tmp_path))
+        server._download_urls["clip"] = "https://www.dvidshub.net/files/clip.mp4"
+        requests = []
+
+        async def send(self, request, **kwargs):
+            requests.append(request)
+            return httpx.Response(
+                206, headers={"Content-Range": "bytes 100-109/5000"},
+                content=b"0123456789", request=request
+            )
+
+        with patch.object(server, "_respect_rate_limit", AsyncMock()), \
+                patch("httpx.AsyncClient.send", send):
+            data, total_size = await server._fetch_range("clip", 100, 110)
+
+        assert (data, total_size) == (b"0123456789", 5000)
+        assert requests[0].headers["Range"] == "bytes=100-109"
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_nasa_fetch_range_rejects_wrong_range(self, tmp_path):
+        """[P1] NASA refuses a 206 for other bytes than requested instead of caching them."""
+        import httpx
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+
+        server = NASAScrapingMCPServer(str(tmp_path))
+        server._download_urls["clip"] = "https://images-assets.nasa.gov/video/clip/clip~orig.mp4"
+
+        async def send(self, request, **kwargs):
+            return httpx.Response(
+                206, headers={"Content-Range": "bytes 0-9/5000"},
+                content=b"0123456789", request=request
+            )
+
+        with patch.object(server, "_respect_rate_limit", AsyncMock()), \
+                patch("httpx.AsyncClient.send", send):
+            with pytest.raises(IOError):
+                await server._fetch_range("clip", 100, 110)
+        await server.aclose()
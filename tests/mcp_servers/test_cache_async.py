@@ -0,0 +1,129 @@
+"""
+VideoCache Async API Tests
+
+These tests validate the async cache API used by the scraping servers:
+coroutine fetchers, in-flight deduplication and download entries.
+"""
+
+import asyncio
+
+import pytest
+
+
+class TestAsyncGet:
+    """Test VideoCache.aget."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_aget_awaits_coroutine_fetcher(self, tmp_path):
+        """[P0] aget awaits a coroutine fetcher and caches its result.
+
+        GIVEN: A VideoCache and an async fetch function
+        WHEN: Calling aget twice for the same video
+        THEN: The fetcher runs once and the second call is served from disk
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("nasa", str(tmp_path))
+        calls = []
+
+        async def fetch(video_id):
+            calls.append(video_id)
+            return b"async content"
+
+        assert await cache.aget("clip", fetch) == b"async content"
+        assert await cache.aget("clip", fetch) == b"async content"
+        assert calls == ["clip"]
+        assert (tmp_path / "nasa" / "clip.mp4").read_bytes() == b"async content"
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_aget_accepts_sync_fetcher(self, tmp_path):
+        """[P1] aget also accepts a regular fetch function."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+
+        assert await cache.aget("clip", lambda v: b"sync content") == b"sync content"
+        assert cache.is_cached("clip") is True
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_concurrent_aget_shares_one_fetch(self, tmp_path):
+        """[P0] Concurrent aget calls for one video share a single fetch.
+
+        GIVEN: Five coroutines requesting the same uncached video
+        WHEN: The fetcher is slow
+        THEN: It runs once and every caller gets its content
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        calls = []
+
+        async def fetch(video_id):
+            calls.append(video_id)
+            await asyncio.sleep(0.1)
+            return b"shared"
+
+        results = await asyncio.gather(*(cache.aget("clip", fetch) for _ in range(5)))
+
+        assert calls == ["clip"]
+        assert results == [b"shared"] * 5
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_shared_then_retried(self, tmp_path):
+        """[P1] A failing fetch fails all waiters, and the next call retries."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        attempts = []
+
+        async def fetch(video_id):
+            attempts.append(video_id)
+            await asyncio.sleep(0.05)
+            if len(attempts) == 1:
+                raise ConnectionError("upstream down")
+            return b"ok"
+
+        results = await asyncio.gather(
+            cache.aget("clip", fetch), cache.aget("clip", fetch), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert await cache.aget("clip", fetch) == b"ok"
+        assert len(attempts) == 2
+
+
+class TestAsyncGetEntry:
+    """Test VideoCache.aget_entry."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_aget_entry_downloads_once_then_hits(self, tmp_path):
+        """[P0] aget_entry runs the downloader on a miss and reports hits.
+
+        GIVEN: A downloader that streams into the cache
+        WHEN: Calling aget_entry concurrently and then again
+        THEN: The download happens once and the last call reports cached=True
+        """
+        from mcp_servers.cache import VideoCache, iter_chunks
+
+        cache = VideoCache("nasa", str(tmp_path))
+        downloads = []
+
+        async def download(video_id):
+            downloads.append(video_id)
+            await asyncio.sleep(0.05)
+            return await cache.put_stream(video_id, iter_chunks(b"video"))
+
+        first, second = await asyncio.gather(
+            cache.aget_entry("clip", download), cache.aget_entry("clip", download)
+        )
+        entry, cached = await cache.aget_entry("clip", download)
+
+        assert downloads == ["clip"]
+        assert first[1] is False and second[1] is False
+        assert cached is True
+        assert entry["file_path"] == first[0]["file_path"]
@@ -504,7 +504,7 @@ class TestCacheWithDifferentContentTypes:
 
         GIVEN: Fetch function returning empty bytes/string
         WHEN: Calling get()
-        THEN: Should cache empty content correctly
+        THEN: Should return the content without caching it (empty payloads are rejected)
         """
         with tempfile.TemporaryDirectory() as temp_dir:
             from mcp_servers.cache import VideoCache
@@ -519,13 +519,13 @@ class TestCacheWithDifferentContentTypes:
             video_id1 = "test_empty_bytes"
             result1 = cache.get(video_id1, lambda v: b"")
             assert result1 == b""
-            assert cache.is_cached(video_id1) is True
+            assert cache.is_cached(video_id1) is False
 
             # Empty string
             video_id2 = "test_empty_string"
             result2 = cache.get(video_id2, lambda v: "")
             assert result2 == ""
-            assert cache.is_cached(video_id2) is True
+            assert cache.is_cached(video_id2) is False
 
     @pytest.mark.P2
     def test_cache_with_large_binary_content(self):
@@ -0,0 +1,181 @@
+"""
+VideoCache Statistics Tests
+
+These tests validate incrementally maintained cache statistics: sizes,
+counts, per-provider bytes, event counters, age histograms and the
+reconcile mode that rescans the disk.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+
+class TestCacheStats:
+    """Test the CacheStats accumulator."""
+
+    @pytest.mark.P0
+    def test_add_replace_remove(self):
+        """[P0] Totals follow inserts, replacements and removals.
+
+        GIVEN: An empty CacheStats
+        WHEN: Adding two entries, replacing one and removing the other
+        THEN: Totals and per-provider usage reflect only the current entries
+        """
+        from mcp_servers.cache_stats import CacheStats
+
+        now = datetime.now().isoformat()
+        stats = CacheStats()
+        stats.add(("dvids", "a"), {"size": 100, "cached_date": now})
+        stats.add(("nasa", "b"), {"size": 50, "cached_date": now})
+        stats.add(("dvids", "a"), {"size": 30, "cached_date": now})
+        stats.remove(("nasa", "b"))
+        stats.remove(("nasa", "unknown"))
+
+        snapshot = stats.snapshot()
+        assert snapshot["total_bytes"] == 30
+        assert snapshot["total_entries"] == 1
+        assert snapshot["provider_bytes"] == {"dvids": 30}
+        assert stats.provider_usage("nasa") == (0, 0)
+
+    @pytest.mark.P1
+    def test_shared_content_counts_once_in_total(self):
+        """[P1] Entries sharing a content hash count once towards total_bytes."""
+        from mcp_servers.cache_stats import CacheStats
+
+        stats = CacheStats()
+        stats.add(("dvids", "a"), {"size": 100, "content_hash": "h"})
+        stats.add(("nasa", "b"), {"size": 100, "content_hash": "h"})
+
+        assert stats.total_bytes == 100
+        assert stats.provider_usage("nasa") == (100, 1)
+        stats.remove(("dvids", "a"))
+        assert stats.total_bytes == 100
+        stats.remove(("nasa", "b"))
+        assert stats.total_bytes == 0
+
+    @pytest.mark.P1
+    def test_age_histogram_buckets(self):
+        """[P1] Entries are bucketed by the age of their cached_date."""
+        from mcp_servers.cache_stats import CacheStats
+
+        stats = CacheStats()
+        for i, days in enumerate((0, 3, 3, 10, 45, 200)):
+            cached = (datetime.now() - timedelta(days=days)).isoformat()
+            stats.add(("dvids", str(i)), {"size": 1, "cached_date": cached})
+        stats.add(("dvids", "bad"), {"size": 1, "cached_date": "not a date"})
+
+        assert stats.age_histogram("dvids") == {
+            "<1d": 1, "1-7d": 2, "7-30d": 1, "30-90d": 1, ">=90d": 1, "unknown": 1
+        }
+        assert stats.age_histogram("nasa")["<1d"] == 0
+
+
+class TestVideoCacheStats:
+    """Test VideoCache.get_stats and the cheap size/count accessors."""
+
+    @pytest.mark.P0
+    def test_stats_do_not_stat_files(self, tmp_path):
+        """[P0] get_cache_size and get_stats use recorded sizes, not the disk.
+
+        GIVEN: A cache with two videos
+        WHEN: Reading statistics with Path.stat patched to fail
+        THEN: Sizes and counts are still reported
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("a", lambda v: b"x" * 100)
+        cache.get("b", lambda v: b"y" * 50)
+
+        with patch("pathlib.Path.stat", side_effect=AssertionError("disk access")):
+            assert cache.get_cache_size() == 150
+            assert cache.get_cache_count() == 2
+            stats = cache.get_stats()
+
+        assert stats["provider_bytes"] == {"dvids": 150}
+        assert stats["age_histogram"]["<1d"] == 2
+
+    @pytest.mark.P1
+    def test_size_and_count_span_providers(self, tmp_path):
+        """[P1] get_cache_size/get_cache_count cover the whole cache; get_provider_usage one provider."""
+        from mcp_servers.cache import VideoCache
+
+        VideoCache("dvids", str(tmp_path)).get("d1", lambda v: b"x" * 100)
+        nasa = VideoCache("nasa", str(tmp_path))
+        nasa.get("n1", lambda v: b"y" * 30)
+
+        assert (nasa.get_cache_size(), nasa.get_cache_count()) == (130, 2)
+        assert nasa.get_provider_usage() == (30, 1)
+
+    @pytest.mark.P0
+    def test_counters_track_hits_misses_and_evictions(self, tmp_path):
+        """[P0] Hits, misses and evictions are counted.
+
+        GIVEN: A cache limited to one entry
+        WHEN: Fetching a, reading it again, then fetching b
+        THEN: Two misses, one hit and one eviction are reported
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.eviction import CacheBudget
+
+        cache = VideoCache("dvids", str(tmp_path), budget=CacheBudget(max_entries=1))
+        cache.get("a", lambda v: b"a")
+        cache.get("a", lambda v: pytest.fail("should be cached"))
+        cache.get("b", lambda v: b"b")
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 2, 1)
+        assert stats["total_entries"] == 1
+
+    @pytest.mark.P1
+    def test_invalidate_updates_stats(self, tmp_path):
+        """[P1] Invalidated entries leave the statistics immediately."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("nasa", str(tmp_path), metadata_backend="sqlite")
+        cache.get("a", lambda v: b"12345")
+        assert cache.get_cache_size() == 5
+
+        cache.invalidate("a")
+
+        assert cache.get_stats()["total_entries"] == 0
+        assert cache.get_cache_size() == 0
+
+    @pytest.mark.P1
+    def test_sees_entries_written_by_other_caches(self, tmp_path):
+        """[P1] Statistics include entries committed through another instance."""
+        from mcp_servers.cache import VideoCache
+
+        dvids = VideoCache("dvids", str(tmp_path))
+        assert dvids.get_stats()["total_entries"] == 0
+
+        VideoCache("nasa", str(tmp_path)).get("n", lambda v: b"nasa clip")
+
+        stats = dvids.get_stats()
+        assert stats["provider_entries"] == {"nasa": 1}
+        assert stats["total_bytes"] == len(b"nasa clip")
+
+    @pytest.mark.P1
+    def test_reconcile_rescans_disk(self, tmp_path):
+        """[P1] Reconcile mode replaces recorded sizes with sizes on disk.
+
+        GIVEN: A cached file changed and another deleted behind the cache's back
+        WHEN: Calling get_stats(reconcile=True)
+        THEN: Sizes match the disk and the missing file is reported
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path), content_addressed=False)
+        cache.get("a", lambda v: b"x" * 10)
+        cache.get("b", lambda v: b"y" * 10)
+        (tmp_path / "dvids" / "a.mp4").write_bytes(b"x" * 25)
+        (tmp_path / "dvids" / "b.mp4").unlink()
+
+        assert cache.get_cache_size() == 20
+        stats = cache.get_stats(reconcile=True)
+
+        assert stats["missing_files"] == 1
+        assert stats["provider_bytes"] == {"dvids": 25}
+        assert cache.get_cache_size() == 25
@@ -0,0 +1,124 @@
+"""
+VideoCache Streaming Write Tests
+
+These tests validate chunked cache writes from async byte streams, atomic
+commit via temporary files, and path-based cache hits.
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+class TestPutStream:
+    """Test VideoCache.put_stream and get_path."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_put_stream_writes_chunks_and_records_entry(self, tmp_path):
+        """[P0] Streamed chunks are written to the cache file and recorded.
+
+        GIVEN: A VideoCache
+        WHEN: Streaming three chunks into the cache
+        THEN: The file holds the concatenated chunks and metadata has its size
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+
+        entry = await cache.put_stream("clip", _chunks(b"abc", b"def", b"g"))
+
+        cache_file = tmp_path / "dvids" / "clip.mp4"
+        assert entry["file_path"] == str(cache_file)
+        assert entry["size"] == 7
+        assert cache_file.read_bytes() == b"abcdefg"
+        assert cache.get_path("clip") == cache_file
+        assert list((tmp_path / "dvids").glob(".*.tmp")) == []
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_failed_stream_keeps_previous_copy(self, tmp_path):
+        """[P0] A stream that fails midway leaves no partial file behind.
+
+        GIVEN: A cached video
+        WHEN: Re-downloading it fails after the first chunk
+        THEN: The old copy is intact and no temporary file remains
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("nasa", str(tmp_path))
+        await cache.put_stream("clip", _chunks(b"original"))
+
+        async def broken():
+            yield b"partial"
+            raise ConnectionError("connection reset")
+
+        with pytest.raises(ConnectionError):
+            await cache.put_stream("clip", broken())
+
+        assert (tmp_path / "nasa" / "clip.mp4").read_bytes() == b"original"
+        assert cache.get_entry("clip")["size"] == 8
+        assert list((tmp_path / "nasa").glob(".*.tmp")) == []
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_iter_chunks_splits_payload(self):
+        """[P1] iter_chunks yields the payload in chunk_size slices."""
+        from mcp_servers.cache import iter_chunks
+
+        parts = [bytes(chunk) async for chunk in iter_chunks(b"0123456789", chunk_size=4)]
+
+        assert parts == [b"0123", b"4567", b"89"]
+
+    @pytest.mark.P1
+    def test_get_path_returns_none_on_miss(self, tmp_path):
+        """[P1] get_path returns None for videos that are not cached."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+
+        assert cache.get_path("missing") is None
+
+
+class TestServerStreamingDownload:
+    """Test that servers stream video downloads into the cache."""
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_dvids_download_streams_video_file(self, tmp_path):
+        """[P1] DVIDS download_video streams the linked .mp4 into the cache.
+
+        GIVEN: A DVIDS video page linking to an .mp4 file
+        WHEN: Downloading the video
+        THEN: The file body is streamed in chunks and the response is closed
+        """
+        from mcp_servers.dvids_scraping_server import DVIDSScrapingMCPServer
+
+        server = DVIDSScrapingMCPServer(cache_dir=str(tmp_path))
+
+        page = Mock()
+        page.status_code = 200
+        page.text = '<html><a href="/files/clip.mp4">Download</a></html>'
+        page.content = page.text.encode()
+
+        stream = Mock()
+        stream.status_code = 200
+        stream.aiter_bytes = lambda chunk_size=None: _chunks(b"video-", b"bytes")
+        stream.aclose = AsyncMock()
+
+        with patch.object(server, '_respect_rate_limit', AsyncMock()), \
+             patch('httpx.AsyncClient.get', return_value=page), \
+             patch('httpx.AsyncClient.send', return_value=stream) as mock_send:
+            result = await server.download_video(video_id="123")
+
+        request = mock_send.call_args[0][0]
+        assert str(request.url).endswith("/files/clip.mp4")
+        assert mock_send.call_args[1]["stream"] is True
+        stream.aclose.assert_awaited_once()
+        assert result["cached"] is False
+        assert (tmp_path / "dvids" / "123.mp4").read_bytes() == b"video-bytes"
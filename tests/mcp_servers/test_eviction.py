@@ -0,0 +1,241 @@
+"""
+VideoCache Eviction Policy and Budget Tests
+
+These tests validate size/entry budgets and the LRU, LFU and GDSF eviction
+policies used by VideoCache.
+"""
+
+import time
+
+import pytest
+
+
+def _index_entry(size=100, last_access=0.0, hits=0):
+    return {"size": size, "last_access": last_access, "hits": hits}
+
+
+class TestEvictionIndex:
+    """Test victim selection in the eviction index."""
+
+    @pytest.mark.P0
+    def test_lru_picks_least_recently_accessed(self):
+        """[P0] LRU evicts the entry with the oldest last_access."""
+        from mcp_servers.eviction import EvictionIndex, LRUPolicy
+
+        index = EvictionIndex(LRUPolicy())
+        index.update(("dvids", "old"), _index_entry(last_access=1.0))
+        index.update(("dvids", "new"), _index_entry(last_access=2.0))
+
+        assert index.peek_victim() == ("dvids", "old")
+
+        # Accessing "old" makes "new" the victim
+        index.update(("dvids", "old"), _index_entry(last_access=3.0))
+        assert index.peek_victim() == ("dvids", "new")
+
+    @pytest.mark.P1
+    def test_lfu_picks_least_frequently_accessed(self):
+        """[P1] LFU evicts the entry with the fewest hits."""
+        from mcp_servers.eviction import EvictionIndex, LFUPolicy
+
+        index = EvictionIndex(LFUPolicy())
+        index.update(("nasa", "popular"), _index_entry(hits=10, last_access=1.0))
+        index.update(("nasa", "rare"), _index_entry(hits=1, last_access=5.0))
+
+        assert index.peek_victim() == ("nasa", "rare")
+
+    @pytest.mark.P1
+    def test_gdsf_prefers_evicting_large_entries(self):
+        """[P1] GDSF evicts large entries before small ones with equal hits."""
+        from mcp_servers.eviction import EvictionIndex, GDSFPolicy
+
+        index = EvictionIndex(GDSFPolicy())
+        index.update(("dvids", "small"), _index_entry(size=10, hits=1))
+        index.update(("dvids", "large"), _index_entry(size=10_000, hits=1))
+
+        assert index.peek_victim() == ("dvids", "large")
+
+    @pytest.mark.P1
+    def test_provider_scope_and_protected_key(self):
+        """[P1] Victims can be restricted to a provider and skip the protected key."""
+        from mcp_servers.eviction import EvictionIndex, LRUPolicy
+
+        index = EvictionIndex(LRUPolicy())
+        index.update(("dvids", "a"), _index_entry(last_access=1.0))
+        index.update(("nasa", "b"), _index_entry(last_access=2.0))
+        index.update(("nasa", "c"), _index_entry(last_access=3.0))
+
+        assert index.peek_victim("nasa") == ("nasa", "b")
+        assert index.peek_victim("nasa", protect=("nasa", "b")) == ("nasa", "c")
+        assert index.provider_usage("nasa") == (200, 2)
+
+        index.remove(("nasa", "b"))
+        assert index.peek_victim("nasa") == ("nasa", "c")
+        assert index.total_bytes == 200
+
+    @pytest.mark.P2
+    def test_index_handles_100k_entries_quickly(self):
+        """[P2] Touching and evicting cost about the same at 100k entries as at 10k.
+
+        GIVEN: Indexes of 10k and 100k entries
+        WHEN: Timing the same number of touches and evictions on each (best of three)
+        THEN: The 100k index is well under 10x slower, i.e. operations do not scan all entries
+        """
+        from mcp_servers.eviction import EvictionIndex, LRUPolicy
+
+        def build(size):
+            index = EvictionIndex(LRUPolicy())
+            for i in range(size):
+                index.update(("dvids", str(i)), _index_entry(last_access=float(i)))
+            return index
+
+        def time_operations(size, rounds=2_000):
+            index = build(size)
+            start = time.perf_counter()
+            for i in range(0, size, size // rounds):
+                index.update(("dvids", str(i)), _index_entry(last_access=float(size + i)))
+            for _ in range(rounds):
+                index.remove(index.peek_victim())
+            return time.perf_counter() - start
+
+        small = min(time_operations(10_000) for _ in range(3))
+        large = min(time_operations(100_000) for _ in range(3))
+        # Relative, so machine load does not matter; a linear scan per operation would be ~10x
+        assert large < 5 * small, (small, large)
+
+        index = build(100_000)
+        for i in range(0, 100_000, 2):
+            index.update(("dvids", str(i)), _index_entry(last_access=200_000.0 + i))
+        for _ in range(1_000):
+            index.remove(index.peek_victim())
+        assert len(index) == 99_000
+        assert index.peek_victim() == ("dvids", "2001")
+
+    @pytest.mark.P1
+    def test_shared_content_counts_once_globally(self):
+        """[P1] Entries sharing a content hash count once towards total_bytes."""
+        from mcp_servers.eviction import EvictionIndex, LRUPolicy
+
+        index = EvictionIndex(LRUPolicy())
+        shared = dict(_index_entry(size=100), content_hash="abc")
+        index.update(("dvids", "a"), shared)
+        index.update(("nasa", "b"), shared)
+
+        assert index.total_bytes == 100
+        assert index.blob_refs("abc") == 2
+        assert index.provider_usage("nasa") == (100, 1)
+
+        index.remove(("dvids", "a"))
+        assert index.total_bytes == 100
+        index.remove(("nasa", "b"))
+        assert index.total_bytes == 0
+
+
+class TestVideoCacheBudgets:
+    """Test budget enforcement in VideoCache."""
+
+    @pytest.mark.P0
+    def test_provider_byte_budget_evicts_lru_entry(self, tmp_path):
+        """[P0] Inserting past the byte budget evicts the least recently used clip.
+
+        GIVEN: A cache with a 250 byte budget holding two 100 byte clips
+        WHEN: The older clip is read and a third clip is inserted
+        THEN: The clip that was not read is evicted from disk and metadata
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.eviction import CacheBudget
+
+        cache = VideoCache("dvids", str(tmp_path), budget=CacheBudget(max_bytes=250))
+        cache.get("first", lambda v: b"x" * 100)
+        cache.get("second", lambda v: b"x" * 100)
+        cache.get("first", lambda v: pytest.fail("should be a cache hit"))
+
+        cache.get("third", lambda v: b"x" * 100)
+
+        assert cache.is_cached("first") is True
+        assert cache.is_cached("second") is False
+        assert cache.is_cached("third") is True
+        assert not (tmp_path / "dvids" / "second.mp4").exists()
+        assert cache.get_provider_usage() == (200, 2)
+
+    @pytest.mark.P0
+    def test_eviction_skips_video_being_downloaded(self, tmp_path):
+        """[P0] Eviction never deletes a video whose lock another caller holds.
+
+        GIVEN: A 250 byte budget with two 100 byte clips, the older one locked by a download thread
+        WHEN: A third clip is inserted
+        THEN: The locked clip survives and the next least recently used clip is evicted
+        """
+        import threading
+
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.eviction import CacheBudget
+
+        cache = VideoCache("dvids", str(tmp_path), budget=CacheBudget(max_bytes=250))
+        cache.get("busy", lambda v: b"x" * 100)
+        cache.get("idle", lambda v: b"x" * 100)
+
+        locked, done = threading.Event(), threading.Event()
+
+        def download():
+            with cache.lock_video("busy"):
+                locked.set()
+                done.wait(5)
+
+        downloader = threading.Thread(target=download)
+        downloader.start()
+        try:
+            assert locked.wait(5)
+            cache.get("new", lambda v: b"x" * 100)
+        finally:
+            done.set()
+            downloader.join()
+
+        assert cache.is_cached("busy") is True
+        assert (tmp_path / "dvids" / "busy.mp4").exists()
+        assert cache.is_cached("idle") is False
+        assert cache.is_cached("new") is True
+
+    @pytest.mark.P1
+    def test_global_entry_budget_spans_providers(self, tmp_path):
+        """[P1] The global entry budget counts clips from every provider.
+
+        GIVEN: A DVIDS clip cached first, then a NASA cache with a 1 entry global budget
+        WHEN: The NASA cache inserts a clip
+        THEN: The DVIDS clip is evicted
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.eviction import CacheBudget
+
+        dvids = VideoCache("dvids", str(tmp_path))
+        dvids.get("d1", lambda v: b"dvids")
+
+        nasa = VideoCache("nasa", str(tmp_path), global_budget=CacheBudget(max_entries=1))
+        nasa.get("n1", lambda v: b"nasa")
+
+        assert dvids.is_cached("d1") is False
+        assert nasa.is_cached("n1") is True
+
+    @pytest.mark.P1
+    def test_hits_and_access_time_are_recorded(self, tmp_path):
+        """[P1] Cache hits update hits and last_access in the metadata entry."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("nasa", str(tmp_path), metadata_backend="sqlite")
+        cache.get("clip", lambda v: b"data")
+        created = cache.get_entry("clip")
+
+        cache.get("clip", lambda v: b"data")
+        cache.get("clip", lambda v: b"data")
+        entry = cache.get_entry("clip")
+
+        assert created["size"] == 4
+        assert entry["hits"] == 2
+        assert entry["last_access"] >= created["last_access"]
+
+    @pytest.mark.P2
+    def test_unknown_policy_raises(self, tmp_path):
+        """[P2] An unknown eviction policy name is rejected."""
+        from mcp_servers.cache import VideoCache
+
+        with pytest.raises(ValueError):
+            VideoCache("dvids", str(tmp_path), eviction_policy="random")
@@ -0,0 +1,77 @@
+"""
+Shared Fetch Loop Tests
+
+These tests validate the retry loop and the resumable streaming download
+shared by the DVIDS and NASA servers, independently of either server.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+class TestFetchWithBackoff:
+    """Test fetch_with_backoff."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_retries_with_caller_settings(self):
+        """[P0] A 503 is retried after a token from acquire(); retry settings come from the caller.
+
+        GIVEN: An origin answering 503 twice, then 200
+        WHEN: Fetching with max_retries=3 and max_backoff=4
+        THEN: Three tokens are taken, both backoffs stay within 4 s, and the 200 is returned
+        """
+        import httpx
+
+        from mcp_servers.fetching import fetch_with_backoff
+        from mcp_servers.rate_limiter import RateLimiter
+
+        request = httpx.Request("GET", "https://example.org/page")
+        client = AsyncMock()
+        client.get = AsyncMock(side_effect=[
+            httpx.Response(503, request=request),
+            httpx.Response(503, request=request),
+            httpx.Response(200, text="ok", request=request),
+        ])
+        acquire = AsyncMock()
+        limiter = RateLimiter("https://example.org", 10)
+
+        with patch("mcp_servers.fetching.asyncio.sleep", AsyncMock()) as sleep:
+            response = await fetch_with_backoff(
+                "https://example.org/page", client, limiter, acquire, max_retries=3, max_backoff=4
+            )
+
+        assert response.status_code == 200
+        assert acquire.await_count == 3
+        assert all(call.args[0] <= 4 for call in sleep.await_args_list)
+        assert limiter.stats()["throttled"] == 2
+
+
+class TestStreamToCache:
+    """Test stream_to_cache."""
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_streams_through_given_fetch(self, tmp_path):
+        """[P1] The body comes from the caller's fetch function and is stored with its validators."""
+        import httpx
+
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.fetching import stream_to_cache
+
+        cache = VideoCache("nasa", str(tmp_path))
+        calls = []
+
+        async def fetch(url, stream=False, headers=None):
+            calls.append((url, stream, headers))
+            return httpx.Response(
+                200, headers={"ETag": '"v1"', "Content-Length": "4"}, content=b"data",
+                request=httpx.Request("GET", url)
+            )
+
+        entry = await stream_to_cache(cache, "clip", "https://example.org/clip.mp4", fetch)
+
+        assert calls == [("https://example.org/clip.mp4", True, None)]
+        assert entry["etag"] == '"v1"'
+        assert cache.get("clip", lambda v: pytest.fail("should be cached")) == b"data"
@@ -0,0 +1,76 @@
+"""
+Shared HTTP Client Tests
+
+These tests validate the pooled client's settings, its reuse across
+requests, and that the scraping servers close it on shutdown.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+class TestSharedHttpClient:
+    """Test SharedHttpClient."""
+
+    @pytest.mark.P1
+    def test_options_from_env(self, monkeypatch):
+        """[P1] Timeouts, pool limits and HTTP/2 are read from the environment."""
+        from mcp_servers.http_client import SharedHttpClient, http_client_options_from_env
+
+        monkeypatch.setenv("VIDEO_HTTP_CONNECT_TIMEOUT", "3")
+        monkeypatch.setenv("VIDEO_HTTP_MAX_CONNECTIONS", "4")
+        monkeypatch.setenv("VIDEO_HTTP2", "0")
+        shared = SharedHttpClient(**http_client_options_from_env())
+
+        assert shared.timeout.connect == 3.0
+        assert shared.timeout.read == 60.0
+        assert shared.limits.max_connections == 4
+        assert shared.http2 is False
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_client_reused_until_closed(self):
+        """[P0] The same pooled client serves every request until aclose().
+
+        GIVEN: A SharedHttpClient
+        WHEN: The client is requested twice, closed, then requested again
+        THEN: The first two are the same instance; aclose() closes it and a new one replaces it
+        """
+        from mcp_servers.http_client import SharedHttpClient
+
+        shared = SharedHttpClient()
+        first = shared.client
+        assert shared.client is first and not shared.closed
+
+        await shared.aclose()
+
+        assert first.is_closed and shared.closed
+        second = shared.client
+        assert second is not first and not second.is_closed
+        await shared.aclose()
+
+
+class TestServerHttpClient:
+    """Test the scraping servers' use of the shared client."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_requests_share_one_client(self, tmp_path):
+        """[P0] Consecutive tool calls reuse one connection pool; aclose() shuts it down."""
+        import httpx
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+
+        server = NASAScrapingMCPServer(cache_dir=str(tmp_path))
+        page = httpx.Response(200, text="<html></html>", request=httpx.Request("GET", "https://images.nasa.gov"))
+
+        with patch("httpx.AsyncClient.get", autospec=True, return_value=page) as get, \
+                patch.object(server, "_respect_rate_limit", AsyncMock()):
+            await server.search_videos("apollo")
+            await server.search_videos("gemini")
+
+        clients = {call.args[0] for call in get.call_args_list}
+        assert get.call_count == 2 and clients == {server.http.client}
+
+        await server.aclose()
+        assert server.http.closed
@@ -0,0 +1,158 @@
+"""
+Cache Integrity Tests
+
+These tests validate that empty and HTML payloads are rejected before
+commit, that truncated files stop being served as hits, and that the
+parallel verify command quarantines corrupted entries.
+"""
+
+import pytest
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+class TestPayloadChecks:
+    """Test payload checks at write time."""
+
+    @pytest.mark.P0
+    def test_payload_problem(self):
+        """[P0] Empty payloads and HTML pages are recognised; video bytes are not."""
+        from mcp_servers.integrity import payload_problem
+
+        assert payload_problem(b"", 0) == "empty payload"
+        assert payload_problem(b"\n  <!DOCTYPE html><html>", 23) == "HTML payload"
+        assert payload_problem(b"<HTML><body>Error 500</body>", 28) == "HTML payload"
+        assert payload_problem(b"\x00\x00\x00\x18ftypmp42", 12) is None
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_rejected_before_commit(self, tmp_path):
+        """[P0] put_stream and put_stream_resumable refuse error pages and keep the old copy.
+
+        GIVEN: A cached video
+        WHEN: A re-download streams an HTML error page, then an empty body
+        THEN: IntegrityError is raised, the old copy is still served and no temp files remain
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.integrity import IntegrityError
+
+        cache = VideoCache("nasa", str(tmp_path))
+        original = await cache.put_stream("clip", _chunks(b"footage"))
+
+        with pytest.raises(IntegrityError):
+            await cache.put_stream("clip", _chunks(b"<html><body>Not Found</body></html>"))
+        with pytest.raises(IntegrityError):
+            await cache.put_stream_resumable("other", _chunks(), validators={"etag": '"v1"'})
+
+        assert cache.get_cached_entry("clip")["content_hash"] == original["content_hash"]
+        assert cache.get_entry("other") is None
+        assert list(cache.provider_dir.glob("*.tmp")) == []
+        assert list((cache.provider_dir / "segments").glob("*")) == []
+
+    @pytest.mark.P1
+    def test_truncated_file_is_not_a_hit(self, tmp_path):
+        """[P1] A cached file whose length changed is no longer served."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("clip", lambda v: b"complete footage")
+        entry = cache.get_entry("clip")
+        with open(entry["file_path"], "r+b") as f:
+            f.truncate(4)
+
+        assert cache.is_cached("clip") is False
+        assert cache.get("clip", lambda v: b"fresh footage") == b"fresh footage"
+
+
+class TestVerifyCache:
+    """Test parallel verification with quarantine."""
+
+    @pytest.mark.P0
+    def test_verify_quarantines_corrupted_entries(self, tmp_path):
+        """[P0] verify_cache re-hashes entries and quarantines bad ones.
+
+        GIVEN: Three cached videos, one corrupted in place and one truncated
+        WHEN: verify_cache runs with two worker processes
+        THEN: The two bad files move to quarantine and their entries are dropped
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.integrity import QUARANTINE_DIRNAME, verify_cache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        for video_id in ("good", "flipped", "short"):
+            cache.get(video_id, lambda v: f"footage of {v}".encode())
+        with open(cache.get_entry("flipped")["file_path"], "r+b") as f:
+            f.write(b"F")
+        with open(cache.get_entry("short")["file_path"], "r+b") as f:
+            f.truncate(3)
+
+        results = verify_cache(cache, workers=2)
+
+        assert (results["checked"], results["ok"], results["quarantined"]) == (3, 1, 2)
+        assert "SHA-256" in results["problems"]["flipped"]
+        assert "expected" in results["problems"]["short"]
+        assert cache.get_entry("good") is not None
+        assert cache.get_entry("flipped") is None and cache.get_entry("short") is None
+        assert len(list((tmp_path / QUARANTINE_DIRNAME / "dvids").iterdir())) == 2
+
+    @pytest.mark.P1
+    def test_quarantine_waits_for_download_and_skips_replaced_entry(self, tmp_path):
+        """[P1] VideoCache.quarantine holds the video lock and leaves replaced entries alone.
+
+        GIVEN: A cached clip whose lock is held by a download thread
+        WHEN: The clip is quarantined with the cached_date it was checked under
+        THEN: Nothing moves until the lock is released; a replaced entry is not quarantined
+        """
+        import threading
+
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("clip", lambda v: b"footage")
+        checked = cache.get_entry("clip")["cached_date"]
+
+        locked, release = threading.Event(), threading.Event()
+
+        def download():
+            with cache.lock_video("clip"):
+                locked.set()
+                release.wait(5)
+                cache.invalidate("clip")
+                cache.get("clip", lambda v: b"new footage")
+
+        downloader = threading.Thread(target=download)
+        downloader.start()
+        assert locked.wait(5)
+        result = []
+        quarantiner = threading.Thread(
+            target=lambda: result.append(cache.quarantine("clip", "bad hash", cached_date=checked))
+        )
+        quarantiner.start()
+        quarantiner.join(0.2)
+        assert quarantiner.is_alive()
+
+        release.set()
+        downloader.join()
+        quarantiner.join(5)
+
+        assert result == [None]
+        assert cache.get("clip", lambda v: pytest.fail("should be cached")) == b"new footage"
+
+    @pytest.mark.P1
+    def test_cli_verify_dry_run(self, tmp_path, capsys):
+        """[P1] cache_cli verify --dry-run reports bad entries without moving them."""
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.cache_cli import main
+
+        cache = VideoCache("nasa", str(tmp_path))
+        cache.get("clip", lambda v: b"footage")
+        with open(cache.get_entry("clip")["file_path"], "r+b") as f:
+            f.write(b"X")
+
+        assert main(["verify", str(tmp_path), "--workers", "1", "--dry-run"]) == 1
+        out = capsys.readouterr().out
+        assert "nasa/clip" in out and "quarantined=0" in out
+        assert VideoCache("nasa", str(tmp_path)).get_entry("clip") is not None
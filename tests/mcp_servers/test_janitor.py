@@ -0,0 +1,228 @@
+"""
+VideoCache Janitor Tests
+
+These tests validate background cache maintenance: sweeping expired
+entries, dropping metadata of missing files, deleting orphan files and
+blobs, and the cache_cli janitor command.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+def _expire(cache, video_id, days=31):
+    entry = cache.get_entry(video_id)
+    old_date = (datetime.now() - timedelta(days=days)).isoformat()
+    cache._store.put(cache.provider_name, video_id, dict(entry, cached_date=old_date))
+
+
+def _age(path, seconds=7200):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestCacheJanitor:
+    """Test CacheJanitor maintenance jobs."""
+
+    @pytest.mark.P0
+    def test_sweeps_expired_entries(self, tmp_path):
+        """[P0] Expired entries are deleted with their files and blobs.
+
+        GIVEN: A cache with one expired and one fresh video
+        WHEN: Running the janitor
+        THEN: Only the expired video's file, blob and metadata are removed
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("old", lambda v: b"old footage")
+        cache.get("new", lambda v: b"new footage")
+        blob = cache.blobs.path_for(cache.get_entry("old")["content_hash"])
+        _expire(cache, "old")
+
+        results = CacheJanitor(cache, batch_pause=0).run_once()
+
+        assert results["expired"] == 1
+        assert cache.get_entry("old") is None
+        assert not (tmp_path / "dvids" / "old.mp4").exists()
+        assert not blob.exists()
+        assert cache.is_cached("new") is True
+
+    @pytest.mark.P0
+    def test_drops_metadata_of_missing_files(self, tmp_path):
+        """[P0] Metadata pointing at deleted files is removed."""
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        cache = VideoCache("nasa", str(tmp_path))
+        cache.get("gone", lambda v: b"content")
+        (tmp_path / "nasa" / "gone.mp4").unlink()
+
+        results = CacheJanitor(cache, batch_pause=0).run_once(["missing"])
+
+        assert results == {"missing": 1}
+        assert cache.get_cache_count() == 0
+
+    @pytest.mark.P0
+    def test_keeps_entry_relocated_after_listing(self, tmp_path):
+        """[P0] An entry moved between listing and checking is kept with its file.
+
+        GIVEN: A flat-layout video that another worker relocates right after the job lists entries
+        WHEN: Running the missing and orphan jobs
+        THEN: The entry still points at the moved file and nothing is deleted
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("moved", lambda v: b"content")
+        old_path = tmp_path / "dvids" / "moved.mp4"
+        list_entries = cache.iter_entries
+
+        def list_then_relocate():
+            listed = list(list_entries())
+            cache.layout = "sharded"
+            cache.relocate("moved")
+            return iter(listed)
+
+        cache.iter_entries = list_then_relocate
+        results = CacheJanitor(cache, batch_pause=0, orphan_grace=0).run_once(["missing"])
+        cache.iter_entries = list_entries
+        results.update(CacheJanitor(cache, batch_pause=0, orphan_grace=0).run_once(["orphans"]))
+
+        entry = cache.get_entry("moved")
+        assert results == {"missing": 0, "orphans": 0}
+        assert not old_path.exists()
+        assert entry is not None and Path(entry["file_path"]).read_bytes() == b"content"
+
+    @pytest.mark.P0
+    def test_deletes_old_orphans_only(self, tmp_path):
+        """[P0] Unreferenced files and blobs are deleted after the grace period.
+
+        GIVEN: An old orphan video, a stale temp file, a fresh orphan and an orphan blob
+        WHEN: Running the orphan job
+        THEN: Old orphans are deleted and the fresh file is kept
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("kept", lambda v: b"kept")
+        orphan = tmp_path / "dvids" / "orphan.mp4"
+        stale_temp = tmp_path / "dvids" / ".abc.tmp"
+        fresh = tmp_path / "dvids" / "fresh.mp4"
+        blob = cache.blobs.path_for("ab" * 32)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        for path in (orphan, stale_temp, fresh, blob):
+            path.write_bytes(b"x")
+        for path in (orphan, stale_temp, blob):
+            _age(path)
+
+        results = CacheJanitor(cache, batch_pause=0).run_once(["orphans"])
+
+        assert results == {"orphans": 3}
+        assert fresh.exists()
+        assert not orphan.exists() and not stale_temp.exists() and not blob.exists()
+        assert cache.is_cached("kept") is True
+
+    @pytest.mark.P1
+    def test_processes_in_batches(self, tmp_path):
+        """[P1] Jobs yield once per batch_size items."""
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        cache = VideoCache("dvids", str(tmp_path))
+        for i in range(5):
+            cache.get(f"v{i}", lambda v: v.encode())
+            _expire(cache, f"v{i}")
+
+        batches = list(CacheJanitor(cache, batch_size=2)._sweep_expired())
+
+        assert batches == [2, 2, 1]
+        assert cache.get_cache_count() == 0
+
+    @pytest.mark.P1
+    def test_skips_videos_being_downloaded(self, tmp_path):
+        """[P1] An expired video locked by a download is left alone."""
+        import threading
+
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("busy", lambda v: b"content")
+        _expire(cache, "busy")
+        results = []
+
+        with cache.lock_video("busy"):
+            worker = threading.Thread(
+                target=lambda: results.append(CacheJanitor(cache, batch_pause=0).run_once(["expired"]))
+            )
+            worker.start()
+            worker.join()
+
+        assert results == [{"expired": 0}]
+        assert cache.get_entry("busy") is not None
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_run_once_async(self, tmp_path):
+        """[P1] The async runner performs the same jobs off the event loop."""
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        cache = VideoCache("nasa", str(tmp_path), metadata_backend="sqlite")
+        cache.get("old", lambda v: b"old")
+        _expire(cache, "old")
+
+        results = await CacheJanitor(cache, batch_pause=0).run_once_async()
+
+        assert results["expired"] == 1
+        assert cache.get_cache_count() == 0
+
+    @pytest.mark.P2
+    def test_unknown_job_rejected(self, tmp_path):
+        """[P2] Unknown job names raise ValueError."""
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        with pytest.raises(ValueError):
+            CacheJanitor(VideoCache("dvids", str(tmp_path))).run_once(["vacuum"])
+
+    @pytest.mark.P2
+    def test_interval_from_env(self, monkeypatch):
+        """[P2] VIDEO_CACHE_JANITOR_INTERVAL sets the interval; 0 disables."""
+        from mcp_servers.janitor import DEFAULT_JANITOR_INTERVAL_SECONDS, janitor_interval_from_env
+
+        monkeypatch.setenv("VIDEO_CACHE_JANITOR_INTERVAL", "0")
+        assert janitor_interval_from_env() == 0
+        monkeypatch.setenv("VIDEO_CACHE_JANITOR_INTERVAL", "bogus")
+        assert janitor_interval_from_env() == DEFAULT_JANITOR_INTERVAL_SECONDS
+
+
+class TestCacheCli:
+    """Test the cache_cli janitor subcommand."""
+
+    @pytest.mark.P1
+    def test_janitor_command_maintains_all_providers(self, tmp_path, capsys):
+        """[P1] The janitor command sweeps every provider in cache_dir."""
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.cache_cli import discover_providers, main
+
+        for provider in ("dvids", "nasa"):
+            cache = VideoCache(provider, str(tmp_path))
+            cache.get(f"{provider}-old", lambda v: v.encode())
+            _expire(cache, f"{provider}-old")
+
+        assert discover_providers(tmp_path) == ["dvids", "nasa"]
+        assert main(["janitor", str(tmp_path), "--batch-pause", "0"]) == 0
+
+        output = capsys.readouterr().out
+        assert "dvids: expired=1" in output
+        assert "nasa: expired=1" in output
+        assert VideoCache("dvids", str(tmp_path)).get_cache_count() == 0
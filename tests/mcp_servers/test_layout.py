@@ -0,0 +1,153 @@
+"""
+Cache Directory Layout Tests
+
+These tests validate the sharded (hex prefix) layout of provider_dir, the
+fallback lookup of files stored under the other layout, and the online
+migration between layouts run by the janitor.
+"""
+
+import os
+import time
+
+import pytest
+
+
+class TestLayoutPaths:
+    """Test path computation of the layouts."""
+
+    @pytest.mark.P1
+    def test_layout_paths(self, tmp_path):
+        """[P1] Sharded paths use two hex prefix levels from the ID's SHA-256."""
+        import hashlib
+
+        from mcp_servers.layout import layout_candidates, layout_path
+
+        digest = hashlib.sha256(b"12345").hexdigest()
+        assert layout_path(tmp_path, "12345", "12345.mp4", "flat") == tmp_path / "12345.mp4"
+        assert layout_path(tmp_path, "12345", "12345.mp4", "sharded") == \
+            tmp_path / digest[:2] / digest[2:4] / "12345.mp4"
+        assert len(layout_candidates(tmp_path, "12345", "12345.mp4")) == 2
+        with pytest.raises(ValueError):
+            layout_path(tmp_path, "12345", "12345.mp4", "nested")
+
+    @pytest.mark.P2
+    def test_unknown_layout_rejected(self, tmp_path):
+        """[P2] VideoCache refuses unknown layouts."""
+        from mcp_servers.cache import VideoCache
+
+        with pytest.raises(ValueError):
+            VideoCache("dvids", str(tmp_path), layout="nested")
+
+
+class TestShardedCache:
+    """Test VideoCache with the sharded layout."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_writes_and_recovers_sharded_files(self, tmp_path):
+        """[P0] New files land in shard directories and are recovered from there.
+
+        GIVEN: A sharded cache
+        WHEN: Videos are cached with get() and put_stream(), then the metadata is lost
+        THEN: Files live under provider_dir/ab/cd/ and recover() finds them again
+        """
+        from mcp_servers.cache import VideoCache, iter_chunks
+        from mcp_servers.layout import layout_path
+
+        cache = VideoCache("dvids", str(tmp_path), layout="sharded")
+        assert cache.get("a", lambda v: b"footage a") == b"footage a"
+        await cache.put_stream("b", iter_chunks(b"footage b"))
+
+        for video_id in ("a", "b"):
+            expected = layout_path(cache.provider_dir, video_id, f"{video_id}.mp4", "sharded")
+            assert cache.get_path(video_id) == expected
+            assert expected.exists()
+        assert list(cache.provider_dir.glob("*.mp4")) == []
+
+        (tmp_path / "metadata.json").unlink()
+        recovered = VideoCache("dvids", str(tmp_path), layout="sharded")
+        assert recovered.get_cache_count() == 2
+        assert recovered.get("a", lambda v: b"refetched") == b"footage a"
+
+
+class TestLayoutMigration:
+    """Test legacy fallback lookups and online migration."""
+
+    @pytest.mark.P0
+    def test_janitor_migrates_flat_cache(self, tmp_path):
+        """[P0] The layout job moves flat files into shards without losing hits.
+
+        GIVEN: Videos cached in the flat layout
+        WHEN: The cache is reopened as sharded and the janitor's layout job runs
+        THEN: Hits are served before and after the move, and no flat files remain
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        flat = VideoCache("nasa", str(tmp_path))
+        for video_id in ("x", "y", "z"):
+            flat.get(video_id, lambda v: f"footage {v}".encode())
+
+        sharded = VideoCache("nasa", str(tmp_path), layout="sharded")
+        assert sharded.get("x", lambda v: b"refetched") == b"footage x"
+        assert sharded.is_misplaced("x", sharded.get_entry("x"))
+
+        results = CacheJanitor(sharded, batch_size=2, batch_pause=0).run_once(["layout"])
+
+        assert results == {"layout": 3}
+        assert list(sharded.provider_dir.glob("*.mp4")) == []
+        for video_id in ("x", "y", "z"):
+            assert sharded.get(video_id, lambda v: b"refetched") == f"footage {video_id}".encode()
+            assert not sharded.is_misplaced(video_id, sharded.get_entry(video_id))
+        assert CacheJanitor(sharded, batch_pause=0).run_once(["layout"]) == {"layout": 0}
+
+    @pytest.mark.P0
+    def test_fallback_to_moved_file(self, tmp_path):
+        """[P0] An entry whose file another process migrated still hits and is repaired.
+
+        GIVEN: A flat-layout process whose entry predates a migration
+        WHEN: The file has moved to its sharded location
+        THEN: The flat process finds it, records the new path, and the janitor keeps the entry
+        """
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        flat = VideoCache("dvids", str(tmp_path))
+        flat.get("clip", lambda v: b"footage")
+        sharded = VideoCache("dvids", str(tmp_path), layout="sharded")
+        moved_to = sharded.relocate("clip")
+
+        assert moved_to is not None and moved_to.exists()
+        assert flat.get("clip", lambda v: b"refetched") == b"footage"
+        assert flat.get_entry("clip")["file_path"] == str(moved_to)
+
+        # Moved back behind the entry's back: the missing job relocates instead of dropping
+        os.replace(moved_to, flat.provider_dir / "clip.mp4")
+        assert CacheJanitor(flat, batch_pause=0).run_once(["missing"]) == {"missing": 0}
+        assert flat.get_path("clip") == flat.provider_dir / "clip.mp4"
+
+    @pytest.mark.P1
+    def test_redownload_and_orphans_across_layouts(self, tmp_path):
+        """[P1] Replacing a flat entry removes the flat copy; shard orphans are swept."""
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+        from mcp_servers.layout import layout_path
+
+        VideoCache("dvids", str(tmp_path)).get("clip", lambda v: b"old footage")
+        sharded = VideoCache("dvids", str(tmp_path), layout="sharded")
+        sharded._store_content("clip", b"new footage")
+
+        assert not (sharded.provider_dir / "clip.mp4").exists()
+        assert sharded.get("clip", lambda v: b"refetched") == b"new footage"
+
+        orphan = layout_path(sharded.provider_dir, "lost", "lost.mp4", "sharded")
+        orphan.parent.mkdir(parents=True, exist_ok=True)
+        orphan.write_bytes(b"unreferenced")
+        old = time.time() - 7200
+        os.utime(orphan, (old, old))
+
+        results = CacheJanitor(sharded, batch_pause=0).run_once(["orphans"])
+
+        assert results == {"orphans": 1}
+        assert not orphan.exists()
+        assert sharded.is_cached("clip")
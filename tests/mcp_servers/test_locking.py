@@ -0,0 +1,167 @@
+"""
+VideoCache Locking and Single-Flight Tests
+
+These tests validate cross-process metadata locking and per-video
+single-flight downloads shared by the DVIDS and NASA server processes.
+"""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=str(PROJECT_ROOT),
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+
+class TestFileLock:
+    """Test the cross-process FileLock."""
+
+    @pytest.mark.P0
+    def test_lock_excludes_other_processes(self, tmp_path):
+        """[P0] A held FileLock cannot be taken by another process.
+
+        GIVEN: A FileLock held by this process
+        WHEN: Another process tries to acquire it without blocking
+        THEN: It fails until the lock is released
+        """
+        from mcp_servers.locking import FileLock
+
+        lock_path = tmp_path / "test.lock"
+        probe = (
+            "import sys; from mcp_servers.locking import FileLock; "
+            "print(FileLock(sys.argv[1]).acquire(blocking=False))"
+        )
+
+        with FileLock(lock_path):
+            assert _run_python(probe, str(lock_path)).stdout.strip() == "False"
+        assert _run_python(probe, str(lock_path)).stdout.strip() == "True"
+
+    @pytest.mark.P1
+    def test_lock_is_reentrant_and_times_out(self, tmp_path):
+        """[P1] The owning thread can re-acquire; other threads time out."""
+        from mcp_servers.locking import FileLock, LockTimeout
+
+        lock = FileLock(tmp_path / "test.lock")
+        errors = []
+
+        def contend():
+            try:
+                lock.acquire(timeout=0.1)
+            except LockTimeout as e:
+                errors.append(e)
+
+        with lock:
+            with lock:
+                thread = threading.Thread(target=contend)
+                thread.start()
+                thread.join()
+            assert lock.locked is True
+        assert lock.locked is False
+        assert len(errors) == 1
+
+
+class TestConcurrentMetadataWriters:
+    """Test that concurrent writers do not lose metadata entries."""
+
+    @pytest.mark.P0
+    def test_parallel_processes_keep_all_entries(self, tmp_path):
+        """[P0] Entries written by two processes at once all survive.
+
+        GIVEN: Two processes sharing one metadata.json
+        WHEN: Each registers 25 videos concurrently
+        THEN: metadata.json holds all 50 entries
+        """
+        from mcp_servers.cache import VideoCache
+
+        writer = (
+            "import sys; from mcp_servers.cache import VideoCache\n"
+            "cache = VideoCache(sys.argv[2], sys.argv[1])\n"
+            "for i in range(25):\n"
+            "    path = cache.provider_dir / f'{sys.argv[2]}-{i}.mp4'\n"
+            "    path.write_bytes(b'x')\n"
+            "    cache.register_file(path.stem, path)\n"
+        )
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-c", writer, str(tmp_path), provider],
+                cwd=str(PROJECT_ROOT)
+            )
+            for provider in ("dvids", "nasa")
+        ]
+        for process in processes:
+            assert process.wait(timeout=60) == 0
+
+        assert VideoCache("dvids", str(tmp_path)).get_provider_usage()[1] == 25
+        assert VideoCache("nasa", str(tmp_path)).get_provider_usage() == (25, 25)
+        assert VideoCache("nasa", str(tmp_path)).get_cache_count() == 50
+
+
+class TestSingleFlight:
+    """Test per-video single-flight fetches."""
+
+    @pytest.mark.P0
+    def test_concurrent_get_fetches_once(self, tmp_path):
+        """[P0] Concurrent misses for the same video call fetch_fn once.
+
+        GIVEN: Five threads requesting the same uncached video
+        WHEN: fetch_fn is slow
+        THEN: It is called once and every thread gets the content
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        calls = []
+        results = []
+
+        def fetch(video_id):
+            calls.append(video_id)
+            time.sleep(0.2)
+            return b"content"
+
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("clip", fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ["clip"]
+        assert results == [b"content"] * 5
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_async_lock_serializes_coroutines(self, tmp_path):
+        """[P1] Coroutines holding lock_video_async for one video run one at a time."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("nasa", str(tmp_path))
+        active = []
+        overlaps = []
+
+        async def download():
+            async with cache.lock_video_async("clip"):
+                overlaps.append(len(active))
+                active.append(1)
+                await asyncio.sleep(0.05)
+                active.pop()
+
+        await asyncio.gather(*(download() for _ in range(4)))
+
+        assert overlaps == [0, 0, 0, 0]
+        assert cache._key_locks._file_locks == {}
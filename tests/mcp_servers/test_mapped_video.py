@@ -0,0 +1,104 @@
+"""
+Zero-Copy Cache Hit Tests
+
+These tests validate memory-mapped access to cached videos: hits return a
+memoryview over the cached file instead of a copy, misses are cached and
+then mapped, and send_file copies cached files without reading them into
+Python.
+"""
+
+import pytest
+
+
+class TestMappedVideo:
+    """Test MappedVideo and send_file."""
+
+    @pytest.mark.P1
+    def test_map_and_close(self, tmp_path):
+        """[P1] A mapped file exposes its bytes zero-copy and closes cleanly."""
+        from mcp_servers.mapped_video import MappedVideo
+
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"0123456789")
+
+        with MappedVideo.open(path) as video:
+            assert len(video) == 10
+            assert video.view[2:5] == b"234"
+            assert video.view.readonly
+            assert video.fileno() >= 0
+        assert video.closed
+
+        empty = tmp_path / "empty.mp4"
+        empty.write_bytes(b"")
+        with MappedVideo.open(empty) as video:
+            assert video.view.nbytes == 0
+
+    @pytest.mark.P1
+    def test_send_file_range(self, tmp_path):
+        """[P1] send_file copies a byte range of a cached file to a file object."""
+        from mcp_servers.mapped_video import send_file
+
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"0123456789")
+
+        with open(tmp_path / "out.bin", "wb") as out:
+            out.write(b">")
+            assert send_file(path, out, offset=3, count=4) == 4
+            assert send_file(path, out, offset=8) == 2
+
+        assert (tmp_path / "out.bin").read_bytes() == b">345689"
+
+
+class TestVideoCacheMapped:
+    """Test VideoCache zero-copy hit paths."""
+
+    @pytest.mark.P0
+    def test_get_mapped_hit_and_miss(self, tmp_path):
+        """[P0] get_mapped caches a miss and maps the cached file on hits.
+
+        GIVEN: An empty cache
+        WHEN: get_mapped is called twice for the same video
+        THEN: fetch_fn runs once and both results are maps of the cached file
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        calls = []
+
+        def fetch(video_id):
+            calls.append(video_id)
+            return b"footage"
+
+        with cache.get_mapped("clip", fetch) as first:
+            assert first.view == b"footage"
+            assert first.path == cache.provider_dir / "clip.mp4"
+        with cache.get_mapped("clip", fetch) as second:
+            assert second.view == b"footage"
+
+        assert calls == ["clip"]
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert cache.open_cached("other") is None
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_aget_mapped_concurrent_callers(self, tmp_path):
+        """[P1] Concurrent aget_mapped misses fetch once and each get their own map."""
+        import asyncio
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("nasa", str(tmp_path))
+        calls = []
+
+        async def fetch(video_id):
+            calls.append(video_id)
+            await asyncio.sleep(0.05)
+            return b"launch"
+
+        videos = await asyncio.gather(*(cache.aget_mapped("clip", fetch) for _ in range(3)))
+
+        assert calls == ["clip"]
+        assert len({id(video) for video in videos}) == 3
+        for video in videos:
+            assert video.view == b"launch"
+            video.close()
@@ -0,0 +1,457 @@
+"""
+VideoCache Metadata Store Backend Tests
+
+These tests validate the pluggable metadata backends (legacy metadata.json and
+indexed SQLite/WAL) and the one-shot migration between them.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+
+def _entry(file_path: Path, provider: str = "dvids") -> dict:
+    return {
+        "provider": provider,
+        "cached_date": datetime.now().isoformat(),
+        "ttl": 30,
+        "file_path": str(file_path)
+    }
+
+
+class TestSQLiteMetadataStore:
+    """Test the SQLite metadata backend."""
+
+    @pytest.mark.P0
+    def test_put_get_delete_roundtrip(self, tmp_path):
+        """[P0] Entries round-trip through SQLite including extra fields.
+
+        GIVEN: An SQLite metadata store
+        WHEN: Putting, reading and deleting an entry
+        THEN: The entry is returned unchanged and removed afterwards
+        """
+        from mcp_servers.metadata_store import SQLiteMetadataStore
+
+        store = SQLiteMetadataStore(tmp_path / "metadata.db")
+        entry = dict(_entry(tmp_path / "a.mp4"), title="Launch")
+
+        store.put("dvids", "a", entry)
+
+        assert store.get("dvids", "a") == entry
+        assert store.count("dvids") == 1
+        assert store.delete("dvids", "a") is True
+        assert store.get("dvids", "a") is None
+        assert store.delete("dvids", "a") is False
+        store.close()
+
+    @pytest.mark.P1
+    def test_entries_are_keyed_by_provider_and_video_id(self, tmp_path):
+        """[P1] The same video_id under two providers is stored separately.
+
+        GIVEN: An SQLite metadata store
+        WHEN: Putting "123" for both dvids and nasa
+        THEN: Each provider sees only its own entry
+        """
+        from mcp_servers.metadata_store import SQLiteMetadataStore
+
+        store = SQLiteMetadataStore(tmp_path / "metadata.db")
+        store.put("dvids", "123", _entry(tmp_path / "d.mp4", "dvids"))
+        store.put("nasa", "123", _entry(tmp_path / "n.mp4", "nasa"))
+
+        assert store.get("dvids", "123")["file_path"].endswith("d.mp4")
+        assert store.get("nasa", "123")["file_path"].endswith("n.mp4")
+        assert store.count() == 2
+        assert [vid for vid, _ in store.items("nasa")] == ["123"]
+        store.close()
+
+    @pytest.mark.P1
+    def test_database_uses_wal_and_indexes(self, tmp_path):
+        """[P1] The database runs in WAL mode with cached_date/ttl indexes.
+
+        GIVEN: A newly created SQLite metadata store
+        WHEN: Inspecting the database
+        THEN: journal_mode is wal and the secondary indexes exist
+        """
+        from mcp_servers.metadata_store import SQLiteMetadataStore
+
+        db_path = tmp_path / "metadata.db"
+        SQLiteMetadataStore(db_path).close()
+
+        conn = sqlite3.connect(str(db_path))
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(videos)")}
+        conn.close()
+
+        assert mode == "wal"
+        assert {"idx_videos_cached_date", "idx_videos_ttl"} <= indexes
+
+
+class TestMetadataMigration:
+    """Test migration from metadata.json to SQLite."""
+
+    @pytest.mark.P0
+    def test_migrate_json_to_sqlite(self, tmp_path):
+        """[P0] Legacy metadata.json entries are migrated to SQLite.
+
+        GIVEN: A metadata.json with entries from two providers
+        WHEN: Running migrate_json_to_sqlite
+        THEN: All entries are available in the SQLite store
+        """
+        from mcp_servers.metadata_store import SQLiteMetadataStore, migrate_json_to_sqlite
+
+        json_path = tmp_path / "metadata.json"
+        json_path.write_text(json.dumps({"videos": {
+            "a": _entry(tmp_path / "a.mp4", "dvids"),
+            "b": _entry(tmp_path / "b.mp4", "nasa"),
+            "orphan": {"cached_date": datetime.now().isoformat()}
+        }}))
+
+        migrated = migrate_json_to_sqlite(json_path, tmp_path / "metadata.db", remove_source=True)
+
+        assert migrated == 2
+        assert not json_path.exists()
+        assert (tmp_path / "metadata.json.migrated").exists()
+
+        store = SQLiteMetadataStore(tmp_path / "metadata.db")
+        assert store.get("dvids", "a")["file_path"] == str(tmp_path / "a.mp4")
+        assert store.get("nasa", "b") is not None
+        store.close()
+
+    @pytest.mark.P1
+    def test_sqlite_backend_cache_migrates_existing_json(self, tmp_path):
+        """[P1] VideoCache with the sqlite backend picks up legacy entries.
+
+        GIVEN: An existing metadata.json with a cached video
+        WHEN: Creating a VideoCache with metadata_backend="sqlite"
+        THEN: The video is reported as cached
+        """
+        from mcp_servers.cache import VideoCache
+
+        video_file = tmp_path / "dvids" / "legacy.mp4"
+        video_file.parent.mkdir(parents=True)
+        video_file.write_bytes(b"video")
+        (tmp_path / "metadata.json").write_text(
+            json.dumps({"videos": {"legacy": _entry(video_file)}})
+        )
+
+        cache = VideoCache("dvids", str(tmp_path), metadata_backend="sqlite")
+
+        assert cache.is_cached("legacy") is True
+        assert cache.get_cache_count() == 1
+        assert cache.get_cache_size() == 5
+
+    @pytest.mark.P0
+    @pytest.mark.parametrize("provider_id, module_name, server_class", [
+        ("dvids", "dvids_scraping_server", "DVIDSScrapingMCPServer"),
+        ("nasa", "nasa_scraping_server", "NASAScrapingMCPServer"),
+    ])
+    def test_configured_servers_use_sqlite(self, tmp_path, monkeypatch, provider_id, module_name, server_class):
+        """[P0] config/mcp_servers.json runs the servers on SQLite, migrating metadata.json on first open.
+
+        GIVEN: The launcher environment of a provider and a legacy metadata.json
+        WHEN: The provider's server starts
+        THEN: Its cache uses the SQLite store and still finds the legacy entry
+        """
+        import importlib
+
+        from mcp_servers.metadata_store import SQLiteMetadataStore
+
+        config = json.loads((Path(__file__).parents[2] / "config" / "mcp_servers.json").read_text())
+        env = next(p["env"] for p in config["providers"] if p["id"] == provider_id)
+        assert env["VIDEO_CACHE_BACKEND"] == "sqlite"
+        monkeypatch.setenv("VIDEO_CACHE_BACKEND", env["VIDEO_CACHE_BACKEND"])
+
+        video_file = tmp_path / provider_id / "legacy.mp4"
+        video_file.parent.mkdir(parents=True)
+        video_file.write_bytes(b"video")
+        (tmp_path / "metadata.json").write_text(
+            json.dumps({"videos": {"legacy": _entry(video_file, provider_id)}})
+        )
+
+        module = importlib.import_module(f"mcp_servers.{module_name}")
+        server = getattr(module, server_class)(cache_dir=str(tmp_path))
+
+        assert isinstance(server.cache._store, SQLiteMetadataStore)
+        assert server.cache.is_cached("legacy") is True
+        assert (tmp_path / "metadata.json.migrated").exists()
+
+
+class TestVideoCacheSQLiteBackend:
+    """Test VideoCache behavior on top of the SQLite backend."""
+
+    @pytest.mark.P1
+    def test_get_invalidate_with_sqlite_backend(self, tmp_path):
+        """[P1] VideoCache get/invalidate work with the sqlite backend.
+
+        GIVEN: A VideoCache using the sqlite backend
+        WHEN: Fetching, re-reading and invalidating a video
+        THEN: The second get is a cache hit and invalidate removes it
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("nasa", str(tmp_path), metadata_backend="sqlite")
+        fetches = []
+
+        def fetch(video_id):
+            fetches.append(video_id)
+            return b"payload"
+
+        assert cache.get("v1", fetch) == b"payload"
+        assert cache.get("v1", fetch) == b"payload"
+        assert fetches == ["v1"]
+        assert cache.get_cache_age("v1") == 0
+
+        assert cache.invalidate("v1") is True
+        assert cache.is_cached("v1") is False
+        assert cache.get_cache_count() == 0
+
+    @pytest.mark.P2
+    def test_unknown_backend_raises(self, tmp_path):
+        """[P2] An unknown metadata backend name is rejected."""
+        from mcp_servers.cache import VideoCache
+
+        with pytest.raises(ValueError):
+            VideoCache("dvids", str(tmp_path), metadata_backend="redis")
+
+
+class TestInMemoryMetadataView:
+    """Test in-memory metadata views and change detection."""
+
+    @pytest.mark.P0
+    def test_json_store_serves_repeated_lookups_from_memory(self, tmp_path):
+        """[P0] Repeated lookups do not re-parse an unchanged metadata.json.
+
+        GIVEN: A VideoCache with a cached video
+        WHEN: Checking the same video several times
+        THEN: metadata.json is parsed only once more than at startup
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("v1", lambda v: b"content")
+        reloads_before = cache.get_metadata_stats()["reloads"]
+
+        for _ in range(10):
+            assert cache.is_cached("v1") is True
+
+        stats = cache.get_metadata_stats()
+        assert stats["reloads"] == reloads_before
+        assert stats["hits"] >= 10
+
+    @pytest.mark.P0
+    def test_json_store_reloads_after_external_write(self, tmp_path):
+        """[P0] An external rewrite of metadata.json is picked up.
+
+        GIVEN: A VideoCache whose view has been loaded
+        WHEN: Another writer replaces metadata.json
+        THEN: The next lookup sees the new entry
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        assert cache.is_cached("external") is False
+
+        video_file = tmp_path / "dvids" / "external.mp4"
+        video_file.write_bytes(b"video")
+        (tmp_path / "metadata.json").write_text(
+            json.dumps({"videos": {"external": _entry(video_file)}})
+        )
+
+        assert cache.is_cached("external") is True
+        assert cache.get_metadata_stats()["misses"] >= 1
+
+    @pytest.mark.P1
+    def test_change_counter_propagates_between_instances(self, tmp_path):
+        """[P1] Writes by one cache instance invalidate another's view.
+
+        GIVEN: Two VideoCache instances trusting their views for an hour
+        WHEN: One instance caches a video
+        THEN: The other sees it immediately via the change counter
+        """
+        from mcp_servers.cache import VideoCache
+
+        reader = VideoCache("dvids", str(tmp_path), metadata_stat_interval=3600)
+        writer = VideoCache("dvids", str(tmp_path), metadata_stat_interval=3600)
+        assert reader.is_cached("shared") is False
+
+        writer.get("shared", lambda v: b"content")
+
+        assert reader.is_cached("shared") is True
+
+    @pytest.mark.P1
+    def test_sqlite_view_invalidated_by_other_connection(self, tmp_path):
+        """[P1] SQLite views are dropped when another connection commits.
+
+        GIVEN: Two SQLite stores on the same database
+        WHEN: One store updates an entry the other has already read
+        THEN: The other store returns the updated entry
+        """
+        from mcp_servers.metadata_store import SQLiteMetadataStore
+
+        first = SQLiteMetadataStore(tmp_path / "metadata.db")
+        second = SQLiteMetadataStore(tmp_path / "metadata.db")
+
+        first.put("dvids", "v", _entry(tmp_path / "old.mp4"))
+        assert second.get("dvids", "v")["file_path"].endswith("old.mp4")
+        assert second.get("dvids", "v")["file_path"].endswith("old.mp4")
+        assert second.stats()["hits"] == 1
+        reloads_before = second.stats()["reloads"]
+
+        first.put("dvids", "v", _entry(tmp_path / "new.mp4"))
+
+        assert second.get("dvids", "v")["file_path"].endswith("new.mp4")
+        assert second.stats()["reloads"] == reloads_before + 1
+        first.close()
+        second.close()
+
+    @pytest.mark.P1
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_get_returns_copies(self, tmp_path, backend):
+        """[P1] Both backends return copies: changing a result changes nothing until put/touch."""
+        from mcp_servers.metadata_store import create_metadata_store
+
+        store = create_metadata_store(tmp_path, backend)
+        store.put("dvids", "v", _entry(tmp_path / "v.mp4"))
+
+        store.get("dvids", "v")["file_path"] = "elsewhere"
+        next(store.items("dvids"))[1]["ttl"] = 0
+        assert store.get("dvids", "v")["file_path"].endswith("v.mp4")
+        assert store.get("dvids", "v")["ttl"] == 30
+
+        store.touch("dvids", "v", {"last_access": 1.0, "hits": 3})
+        assert store.get("dvids", "v")["hits"] == 3
+        store.close()
+
+    @pytest.mark.P0
+    def test_close_flushes_batched_hits(self, tmp_path):
+        """[P0] VideoCache.close() persists access updates still batched in memory.
+
+        GIVEN: A JSON-backed cache with hits recorded within ACCESS_FLUSH_SECONDS
+        WHEN: The cache is closed and reopened
+        THEN: The reopened cache sees the hit count
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        cache.get("v1", lambda v: b"content")
+        for _ in range(3):
+            cache.get("v1", lambda v: b"never fetched")
+        on_disk = json.loads((tmp_path / "metadata.json").read_text())["videos"]["v1"]
+        assert on_disk["hits"] == 0
+
+        cache.close()
+
+        assert VideoCache("dvids", str(tmp_path)).get_entry("v1")["hits"] == 3
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("module_name, server_class", [
+        ("dvids_scraping_server", "DVIDSScrapingMCPServer"),
+        ("nasa_scraping_server", "NASAScrapingMCPServer"),
+    ])
+    async def test_server_aclose_closes_cache(self, tmp_path, module_name, server_class):
+        """[P1] Shutting a server down flushes and closes its video cache."""
+        import importlib
+        from unittest.mock import patch
+
+        module = importlib.import_module(f"mcp_servers.{module_name}")
+        server = getattr(module, server_class)(cache_dir=str(tmp_path))
+
+        with patch.object(server.cache, "close", wraps=server.cache.close) as close:
+            await server.aclose()
+
+        close.assert_called_once()
+
+
+class TestCrashSafeMetadata:
+    """Test atomic metadata commits and index recovery."""
+
+    @pytest.mark.P0
+    def test_failed_save_keeps_previous_metadata(self, tmp_path):
+        """[P0] A save interrupted before the rename leaves metadata.json intact.
+
+        GIVEN: A JSON store with one committed entry
+        WHEN: The next save fails while replacing the file
+        THEN: metadata.json still holds the committed entry and no temp file remains
+        """
+        from unittest.mock import patch
+
+        from mcp_servers.metadata_store import JsonMetadataStore
+
+        metadata_file = tmp_path / "metadata.json"
+        store = JsonMetadataStore(metadata_file)
+        store.put("dvids", "kept", _entry(tmp_path / "kept.mp4"))
+
+        with patch("mcp_servers.metadata_store.os.replace", side_effect=OSError("disk full")):
+            store.put("dvids", "lost", _entry(tmp_path / "lost.mp4"))
+
+        on_disk = json.loads(metadata_file.read_text())
+        assert list(on_disk["videos"]) == ["kept"]
+        assert list(tmp_path.glob(".metadata.json.*.tmp")) == []
+
+    @pytest.mark.P0
+    def test_corrupt_json_index_is_rebuilt_from_disk(self, tmp_path):
+        """[P0] Corrupt metadata.json is rebuilt by scanning provider_dir.
+
+        GIVEN: Two cached video files and a truncated metadata.json
+        WHEN: Creating a VideoCache
+        THEN: Both videos are cached again and the bad file is kept aside
+        """
+        from mcp_servers.cache import VideoCache
+
+        provider_dir = tmp_path / "dvids"
+        provider_dir.mkdir()
+        (provider_dir / "a.mp4").write_bytes(b"aaaa")
+        (provider_dir / "b.mp4").write_bytes(b"bb")
+        (provider_dir / ".partial.tmp").write_bytes(b"x")
+        (tmp_path / "metadata.json").write_text('{"videos": {"a": {"prov')
+
+        cache = VideoCache("dvids", str(tmp_path))
+
+        assert cache.is_cached("a") is True
+        assert cache.is_cached("b") is True
+        assert cache.get_cache_count() == 2
+        assert cache.get_entry("a")["size"] == 4
+        assert (tmp_path / "metadata.json.corrupt").exists()
+
+    @pytest.mark.P1
+    def test_missing_metadata_recovers_only_own_provider(self, tmp_path):
+        """[P1] Recovery records files of the cache's own provider.
+
+        GIVEN: Video files for dvids and nasa but no metadata file
+        WHEN: Creating a dvids VideoCache
+        THEN: Only the dvids video is recovered
+        """
+        from mcp_servers.cache import VideoCache
+
+        for provider in ("dvids", "nasa"):
+            (tmp_path / provider).mkdir()
+            (tmp_path / provider / f"{provider}_clip.mp4").write_bytes(b"video")
+
+        cache = VideoCache("dvids", str(tmp_path))
+
+        assert cache.is_cached("dvids_clip") is True
+        assert cache.get_cache_count() == 1
+        assert VideoCache("nasa", str(tmp_path)).is_cached("nasa_clip") is True
+
+    @pytest.mark.P1
+    def test_corrupt_sqlite_database_is_rebuilt(self, tmp_path):
+        """[P1] An unreadable metadata.db is moved aside and rebuilt.
+
+        GIVEN: A cached video file and a metadata.db that is not a database
+        WHEN: Creating a VideoCache with the sqlite backend
+        THEN: The video is recovered into a fresh database
+        """
+        from mcp_servers.cache import VideoCache
+
+        (tmp_path / "nasa").mkdir()
+        (tmp_path / "nasa" / "clip.mp4").write_bytes(b"video")
+        (tmp_path / "metadata.db").write_bytes(b"not a database" * 100)
+
+        cache = VideoCache("nasa", str(tmp_path), metadata_backend="sqlite")
+
+        assert cache.is_cached("clip") is True
+        assert (tmp_path / "metadata.db.corrupt").exists()
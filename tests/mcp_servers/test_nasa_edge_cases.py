@@ -332,18 +332,23 @@ class TestNASAServerErrorHandling:
             </html>
             """
 
-            with patch('httpx.AsyncClient.get') as mock_get:
-                # First call returns HTML page, second returns video content
+            async def video_body(chunk_size=None):
+                yield b"fake video data"
+
+            with patch('httpx.AsyncClient.get') as mock_get, \
+                 patch('httpx.AsyncClient.send') as mock_send:
+                # Page request returns HTML, the streamed download returns video content
                 mock_html_response = Mock()
                 mock_html_response.text = unicode_html
                 mock_html_response.status_code = 200
                 mock_html_response.content = unicode_html.encode('utf-8')
+                mock_get.return_value = mock_html_response
 
                 mock_video_response = Mock()
-                mock_video_response.content = b"fake video data"
                 mock_video_response.status_code = 200
-
-                mock_get.side_effect = [mock_html_response, mock_video_response]
+                mock_video_response.aiter_bytes = video_body
+                mock_video_response.aclose = AsyncMock()
+                mock_send.return_value = mock_video_response
 
                 result = await server.download_video(video_id=video_id)
 
@@ -426,7 +431,7 @@ class TestNASAServerErrorHandling:
 
         GIVEN: NASA MCP server instance
         WHEN: Video download returns empty content
-        THEN: Should handle gracefully (create empty file or error)
+        THEN: Should raise an error and cache nothing
         """
         from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
 
@@ -435,18 +440,30 @@ class TestNASAServerErrorHandling:
 
             video_id = "empty_video"
 
-            with patch('httpx.AsyncClient.get') as mock_get:
+            async def empty_body(chunk_size=None):
+                return
+                yield
+
+            with patch('httpx.AsyncClient.get') as mock_get, \
+                 patch('httpx.AsyncClient.send') as mock_send:
                 mock_response = Mock()
                 mock_response.text = "<html></html>"
                 mock_response.content = b""  # Empty content
                 mock_response.status_code = 200
                 mock_get.return_value = mock_response
 
-                result = await server.download_video(video_id=video_id)
+                # Video file download is streamed
+                mock_stream = Mock()
+                mock_stream.status_code = 200
+                mock_stream.aiter_bytes = empty_body
+                mock_stream.aclose = AsyncMock()
+                mock_send.return_value = mock_stream
 
-                # Should handle empty content
-                assert 'video_id' in result
-                assert 'file_path' in result
+                # Empty payloads are rejected before commit
+                with pytest.raises(IOError):
+                    await server.download_video(video_id=video_id)
+
+                assert not server.cache.is_cached(video_id)
 
 
 class TestNASAServerEdgeCases:
@@ -0,0 +1,132 @@
+"""
+Negative Cache Tests
+
+These tests validate that missing video IDs and searches without results
+are remembered with a short TTL that grows on repeated misses, and that the
+scraping servers answer them without touching the network.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+def _not_found(url="https://www.dvidshub.net/video/gone"):
+    import httpx
+
+    request = httpx.Request("GET", url)
+    return httpx.HTTPStatusError("Not found", request=request, response=httpx.Response(404, request=request))
+
+
+class TestNegativeCache:
+    """Test NegativeCache."""
+
+    @pytest.mark.P0
+    def test_ttl_grows_on_repeated_misses(self, tmp_path):
+        """[P0] Each repeated miss doubles the TTL up to max_ttl.
+
+        GIVEN: A negative cache with base_ttl=10 and max_ttl=35
+        WHEN: The same key misses four times
+        THEN: The TTLs are 10, 20, 35 and 35 seconds
+        """
+        from mcp_servers.negative_cache import NegativeCache
+
+        cache = NegativeCache(tmp_path / "negative.db", base_ttl=10, max_ttl=35)
+
+        assert [cache.record("k") for _ in range(4)] == [10, 20, 35, 35]
+        assert cache.get("k")["misses"] == 4
+        assert cache.get("other") is None
+
+    @pytest.mark.P1
+    def test_expiry_clear_and_persistence(self, tmp_path):
+        """[P1] Entries expire, are cleared on success and survive reopening."""
+        from mcp_servers.negative_cache import NegativeCache
+
+        NegativeCache(tmp_path / "negative.db").record("k", [])
+        cache = NegativeCache(tmp_path / "negative.db")
+        assert cache.get("k")["value"] == []
+
+        assert cache.clear("k") is True
+        assert cache.get("k") is None
+
+        expired = NegativeCache(tmp_path / "expired.db", base_ttl=0)
+        expired.record("k")
+        assert expired.get("k") is None
+        # The miss count is kept, so the next miss gets a longer TTL
+        assert expired.record("k") == 0 and expired.get("k") is None
+
+
+class TestServerNegativeCaching:
+    """Test negative caching in the scraping servers."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_missing_video_skips_network(self, tmp_path):
+        """[P0] A video ID that 404ed is answered with a 404 without any request.
+
+        GIVEN: A DVIDS video page that returns 404
+        WHEN: get_video_details and download_video are called for it again
+        THEN: Both raise HTTPStatusError 404 and the page is fetched once
+        """
+        import httpx
+        from mcp_servers.dvids_scraping_server import DVIDSScrapingMCPServer
+
+        server = DVIDSScrapingMCPServer(cache_dir=str(tmp_path))
+        fetch = AsyncMock(side_effect=_not_found())
+
+        with patch.object(server, "_fetch_with_backoff", fetch), \
+                patch("mcp_servers.dvids_scraping_server.check_robots_txt", AsyncMock(return_value=True)):
+            for call in (server.get_video_details, server.get_video_details, server.download_video):
+                with pytest.raises(httpx.HTTPStatusError) as excinfo:
+                    await call("gone")
+                assert excinfo.value.response.status_code == 404
+
+        fetch.assert_awaited_once()
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_not_cached(self, tmp_path):
+        """[P1] A 503 is not a miss; the next lookup goes to the network."""
+        import httpx
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+
+        server = NASAScrapingMCPServer(cache_dir=str(tmp_path))
+        request = httpx.Request("GET", "https://images.nasa.gov/details/x")
+        error = httpx.HTTPStatusError("Unavailable", request=request, response=httpx.Response(503, request=request))
+        fetch = AsyncMock(side_effect=error)
+
+        with patch.object(server, "_fetch_with_backoff", fetch):
+            for _ in range(2):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await server.get_video_details("x")
+
+        assert fetch.await_count == 2
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_empty_search_cached_briefly(self, tmp_path):
+        """[P0] A search without results is answered from the negative cache until it expires.
+
+        GIVEN: A NASA search that finds nothing
+        WHEN: It is repeated, then repeated again once the negative entry is gone
+        THEN: The repeat skips scraping; later results are fetched and kept
+        """
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+        from mcp_servers.response_cache import response_key
+
+        server = NASAScrapingMCPServer(cache_dir=str(tmp_path))
+        scrape = AsyncMock(return_value=[])
+
+        with patch.object(server, "_search_videos", scrape):
+            assert await server.search_videos(query="nothing here") == []
+            assert await server.search_videos(query="Nothing  here") == []
+            assert scrape.await_count == 1
+
+            key = response_key("search", "nasa", query="nothing here", max_duration=None)
+            assert server.responses.get(key) is None
+            server.negative.clear(key)
+            scrape.return_value = [{"videoId": "1"}]
+            assert await server.search_videos(query="nothing here") == [{"videoId": "1"}]
+
+        assert server.responses.get(key)[0] == [{"videoId": "1"}]
+        assert server.negative.get(key) is None
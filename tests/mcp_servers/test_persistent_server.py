@@ -0,0 +1,65 @@
+"""
+Persistent Server Instance Tests
+
+These tests validate that every MCP tool call is served by one long-lived
+scraping server per process, so the cache, HTTP pool and rate limiter
+state carry over between calls.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+class TestPersistentServer:
+    """Test get_server() and call_tool reuse."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("module_name", ["dvids_scraping_server", "nasa_scraping_server"])
+    async def test_tool_calls_share_one_server(self, module_name, tmp_path, monkeypatch):
+        """[P0] Consecutive tool calls use the same server and its rate limiter state.
+
+        GIVEN: No server created yet in the process
+        WHEN: Two search_videos tool calls are made
+        THEN: One server handles both and the second call waits on the first call's token
+        """
+        import importlib
+
+        module = importlib.import_module(f"mcp_servers.{module_name}")
+        monkeypatch.setattr(module, "_server_instance", None)
+        server = module.get_server(str(tmp_path))
+        seen = []
+
+        async def search(query, max_duration=None):
+            seen.append(module.get_server())
+            await module.get_server()._respect_rate_limit()
+            return []
+
+        with patch.object(server, "search_videos", AsyncMock(side_effect=search)), \
+                patch("mcp_servers.rate_limiter.asyncio.sleep", AsyncMock()) as sleep:
+            await module.call_tool("search_videos", {"query": "apollo"})
+            await module.call_tool("search_videos", {"query": "gemini"})
+
+        assert seen == [server, server]
+        assert module.get_server() is server
+        # Only the second call waits: the first one used the bucket's token
+        sleep.assert_awaited_once()
+        assert sleep.await_args.args[0] == pytest.approx(server.limiter.interval, rel=0.01)
+        await server.aclose()
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("module_name", ["dvids_scraping_server", "nasa_scraping_server"])
+    async def test_unknown_tool_creates_no_server(self, module_name, monkeypatch):
+        """[P1] Unknown tool names are rejected before the server is built; TOOL_NAMES matches list_tools."""
+        import importlib
+
+        module = importlib.import_module(f"mcp_servers.{module_name}")
+        monkeypatch.setattr(module, "_server_instance", None)
+
+        with pytest.raises(ValueError, match="Unknown tool"):
+            await module.call_tool("unknown_tool", {})
+
+        assert module._server_instance is None
+        assert tuple(tool.name for tool in await module.list_tools()) == module.TOOL_NAMES
@@ -0,0 +1,194 @@
+"""
+Prefetch Planner Tests
+
+These tests validate cache warmup from a scene list: priority ordering,
+skipping cached videos, the request budget, progress reporting,
+cancellation and the scraping servers' prefetch API.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+class _FakeServer:
+    """Scraping server stand-in recording the order of downloads."""
+
+    def __init__(self, cache, delay=0.0):
+        self.cache = cache
+        self.delay = delay
+        self.downloads = []
+        self.searches = []
+
+    async def search_videos(self, query, max_duration=None):
+        self.searches.append(query)
+        return [{"videoId": f"{query}-1"}, {"videoId": f"{query}-2"}]
+
+    async def download_video(self, video_id):
+        await asyncio.sleep(self.delay)
+        if video_id == "missing":
+            raise RuntimeError("HTTP 404")
+        self.downloads.append(video_id)
+        self.cache.get(video_id, lambda v: b"clip " + v.encode())
+        return {"video_id": video_id, "cached": False}
+
+
+def _planner(tmp_path, delay=0.0):
+    from mcp_servers.cache import VideoCache
+    from mcp_servers.prefetch import PrefetchPlanner
+
+    server = _FakeServer(VideoCache("dvids", str(tmp_path)), delay)
+    return server, PrefetchPlanner(server, rate_interval=30)
+
+
+class TestPrefetchPlanner:
+    """Test PrefetchPlanner and PrefetchJob."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_priority_order_and_cached_videos(self, tmp_path):
+        """[P0] Items are fetched highest priority first and cached videos are skipped.
+
+        GIVEN: A cache already holding video "a"
+        WHEN: Prefetching "a", "b" (priority 1), a query (priority 5) and "missing"
+        THEN: The query results come first, "a" is not downloaded and the failure is reported
+        """
+        server, planner = _planner(tmp_path)
+        server.cache.get("a", lambda v: b"cached")
+
+        job = planner.start(
+            [{"video_id": "a"}, {"video_id": "b", "priority": 1},
+             {"query": "tank", "priority": 5}, {"video_id": "missing"}],
+            per_query=2
+        )
+        result = await job.wait()
+
+        assert server.downloads == ["tank-1", "tank-2", "b"]
+        assert result["status"] == "done"
+        assert (result["downloaded"], result["cached"], result["failed"]) == (3, 1, 1)
+        assert "HTTP 404" in result["errors"]["missing"]
+        assert result["items_done"] == result["items_total"] == 4
+        assert server.cache.is_cached("tank-1")
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_request_budget_and_progress(self, tmp_path):
+        """[P1] max_requests caps rate-limited requests; progress is reported after each step."""
+        server, planner = _planner(tmp_path)
+        progress = []
+
+        job = planner.start(["tank", "ship"], per_query=2, max_requests=5, on_progress=progress.append)
+        result = await job.wait()
+
+        assert server.searches == ["tank"]
+        assert server.downloads == ["tank-1", "tank-2"]
+        assert (result["requests"], result["skipped"]) == (5, 2)
+        assert progress[-1]["status"] == "done"
+        assert any(step["current"] == "tank-1" for step in progress)
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_download_costs_page_and_file_requests(self, tmp_path):
+        """[P1] A download counts as two requests (page and file) in the estimate and the budget.
+
+        GIVEN: Two videos and a query (one result) at 30 s between requests, budget 3
+        WHEN: Starting the job, then letting it run
+        THEN: The estimate covers 2 + 2 + (1 + 2) requests; only the first video fits the budget
+        """
+        from mcp_servers.prefetch import DOWNLOAD_REQUESTS
+
+        server, planner = _planner(tmp_path)
+
+        unlimited = planner.start([{"video_id": "a"}, {"video_id": "b"}, "tank"])
+        assert unlimited.snapshot()["estimated_seconds_left"] == (3 * DOWNLOAD_REQUESTS + 1) * 30
+        unlimited.cancel()
+        await unlimited.wait()
+
+        job = planner.start([{"video_id": "c"}, {"video_id": "d"}], max_requests=3)
+        assert job.snapshot()["estimated_seconds_left"] == 3 * 30
+        result = await job.wait()
+
+        assert server.downloads == ["c"]
+        assert (result["requests"], result["skipped"]) == (DOWNLOAD_REQUESTS, 1)
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_cancel(self, tmp_path):
+        """[P0] A cancelled job stops downloading and reports its state."""
+        server, planner = _planner(tmp_path, delay=0.1)
+
+        job = planner.start([{"video_id": str(i)} for i in range(5)])
+        await asyncio.sleep(0.15)
+        assert planner.get(job.job_id).cancel() is True
+        result = await job.wait()
+
+        assert result["status"] == "cancelled"
+        assert len(server.downloads) < 5
+        assert job.cancel() is False
+
+    @pytest.mark.P1
+    def test_invalid_items(self, tmp_path):
+        """[P1] Items without a video_id or query are rejected."""
+        from mcp_servers.prefetch import PrefetchItem
+
+        assert PrefetchItem.parse("tank").kind == "query"
+        with pytest.raises(ValueError):
+            PrefetchItem.parse({"priority": 3})
+        with pytest.raises(ValueError):
+            PrefetchItem.parse({"query": "  "})
+
+
+class TestServerPrefetch:
+    """Test the scraping servers' prefetch API."""
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_nasa_prefetch_then_status(self, tmp_path):
+        """[P1] NASA prefetch runs in the background and is queried by job_id."""
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+
+        server = NASAScrapingMCPServer(cache_dir=str(tmp_path))
+        download = AsyncMock(return_value={"video_id": "x", "cached": False})
+
+        with patch.object(server, "download_video", download):
+            started = await server.prefetch([{"video_id": "x", "priority": 2}])
+            assert started["status"] in ("pending", "running")
+            await server.prefetcher.get(started["job_id"]).wait()
+            status = server.prefetch_status(started["job_id"])
+
+        assert status["downloaded"] == 1
+        download.assert_awaited_once_with(video_id="x")
+        with pytest.raises(ValueError):
+            server.prefetch_status("unknown")
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_estimate_follows_adaptive_rate(self, tmp_path):
+        """[P1] The time estimate of a running job uses the limiter's current interval.
+
+        GIVEN: A DVIDS prefetch job blocked on its first download
+        WHEN: The origin throttles, doubling the limiter's interval
+        THEN: estimated_seconds_left doubles too
+        """
+        from mcp_servers.dvids_scraping_server import DVIDSScrapingMCPServer
+
+        server = DVIDSScrapingMCPServer(cache_dir=str(tmp_path))
+        gate = asyncio.Event()
+
+        async def download_video(video_id):
+            await gate.wait()
+            return {"video_id": video_id, "cached": False}
+
+        with patch.object(server, "download_video", download_video):
+            started = await server.prefetch([{"video_id": "a"}, {"video_id": "b"}])
+            await asyncio.sleep(0.01)
+            before = server.prefetch_status(started["job_id"])["estimated_seconds_left"]
+            await server.limiter.on_throttle()
+            after = server.prefetch_status(started["job_id"])["estimated_seconds_left"]
+            gate.set()
+            await server.prefetcher.get(started["job_id"]).wait()
+
+        assert before > 0
+        assert after == pytest.approx(2 * before)
+        await server.aclose()
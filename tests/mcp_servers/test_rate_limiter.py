@@ -0,0 +1,371 @@
+"""
+Token-Bucket Rate Limiter Tests
+
+These tests validate the token bucket arithmetic, spacing of concurrent
+coroutines, refunds on cancellation, the cross-process file backend,
+configuration from the environment, and AIMD adaptation with Retry-After.
+"""
+
+import asyncio
+import subprocess
+import sys
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+class FakeClock:
+    """Stand-in for the time module whose clocks advance only when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Test the bucket arithmetic."""
+
+    @pytest.mark.P0
+    def test_reserve_token(self):
+        """[P0] A full bucket serves burst requests at once, then one per interval.
+
+        GIVEN: A bucket with burst=2 refilled at 0.5 tokens per second
+        WHEN: Three tokens are reserved at the same instant, then after 4 seconds
+        THEN: The third waits 2 s; after 4 s the refill covers the debt and one more
+        """
+        from mcp_servers.rate_limiter import reserve_token
+
+        tokens, updated = 2.0, 0.0
+        waits = []
+        for _ in range(3):
+            tokens, wait = reserve_token(tokens, updated, 0.0, 0.5, 2)
+            waits.append(wait)
+        assert waits == [0.0, 0.0, 2.0]
+
+        tokens, wait = reserve_token(tokens, 0.0, 4.0, 0.5, 2)
+        assert (tokens, wait) == (0.0, 0.0)
+
+
+class TestRateLimiter:
+    """Test RateLimiter."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_concurrent_acquires_are_spaced(self):
+        """[P0] Concurrent coroutines are queued one interval apart instead of firing together."""
+        from mcp_servers.rate_limiter import RateLimiter
+
+        limiter = RateLimiter("https://images.nasa.gov", interval=0.1)
+
+        # Frozen clock: the reserved waits do not depend on scheduling delays
+        with patch("mcp_servers.rate_limiter.time", FakeClock()), \
+                patch("mcp_servers.rate_limiter.asyncio.sleep", AsyncMock()) as sleep:
+            waits = await asyncio.gather(*(limiter.acquire() for _ in range(4)))
+
+        assert sorted(waits) == pytest.approx([0.0, 0.1, 0.2, 0.3])
+        assert sorted(call.args[0] for call in sleep.await_args_list) == pytest.approx([0.1, 0.2, 0.3])
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_cancelled_wait_refunds_token(self):
+        """[P1] A caller cancelled while waiting gives its token back."""
+        from mcp_servers.rate_limiter import RateLimiter
+
+        limiter = RateLimiter("https://www.dvidshub.net", interval=10)
+        assert await limiter.acquire() == 0.0
+
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.bucket.tokens == pytest.approx(0.0, abs=0.01)
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_file_backend_refund_off_loop_and_capped(self, tmp_path):
+        """[P1] The file backend refunds in a worker thread, and no refund raises tokens past burst."""
+        import json
+
+        from mcp_servers.rate_limiter import FileBucket, MemoryBucket, RateLimiter
+
+        limiter = RateLimiter("https://www.dvidshub.net", 10, backend="file", state_dir=tmp_path)
+        assert await limiter.acquire() == 0.0
+
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.05)
+        with patch("mcp_servers.rate_limiter.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        to_thread.assert_called_once_with(limiter.bucket.refund, 1)
+        assert json.loads(limiter.bucket.path.read_text())["tokens"] == pytest.approx(0.0, abs=0.01)
+
+        full = FileBucket(tmp_path, "https://images.nasa.gov")
+        full.refund(2)
+        assert json.loads(full.path.read_text())["tokens"] == 2
+        memory = MemoryBucket(2)
+        memory.refund(2)
+        assert memory.tokens == 2
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_file_backend_shared_between_processes(self, tmp_path):
+        """[P0] Limiters using the file backend share one budget per origin.
+
+        GIVEN: Another process that just used the only token of an origin
+        WHEN: This process acquires for the same origin, and for another origin
+        THEN: The same origin waits about one interval; the other origin does not
+        """
+        from mcp_servers.rate_limiter import RateLimiter
+
+        script = (
+            "import sys; from pathlib import Path\n"
+            "from mcp_servers.rate_limiter import RateLimiter\n"
+            "limiter = RateLimiter('https://images.nasa.gov', 30, backend='file', state_dir=Path(sys.argv[1]))\n"
+            "print(limiter.bucket.reserve(limiter.rate, limiter.burst))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script, str(tmp_path)], capture_output=True, text=True, check=True
+        ).stdout
+        assert float(output) == 0.0
+
+        same = RateLimiter("https://images.nasa.gov", 30, backend="file", state_dir=tmp_path)
+        other = RateLimiter("https://www.dvidshub.net", 30, backend="file", state_dir=tmp_path)
+        assert 25 < same.bucket.reserve(same.rate, same.burst) <= 30
+        assert other.bucket.reserve(other.rate, other.burst) == 0.0
+
+    @pytest.mark.P1
+    def test_from_env(self, monkeypatch, tmp_path):
+        """[P1] Interval and burst come from {PROVIDER}_RATE_LIMIT/_RATE_BURST; unknown backends fail."""
+        from mcp_servers.rate_limiter import FileBucket, RateLimiter, rate_limiter_from_env
+
+        monkeypatch.setenv("DVIDS_RATE_LIMIT", "15")
+        monkeypatch.setenv("DVIDS_RATE_BURST", "3")
+        monkeypatch.setenv("VIDEO_RATE_LIMIT_BACKEND", "file")
+        monkeypatch.setenv("VIDEO_RATE_LIMIT_DIR", str(tmp_path))
+
+        limiter = rate_limiter_from_env("dvids", "https://www.dvidshub.net", 30)
+        assert (limiter.interval, limiter.burst) == (15.0, 3)
+        assert isinstance(limiter.bucket, FileBucket) and limiter.bucket.path.parent == tmp_path
+        assert rate_limiter_from_env("nasa", "https://images.nasa.gov", 10).interval == 10
+
+        with pytest.raises(ValueError):
+            RateLimiter("https://images.nasa.gov", 10, backend="socket")
+
+
+class TestAdaptiveRate:
+    """Test AIMD adaptation, Retry-After and full jitter."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_aimd_adjusts_interval(self):
+        """[P0] Fast successes add to the rate up to the ceiling; throttling halves it down to the floor.
+
+        GIVEN: A limiter at 10 s between requests, ceiling 5 s, floor 40 s
+        WHEN: 429s and fast or slow successes are reported
+        THEN: The interval doubles per 429, climbs back additively only on fast responses
+        """
+        from mcp_servers.rate_limiter import RateLimiter
+
+        limiter = RateLimiter("https://images.nasa.gov", 10, min_interval=5, max_interval=40)
+
+        await limiter.on_throttle()
+        assert limiter.interval == 20
+        await limiter.on_throttle()
+        await limiter.on_throttle()
+        assert limiter.interval == 40
+
+        limiter.on_success(latency=30)
+        assert limiter.interval == 40
+        limiter.on_success(latency=0.1)
+        assert limiter.interval == pytest.approx(1 / (1 / 40 + 1 / 50))
+
+        for _ in range(20):
+            limiter.on_success(latency=0.1)
+        stats = limiter.stats()
+        assert stats["interval"] == 5
+        assert stats["requests_per_minute"] == 12
+        assert stats["throttled"] == 3
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_default_ceiling_is_configured_interval(self):
+        """[P1] Without min_interval the limiter recovers from throttling but never exceeds its interval."""
+        from mcp_servers.rate_limiter import RateLimiter
+
+        limiter = RateLimiter("https://www.dvidshub.net", 30)
+        limiter.on_success(latency=0.1)
+        assert limiter.interval == 30
+
+        await limiter.on_throttle()
+        for _ in range(20):
+            limiter.on_success(latency=0.1)
+        assert limiter.interval == 30
+
+    @pytest.mark.P1
+    def test_shipped_config_never_speeds_up(self):
+        """[P1] config/mcp_servers.json keeps the AC rate limits: adapting faster is opt-in."""
+        import json
+        from pathlib import Path
+
+        config = json.loads((Path(__file__).parents[2] / "config" / "mcp_servers.json").read_text())
+        env = {}
+        for provider in config["providers"]:
+            env.update(provider.get("env", {}))
+        for prefix in ("DVIDS", "NASA"):
+            assert env[f"{prefix}_RATE_LIMIT_MIN"] == env[f"{prefix}_RATE_LIMIT"]
+
+    @pytest.mark.P1
+    def test_parse_retry_after_and_jitter(self):
+        """[P1] Retry-After is read as seconds or an HTTP date; jitter stays below the capped bound."""
+        from datetime import datetime, timezone
+
+        from mcp_servers.rate_limiter import full_jitter_backoff, parse_retry_after
+
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert parse_retry_after("120") == 120
+        assert parse_retry_after("Mon, 01 Jan 2024 00:00:30 GMT", now=now) == 30
+        assert parse_retry_after("Sun, 31 Dec 2023 00:00:00 GMT", now=now) == 0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+        delays = [full_jitter_backoff(attempt, 2, 60) for attempt in range(10) for _ in range(20)]
+        assert all(0 <= delay <= 60 for delay in delays)
+        assert len(set(delays)) > 1
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_retry_after_blocks_all_requests(self):
+        """[P0] After a Retry-After, acquire() waits it out before taking a token."""
+        from mcp_servers.rate_limiter import RateLimiter
+
+        limiter = RateLimiter("https://images.nasa.gov", 10, burst=5)
+        await limiter.on_throttle(retry_after=0.2)
+
+        started = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - started >= 0.15
+        assert limiter.stats()["blocked_seconds"] == 0
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_retry_after_holds_back_waiting_callers(self):
+        """[P0] A Retry-After received while a caller waits for its token delays that caller too.
+
+        GIVEN: A caller sleeping 1 s for its token
+        WHEN: A 429 with Retry-After: 5 arrives during that sleep
+        THEN: The caller sleeps the remaining 4 s before acquire() returns
+        """
+        from mcp_servers.rate_limiter import RateLimiter
+
+        clock = FakeClock()
+        limiter = RateLimiter("https://images.nasa.gov", 1)
+
+        async def sleep(seconds):
+            if not limiter.throttled:
+                await limiter.on_throttle(retry_after=5)
+            clock.now += seconds
+
+        with patch("mcp_servers.rate_limiter.time", clock), \
+                patch("mcp_servers.rate_limiter.asyncio.sleep", AsyncMock(side_effect=sleep)) as slept:
+            assert await limiter.acquire() == 0.0
+            assert await limiter.acquire() == pytest.approx(5)
+
+        assert [call.args[0] for call in slept.await_args_list] == pytest.approx([1, 4])
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_file_backend_shares_retry_after(self, tmp_path):
+        """[P0] With the file backend a Retry-After seen by one process holds back the others.
+
+        GIVEN: Two limiters sharing an origin's state file (two processes)
+        WHEN: One is throttled with Retry-After: 5
+        THEN: The other waits 5 s before its first request
+        """
+        from mcp_servers.rate_limiter import RateLimiter
+
+        clock = FakeClock()
+
+        async def sleep(seconds):
+            clock.now += seconds
+
+        with patch("mcp_servers.rate_limiter.time", clock), \
+                patch("mcp_servers.rate_limiter.asyncio.sleep", AsyncMock(side_effect=sleep)):
+            throttled = RateLimiter("https://www.dvidshub.net", 30, backend="file", state_dir=tmp_path)
+            other = RateLimiter("https://www.dvidshub.net", 30, backend="file", state_dir=tmp_path)
+            await throttled.on_throttle(retry_after=5)
+            assert other.stats()["blocked_seconds"] == 0
+            assert await other.acquire() == pytest.approx(5)
+
+
+class TestServerBackoff:
+    """Test Retry-After and adaptation in the servers' fetch loop."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("module_name, server_class", [
+        ("dvids_scraping_server", "DVIDSScrapingMCPServer"),
+        ("nasa_scraping_server", "NASAScrapingMCPServer"),
+    ])
+    async def test_fetch_honors_retry_after(self, module_name, server_class, tmp_path):
+        """[P0] A 429 with Retry-After slows the limiter and the retry waits at least that long.
+
+        GIVEN: An origin answering 429 with Retry-After: 7, then 200
+        WHEN: The server fetches a URL
+        THEN: It sleeps >= 7 s once; the rate is halved, then raised one step by the fast 200
+        """
+        import importlib
+
+        import httpx
+
+        module = importlib.import_module(f"mcp_servers.{module_name}")
+        server = getattr(module, server_class)(cache_dir=str(tmp_path))
+        interval = server.limiter.interval
+        request = httpx.Request("GET", "https://example.org/page")
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "7"}, request=request),
+            httpx.Response(200, text="ok", request=request),
+        ]
+        client = AsyncMock()
+        client.get = AsyncMock(side_effect=responses)
+
+        with patch.object(server, "_respect_rate_limit", AsyncMock()), \
+                patch(f"mcp_servers.{module_name}.asyncio.sleep", AsyncMock()) as sleep:
+            response = await server._fetch_with_backoff("https://example.org/page", client)
+
+        assert response.status_code == 200
+        sleep.assert_awaited_once()
+        assert 7 <= sleep.await_args.args[0] <= module.MAX_BACKOFF_SECONDS
+        assert server.limiter.interval == pytest.approx(1 / (1 / (2 * interval) + 1 / (10 * interval)))
+        assert server.rate_limit_status()["throttled"] == 1
+        await server.aclose()
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_fetch_gives_up_on_long_retry_after(self, tmp_path):
+        """[P1] A Retry-After beyond MAX_BACKOFF_SECONDS raises instead of sleeping through the tool call."""
+        import httpx
+
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+
+        server = NASAScrapingMCPServer(cache_dir=str(tmp_path))
+        request = httpx.Request("GET", "https://images.nasa.gov/search")
+        client = AsyncMock()
+        client.get = AsyncMock(return_value=httpx.Response(503, headers={"Retry-After": "3600"}, request=request))
+
+        with patch.object(server, "_respect_rate_limit", AsyncMock()), \
+                patch("mcp_servers.nasa_scraping_server.asyncio.sleep", AsyncMock()) as sleep:
+            with pytest.raises(httpx.HTTPStatusError):
+                await server._fetch_with_backoff("https://images.nasa.gov/search", client)
+
+        client.get.assert_awaited_once()
+        sleep.assert_not_awaited()
+        await server.aclose()
@@ -0,0 +1,164 @@
+"""
+Response Cache Tests
+
+These tests validate the persistent search/details response cache: key
+normalization, TTLs with stale-while-revalidate, in-flight request
+deduplication, the size cap and its use by the scraping servers.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+def _cache(tmp_path, **options):
+    from mcp_servers.response_cache import ResponseCache
+
+    return ResponseCache(tmp_path / "responses.db", **options)
+
+
+class TestResponseCache:
+    """Test ResponseCache."""
+
+    @pytest.mark.P1
+    def test_key_normalization(self):
+        """[P1] Case and whitespace differences in queries share a key."""
+        from mcp_servers.response_cache import response_key
+
+        assert response_key("search", "nasa", query=" Space  Shuttle", max_duration=60) == \
+            response_key("search", "nasa", query="space shuttle", max_duration=60)
+        assert response_key("search", "nasa", query="space shuttle", max_duration=60) != \
+            response_key("search", "nasa", query="space shuttle", max_duration=120)
+        assert response_key("search", "nasa", query="x") != response_key("search", "dvids", query="x")
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_fetch_once(self, tmp_path):
+        """[P0] Concurrent requests for the same key share one fetch.
+
+        GIVEN: An empty response cache
+        WHEN: Three callers request the same key at once
+        THEN: The fetch runs once, all callers get its result and it persists
+        """
+        cache = _cache(tmp_path)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return [{"videoId": "1"}]
+
+        results = await asyncio.gather(*(cache.aget("k", fetch) for _ in range(3)))
+
+        assert results == [[{"videoId": "1"}]] * 3
+        assert len(calls) == 1
+        assert _cache(tmp_path).get("k")[0] == [{"videoId": "1"}]
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, tmp_path):
+        """[P0] A stale response is served immediately and refreshed in the background.
+
+        GIVEN: A stored response older than ttl but within stale_ttl
+        WHEN: Requesting it
+        THEN: The stale value is returned and the next request sees the refreshed value
+        """
+        cache = _cache(tmp_path, ttl=0, stale_ttl=60)
+        cache.put("k", "old")
+
+        assert await cache.aget("k", AsyncMock(return_value="new")) == "old"
+        await asyncio.gather(*cache._inflight.values())
+
+        assert cache.get("k")[0] == "new"
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_failures_are_not_stored(self, tmp_path):
+        """[P1] A failed fetch raises to the caller and leaves nothing behind."""
+        cache = _cache(tmp_path)
+
+        with pytest.raises(RuntimeError):
+            await cache.aget("k", AsyncMock(side_effect=RuntimeError("HTTP 503")))
+
+        assert cache.get("k") is None
+        assert await cache.aget("k", AsyncMock(return_value=[])) == []
+
+    @pytest.mark.P1
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """[P1] The total size stays under max_bytes by evicting LRU responses."""
+        import time
+
+        cache = _cache(tmp_path, max_bytes=250)
+        cache.put("a", "x" * 100)
+        cache.put("b", "y" * 100)
+        time.sleep(0.01)
+        cache.get("a")
+        cache.put("c", "z" * 100)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.total_bytes() <= 250
+
+
+class TestServerResponseCaching:
+    """Test response caching in the scraping servers."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_repeated_search_skips_network(self, tmp_path):
+        """[P0] A repeated NASA search is answered without scraping again."""
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+
+        server = NASAScrapingMCPServer(cache_dir=str(tmp_path))
+        results = [{"videoId": "1", "title": "Launch"}]
+
+        with patch.object(server, "_search_videos", AsyncMock(return_value=results)) as scrape:
+            first = await server.search_videos(query="Space Shuttle", max_duration=60)
+            second = await server.search_videos(query="space  shuttle", max_duration=60)
+
+        assert first == second == results
+        scrape.assert_awaited_once()
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_details_cached_per_video(self, tmp_path):
+        """[P1] DVIDS video details are cached per video_id."""
+        from mcp_servers.dvids_scraping_server import DVIDSScrapingMCPServer
+
+        server = DVIDSScrapingMCPServer(cache_dir=str(tmp_path))
+
+        async def details(video_id):
+            return {"videoId": video_id}
+
+        with patch.object(server, "_get_video_details", side_effect=details) as scrape:
+            await server.get_video_details("1")
+            await server.get_video_details("1")
+            assert await server.get_video_details("2") == {"videoId": "2"}
+
+        assert scrape.call_count == 2
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_rejected_before_cache_lookup(self, tmp_path):
+        """[P1] NASA validates search and details arguments even when the response cache would answer.
+
+        GIVEN: A search for "launch" already cached
+        WHEN: Searching with an invalid max_duration, or asking details for an invalid video_id
+        THEN: ValueError is raised without consulting the response cache
+        """
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+
+        server = NASAScrapingMCPServer(cache_dir=str(tmp_path))
+        with patch.object(server, "_search_videos", AsyncMock(return_value=[{"videoId": "1"}])):
+            await server.search_videos(query="launch")
+
+        with patch.object(server.responses, "aget", AsyncMock()) as lookup:
+            with pytest.raises(ValueError):
+                await server.search_videos(query="launch", max_duration=-5)
+            with pytest.raises(ValueError):
+                await server.search_videos(query="launch\x00pad")
+            with pytest.raises(ValueError):
+                await server.get_video_details("../etc")
+
+        lookup.assert_not_awaited()
@@ -0,0 +1,179 @@
+"""
+Resumable Download Tests
+
+These tests validate that interrupted downloads are kept as .part files
+with their byte offset and ETag/Last-Modified recorded in metadata, that
+the next attempt resumes with a Range request, and that only complete
+files are committed.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+VIDEO = bytes(range(256)) * 40
+ETAG = '"v1"'
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def _broken(*parts):
+    for part in parts:
+        yield part
+    raise ConnectionError("connection reset")
+
+
+class TestVideoCacheResume:
+    """Test put_stream_resumable and resume_point."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_interrupted_download_resumes(self, tmp_path):
+        """[P0] An interrupted download is checkpointed and resumed.
+
+        GIVEN: A download that fails after 3000 bytes
+        WHEN: Resuming it from the recorded offset with the remaining bytes
+        THEN: The complete, correctly hashed file is committed and the .part file is gone
+        """
+        import hashlib
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        with pytest.raises(ConnectionError):
+            await cache.put_stream_resumable(
+                "clip", _broken(VIDEO[:1000], VIDEO[1000:3000]),
+                validators={"etag": ETAG}, total_size=len(VIDEO)
+            )
+
+        assert cache.get_cached_entry("clip") is None
+        checkpoint = cache.resume_point("clip")
+        assert checkpoint["offset"] == 3000
+        assert checkpoint["etag"] == ETAG
+        assert checkpoint["total_size"] == len(VIDEO)
+
+        entry = await cache.put_stream_resumable(
+            "clip", _chunks(VIDEO[3000:]), offset=3000,
+            validators={"etag": ETAG}, total_size=len(VIDEO)
+        )
+
+        assert not entry.get("partial")
+        assert entry["etag"] == ETAG
+        assert entry["content_hash"] == hashlib.sha256(VIDEO).hexdigest()
+        assert (tmp_path / "dvids" / "clip.mp4").read_bytes() == VIDEO
+        assert not (tmp_path / "dvids" / "segments" / "clip.mp4.part").exists()
+        assert cache.resume_point("clip") is None
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_short_stream_is_not_committed(self, tmp_path):
+        """[P0] A stream ending before total_size is kept as a checkpoint, not committed."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        with pytest.raises(IOError):
+            await cache.put_stream_resumable(
+                "clip", _chunks(VIDEO[:500]), validators={"etag": ETAG}, total_size=len(VIDEO)
+            )
+
+        assert not (tmp_path / "dvids" / "clip.mp4").exists()
+        assert cache.resume_point("clip")["offset"] == 500
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_without_validators_nothing_is_kept(self, tmp_path):
+        """[P1] Without ETag or Last-Modified a failed download cannot be resumed."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path))
+        with pytest.raises(ConnectionError):
+            await cache.put_stream_resumable("clip", _broken(VIDEO[:1000]))
+
+        assert cache.get_entry("clip") is None
+        assert not (tmp_path / "dvids" / "segments" / "clip.mp4.part").exists()
+
+    @pytest.mark.P1
+    def test_resume_offset_detects_changed_file(self):
+        """[P1] A 206 for a different ETag or offset means starting over."""
+        from mcp_servers.byte_ranges import resume_headers, resume_offset
+
+        checkpoint = {"offset": 100, "etag": ETAG, "last_modified": None}
+        assert resume_headers(checkpoint) == {"Range": "bytes=100-", "If-Range": ETAG}
+        assert resume_headers(None) is None
+
+        resumed = {"Content-Range": "bytes 100-999/1000", "ETag": ETAG}
+        assert resume_offset(206, resumed, checkpoint) == 100
+        assert resume_offset(206, dict(resumed, ETag='"v2"'), checkpoint) is None
+        assert resume_offset(206, dict(resumed, **{"Content-Range": "bytes 0-999/1000"}), checkpoint) is None
+        assert resume_offset(200, {"ETag": '"v2"'}, checkpoint) == 0
+
+
+class TestServerResume:
+    """Test resumed downloads through the scraping servers."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_dvids_resumes_with_range_request(self, tmp_path):
+        """[P0] DVIDS continues an interrupted download with Range and If-Range.
+
+        GIVEN: A checkpoint of 2000 bytes with ETag "v1"
+        WHEN: Downloading the video again and the origin answers 206
+        THEN: Only the remaining bytes are requested and the full file is cached
+        """
+        import httpx
+        from mcp_servers.dvids_scraping_server import DVIDSScrapingMCPServer
+
+        server = DVIDSScrapingMCPServer(cache_dir=str(tmp_path))
+        with pytest.raises(ConnectionError):
+            await server.cache.put_stream_resumable(
+                "123", _broken(VIDEO[:2000]), validators={"etag": ETAG}, total_size=len(VIDEO)
+            )
+        requests = []
+
+        async def send(self, request, **kwargs):
+            requests.append(request)
+            return httpx.Response(
+                206,
+                headers={"Content-Range": f"bytes 2000-{len(VIDEO) - 1}/{len(VIDEO)}", "ETag": ETAG},
+                content=VIDEO[2000:], request=request
+            )
+
+        with patch.object(server, "_respect_rate_limit", AsyncMock()), \
+                patch("httpx.AsyncClient.send", send):
+            async with httpx.AsyncClient() as client:
+                entry = await server._stream_to_cache("123", "https://www.dvidshub.net/files/123.mp4", client)
+
+        assert requests[0].headers["Range"] == "bytes=2000-"
+        assert requests[0].headers["If-Range"] == ETAG
+        assert (tmp_path / "dvids" / "123.mp4").read_bytes() == VIDEO
+        assert entry["etag"] == ETAG
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_nasa_restarts_when_file_changed(self, tmp_path):
+        """[P1] NASA starts over when If-Range yields the whole (changed) file."""
+        import httpx
+        from mcp_servers.nasa_scraping_server import NASAScrapingMCPServer
+
+        server = NASAScrapingMCPServer(cache_dir=str(tmp_path))
+        with pytest.raises(ConnectionError):
+            await server.cache.put_stream_resumable(
+                "123", _broken(VIDEO[:2000]), validators={"etag": ETAG}, total_size=len(VIDEO)
+            )
+        changed = VIDEO[::-1]
+
+        async def send(self, request, **kwargs):
+            return httpx.Response(
+                200, headers={"Content-Length": str(len(changed)), "ETag": '"v2"'},
+                content=changed, request=request
+            )
+
+        with patch.object(server, "_respect_rate_limit", AsyncMock()), \
+                patch("httpx.AsyncClient.send", send):
+            async with httpx.AsyncClient() as client:
+                entry = await server._stream_to_cache("123", "https://images.nasa.gov/clip.mp4", client)
+
+        assert (tmp_path / "nasa" / "123.mp4").read_bytes() == changed
+        assert entry["etag"] == '"v2"'
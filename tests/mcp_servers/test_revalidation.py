@@ -0,0 +1,140 @@
+"""
+Conditional Revalidation Tests
+
+These tests validate that expired entries recorded with an ETag or
+Last-Modified are revalidated with the origin, that a 304 extends the TTL
+without downloading the body, and that changed files are downloaded again.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+ETAG = '"v1"'
+
+
+async def _chunks(data):
+    yield data
+
+
+async def _expired_entry(cache, video_id="clip", data=b"footage", **validators):
+    """Cache a video whose TTL has passed (cache created with default_ttl_days=0)."""
+    return await cache.put_stream_resumable(
+        video_id, _chunks(data), validators=validators or {"etag": ETAG}
+    )
+
+
+class TestUnchangedValidators:
+    """Test interpretation of conditional responses."""
+
+    @pytest.mark.P0
+    def test_not_modified_and_matching_responses(self):
+        """[P0] 304, or 200 with matching validators, means unchanged."""
+        from mcp_servers.revalidation import conditional_headers, unchanged_validators
+
+        entry = {"etag": ETAG, "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT", "size": 7}
+        assert conditional_headers(entry) == {
+            "If-None-Match": ETAG, "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+        }
+
+        assert unchanged_validators(304, {}, entry) == {
+            "etag": ETAG, "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"
+        }
+        assert unchanged_validators(200, {"ETag": ETAG, "Content-Length": "7"}, entry) == {"etag": ETAG}
+        assert unchanged_validators(200, {"ETag": '"v2"'}, entry) is None
+        assert unchanged_validators(200, {"ETag": ETAG, "Content-Length": "8"}, entry) is None
+        assert unchanged_validators(404, {}, entry) is None
+
+
+class TestVideoCacheRevalidation:
+    """Test revalidation through VideoCache.aget_entry."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_not_modified_extends_ttl_without_download(self, tmp_path):
+        """[P0] An unchanged expired entry is renewed, not downloaded.
+
+        GIVEN: An expired entry recorded with an ETag
+        WHEN: aget_entry is called and revalidate_fn reports it unchanged
+        THEN: download_fn is not called and the entry is served with a fresh cached_date
+        """
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path), default_ttl_days=0)
+        old = await _expired_entry(cache)
+        assert cache.get_cached_entry("clip") is None
+
+        revalidate = AsyncMock(return_value={"etag": ETAG})
+        download = AsyncMock(side_effect=AssertionError("should not download"))
+        entry, cached = await cache.aget_entry("clip", download, revalidate_fn=revalidate)
+
+        assert cached is True
+        assert entry["cached_date"] > old["cached_date"]
+        assert entry["file_path"] == old["file_path"]
+        assert revalidate.await_args[0][1]["etag"] == ETAG
+        stats = cache.get_stats()
+        assert (stats["revalidations"], stats["misses"]) == (1, 0)
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_changed_file_is_downloaded(self, tmp_path):
+        """[P1] When revalidate_fn reports a change the video is downloaded again."""
+        from mcp_servers.cache import VideoCache
+
+        cache = VideoCache("dvids", str(tmp_path), default_ttl_days=0)
+        await _expired_entry(cache)
+
+        async def download(video_id):
+            return await cache.put_stream_resumable(video_id, _chunks(b"new footage"))
+
+        entry, cached = await cache.aget_entry("clip", download, revalidate_fn=AsyncMock(return_value=None))
+
+        assert cached is False
+        assert entry["size"] == len(b"new footage")
+
+    @pytest.mark.P1
+    def test_janitor_keeps_revalidatable_entries(self, tmp_path):
+        """[P1] The expired sweep keeps entries that can still be revalidated."""
+        import asyncio
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.janitor import CacheJanitor
+
+        cache = VideoCache("dvids", str(tmp_path), default_ttl_days=0)
+        asyncio.run(_expired_entry(cache, "with_etag"))
+        cache.get("plain", lambda v: b"no validators")
+
+        CacheJanitor(cache, batch_pause=0).run_once(jobs=["expired"])
+
+        assert cache.get_entry("with_etag") is not None
+        assert cache.get_entry("plain") is None
+
+
+class TestServerRevalidation:
+    """Test conditional HEAD requests of the scraping servers."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_dvids_download_revalidates_with_head(self, tmp_path):
+        """[P0] DVIDS renews an expired video with a conditional HEAD answered 304."""
+        import httpx
+        from mcp_servers.cache import VideoCache
+        from mcp_servers.dvids_scraping_server import DVIDSScrapingMCPServer
+
+        server = DVIDSScrapingMCPServer(cache_dir=str(tmp_path))
+        server.cache = VideoCache("dvids", str(tmp_path), default_ttl_days=0)
+        await _expired_entry(server.cache, "123")
+        server._download_urls["123"] = "https://www.dvidshub.net/files/123.mp4"
+        requests = []
+
+        async def request(self, method, url, **kwargs):
+            requests.append((method, kwargs.get("headers")))
+            return httpx.Response(304, request=httpx.Request(method, url))
+
+        with patch.object(server, "_respect_rate_limit", AsyncMock()), \
+                patch("mcp_servers.dvids_scraping_server.check_robots_txt", AsyncMock(return_value=True)), \
+                patch("httpx.AsyncClient.request", request), \
+                patch("httpx.AsyncClient.send", AsyncMock(side_effect=AssertionError("body fetched"))):
+            result = await server.download_video(video_id="123")
+
+        assert result["cached"] is True
+        assert requests == [("HEAD", {"If-None-Match": ETAG})]
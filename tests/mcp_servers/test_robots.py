@@ -0,0 +1,145 @@
+"""
+robots.txt Policy Cache Tests
+
+These tests validate that robots.txt is fetched once per origin and TTL,
+that cache headers set the TTL, that concurrent checks share one fetch,
+and that the DVIDS server answers compliance checks from the cache.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+ROBOTS_TXT = "User-agent: *\nDisallow: /private/\n"
+
+
+def _response(status=200, text=ROBOTS_TXT, headers=None):
+    import httpx
+
+    request = httpx.Request("GET", "https://www.dvidshub.net/robots.txt")
+    return httpx.Response(status, text=text, headers=headers or {}, request=request)
+
+
+def _client(*responses, delay=0.0):
+    """Client stand-in whose get() returns responses in order."""
+    queue = list(responses)
+
+    async def get(url, **kwargs):
+        await asyncio.sleep(delay)
+        item = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    client = AsyncMock()
+    client.get = AsyncMock(side_effect=get)
+    return client
+
+
+class TestTtlFromHeaders:
+    """Test cache header parsing."""
+
+    @pytest.mark.P1
+    def test_ttl_from_headers(self):
+        """[P1] max-age wins over Expires; no-cache means 0; no headers use the default."""
+        import httpx
+
+        from mcp_servers.robots import ttl_from_headers
+
+        assert ttl_from_headers(httpx.Headers({"Cache-Control": "public, max-age=600"}), 99) == 600
+        assert ttl_from_headers(httpx.Headers({"Cache-Control": "no-cache"}), 99) == 0
+        assert ttl_from_headers(httpx.Headers({
+            "Date": "Mon, 01 Jan 2024 00:00:00 GMT",
+            "Expires": "Mon, 01 Jan 2024 01:00:00 GMT",
+        }), 99) == 3600
+        assert ttl_from_headers(httpx.Headers({"Expires": "0"}), 99) == 0
+        assert ttl_from_headers(httpx.Headers({}), 99) == 99
+
+
+class TestRobotsCache:
+    """Test RobotsCache."""
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_policy_cached_and_single_flight(self):
+        """[P0] Concurrent checks share one fetch; later checks are in-memory lookups.
+
+        GIVEN: A robots.txt disallowing /private/
+        WHEN: Five checks of the same origin run concurrently, then two more follow
+        THEN: robots.txt is fetched once and the rules are applied to each URL
+        """
+        from mcp_servers.robots import RobotsCache
+
+        robots = RobotsCache()
+        client = _client(_response(), delay=0.05)
+
+        results = await asyncio.gather(*(
+            robots.is_allowed(f"https://www.dvidshub.net/video/{i}", client) for i in range(5)
+        ))
+        assert results == [True] * 5
+        assert await robots.is_allowed("https://www.dvidshub.net/private/x", client) is False
+        assert await robots.is_allowed("https://www.dvidshub.net/search/?q=a", client) is True
+
+        client.get.assert_awaited_once()
+
+    @pytest.mark.P0
+    @pytest.mark.asyncio
+    async def test_ttl_from_headers_and_expiry(self):
+        """[P0] The policy lives for the header TTL (bounded) and is refetched after it."""
+        import time
+
+        from mcp_servers.robots import RobotsCache
+
+        robots = RobotsCache(ttl=3600, min_ttl=60, max_ttl=7200)
+        client = _client(
+            _response(headers={"Cache-Control": "max-age=10"}),
+            _response(text="User-agent: *\nDisallow: /\n", headers={"Cache-Control": "max-age=999999"}),
+        )
+
+        await robots.is_allowed("https://www.dvidshub.net/video/1", client)
+        policy = robots.get_policy("https://www.dvidshub.net/")
+        assert 59 < policy.expires_at - time.monotonic() <= 60
+
+        policy.expires_at = 0
+        assert await robots.is_allowed("https://www.dvidshub.net/video/1", client) is False
+        assert robots.get_policy("https://www.dvidshub.net/").expires_at - time.monotonic() <= 7200
+        assert client.get.await_count == 2
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_errors_keep_previous_policy(self):
+        """[P1] 404 allows everything; 5xx and network errors keep the known rules briefly."""
+        import httpx
+
+        from mcp_servers.robots import RobotsCache
+
+        robots = RobotsCache(error_ttl=30)
+        assert await robots.is_allowed("https://a.example/private/x", _client(_response(404))) is True
+
+        await robots.is_allowed("https://b.example/", _client(_response()))
+        for failure in (_response(503), httpx.ConnectError("down")):
+            robots.get_policy("https://b.example/").expires_at = 0
+            assert await robots.is_allowed("https://b.example/private/x", _client(failure)) is False
+        assert await robots.is_allowed("https://c.example/private/x", _client(httpx.ConnectError("down"))) is True
+
+
+class TestServerRobots:
+    """Test robots.txt checks in the DVIDS server."""
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_dvids_fetches_robots_once(self, tmp_path):
+        """[P1] Consecutive DVIDS searches fetch robots.txt only once."""
+        from mcp_servers.dvids_scraping_server import DVIDSScrapingMCPServer
+
+        server = DVIDSScrapingMCPServer(cache_dir=str(tmp_path))
+
+        with patch("httpx.AsyncClient.get", AsyncMock(return_value=_response(text="<html></html>"))) as get, \
+                patch.object(server, "_respect_rate_limit", AsyncMock()):
+            await server.search_videos("tank")
+            await server.search_videos("ship")
+
+        robots_calls = [call for call in get.call_args_list if call.args[0].endswith("/robots.txt")]
+        assert len(robots_calls) == 1
+        await server.aclose()
@@ -0,0 +1,136 @@
+"""
+VideoCache Hot Tier Tests
+
+These tests validate the two-tier cache: new downloads land in the cold
+tier, repeatedly hit videos are promoted to the hot tier, and hot entries
+are demoted by LRU when the hot tier budget is exceeded.
+"""
+
+from pathlib import Path
+
+import pytest
+
+
+def _hot_cache(tmp_path, **tier_options):
+    from mcp_servers.cache import VideoCache
+    from mcp_servers.tiering import HotTier
+
+    hot_tier = HotTier(str(tmp_path / "nvme"), **tier_options)
+    return VideoCache("dvids", str(tmp_path / "nfs"), hot_tier=hot_tier)
+
+
+def _hit(cache, video_id, times=1):
+    for _ in range(times):
+        cache.get(video_id, lambda v: pytest.fail("should be cached"))
+
+
+class TestHotTierPromotion:
+    """Test promotion of frequently hit videos."""
+
+    @pytest.mark.P0
+    def test_promoted_after_repeated_hits(self, tmp_path):
+        """[P0] A video is copied to the hot tier once it has been hit twice.
+
+        GIVEN: A two-tier cache with promote_after=2
+        WHEN: Downloading a video and hitting it twice
+        THEN: It is served from the hot tier and the cold copy is kept
+        """
+        cache = _hot_cache(tmp_path)
+        cache.get("clip", lambda v: b"footage")
+        cold_file = tmp_path / "nfs" / "dvids" / "clip.mp4"
+        hot_file = tmp_path / "nvme" / "dvids" / "clip.mp4"
+
+        _hit(cache, "clip")
+        assert cache.get_entry("clip").get("tier") is None
+        assert not hot_file.exists()
+
+        _hit(cache, "clip")
+        entry = cache.get_entry("clip")
+        assert entry["tier"] == "hot"
+        assert Path(entry["file_path"]) == hot_file
+        assert hot_file.read_bytes() == b"footage"
+        assert cold_file.exists()
+        assert cache.get_path("clip") == hot_file
+
+    @pytest.mark.P0
+    def test_lru_demotion_when_hot_tier_full(self, tmp_path):
+        """[P0] The least recently used hot entry is demoted to make room.
+
+        GIVEN: A hot tier holding at most one video
+        WHEN: Promoting a, then b, then hitting a once more
+        THEN: a is demoted back to its cold copy and b stays hot
+        """
+        from mcp_servers.eviction import CacheBudget
+
+        cache = _hot_cache(tmp_path, budget=CacheBudget(max_entries=1))
+        cache.get("a", lambda v: b"aaa")
+        cache.get("b", lambda v: b"bbb")
+
+        _hit(cache, "a", times=2)
+        _hit(cache, "b", times=2)
+
+        assert cache.get_entry("a").get("tier") is None
+        assert cache.get_entry("a")["file_path"] == str(tmp_path / "nfs" / "dvids" / "a.mp4")
+        assert not (tmp_path / "nvme" / "dvids" / "a.mp4").exists()
+        assert cache.get_entry("b")["tier"] == "hot"
+        assert cache.get("a", lambda v: pytest.fail("should be cached")) == b"aaa"
+
+        stats = cache.get_stats()
+        assert (stats["promotions"], stats["demotions"]) == (2, 1)
+        assert stats["tiers"]["hot"] == {"bytes": 3, "entries": 1}
+        assert stats["tiers"]["cold"]["entries"] == 2
+
+    @pytest.mark.P1
+    def test_lost_hot_copy_falls_back_to_cold(self, tmp_path):
+        """[P1] If the hot copy disappears the cold copy is served."""
+        cache = _hot_cache(tmp_path, promote_after=1)
+        cache.get("clip", lambda v: b"footage")
+        _hit(cache, "clip")
+        (tmp_path / "nvme" / "dvids" / "clip.mp4").unlink()
+
+        assert cache.get_cached_entry("clip")["file_path"] == str(tmp_path / "nfs" / "dvids" / "clip.mp4")
+        assert cache.get("clip", lambda v: pytest.fail("should be cached")) == b"footage"
+
+    @pytest.mark.P1
+    def test_invalidate_removes_both_copies(self, tmp_path):
+        """[P1] Invalidating a hot entry deletes the hot and the cold copy."""
+        cache = _hot_cache(tmp_path, promote_after=1)
+        cache.get("clip", lambda v: b"footage")
+        _hit(cache, "clip")
+
+        assert cache.invalidate("clip") is True
+        assert not (tmp_path / "nvme" / "dvids" / "clip.mp4").exists()
+        assert not (tmp_path / "nfs" / "dvids" / "clip.mp4").exists()
+
+    @pytest.mark.P1
+    @pytest.mark.asyncio
+    async def test_aget_entry_promotes(self, tmp_path):
+        """[P1] Hits through aget_entry promote without blocking the event loop."""
+        from mcp_servers.cache import iter_chunks
+
+        cache = _hot_cache(tmp_path, promote_after=1)
+
+        async def download(video_id):
+            return await cache.put_stream(video_id, iter_chunks(b"video"))
+
+        await cache.aget_entry("clip", download)
+        entry, cached = await cache.aget_entry("clip", download)
+
+        assert cached is True
+        assert entry["tier"] == "hot"
+
+    @pytest.mark.P2
+    def test_hot_tier_from_env(self, tmp_path, monkeypatch):
+        """[P2] VIDEO_CACHE_HOT_* variables configure the hot tier."""
+        from mcp_servers.cache import cache_options_from_env
+
+        assert cache_options_from_env("dvids")["hot_tier"] is None
+
+        monkeypatch.setenv("VIDEO_CACHE_HOT_DIR", str(tmp_path))
+        monkeypatch.setenv("VIDEO_CACHE_HOT_MAX_BYTES", "1000")
+        monkeypatch.setenv("VIDEO_CACHE_PROMOTE_AFTER_HITS", "5")
+        hot_tier = cache_options_from_env("dvids")["hot_tier"]
+
+        assert hot_tier.root == tmp_path
+        assert hot_tier.budget.max_bytes == 1000
+        assert hot_tier.promote_after == 5